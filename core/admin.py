@@ -257,6 +257,8 @@ class ProductAdmin(admin.ModelAdmin):
 
     search_fields = (
         "title",
+        "=sku",
+        "=barcode",
         "business__business_name",
         "public_id",
     )
@@ -0,0 +1,67 @@
+"""
+Vistas DRF para servir con ASGI.
+
+DRF despacha siempre de forma síncrona. `AsyncAPIView` ejecuta en un
+hilo la parte síncrona (autenticación, permisos y throttling, que usan
+el ORM y la caché) y espera en el event loop al handler `async def`.
+"""
+
+import asyncio
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            handler = getattr(
+                self,
+                request.method.lower(),
+                self.http_method_not_allowed,
+            )
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request,
+            response,
+            *args,
+            **kwargs,
+        )
+
+        return self.response
+
+
+def async_report_view(view_class):
+    """
+    Variante asíncrona de un `ReportAPIView`: mismas consultas, permisos
+    y esquema, con `get` como corrutina. El builder sigue siendo síncrono
+    y corre en el hilo de la petición; las búsquedas previas usan el ORM
+    asíncrono.
+    """
+
+    @wraps(view_class.get)
+    async def get(self, request):
+        return await self.areport_response(request)
+
+    return type(
+        f"Async{view_class.__name__}",
+        (AsyncAPIView, view_class),
+        {
+            "__module__": view_class.__module__,
+            "get": get,
+        },
+    )
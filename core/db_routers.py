@@ -0,0 +1,197 @@
+"""
+Lecturas en la réplica de PostgreSQL.
+
+Las escrituras siempre van a `default`. Las lecturas solo van a la
+réplica (`REPLICA_DATABASE_ALIAS`, si está configurada) dentro de una
+política activa:
+
+- `ReplicaReadMiddleware` la abre en cada petición y la habilita en
+  peticiones GET/HEAD a vistas con `replica_reads = True` (los reportes)
+  y a la acción `list` de los ViewSets.
+- `replica_reads()` la abre fuera de una petición, por ejemplo en
+  `run_report_worker`.
+
+Aun con la política habilitada se lee de `default` si la petición ya
+escribió, si hay una transacción abierta en `default` o si el usuario
+escribió hace menos de `REPLICA_READ_YOUR_WRITES_SECONDS`, para que
+nadie deje de ver sus propios cambios por el retraso de la réplica.
+"""
+
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import SimpleLazyObject, empty
+
+
+_policy = contextvars.ContextVar(
+    "replica_read_policy",
+    default=None,
+)
+
+SAFE_READ_METHODS = (
+    "GET",
+    "HEAD",
+)
+
+
+def replica_alias():
+    alias = settings.REPLICA_DATABASE_ALIAS
+
+    if alias and alias in settings.DATABASES:
+        return alias
+
+    return None
+
+
+def _pin_key(user_id):
+    return f"replica:pin:{user_id}"
+
+
+def pin_to_primary(user):
+    """
+    Marca al usuario para leer de `default` durante la ventana de
+    read-your-writes. La marca vive en la caché: con varios workers debe
+    ser una caché compartida, igual que la del throttling.
+    """
+    if (
+        replica_alias() is None
+        or user is None
+        or not user.is_authenticated
+    ):
+        return
+
+    cache.set(
+        _pin_key(user.pk),
+        True,
+        settings.REPLICA_READ_YOUR_WRITES_SECONDS,
+    )
+
+
+async def apin_to_primary(user):
+    """Variante de `pin_to_primary` para el middleware en modo ASGI."""
+    if (
+        replica_alias() is None
+        or user is None
+        or not user.is_authenticated
+    ):
+        return
+
+    await cache.aset(
+        _pin_key(user.pk),
+        True,
+        settings.REPLICA_READ_YOUR_WRITES_SECONDS,
+    )
+
+
+class ReadPolicy:
+    def __init__(self, request=None):
+        self.request = request
+        self.allowed = False
+        self.wrote = False
+        self._pinned = None
+
+    def current_user(self):
+        user = getattr(self.request, "user", None)
+
+        # No se evalúa el usuario perezoso de la sesión: hacerlo lanzaría
+        # consultas desde el propio router. DRF lo reemplaza por el
+        # usuario autenticado antes de llegar a la vista.
+        if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+            return None
+
+        return user
+
+    def is_pinned(self):
+        if self._pinned is not None:
+            return self._pinned
+
+        user = self.current_user()
+        if user is None:
+            return False
+
+        self._pinned = (
+            user.is_authenticated
+            and cache.get(_pin_key(user.pk)) is not None
+        )
+
+        return self._pinned
+
+    def read_alias(self):
+        if not self.allowed or self.wrote:
+            return None
+
+        alias = replica_alias()
+        if (
+            alias is None
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+            or self.is_pinned()
+        ):
+            return None
+
+        return alias
+
+
+def activate_policy(policy):
+    return _policy.set(policy)
+
+
+def deactivate_policy(token):
+    _policy.reset(token)
+
+
+@contextmanager
+def replica_reads():
+    """Habilita la réplica para las lecturas del bloque."""
+    policy = ReadPolicy()
+    policy.allowed = True
+    token = activate_policy(policy)
+
+    try:
+        yield policy
+    finally:
+        deactivate_policy(token)
+
+
+def view_reads_from_replica(view_func, method):
+    if method not in SAFE_READ_METHODS:
+        return False
+
+    view_class = getattr(view_func, "cls", None)
+    if view_class is None:
+        return False
+
+    actions = getattr(view_func, "actions", None)
+    if actions is not None:
+        # DRF atiende HEAD con la acción de GET.
+        return actions.get("get") == "list"
+
+    return getattr(view_class, "replica_reads", False)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        policy = _policy.get()
+
+        if policy is None:
+            return None
+
+        return policy.read_alias()
+
+    def db_for_write(self, model, **hints):
+        policy = _policy.get()
+
+        if policy is not None:
+            policy.wrote = True
+
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # La réplica es una copia de `default`: los objetos leídos de
+        # cualquiera de las dos se pueden relacionar.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
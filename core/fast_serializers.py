@@ -0,0 +1,327 @@
+"""
+Representación rápida de listados a partir de `values()`.
+
+En páginas de cientos de filas la mayor parte del tiempo se va en crear
+instancias de modelo y en recorrer campo por campo el serializer. Para
+los serializers de solo columnas y relaciones directas se compila una
+vez por clase (y por conjunto de campos) la lista de rutas de `values()`
+y un convertidor por campo, y cada fila se traduce directamente al
+mismo diccionario que produciría `to_representation()`.
+
+Los campos que no se pueden resolver así (SerializerMethodField,
+propiedades del modelo, `source="*"`, relaciones many-to-many o
+serializers anidados que no sean listas inversas del modelo principal)
+dejan el serializer sin ruta rápida y el listado usa el camino normal.
+"""
+
+from collections import defaultdict
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import empty
+
+from core.query_plans import PlanCache
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+_FAST_CONVERTERS = {
+    serializers.CharField: str,
+    serializers.EmailField: str,
+    serializers.URLField: str,
+    serializers.SlugField: str,
+    serializers.IntegerField: int,
+    serializers.FloatField: float,
+    serializers.BooleanField: bool,
+    serializers.ReadOnlyField: None,
+    serializers.SlugRelatedField: None,
+}
+
+
+def _converter(field):
+    if type(field) in _FAST_CONVERTERS:
+        return _FAST_CONVERTERS[type(field)]
+
+    if isinstance(field, serializers.UUIDField) and (
+        field.uuid_format == "hex_verbose"
+    ):
+        return str
+
+    if isinstance(field, serializers.SlugRelatedField):
+        return None
+
+    return field.to_representation
+
+
+class FastListPlan:
+    """
+    Rutas de `values()` y convertidores de un serializer de lectura.
+
+    `entries` conserva el orden de los campos del serializer; cada
+    entrada es una columna `(nombre, ruta, convertidor, ruta de guarda)`
+    o una lista anidada `(nombre, plan, campo FK del hijo)`.
+    """
+
+    def __init__(self, *, model, pk_path, entries):
+        self.model = model
+        self.pk_path = pk_path
+        self.entries = entries
+
+    @property
+    def paths(self):
+        paths = {self.pk_path}
+
+        for entry in self.entries:
+            if isinstance(entry[1], FastListPlan):
+                continue
+
+            _, path, _, guard = entry
+            paths.add(path)
+            if guard is not None:
+                paths.add(guard)
+
+        return sorted(paths)
+
+    def values(self, queryset):
+        return (
+            queryset
+            .select_related(None)
+            .prefetch_related(None)
+            .values(*self.paths)
+        )
+
+    def _nested_rows(self, plan, foreign_key, parent_ids):
+        ordering = plan.model._meta.ordering or [plan.pk_path]
+        grouped = defaultdict(list)
+
+        rows = (
+            plan.model._default_manager
+            .filter(**{f"{foreign_key}__in": parent_ids})
+            .order_by(*ordering)
+            .values(foreign_key, *plan.paths)
+        )
+        for row in rows:
+            grouped[row[foreign_key]].append(row)
+
+        return grouped
+
+    def represent(self, rows):
+        rows = list(rows)
+        nested = {
+            name: (
+                plan,
+                self._nested_rows(
+                    plan,
+                    foreign_key,
+                    [row[self.pk_path] for row in rows],
+                ),
+            )
+            for name, plan, foreign_key in (
+                entry
+                for entry in self.entries
+                if isinstance(entry[1], FastListPlan)
+            )
+        }
+
+        return [
+            self._represent_row(row, nested)
+            for row in rows
+        ]
+
+    def _represent_row(self, row, nested):
+        item = {}
+
+        for entry in self.entries:
+            name = entry[0]
+
+            if name in nested:
+                plan, grouped = nested[name]
+                item[name] = plan.represent(
+                    grouped.get(row[self.pk_path], ())
+                )
+                continue
+
+            _, path, convert, guard = entry
+            value = row[path]
+
+            if value is None:
+                # DRF omite el campo cuando una relación intermedia nula
+                # impide leerlo y el campo no admite null.
+                if guard is not None and row[guard] is None:
+                    continue
+                item[name] = None
+            else:
+                item[name] = convert(value) if convert else value
+
+        return item
+
+
+class _PlanCompiler:
+    def __init__(self, model, *, annotations=frozenset()):
+        self.model = model
+        self.annotations = annotations
+
+    def column_path(self, field):
+        """
+        Ruta de `values()` del campo y ruta de guarda, si hace falta.
+
+        La guarda es la clave primaria del último modelo relacionado:
+        cuando una FK intermedia nula impide leer el campo, DRF lo omite
+        si no admite null, y la guarda permite distinguir ese caso de
+        una columna que simplemente vale NULL.
+        """
+        model = self.model
+        names = []
+        nullable_relation = False
+        reverse_relation = False
+        attrs = field.source_attrs
+
+        for index, attr in enumerate(attrs):
+            last = index == len(attrs) - 1
+
+            if attr == "pk":
+                attr = model._meta.pk.name
+
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                if last and not names and attr in self.annotations:
+                    return attr, None
+                raise UnsupportedField(attr)
+
+            if last:
+                owner = model
+
+            if not model_field.is_relation:
+                if not last:
+                    raise UnsupportedField(attr)
+                names.append(attr)
+                break
+
+            if not (model_field.many_to_one or model_field.one_to_one):
+                raise UnsupportedField(attr)
+
+            names.append(attr)
+            model = model_field.related_model
+
+            if last:
+                if not isinstance(field, serializers.SlugRelatedField):
+                    raise UnsupportedField(attr)
+                names.append(field.slug_field)
+                break
+
+            if not model_field.concrete:
+                reverse_relation = True
+            elif model_field.null:
+                nullable_relation = True
+
+        path = "__".join(names)
+
+        if not nullable_relation or field.allow_null:
+            return path, None
+
+        if reverse_relation or field.default is not empty:
+            raise UnsupportedField(path)
+
+        guard = "__".join((*names[:len(attrs) - 1], owner._meta.pk.name))
+        return path, guard
+
+    def compile(self, serializer):
+        if (
+            type(serializer).to_representation
+            is not serializers.Serializer.to_representation
+        ):
+            raise UnsupportedField("to_representation")
+
+        entries = []
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if isinstance(field, serializers.ListSerializer):
+                entries.append(self.compile_nested(name, field))
+                continue
+
+            if (
+                field.source == "*"
+                or isinstance(
+                    field,
+                    (
+                        serializers.BaseSerializer,
+                        serializers.SerializerMethodField,
+                        serializers.ManyRelatedField,
+                        serializers.HyperlinkedRelatedField,
+                    ),
+                )
+                or (
+                    isinstance(field, serializers.RelatedField)
+                    and not isinstance(
+                        field,
+                        serializers.SlugRelatedField,
+                    )
+                )
+            ):
+                raise UnsupportedField(name)
+
+            path, guard = self.column_path(field)
+            entries.append((name, path, _converter(field), guard))
+
+        return FastListPlan(
+            model=self.model,
+            pk_path=self.model._meta.pk.name,
+            entries=entries,
+        )
+
+    def compile_nested(self, name, field):
+        if len(field.source_attrs) != 1:
+            raise UnsupportedField(name)
+
+        try:
+            relation = self.model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            raise UnsupportedField(name)
+
+        if not (relation.one_to_many and not relation.concrete):
+            raise UnsupportedField(name)
+
+        plan = _PlanCompiler(relation.related_model).compile(field.child)
+        if any(isinstance(entry[1], FastListPlan) for entry in plan.entries):
+            raise UnsupportedField(name)
+
+        return (name, plan, relation.field.attname)
+
+
+_PLANS = PlanCache()
+
+
+def _compile_or_none(model, serializer, annotations):
+    try:
+        return _PlanCompiler(model, annotations=annotations).compile(serializer)
+    except UnsupportedField:
+        return None
+
+
+def fast_list_plan(serializer, *, annotations=()):
+    """
+    Plan rápido de un ModelSerializer, o None si no admite la ruta
+    rápida. Se cachea por clase, campos expuestos y anotaciones en una
+    `PlanCache` acotada, incluidos los None.
+    """
+    model = getattr(getattr(serializer, "Meta", None), "model", None)
+    if model is None:
+        return None
+
+    annotations = frozenset(annotations)
+    key = (
+        type(serializer),
+        tuple(serializer.fields),
+        annotations,
+    )
+
+    return _PLANS.get_or_build(
+        key,
+        lambda: _compile_or_none(model, serializer, annotations),
+    )
@@ -0,0 +1,75 @@
+from uuid import UUID
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Business
+from core.services.archive import archive_closed_periods
+
+
+class Command(BaseCommand):
+    help = (
+        "Traslada a las tablas de archivo las transacciones liquidadas, "
+        "sus detalles, deudas, pagos y movimientos de inventario de los "
+        "meses cerrados anteriores al horizonte configurado."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--business-public-id")
+        parser.add_argument(
+            "--older-than-months",
+            type=int,
+            default=settings.ARCHIVE_HORIZON_MONTHS,
+            help="Meses completos que permanecen en las tablas activas.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Transacciones por lote; cada lote es una transacción.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo cuenta las filas archivables sin moverlas.",
+        )
+
+    def handle(self, *args, **options):
+        if options["older_than_months"] < 1 or options["batch_size"] < 1:
+            raise CommandError(
+                "--older-than-months y --batch-size deben ser mayores "
+                "que cero."
+            )
+
+        businesses = Business.objects.order_by("id")
+        business_public_id = options.get("business_public_id")
+        if business_public_id:
+            try:
+                business_public_id = UUID(str(business_public_id))
+            except (TypeError, ValueError):
+                raise CommandError(
+                    "El business-public-id debe ser un UUID válido."
+                )
+            businesses = businesses.filter(public_id=business_public_id)
+            if not businesses.exists():
+                raise CommandError(
+                    "No existe un Business con el public_id indicado."
+                )
+
+        dry_run = options["dry_run"]
+
+        for business in businesses:
+            moved = archive_closed_periods(
+                business=business,
+                older_than_months=options["older_than_months"],
+                batch_size=options["batch_size"],
+                dry_run=dry_run,
+            )
+            counts = " ".join(
+                f"{name}={count}"
+                for name, count in sorted(moved.items())
+            )
+            self.stdout.write(
+                f"Business={business.public_id} "
+                f"dry_run={str(dry_run).lower()} {counts}".rstrip()
+            )
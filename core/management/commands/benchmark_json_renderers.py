@@ -0,0 +1,138 @@
+import time
+from datetime import timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import (
+    FastJSONRenderer,
+    StreamingJSONRenderer,
+    orjson,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el JSONRenderer de DRF con FastJSONRenderer y "
+        "StreamingJSONRenderer sobre una página de listado y un reporte "
+        "con la forma de los de inventario y deudas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=2000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+        if rows < 1 or repeat < 1:
+            raise CommandError(
+                "--rows y --repeat deben ser mayores que cero."
+            )
+
+        if orjson is None:
+            self.stdout.write(
+                "orjson no está instalado: FastJSONRenderer usa el "
+                "renderer de DRF."
+            )
+
+        payloads = {
+            "list_page": self._list_page(rows),
+            "report": self._report(rows),
+        }
+        renderers = {
+            "drf": lambda data: JSONRenderer().render(data),
+            "fast": lambda data: FastJSONRenderer().render(data),
+            "streaming": lambda data: b"".join(
+                StreamingJSONRenderer().stream(data)
+            ),
+        }
+
+        for payload_name, data in payloads.items():
+            expected = JSONRenderer().render(data)
+
+            for renderer_name, render in renderers.items():
+                if renderer_name == "streaming" and not (
+                    StreamingJSONRenderer().should_stream(data)
+                ):
+                    continue
+
+                output = render(data)
+
+                started = time.perf_counter()
+                for _ in range(repeat):
+                    render(data)
+                seconds = time.perf_counter() - started
+
+                self.stdout.write(
+                    f"payload={payload_name} renderer={renderer_name} "
+                    f"bytes={len(output)} "
+                    f"ms_per_render={seconds * 1000 / repeat:.2f} "
+                    f"same_output={output == expected}"
+                )
+
+    def _list_page(self, rows):
+        now = timezone.now()
+
+        return {
+            "count": rows * 10,
+            "total_pages": 10,
+            "current_page": 1,
+            "page_size": rows,
+            "next": "https://api.playnow.invalid/api/transactions/?page=2",
+            "previous": None,
+            "results": [
+                {
+                    "public_id": str(uuid4()),
+                    "type": "sale",
+                    "concept": f"Venta de mostrador {index}",
+                    "total_value": "1250.50",
+                    "payment_status": "paid",
+                    "customer_name": "Cliente Ñandú",
+                    "created_at": (
+                        now - timedelta(minutes=index)
+                    ).isoformat(),
+                    "details": [
+                        {
+                            "public_id": str(uuid4()),
+                            "product_name": f"Producto {line}",
+                            "quantity": 2,
+                            "unit_price": "312.63",
+                            "total_price": "625.25",
+                        }
+                        for line in range(2)
+                    ],
+                }
+                for index in range(rows)
+            ],
+        }
+
+    def _report(self, rows):
+        return {
+            "business": {
+                "public_id": uuid4(),
+                "name": "Negocio de benchmark",
+                "currency": "NIO",
+            },
+            "period": {
+                "date_from": timezone.localdate() - timedelta(days=30),
+                "date_to": timezone.localdate(),
+            },
+            "products": [
+                {
+                    "public_id": uuid4(),
+                    "title": f"Producto {index}",
+                    "opening_stock": index,
+                    "entries": 10,
+                    "sales": 4,
+                    "adjustments": -1,
+                    "closing_stock": index + 5,
+                    "closing_value": str(Decimal("6.00") * (index + 5)),
+                }
+                for index in range(rows)
+            ],
+            "generated_at": timezone.now(),
+        }
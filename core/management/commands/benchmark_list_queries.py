@@ -0,0 +1,290 @@
+import time
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import (
+    Business,
+    BusinessMembership,
+    Customer,
+    Debt,
+    EntityStatus,
+    PaymentMethod,
+    Product,
+    StockMovement,
+    Transaction,
+    TransactionDetail,
+    User,
+)
+from core.views import (
+    DebtViewSet,
+    ProductViewSet,
+    StockMovementViewSet,
+    TransactionViewSet,
+)
+
+
+ENDPOINTS = {
+    "transactions": TransactionViewSet,
+    "stock-movements": StockMovementViewSet,
+    "debts": DebtViewSet,
+    "products": ProductViewSet,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara los listados completos, con la poda de columnas derivada "
+        "del serializer y con la ruta rápida de values(): consultas, bytes "
+        "leídos de la base y latencia."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=1000,
+            help="Transacciones de venta a crear como datos de prueba.",
+        )
+        parser.add_argument("--page-size", type=int, default=200)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument(
+            "--endpoint",
+            choices=ENDPOINTS,
+            action="append",
+            help="Listado a medir; por defecto se miden todos.",
+        )
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+        if rows < 1 or repeat < 1:
+            raise CommandError(
+                "--rows y --repeat deben ser mayores que cero."
+            )
+
+        fixtures = self._create_fixtures(rows=rows)
+
+        try:
+            for name in options["endpoint"] or list(ENDPOINTS):
+                results = {
+                    mode: self._run_endpoint(
+                        viewset=ENDPOINTS[name],
+                        fixtures=fixtures,
+                        page_size=options["page_size"],
+                        repeat=repeat,
+                        pruned=pruned,
+                        fast=fast,
+                    )
+                    for mode, pruned, fast in (
+                        ("full", False, False),
+                        ("pruned", True, False),
+                        ("fast", True, True),
+                    )
+                }
+
+                for mode, result in results.items():
+                    same_output = (
+                        result["content"] == results["full"]["content"]
+                    )
+                    self.stdout.write(
+                        f"endpoint={name} mode={mode} "
+                        f"queries={result['queries']} "
+                        f"fetched_bytes={result['fetched_bytes']} "
+                        f"ms_per_request={result['ms_per_request']:.1f} "
+                        f"same_output={same_output}"
+                    )
+        finally:
+            self._delete_fixtures(fixtures)
+
+    def _create_fixtures(self, *, rows):
+        suffix = uuid4().hex[:12]
+        active_status, _ = EntityStatus.objects.get_or_create(name="Activo")
+        user = User.objects.create_user(
+            email=f"list-benchmark-{suffix}@playnow.invalid",
+            full_name="Benchmark de listados",
+            password=None,
+        )
+        business = Business.objects.create(
+            user=user,
+            business_name=f"Benchmark de listados {suffix}",
+            description="",
+            currency="NIO",
+            status=active_status,
+        )
+        BusinessMembership.objects.create(
+            user=user,
+            business=business,
+            role=BusinessMembership.ROLE_OWNER,
+            is_active=True,
+        )
+        customer = Customer.objects.create(
+            business=business,
+            full_name="Cliente de benchmark",
+            phone="",
+            email="",
+            status=active_status,
+        )
+        method = PaymentMethod.objects.create(
+            business=business,
+            name="Efectivo",
+            status=active_status,
+        )
+
+        products = Product.objects.bulk_create([
+            Product(
+                business=business,
+                title=f"Producto {index}",
+                description="Descripción extensa del producto. " * 60,
+                image_url=f"https://cdn.playnow.invalid/{suffix}/{index}.jpg",
+                base_price=Decimal("10.00"),
+                base_cost=Decimal("6.00"),
+                stock=rows,
+                is_visible=True,
+                status=active_status,
+            )
+            for index in range(max(rows // 10, 1))
+        ])
+        transactions = Transaction.objects.bulk_create([
+            Transaction(
+                business=business,
+                customer=customer,
+                payment_method=method,
+                type="sale",
+                is_debt=True,
+                concept="Venta de benchmark",
+                total_value=Decimal("20.00"),
+                status=active_status,
+                payment_status="pending",
+                created_by=user,
+            )
+            for _ in range(rows)
+        ])
+        details = TransactionDetail.objects.bulk_create([
+            TransactionDetail(
+                transaction=transaction,
+                product=products[(index + offset) % len(products)],
+                quantity=1,
+                unit_price=Decimal("10.00"),
+                total_price=Decimal("10.00"),
+            )
+            for index, transaction in enumerate(transactions)
+            for offset in range(2)
+        ])
+        StockMovement.objects.bulk_create([
+            StockMovement(
+                product=detail.product,
+                transaction=detail.transaction,
+                transaction_detail=detail,
+                type="sale",
+                quantity=-1,
+                created_by=user,
+            )
+            for detail in details
+        ])
+        Debt.objects.bulk_create([
+            Debt(
+                transaction=transaction,
+                total_amount=Decimal("20.00"),
+                paid_amount=Decimal("0.00"),
+                interest_rate=Decimal("0.00"),
+                term_months=0,
+                due_date=date.today(),
+                is_settled=False,
+            )
+            for transaction in transactions
+        ])
+
+        return {
+            "user": user,
+            "business": business,
+        }
+
+    def _delete_fixtures(self, fixtures):
+        business = fixtures["business"]
+        StockMovement.objects.filter(product__business=business).delete()
+        Transaction.objects.filter(business=business).delete()
+        Product.objects.filter(business=business).delete()
+        business.delete()
+        fixtures["user"].delete()
+
+    def _fetched_bytes(self, queries):
+        """
+        Tamaño aproximado de los valores devueltos por las consultas,
+        volviendo a ejecutar cada SELECT capturado.
+        """
+        total = 0
+
+        with connection.cursor() as cursor:
+            for query in queries:
+                if not query["sql"].lstrip().upper().startswith("SELECT"):
+                    continue
+
+                cursor.execute(query["sql"])
+                for row in cursor.fetchall():
+                    total += sum(
+                        len(value)
+                        if isinstance(value, (bytes, str))
+                        else len(str(value))
+                        for value in row
+                        if value is not None
+                    )
+
+        return total
+
+    def _run_endpoint(
+        self,
+        *,
+        viewset,
+        fixtures,
+        page_size,
+        repeat,
+        pruned,
+        fast,
+    ):
+        view = viewset.as_view(
+            {"get": "list"},
+            throttle_classes=[],
+            fast_list=fast,
+            column_pruning_actions=(
+                viewset.column_pruning_actions
+                if pruned
+                else ()
+            ),
+        )
+        factory = APIRequestFactory()
+
+        def request_page():
+            request = factory.get(
+                "/",
+                {
+                    "business_public_id": str(
+                        fixtures["business"].public_id
+                    ),
+                    "page_size": page_size,
+                },
+                HTTP_HOST=(settings.ALLOWED_HOSTS or ["localhost"])[0],
+            )
+            force_authenticate(request, user=fixtures["user"])
+            return view(request).render()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = request_page()
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            request_page()
+        seconds = time.perf_counter() - started
+
+        return {
+            "content": response.content,
+            "queries": len(queries.captured_queries),
+            "fetched_bytes": self._fetched_bytes(queries.captured_queries),
+            "ms_per_request": seconds * 1000 / repeat,
+        }
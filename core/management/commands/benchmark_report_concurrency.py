@@ -0,0 +1,260 @@
+import asyncio
+import statistics
+import threading
+import time
+import urllib.request
+from datetime import timedelta
+from urllib.parse import urlencode
+from uuid import UUID
+
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.async_views import async_report_view
+from core.models import Business, User
+from core.views import (
+    DashboardOverviewView,
+    DebtSummaryView,
+    InventorySummaryView,
+    PaymentSummaryView,
+)
+
+
+REPORTS = {
+    "dashboard": ("/api/dashboard/overview/", DashboardOverviewView),
+    "debts": ("/api/reports/debts-summary/", DebtSummaryView),
+    "inventory": ("/api/reports/inventory-summary/", InventorySummaryView),
+    "payments": ("/api/reports/payments-summary/", PaymentSummaryView),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide p50/p95 de un reporte con N peticiones concurrentes. Sin "
+        "--base-url compara en el proceso la vista síncrona en hilos "
+        "(como WSGI) con la vista asíncrona en un event loop (como ASGI). "
+        "Con --base-url mide un servidor ya levantado (gunicorn o "
+        "uvicorn) por HTTP; se ejecuta una vez por servidor."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--business-public-id", required=True)
+        parser.add_argument(
+            "--email",
+            required=True,
+            help="Usuario con acceso a los reportes del negocio.",
+        )
+        parser.add_argument(
+            "--report",
+            choices=sorted(REPORTS),
+            default="dashboard",
+        )
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=20)
+        parser.add_argument(
+            "--base-url",
+            help="Por ejemplo http://127.0.0.1:8000",
+        )
+
+    def handle(self, *args, **options):
+        total = options["requests"]
+        concurrency = options["concurrency"]
+        if total < 1 or concurrency < 1 or options["days"] < 0:
+            raise CommandError(
+                "--requests y --concurrency deben ser mayores que cero y "
+                "--days no puede ser negativo."
+            )
+
+        try:
+            business_public_id = UUID(str(options["business_public_id"]))
+        except (TypeError, ValueError):
+            raise CommandError(
+                "El business-public-id debe ser un UUID válido."
+            )
+
+        if not Business.objects.filter(
+            public_id=business_public_id,
+        ).exists():
+            raise CommandError(
+                "No existe un Business con el public_id indicado."
+            )
+
+        user = User.objects.filter(
+            email=options["email"].strip().lower(),
+        ).first()
+        if user is None:
+            raise CommandError("No existe un usuario con ese correo.")
+
+        today = timezone.localdate()
+        params = {
+            "business_public_id": str(business_public_id),
+            "date_from": str(today - timedelta(days=options["days"])),
+            "date_to": str(today),
+        }
+        path, view_class = REPORTS[options["report"]]
+
+        if options["base_url"]:
+            url = (
+                options["base_url"].rstrip("/")
+                + path
+                + "?"
+                + urlencode(params)
+            )
+            runs = {
+                "http": self._run_http(
+                    url=url,
+                    token=str(AccessToken.for_user(user)),
+                    total=total,
+                    concurrency=concurrency,
+                ),
+            }
+        else:
+            # Las corrutinas y los hilos abren sus propias conexiones.
+            connection.close()
+            runs = {
+                "wsgi": self._run_threads(
+                    view=view_class.as_view(),
+                    user=user,
+                    params=params,
+                    total=total,
+                    concurrency=concurrency,
+                ),
+                "asgi": asyncio.run(
+                    self._run_event_loop(
+                        view=async_report_view(view_class).as_view(),
+                        user=user,
+                        params=params,
+                        total=total,
+                        concurrency=concurrency,
+                    )
+                ),
+            }
+
+        for mode, (latencies, seconds, statuses) in runs.items():
+            self._report(
+                mode=mode,
+                latencies=latencies,
+                seconds=seconds,
+                statuses=statuses,
+                concurrency=concurrency,
+            )
+
+    def _report(self, *, mode, latencies, seconds, statuses, concurrency):
+        latencies = sorted(latencies)
+        p95 = (
+            statistics.quantiles(latencies, n=100)[94]
+            if len(latencies) > 1
+            else latencies[0]
+        )
+
+        self.stdout.write(
+            f"mode={mode} requests={len(latencies)} "
+            f"concurrency={concurrency} "
+            f"p50_ms={statistics.median(latencies) * 1000:.1f} "
+            f"p95_ms={p95 * 1000:.1f} "
+            f"max_ms={latencies[-1] * 1000:.1f} "
+            f"rps={len(latencies) / seconds:.1f} "
+            f"statuses={sorted(set(statuses))}"
+        )
+
+    def _request(self, *, user, params):
+        request = APIRequestFactory().get("/", params)
+        force_authenticate(request, user=user)
+
+        return request
+
+    def _run_pool(self, *, total, concurrency, send):
+        latencies = []
+        statuses = []
+        pending = iter(range(total))
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        if next(pending, None) is None:
+                            return
+
+                    started = time.perf_counter()
+                    status_code = send()
+                    elapsed = time.perf_counter() - started
+
+                    with lock:
+                        latencies.append(elapsed)
+                        statuses.append(status_code)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker)
+            for _ in range(concurrency)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return latencies, time.perf_counter() - started, statuses
+
+    def _run_threads(self, *, view, user, params, total, concurrency):
+        def send():
+            response = view(self._request(user=user, params=params))
+            response.render()
+            close_old_connections()
+
+            return response.status_code
+
+        return self._run_pool(
+            total=total,
+            concurrency=concurrency,
+            send=send,
+        )
+
+    def _run_http(self, *, url, token, total, concurrency):
+        def send():
+            request = urllib.request.Request(
+                url,
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            with urllib.request.urlopen(request) as response:
+                response.read()
+
+                return response.status
+
+        return self._run_pool(
+            total=total,
+            concurrency=concurrency,
+            send=send,
+        )
+
+    async def _run_event_loop(self, *, view, user, params, total, concurrency):
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+        statuses = []
+
+        async def send():
+            async with semaphore:
+                # Como el handler ASGI de Django: un hilo síncrono por
+                # petición para el ORM.
+                async with ThreadSensitiveContext():
+                    started = time.perf_counter()
+                    response = await view(
+                        self._request(user=user, params=params)
+                    )
+                    response.render()
+                    latencies.append(time.perf_counter() - started)
+                    statuses.append(response.status_code)
+
+                    await sync_to_async(close_old_connections)()
+
+        started = time.perf_counter()
+        await asyncio.gather(*(send() for _ in range(total)))
+
+        return latencies, time.perf_counter() - started, statuses
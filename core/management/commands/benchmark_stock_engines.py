@@ -0,0 +1,207 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from threading import Barrier
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection
+from django.db import transaction as db_tx
+from rest_framework.exceptions import ValidationError
+
+from core.models import (
+    Business,
+    EntityStatus,
+    Product,
+    StockMovement,
+    User,
+)
+from core.services.inventory import (
+    STOCK_ENGINE_LOCKING,
+    STOCK_ENGINES,
+    lock_products_for_inventory,
+    record_conditional_stock_movement,
+    record_locked_stock_movement,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el rendimiento de los motores de inventario vendiendo "
+        "un mismo producto desde varios hilos concurrentes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument(
+            "--operations",
+            type=int,
+            default=200,
+            help="Ventas por hilo y por motor.",
+        )
+        parser.add_argument(
+            "--work-ms",
+            type=float,
+            default=0.0,
+            help=(
+                "Trabajo simulado dentro de la transacción después de "
+                "escribir el stock, antes del commit."
+            ),
+        )
+        parser.add_argument(
+            "--engine",
+            choices=STOCK_ENGINES,
+            action="append",
+            help="Motor a medir; por defecto se miden ambos.",
+        )
+
+    def handle(self, *args, **options):
+        threads = options["threads"]
+        operations = options["operations"]
+        if threads < 1 or operations < 1:
+            raise CommandError(
+                "--threads y --operations deben ser mayores que cero."
+            )
+
+        if connection.vendor == "sqlite":
+            self.stdout.write(
+                self.style.WARNING(
+                    "SQLite serializa todas las escrituras; los resultados "
+                    "solo son representativos en PostgreSQL."
+                )
+            )
+
+        engines = options["engine"] or list(STOCK_ENGINES)
+        fixtures = self._create_fixtures(
+            stock=threads * operations * len(engines),
+        )
+
+        try:
+            for engine in engines:
+                result = self._run_engine(
+                    engine=engine,
+                    fixtures=fixtures,
+                    threads=threads,
+                    operations=operations,
+                    work_seconds=options["work_ms"] / 1000,
+                )
+                self.stdout.write(
+                    f"engine={engine} threads={threads} "
+                    f"operations={result['operations']} "
+                    f"errors={result['errors']} "
+                    f"seconds={result['seconds']:.3f} "
+                    f"ops_per_second={result['ops_per_second']:.1f}"
+                )
+        finally:
+            self._delete_fixtures(fixtures)
+
+    def _create_fixtures(self, *, stock):
+        suffix = uuid4().hex[:12]
+        active_status, _ = EntityStatus.objects.get_or_create(name="Activo")
+        user = User.objects.create_user(
+            email=f"stock-benchmark-{suffix}@playnow.invalid",
+            full_name="Benchmark de inventario",
+            password=None,
+        )
+        business = Business.objects.create(
+            user=user,
+            business_name=f"Benchmark de inventario {suffix}",
+            description="",
+            currency="NIO",
+            status=active_status,
+        )
+        product = Product.objects.create(
+            business=business,
+            title="Producto de alta demanda",
+            description="",
+            image_url="",
+            base_price=Decimal("1.00"),
+            base_cost=Decimal("1.00"),
+            stock=stock,
+            is_visible=True,
+            status=active_status,
+        )
+        return {
+            "user": user,
+            "business": business,
+            "product": product,
+        }
+
+    def _delete_fixtures(self, fixtures):
+        StockMovement.objects.filter(product=fixtures["product"]).delete()
+        fixtures["product"].delete()
+        fixtures["business"].delete()
+        fixtures["user"].delete()
+
+    def _sell_once(self, *, engine, fixtures, work_seconds):
+        with db_tx.atomic():
+            if engine == STOCK_ENGINE_LOCKING:
+                product = lock_products_for_inventory(
+                    product_ids=[fixtures["product"].pk],
+                    business_id=fixtures["business"].pk,
+                    require_active=True,
+                )[fixtures["product"].pk]
+                record_locked_stock_movement(
+                    product=product,
+                    quantity=-1,
+                    movement_type="sale",
+                    created_by=fixtures["user"],
+                    note="Benchmark",
+                )
+            else:
+                record_conditional_stock_movement(
+                    product=fixtures["product"],
+                    quantity=-1,
+                    movement_type="sale",
+                    created_by=fixtures["user"],
+                    note="Benchmark",
+                    require_active=True,
+                )
+
+            if work_seconds:
+                time.sleep(work_seconds)
+
+    def _run_worker(self, *, engine, fixtures, operations, work_seconds, barrier):
+        close_old_connections()
+        errors = 0
+        try:
+            barrier.wait(timeout=30)
+            for _ in range(operations):
+                try:
+                    self._sell_once(
+                        engine=engine,
+                        fixtures=fixtures,
+                        work_seconds=work_seconds,
+                    )
+                except ValidationError:
+                    errors += 1
+        finally:
+            close_old_connections()
+        return errors
+
+    def _run_engine(self, *, engine, fixtures, threads, operations, work_seconds):
+        barrier = Barrier(threads + 1)
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [
+                executor.submit(
+                    self._run_worker,
+                    engine=engine,
+                    fixtures=fixtures,
+                    operations=operations,
+                    work_seconds=work_seconds,
+                    barrier=barrier,
+                )
+                for _ in range(threads)
+            ]
+            barrier.wait(timeout=30)
+            started = time.perf_counter()
+            errors = sum(future.result() for future in futures)
+            seconds = time.perf_counter() - started
+
+        total = threads * operations
+        return {
+            "operations": total,
+            "errors": errors,
+            "seconds": seconds,
+            "ops_per_second": (total - errors) / seconds if seconds else 0.0,
+        }
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.partitions import (
+    PARTITIONED_MODELS,
+    ensure_monthly_partitions,
+    is_partitioned,
+    partitioning_available,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Crea por adelantado las particiones mensuales de las tablas "
+        "históricas particionadas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Meses futuros a crear además del mes actual.",
+        )
+        parser.add_argument(
+            "--months-back",
+            type=int,
+            default=0,
+            help="Meses anteriores a crear si faltan.",
+        )
+
+    def handle(self, *args, **options):
+        if options["months_ahead"] < 0 or options["months_back"] < 0:
+            raise CommandError(
+                "--months-ahead y --months-back no pueden ser negativos."
+            )
+
+        for model in PARTITIONED_MODELS:
+            table = model._meta.db_table
+            if not partitioning_available(model=model):
+                self.stdout.write(
+                    f"table={table} partitioned=false "
+                    "reason=unsupported_database"
+                )
+                continue
+            if not is_partitioned(model=model):
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"table={table} partitioned=false "
+                        "reason=migration_pending"
+                    )
+                )
+
+        created = ensure_monthly_partitions(
+            months_ahead=options["months_ahead"],
+            months_back=options["months_back"],
+        )
+
+        for name in created:
+            self.stdout.write(f"created partition={name}")
+
+        self.stdout.write(f"SUMMARY created={len(created)}")
@@ -0,0 +1,88 @@
+import gzip
+import time
+from pathlib import Path
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Business
+from core.services.tenant_dump import DUMP_CHUNK_SIZE, export_tenant
+
+
+class Command(BaseCommand):
+    help = (
+        "Vuelca todas las filas de un negocio (catálogo, transacciones, "
+        "deudas, pagos, movimientos, cierres y archivo) a un NDJSON "
+        "comprimido que `import_tenant` puede cargar en otro entorno."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--business-public-id", required=True)
+        parser.add_argument(
+            "--output",
+            help="Por defecto tenant-<public_id>.ndjson.gz.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DUMP_CHUNK_SIZE,
+            help="Filas por lectura del cursor.",
+        )
+        parser.add_argument(
+            "--compresslevel",
+            type=int,
+            default=1,
+            choices=range(1, 10),
+            help=(
+                "Nivel de gzip; el 1 ya reduce el NDJSON varias veces sin "
+                "limitar el ritmo de lectura."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size debe ser mayor que cero.")
+
+        try:
+            business_public_id = UUID(str(options["business_public_id"]))
+        except (TypeError, ValueError):
+            raise CommandError(
+                "El business-public-id debe ser un UUID válido."
+            )
+
+        business = Business.objects.filter(
+            public_id=business_public_id,
+        ).first()
+        if business is None:
+            raise CommandError(
+                "No existe un Business con el public_id indicado."
+            )
+
+        path = Path(
+            options["output"]
+            or f"tenant-{business.public_id}.ndjson.gz"
+        )
+
+        started = time.perf_counter()
+        with gzip.open(
+            path,
+            "wb",
+            compresslevel=options["compresslevel"],
+        ) as stream:
+            counts = export_tenant(
+                business=business,
+                stream=stream,
+                chunk_size=options["chunk_size"],
+            )
+        seconds = time.perf_counter() - started
+
+        total = sum(counts.values())
+        self.stdout.write(
+            f"Business={business.public_id} file={path} "
+            f"rows={total} bytes={path.stat().st_size} "
+            f"seconds={seconds:.2f} "
+            f"rows_per_second={total / seconds if seconds else 0:.0f}"
+        )
+        for name, count in counts.items():
+            if count:
+                self.stdout.write(f"  {name}={count}")
@@ -0,0 +1,95 @@
+from pathlib import Path
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from core.models import Business
+from core.serializers import validate_product_import_rows
+from core.services.product_import import (
+    IMPORT_CHUNK_SIZE,
+    IMPORT_FORMAT_CSV,
+    IMPORT_FORMAT_JSON,
+    IMPORT_FORMATS,
+    parse_product_rows,
+    upsert_products,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Crea o actualiza en bloque los productos de un negocio desde un "
+        "archivo CSV o JSON. Si una fila es inválida no se escribe ninguna."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--business-public-id", required=True)
+        parser.add_argument("--file", required=True)
+        parser.add_argument(
+            "--format",
+            choices=IMPORT_FORMATS,
+            help="Por defecto se deduce de la extensión del archivo.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=IMPORT_CHUNK_SIZE,
+            help="Filas por sentencia de inserción o actualización.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Valida el archivo sin escribir productos.",
+        )
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size debe ser mayor que cero.")
+
+        try:
+            business_public_id = UUID(str(options["business_public_id"]))
+        except (TypeError, ValueError):
+            raise CommandError(
+                "El business-public-id debe ser un UUID válido."
+            )
+
+        business = Business.objects.filter(
+            public_id=business_public_id,
+        ).first()
+        if business is None:
+            raise CommandError(
+                "No existe un Business con el public_id indicado."
+            )
+
+        path = Path(options["file"])
+        if not path.is_file():
+            raise CommandError(f"No existe el archivo {path}.")
+
+        import_format = options["format"] or (
+            IMPORT_FORMAT_JSON
+            if path.suffix.lower() == ".json"
+            else IMPORT_FORMAT_CSV
+        )
+        dry_run = options["dry_run"]
+
+        try:
+            rows = validate_product_import_rows(
+                parse_product_rows(
+                    path.read_bytes(),
+                    import_format=import_format,
+                )
+            )
+            result = upsert_products(
+                business=business,
+                rows=rows,
+                chunk_size=options["chunk_size"],
+                dry_run=dry_run,
+            )
+        except ValidationError as exc:
+            raise CommandError(f"Importación rechazada: {exc.detail}")
+
+        self.stdout.write(
+            f"Business={business.public_id} "
+            f"dry_run={str(dry_run).lower()} "
+            f"created={result['created']} updated={result['updated']}"
+        )
@@ -0,0 +1,63 @@
+import gzip
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from core.services.tenant_dump import DUMP_CHUNK_SIZE, import_tenant
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga un volcado de `export_tenant` como un negocio nuevo, con ids "
+        "nuevos y los mismos public_id. Si algo falla no se escribe nada."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", required=True)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DUMP_CHUNK_SIZE,
+            help="Filas por COPY o INSERT.",
+        )
+        parser.add_argument(
+            "--create-missing-users",
+            action="store_true",
+            help=(
+                "Crea sin contraseña los usuarios del volcado que no existen "
+                "en el destino; sin esta opción la carga se rechaza."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size debe ser mayor que cero.")
+
+        path = Path(options["file"])
+        if not path.is_file():
+            raise CommandError(f"No existe el archivo {path}.")
+
+        started = time.perf_counter()
+        try:
+            with gzip.open(path, "rb") as stream:
+                business, counts = import_tenant(
+                    stream=stream,
+                    create_missing_users=options["create_missing_users"],
+                    batch_size=options["batch_size"],
+                )
+        except (ValidationError, gzip.BadGzipFile, ValueError) as exc:
+            detail = getattr(exc, "detail", exc)
+            raise CommandError(f"Importación rechazada: {detail}")
+        seconds = time.perf_counter() - started
+
+        total = sum(counts.values())
+        self.stdout.write(
+            f"Business={business.public_id} rows={total} "
+            f"seconds={seconds:.2f} "
+            f"rows_per_second={total / seconds if seconds else 0:.0f}"
+        )
+        for name, count in counts.items():
+            if count:
+                self.stdout.write(f"  {name}={count}")
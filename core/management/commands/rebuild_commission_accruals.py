@@ -0,0 +1,76 @@
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Business
+from core.services.commission_accruals import (
+    find_commission_accrual_drift,
+    rebuild_commission_accruals,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye desde el historial de ventas el libro diario de "
+        "comisiones, o solo verifica sus diferencias con --check."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--business-public-id")
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Solo reporta diferencias sin modificar datos.",
+        )
+
+    def handle(self, *args, **options):
+        businesses = Business.objects.order_by("id")
+        business_public_id = options.get("business_public_id")
+        if business_public_id:
+            try:
+                business_public_id = UUID(str(business_public_id))
+            except (TypeError, ValueError):
+                raise CommandError(
+                    "El business-public-id debe ser un UUID válido."
+                )
+            businesses = businesses.filter(public_id=business_public_id)
+            if not businesses.exists():
+                raise CommandError(
+                    "No existe un Business con el public_id indicado."
+                )
+
+        check = options["check"]
+        total_drift = 0
+
+        for business in businesses:
+            if check:
+                drift = find_commission_accrual_drift(business=business)
+                total_drift += len(drift)
+                for row in drift:
+                    self.stdout.write(
+                        self.style.WARNING(
+                            f"drift business={business.public_id} "
+                            f"employee_id={row['employee_id']} "
+                            f"date={row['date'].isoformat()} "
+                            f"expected={row['expected_sales_count']}/"
+                            f"{row['expected_sales_total']} "
+                            f"stored={row['stored_sales_count']}/"
+                            f"{row['stored_sales_total']}"
+                        )
+                    )
+                self.stdout.write(
+                    f"Business={business.public_id} check=true "
+                    f"drift={len(drift)}"
+                )
+                continue
+
+            rows = rebuild_commission_accruals(business=business)
+            self.stdout.write(
+                f"Business={business.public_id} check=false rows={rows}"
+            )
+
+        if total_drift:
+            raise CommandError(
+                "El libro de comisiones no coincide con el historial de "
+                "ventas. Ejecute el comando sin --check para reconstruirlo."
+            )
@@ -0,0 +1,150 @@
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.utils import timezone
+
+from core.services.report_jobs import (
+    claim_report_jobs,
+    purge_report_jobs,
+    run_report_job,
+)
+
+
+def _run_job(job):
+    # Descarta conexiones caídas o vencidas, también la de la réplica que
+    # abre `replica_reads()`, para que un corte del servidor no tumbe el
+    # worker.
+    close_old_connections()
+    try:
+        return run_report_job(job)
+    finally:
+        close_old_connections()
+
+
+def _run_in_thread(job):
+    try:
+        return _run_job(job)
+    finally:
+        # Cada hilo abre sus propias conexiones; se cierran al terminar.
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula los reportes encolados con `?async=true`. Varios workers "
+        "pueden correr a la vez: cada trabajo se reclama con "
+        "SELECT ... FOR UPDATE SKIP LOCKED."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=2,
+            help=(
+                "Reportes simultáneos por proceso. Con 1 se calculan en el "
+                "hilo principal."
+            ),
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Segundos de espera cuando la cola está vacía.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Procesa lo que haya en la cola y termina.",
+        )
+
+    def handle(self, *args, **options):
+        threads = options["threads"]
+        poll_interval = options["poll_interval"]
+        if threads < 1:
+            raise CommandError("--threads debe ser mayor que cero.")
+        if poll_interval <= 0:
+            raise CommandError("--poll-interval debe ser mayor que cero.")
+
+        self.stopping = False
+        previous_handler = signal.signal(signal.SIGTERM, self._stop)
+
+        try:
+            if threads == 1:
+                self._run_inline(
+                    once=options["once"],
+                    poll_interval=poll_interval,
+                )
+            else:
+                self._run_pool(
+                    threads=threads,
+                    once=options["once"],
+                    poll_interval=poll_interval,
+                )
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+
+    def _stop(self, signum, frame):
+        # Se terminan los reportes en curso; no se reclaman más.
+        self.stopping = True
+
+    def _purge(self):
+        purge_report_jobs(
+            older_than=timezone.now() - timedelta(
+                hours=settings.REPORT_JOB_RETENTION_HOURS,
+            ),
+        )
+
+    def _report(self, job):
+        self.stdout.write(
+            f"job={job.public_id} report={job.report} "
+            f"status={job.status} attempts={job.attempts}"
+        )
+
+    def _run_inline(self, *, once, poll_interval):
+        while not self.stopping:
+            close_old_connections()
+            jobs = claim_report_jobs(limit=1)
+
+            if not jobs:
+                if once:
+                    break
+                self._purge()
+                time.sleep(poll_interval)
+                continue
+
+            self._report(_run_job(jobs[0]))
+
+    def _run_pool(self, *, threads, once, poll_interval):
+        in_flight = set()
+
+        with ThreadPoolExecutor(
+            max_workers=threads,
+            thread_name_prefix="report-worker",
+        ) as pool:
+            while True:
+                free = threads - len(in_flight)
+                if free and not self.stopping:
+                    close_old_connections()
+                    for job in claim_report_jobs(limit=free):
+                        in_flight.add(pool.submit(_run_in_thread, job))
+
+                if not in_flight:
+                    if once or self.stopping:
+                        break
+                    self._purge()
+                    time.sleep(poll_interval)
+                    continue
+
+                done, in_flight = wait(
+                    in_flight,
+                    timeout=poll_interval,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    self._report(future.result())
@@ -0,0 +1,84 @@
+from datetime import date
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Business, User
+from core.services.commissions import settle_business_commissions
+
+
+class Command(BaseCommand):
+    help = (
+        "Liquida las comisiones de todos los empleados elegibles de un "
+        "Business para un período."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--business-public-id", required=True)
+        parser.add_argument("--period-start", required=True)
+        parser.add_argument("--period-end", required=True)
+        parser.add_argument(
+            "--created-by-email",
+            required=True,
+            help="Usuario registrado como autor de las liquidaciones.",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        try:
+            business_public_id = UUID(str(options["business_public_id"]))
+        except (TypeError, ValueError):
+            raise CommandError(
+                "El business-public-id debe ser un UUID válido."
+            )
+        business = Business.objects.filter(
+            public_id=business_public_id,
+        ).first()
+        if business is None:
+            raise CommandError(
+                "No existe un Business con el public_id indicado."
+            )
+
+        try:
+            period_start = date.fromisoformat(options["period_start"])
+            period_end = date.fromisoformat(options["period_end"])
+        except ValueError:
+            raise CommandError(
+                "Las fechas deben usar el formato YYYY-MM-DD."
+            )
+        if period_end < period_start:
+            raise CommandError(
+                "La fecha final no puede ser anterior a la fecha inicial."
+            )
+
+        created_by = User.objects.filter(
+            email__iexact=options["created_by_email"].strip(),
+        ).first()
+        if created_by is None:
+            raise CommandError(
+                "No existe un usuario con el correo indicado."
+            )
+
+        dry_run = options["dry_run"]
+        result = settle_business_commissions(
+            business=business,
+            period_start=period_start,
+            period_end=period_end,
+            created_by=created_by,
+            dry_run=dry_run,
+        )
+
+        for skip in result["skipped"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"skipped employee={skip['employee'].public_id} "
+                    f"reason={skip['reason']}"
+                )
+            )
+
+        self.stdout.write(
+            f"Business={business.public_id} dry_run={str(dry_run).lower()} "
+            f"period={period_start.isoformat()}..{period_end.isoformat()} "
+            f"created={len(result['created'])} "
+            f"skipped={len(result['skipped'])}"
+        )
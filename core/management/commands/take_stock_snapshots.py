@@ -0,0 +1,84 @@
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone as django_timezone
+
+from core.models import Business
+from core.services.monthly_summary import get_month_period
+from core.services.stock_snapshots import take_stock_snapshots
+
+
+class Command(BaseCommand):
+    help = (
+        "Guarda la foto de stock por producto al cierre de un mes. "
+        "Por defecto usa el mes anterior."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--business-public-id")
+        parser.add_argument(
+            "--month",
+            help="Mes a fotografiar en formato YYYY-MM.",
+        )
+
+    def handle(self, *args, **options):
+        businesses = Business.objects.order_by("id")
+        business_public_id = options.get("business_public_id")
+        if business_public_id:
+            try:
+                business_public_id = UUID(str(business_public_id))
+            except (TypeError, ValueError):
+                raise CommandError(
+                    "El business-public-id debe ser un UUID válido."
+                )
+            businesses = businesses.filter(public_id=business_public_id)
+            if not businesses.exists():
+                raise CommandError(
+                    "No existe un Business con el public_id indicado."
+                )
+
+        if options.get("month"):
+            try:
+                year, month = (
+                    int(part)
+                    for part in options["month"].split("-")
+                )
+                period = get_month_period(year=year, month=month)
+            except ValueError:
+                raise CommandError(
+                    "El mes debe usar el formato YYYY-MM."
+                )
+        else:
+            first_day = django_timezone.localdate().replace(day=1)
+            previous_month = first_day.replace(
+                year=(
+                    first_day.year - 1
+                    if first_day.month == 1
+                    else first_day.year
+                ),
+                month=(
+                    12
+                    if first_day.month == 1
+                    else first_day.month - 1
+                ),
+            )
+            period = get_month_period(
+                year=previous_month.year,
+                month=previous_month.month,
+            )
+
+        taken_at = period["end_datetime"]
+        if taken_at > django_timezone.now():
+            raise CommandError(
+                "No se puede fotografiar un mes que todavía no ha finalizado."
+            )
+
+        for business in businesses:
+            created = take_stock_snapshots(
+                business=business,
+                taken_at=taken_at,
+            )
+            self.stdout.write(
+                f"Business={business.public_id} "
+                f"taken_at={taken_at.isoformat()} created={created}"
+            )
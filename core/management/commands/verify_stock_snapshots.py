@@ -0,0 +1,57 @@
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Business
+from core.services.stock_snapshots import find_stock_snapshot_drift
+
+
+class Command(BaseCommand):
+    help = (
+        "Verifica las fotos de stock contra el registro de movimientos "
+        "sin modificar datos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--business-public-id")
+
+    def handle(self, *args, **options):
+        businesses = Business.objects.order_by("id")
+        business_public_id = options.get("business_public_id")
+        if business_public_id:
+            try:
+                business_public_id = UUID(str(business_public_id))
+            except (TypeError, ValueError):
+                raise CommandError(
+                    "El business-public-id debe ser un UUID válido."
+                )
+            businesses = businesses.filter(public_id=business_public_id)
+            if not businesses.exists():
+                raise CommandError(
+                    "No existe un Business con el public_id indicado."
+                )
+
+        total_drift = 0
+
+        for business in businesses:
+            drift = find_stock_snapshot_drift(business=business)
+            total_drift += len(drift)
+            for row in drift:
+                self.stdout.write(
+                    self.style.WARNING(
+                        f"drift business={business.public_id} "
+                        f"product={row['product_public_id']} "
+                        f"taken_at={row['taken_at'].isoformat()} "
+                        f"snapshot={row['snapshot_stock']} "
+                        f"expected={row['expected_stock']}"
+                    )
+                )
+            self.stdout.write(
+                f"Business={business.public_id} drift={len(drift)}"
+            )
+
+        if total_drift:
+            raise CommandError(
+                "Las fotos de stock no coinciden con el registro de "
+                "movimientos."
+            )
@@ -0,0 +1,423 @@
+"""
+Métricas por endpoint en el formato de texto de Prometheus.
+
+`RequestMetricsMiddleware` registra cada petición por nombre de ruta y
+método. Cada proceso acumula sus series en memoria y, como mucho cada
+METRICS_FLUSH_SECONDS, las vuelca a `METRICS_DIR/<pid>-<inicio>.json`
+(escritura atómica con `os.replace`). `/api/metrics/` suma los archivos
+de todos los procesos, así que con varios workers de gunicorn cualquiera
+de ellos devuelve el total.
+
+Cada proceso mantiene un `flock` sobre su `<pid>-<inicio>.lock` mientras
+vive. Al recolectar, los archivos cuyo lock ya nadie tiene (workers
+reciclados por `max_requests` o caídos) se suman a `terminated.json` y
+se borran: los contadores no retroceden y el directorio no crece sin
+límite. Que el nombre incluya el inicio evita que un worker nuevo que
+reciba un pid reutilizado pise el archivo del anterior.
+"""
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:
+    # Sin flock (Windows) no se distingue un proceso terminado de uno
+    # vivo: los archivos se conservan todos.
+    fcntl = None
+
+
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+REQUESTS = "playnow_http_requests_total"
+LATENCY = "playnow_http_request_duration_seconds"
+DB_QUERIES = "playnow_http_db_queries_total"
+DB_SECONDS = "playnow_http_db_query_duration_seconds_total"
+RESPONSE_BYTES = "playnow_http_response_bytes_total"
+THROTTLED = "playnow_http_throttled_total"
+
+TERMINATED_FILE = "terminated.json"
+COLLECT_LOCK_FILE = "collect.lock"
+
+METRICS = {
+    REQUESTS: ("counter", "Peticiones atendidas."),
+    LATENCY: ("histogram", "Duración de las peticiones en segundos."),
+    DB_QUERIES: ("counter", "Consultas SQL ejecutadas por las peticiones."),
+    DB_SECONDS: ("counter", "Segundos dedicados a consultas SQL."),
+    RESPONSE_BYTES: (
+        "counter",
+        "Bytes de respuesta, sin contar las respuestas en streaming.",
+    ),
+    THROTTLED: ("counter", "Peticiones rechazadas por throttling."),
+}
+
+
+class QueryTimer:
+    """`execute_wrapper` que cuenta las consultas y su duración."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+def _new_histogram():
+    return {
+        "buckets": [0] * len(LATENCY_BUCKETS),
+        "sum": 0.0,
+        "count": 0,
+    }
+
+
+def _merge_snapshots(snapshots):
+    counters = defaultdict(float)
+    histograms = {}
+
+    for snapshot in snapshots:
+        for name, labels, value in snapshot["counters"]:
+            counters[(name, tuple(map(tuple, labels)))] += value
+
+        for name, labels, histogram in snapshot["histograms"]:
+            merged = histograms.setdefault(
+                (name, tuple(map(tuple, labels))),
+                _new_histogram(),
+            )
+            for index, count in enumerate(histogram["buckets"]):
+                merged["buckets"][index] += count
+            merged["sum"] += histogram["sum"]
+            merged["count"] += histogram["count"]
+
+    return counters, histograms
+
+
+def _as_snapshot(counters, histograms):
+    return {
+        "counters": [
+            [name, [list(pair) for pair in labels], value]
+            for (name, labels), value in counters.items()
+        ],
+        "histograms": [
+            [
+                name,
+                [list(pair) for pair in labels],
+                {
+                    **histogram,
+                    "buckets": list(histogram["buckets"]),
+                },
+            ]
+            for (name, labels), histogram in histograms.items()
+        ],
+    }
+
+
+def _read_snapshot(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        # El directorio pudo vaciarse entre el glob y la lectura.
+        return None
+
+
+def _write_atomically(path, data):
+    temporary = path.with_name(
+        f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    temporary.write_text(json.dumps(data))
+    os.replace(temporary, path)
+
+
+def _is_alive(lock_path):
+    if fcntl is None:
+        return True
+
+    try:
+        descriptor = os.open(lock_path, os.O_RDWR)
+    except FileNotFoundError:
+        return False
+
+    try:
+        fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return True
+    finally:
+        os.close(descriptor)
+
+    return False
+
+
+@contextmanager
+def _collect_lock(directory):
+    if fcntl is None:
+        yield
+        return
+
+    descriptor = os.open(
+        directory / COLLECT_LOCK_FILE,
+        os.O_RDWR | os.O_CREAT,
+        0o644,
+    )
+    try:
+        fcntl.flock(descriptor, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(descriptor)
+
+
+class MetricsStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._histograms = {}
+        self._last_flush = 0.0
+        self._pid = None
+        self._process_id = None
+        self._alive_descriptor = None
+
+    def observe_request(
+        self,
+        *,
+        route,
+        method,
+        status_code,
+        duration,
+        queries,
+        query_seconds,
+        response_bytes,
+    ):
+        labels = (
+            ("route", route),
+            ("method", method),
+        )
+
+        with self._lock:
+            self._counters[
+                (REQUESTS, labels + (("status", str(status_code)),))
+            ] += 1
+            self._counters[(DB_QUERIES, labels)] += queries
+            self._counters[(DB_SECONDS, labels)] += query_seconds
+
+            if response_bytes is not None:
+                self._counters[(RESPONSE_BYTES, labels)] += response_bytes
+
+            if status_code == 429:
+                self._counters[(THROTTLED, labels)] += 1
+
+            histogram = self._histograms.setdefault(
+                (LATENCY, labels),
+                _new_histogram(),
+            )
+            bucket = bisect_left(LATENCY_BUCKETS, duration)
+            if bucket < len(LATENCY_BUCKETS):
+                histogram["buckets"][bucket] += 1
+            histogram["sum"] += duration
+            histogram["count"] += 1
+
+        if (
+            time.monotonic() - self._last_flush
+            >= settings.METRICS_FLUSH_SECONDS
+        ):
+            self.flush()
+
+    def snapshot(self):
+        with self._lock:
+            return _as_snapshot(self._counters, self._histograms)
+
+    def _claim_process_id(self, directory):
+        # Se decide en el primer volcado del proceso y no al importar: con
+        # `--preload` los workers heredan el módulo ya importado del master.
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._process_id = f"{self._pid}-{time.time_ns()}"
+                self._alive_descriptor = None
+
+            if self._alive_descriptor is None and fcntl is not None:
+                descriptor = os.open(
+                    directory / f"{self._process_id}.lock",
+                    os.O_RDWR | os.O_CREAT,
+                    0o644,
+                )
+                # Bloqueante: un colector puede tenerlo un instante mientras
+                # comprueba si el proceso vive.
+                fcntl.flock(descriptor, fcntl.LOCK_EX)
+                self._alive_descriptor = descriptor
+
+            return self._process_id
+
+    def flush(self):
+        self._last_flush = time.monotonic()
+
+        if not settings.METRICS_DIR:
+            return
+
+        directory = Path(settings.METRICS_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        process_id = self._claim_process_id(directory)
+        _write_atomically(
+            directory / f"{process_id}.json",
+            self.snapshot(),
+        )
+
+    def _fold_terminated(self, directory):
+        terminated_path = directory / TERMINATED_FILE
+        terminated = _read_snapshot(terminated_path) or {
+            "counters": [],
+            "histograms": [],
+        }
+        already_folded = set(terminated.get("folded", []))
+
+        snapshots = [terminated]
+        folded = []
+        for path in directory.glob("*.json"):
+            process_id = path.stem
+            if (
+                path.name == TERMINATED_FILE
+                or process_id == self._process_id
+                or _is_alive(directory / f"{process_id}.lock")
+            ):
+                continue
+
+            if process_id not in already_folded:
+                snapshot = _read_snapshot(path)
+                if snapshot is None:
+                    continue
+                snapshots.append(snapshot)
+
+            folded.append(process_id)
+
+        if not folded:
+            return
+
+        # `folded` registra qué archivos ya están sumados: si el proceso se
+        # interrumpe antes de borrarlos, no se suman dos veces.
+        _write_atomically(
+            terminated_path,
+            {
+                **_as_snapshot(*_merge_snapshots(snapshots)),
+                "folded": folded,
+            },
+        )
+
+        for process_id in folded:
+            (directory / f"{process_id}.json").unlink(missing_ok=True)
+            (directory / f"{process_id}.lock").unlink(missing_ok=True)
+
+    def collect(self):
+        """Series de todos los procesos, vivos y terminados."""
+        if not settings.METRICS_DIR:
+            return [self.snapshot()]
+
+        self.flush()
+        directory = Path(settings.METRICS_DIR)
+
+        with _collect_lock(directory):
+            self._fold_terminated(directory)
+
+            return [
+                snapshot
+                for snapshot in map(
+                    _read_snapshot,
+                    sorted(directory.glob("*.json")),
+                )
+                if snapshot is not None
+            ]
+
+
+def _label_value(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\n", "\\n")
+        .replace('"', '\\"')
+    )
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+
+    return "{" + ",".join(
+        f'{name}="{_label_value(value)}"'
+        for name, value in labels
+    ) + "}"
+
+
+def _format_value(value):
+    return repr(float(value))
+
+
+def render_metrics(snapshots) -> str:
+    counters, histograms = _merge_snapshots(snapshots)
+
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+        if kind == "counter":
+            for (series, labels), value in sorted(counters.items()):
+                if series == name:
+                    lines.append(
+                        f"{name}{_format_labels(labels)} "
+                        f"{_format_value(value)}"
+                    )
+            continue
+
+        for (series, labels), histogram in sorted(histograms.items()):
+            if series != name:
+                continue
+
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, histogram["buckets"]):
+                cumulative += count
+                lines.append(
+                    f"{name}_bucket"
+                    f"{_format_labels(labels + (('le', repr(bound)),))} "
+                    f"{_format_value(cumulative)}"
+                )
+            lines.append(
+                f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} "
+                f"{_format_value(histogram['count'])}"
+            )
+            lines.append(
+                f"{name}_sum{_format_labels(labels)} "
+                f"{_format_value(histogram['sum'])}"
+            )
+            lines.append(
+                f"{name}_count{_format_labels(labels)} "
+                f"{_format_value(histogram['count'])}"
+            )
+
+    return "\n".join(lines) + "\n"
+
+
+store = MetricsStore()
@@ -0,0 +1,190 @@
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from .db_routers import (
+    ReadPolicy,
+    activate_policy,
+    apin_to_primary,
+    deactivate_policy,
+    pin_to_primary,
+    view_reads_from_replica,
+)
+from .metrics import QueryTimer, store
+
+
+class ReplicaReadMiddleware:
+    """
+    Abre la política de lectura de cada petición (ver `core.db_routers`).
+    Si la petición escribió, el usuario lee de `default` durante la
+    ventana de read-your-writes.
+
+    Admite los modos síncrono y asíncrono para que Django no tenga que
+    adaptar la cadena de middleware con ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Django adapta `process_view` según sea o no corrutina.
+            self.process_view = self._aprocess_view
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        policy = ReadPolicy(request)
+        request._replica_read_policy = policy
+        token = activate_policy(policy)
+
+        try:
+            response = self.get_response(request)
+        finally:
+            deactivate_policy(token)
+
+        if policy.wrote:
+            pin_to_primary(getattr(request, "user", None))
+
+        return response
+
+    async def __acall__(self, request):
+        policy = ReadPolicy(request)
+        request._replica_read_policy = policy
+        token = activate_policy(policy)
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            deactivate_policy(token)
+
+        if policy.wrote:
+            # El usuario perezoso de la sesión no se evalúa aquí: haría
+            # consultas síncronas dentro del event loop.
+            await apin_to_primary(policy.current_user())
+
+        return response
+
+    async def _aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return self.process_view(request, view_func, view_args, view_kwargs)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        policy = getattr(request, "_replica_read_policy", None)
+
+        if policy is not None and view_reads_from_replica(
+            view_func,
+            request.method,
+        ):
+            policy.allowed = True
+
+
+# Métodos con serie propia; el resto se agrupa en `OTHER`.
+METRIC_METHODS = frozenset((
+    "GET",
+    "HEAD",
+    "POST",
+    "PUT",
+    "PATCH",
+    "DELETE",
+    "OPTIONS",
+))
+
+
+class RequestMetricsMiddleware:
+    """
+    Registra en `core.metrics` la latencia, las consultas SQL, el tamaño
+    de la respuesta y los rechazos por throttling de cada petición, por
+    nombre de ruta y método. Las consultas de hilos auxiliares o de un
+    cuerpo en streaming no se cuentan.
+
+    Admite los modos síncrono y asíncrono: medir no debe cambiar cómo se
+    ejecuta la aplicación.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        started = time.perf_counter()
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+
+            response = self.get_response(request)
+
+        self._observe(request, response, timer, started)
+
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+
+        timer = QueryTimer()
+        started = time.perf_counter()
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+
+            response = await self.get_response(request)
+
+        self._observe(request, response, timer, started)
+
+        return response
+
+    def _observe(self, request, response, timer, started):
+        store.observe_request(
+            route=self._route(request),
+            method=self._method(request),
+            status_code=response.status_code,
+            duration=time.perf_counter() - started,
+            queries=timer.count,
+            query_seconds=timer.seconds,
+            response_bytes=(
+                None
+                if response.streaming
+                else len(response.content)
+            ),
+        )
+
+    def _route(self, request):
+        match = getattr(request, "resolver_match", None)
+
+        # Las rutas sin resolver (404) comparten una sola serie para no
+        # crear una por cada URL inventada.
+        if match is None:
+            return "unmatched"
+
+        return match.view_name or match.route
+
+    def _method(self, request):
+        # El método llega del cliente tal cual; uno inventado no debe
+        # crear series nuevas.
+        if request.method in METRIC_METHODS:
+            return request.method
+
+        return "OTHER"
@@ -0,0 +1,93 @@
+# Generated by Django 5.2.5 on 2026-10-19 02:32
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+TERMINAL_TRANSACTION_STATUS_NAMES = (
+    "Eliminado",
+    "Anulado",
+    "Cancelado",
+    "Void",
+    "Deleted",
+)
+
+
+def backfill_commission_accruals(apps, schema_editor):
+    Transaction = apps.get_model("core", "Transaction")
+    EmployeeCommissionAccrual = apps.get_model(
+        "core",
+        "EmployeeCommissionAccrual",
+    )
+
+    terminal = models.Q()
+    for name in TERMINAL_TRANSACTION_STATUS_NAMES:
+        terminal |= models.Q(status__name__iexact=name)
+
+    rows = (
+        Transaction.objects
+        .filter(employee__isnull=False, type="sale")
+        .exclude(terminal)
+        .annotate(
+            day=TruncDate(
+                "created_at",
+                tzinfo=timezone.get_current_timezone(),
+            )
+        )
+        .values("business_id", "employee_id", "day")
+        .annotate(
+            sales_count=models.Count("id"),
+            sales_total=models.Sum("total_value"),
+        )
+        .order_by("employee_id", "day")
+    )
+
+    accruals = []
+    for row in rows:
+        sales_total = row["sales_total"] or Decimal("0.00")
+        accruals.append(
+            EmployeeCommissionAccrual(
+                business_id=row["business_id"],
+                employee_id=row["employee_id"],
+                date=row["day"],
+                sales_count=row["sales_count"],
+                sales_total=sales_total,
+            )
+        )
+
+    EmployeeCommissionAccrual.objects.bulk_create(accruals, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_harden_debt_audit_constraints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeCommissionAccrual',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('sales_count', models.IntegerField(default=0)),
+                ('sales_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='commission_accruals', to='core.business')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='commission_accruals', to='core.employee')),
+            ],
+            options={
+                'ordering': ['-date'],
+                'indexes': [models.Index(fields=['business', 'date'], name='accrual_business_date_idx')],
+                'constraints': [models.UniqueConstraint(fields=('employee', 'date'), name='unique_commission_accrual_per_employee_day')],
+            },
+        ),
+        migrations.RunPython(
+            backfill_commission_accruals,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-19 02:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_employee_commission_accrual'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='debtpayment',
+            name='cash_register',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='debt_payments', to='core.cashregister'),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='cash_register',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='transactions', to='core.cashregister'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-19 02:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_transaction_cash_register'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductStockSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField()),
+                ('stock', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_snapshots', to='core.business')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_snapshots', to='core.product')),
+            ],
+            options={
+                'ordering': ['-taken_at'],
+                'indexes': [models.Index(fields=['business', 'taken_at'], name='stock_snapshot_business_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'taken_at'), name='unique_stock_snapshot_per_product_instant')],
+            },
+        ),
+    ]
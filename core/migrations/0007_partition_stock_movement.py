@@ -0,0 +1,342 @@
+from datetime import datetime
+
+from django.db import migrations
+from django.utils import timezone
+
+
+MONTHS_AHEAD = 3
+
+
+def _is_partitioned(cursor, table):
+    cursor.execute(
+        """
+        SELECT 1
+        FROM pg_partitioned_table pt
+        JOIN pg_class c ON c.oid = pt.partrelid
+        WHERE c.relname = %s
+          AND c.relnamespace = to_regnamespace(current_schema())
+        """,
+        [table],
+    )
+    return cursor.fetchone() is not None
+
+
+def _month_start(year, month):
+    return timezone.make_aware(
+        datetime(year, month, 1),
+        timezone.get_current_timezone(),
+    )
+
+
+def _add_months(year, month, months):
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def _copy_rows(schema_editor, model, *, source, target):
+    quote_name = schema_editor.quote_name
+    table = model._meta.db_table
+    columns = ", ".join(
+        quote_name(field.column)
+        for field in model._meta.local_fields
+    )
+    schema_editor.execute(
+        f"INSERT INTO {quote_name(target)} ({columns}) "
+        f"SELECT {columns} FROM {quote_name(source)}"
+    )
+    schema_editor.execute(
+        "SELECT setval("
+        f"pg_get_serial_sequence('{table}', 'id'), "
+        "COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) "
+        f"FROM {quote_name(table)}"
+    )
+
+
+def _use_id_sequence(schema_editor, model):
+    """
+    Numera `id` con una secuencia propia en lugar de una columna
+    IDENTITY: PostgreSQL solo admite IDENTITY en tablas particionadas
+    desde la versión 17.
+    """
+    quote_name = schema_editor.quote_name
+    table = model._meta.db_table
+    sequence = f"{table}_id_seq"
+
+    schema_editor.execute(f"CREATE SEQUENCE {quote_name(sequence)}")
+    schema_editor.execute(
+        f"ALTER SEQUENCE {quote_name(sequence)} "
+        f"OWNED BY {quote_name(table)}.id"
+    )
+    schema_editor.execute(
+        f"ALTER TABLE {quote_name(table)} ALTER COLUMN id "
+        f"SET DEFAULT nextval('{sequence}'::regclass)"
+    )
+
+
+def _use_id_identity(schema_editor, model):
+    quote_name = schema_editor.quote_name
+    table = model._meta.db_table
+
+    schema_editor.execute(
+        f"ALTER TABLE {quote_name(table)} ALTER COLUMN id DROP DEFAULT"
+    )
+    schema_editor.execute(
+        f"ALTER TABLE {quote_name(table)} ALTER COLUMN id "
+        "ADD GENERATED BY DEFAULT AS IDENTITY"
+    )
+
+
+def _add_public_id_registry(schema_editor, model):
+    """
+    Una tabla particionada solo admite claves únicas que incluyan
+    created_at. La unicidad global de public_id se mantiene con una
+    tabla sin particionar, sincronizada por triggers.
+    """
+    quote_name = schema_editor.quote_name
+    table = model._meta.db_table
+    registry = f"{table}_public_ids"
+    function = f"{table}_public_id_sync"
+
+    schema_editor.execute(
+        f"CREATE TABLE {quote_name(registry)} "
+        "(public_id uuid PRIMARY KEY)"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {quote_name(registry)} (public_id) "
+        f"SELECT public_id FROM {quote_name(table)}"
+    )
+    schema_editor.execute(
+        f"CREATE FUNCTION {quote_name(function)}() RETURNS trigger AS $$\n"
+        "BEGIN\n"
+        "    IF TG_OP IN ('UPDATE', 'DELETE') THEN\n"
+        f"        DELETE FROM {quote_name(registry)} "
+        "WHERE public_id = OLD.public_id;\n"
+        "    END IF;\n"
+        "    IF TG_OP IN ('INSERT', 'UPDATE') THEN\n"
+        f"        INSERT INTO {quote_name(registry)} (public_id) "
+        "VALUES (NEW.public_id);\n"
+        "    END IF;\n"
+        "    RETURN NULL;\n"
+        "END;\n"
+        "$$ LANGUAGE plpgsql"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {quote_name(f'{table}_public_id_insert_delete')} "
+        f"AFTER INSERT OR DELETE ON {quote_name(table)} "
+        f"FOR EACH ROW EXECUTE FUNCTION {quote_name(function)}()"
+    )
+    schema_editor.execute(
+        f"CREATE TRIGGER {quote_name(f'{table}_public_id_update')} "
+        f"AFTER UPDATE OF public_id ON {quote_name(table)} "
+        "FOR EACH ROW "
+        "WHEN (OLD.public_id IS DISTINCT FROM NEW.public_id) "
+        f"EXECUTE FUNCTION {quote_name(function)}()"
+    )
+
+
+def _drop_public_id_registry(schema_editor, model):
+    quote_name = schema_editor.quote_name
+    table = model._meta.db_table
+
+    schema_editor.execute(
+        f"DROP FUNCTION IF EXISTS {quote_name(f'{table}_public_id_sync')}() "
+        "CASCADE"
+    )
+    schema_editor.execute(
+        f"DROP TABLE IF EXISTS {quote_name(f'{table}_public_ids')}"
+    )
+
+
+def _add_keys_and_indexes(schema_editor, model, *, partitioned):
+    """
+    Recrea claves, índices y FKs de StockMovement. En una tabla
+    particionada la PK incluye created_at y public_id lleva un índice
+    simple; su unicidad la garantiza `_add_public_id_registry`.
+    """
+    quote_name = schema_editor.quote_name
+    table = model._meta.db_table
+    key_suffix = ", created_at" if partitioned else ""
+
+    schema_editor.execute(
+        f"ALTER TABLE {quote_name(table)} "
+        f"ADD CONSTRAINT {quote_name(f'{table}_pkey')} "
+        f"PRIMARY KEY (id{key_suffix})"
+    )
+    if partitioned:
+        schema_editor.execute(
+            f"CREATE INDEX {quote_name(f'{table}_public_id_idx')} "
+            f"ON {quote_name(table)} (public_id)"
+        )
+    else:
+        schema_editor.execute(
+            f"ALTER TABLE {quote_name(table)} "
+            f"ADD CONSTRAINT {quote_name(f'{table}_public_id_key')} "
+            "UNIQUE (public_id)"
+        )
+
+    for index in model._meta.indexes:
+        columns = ", ".join(
+            quote_name(model._meta.get_field(field_name).column)
+            for field_name in index.fields
+        )
+        schema_editor.execute(
+            f"CREATE INDEX {quote_name(index.name)} "
+            f"ON {quote_name(table)} ({columns})"
+        )
+
+    indexed_first_columns = {
+        model._meta.get_field(index.fields[0]).column
+        for index in model._meta.indexes
+    }
+
+    for field in model._meta.local_fields:
+        if not field.is_relation:
+            continue
+
+        column = field.column
+        if column not in indexed_first_columns:
+            schema_editor.execute(
+                f"CREATE INDEX {quote_name(f'{table}_{column}_idx')} "
+                f"ON {quote_name(table)} ({quote_name(column)})"
+            )
+
+        target = field.related_model._meta
+        schema_editor.execute(
+            f"ALTER TABLE {quote_name(table)} "
+            f"ADD CONSTRAINT {quote_name(f'{table}_{column}_fk')} "
+            f"FOREIGN KEY ({quote_name(column)}) "
+            f"REFERENCES {quote_name(target.db_table)} "
+            f"({quote_name(target.pk.column)}) "
+            "DEFERRABLE INITIALLY DEFERRED"
+        )
+
+
+def partition_stock_movements(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    StockMovement = apps.get_model("core", "StockMovement")
+    quote_name = schema_editor.quote_name
+    table = StockMovement._meta.db_table
+    legacy = f"{table}_legacy"
+
+    with schema_editor.connection.cursor() as cursor:
+        if _is_partitioned(cursor, table):
+            return
+        cursor.execute(
+            f"SELECT MIN(created_at) FROM {quote_name(table)}"
+        )
+        first_created_at = cursor.fetchone()[0]
+
+    schema_editor.execute(
+        f"ALTER TABLE {quote_name(table)} RENAME TO {quote_name(legacy)}"
+    )
+    # La secuencia de IDENTITY conserva su nombre al renombrar la tabla;
+    # se aparta para que la nueva pueda llamarse `<tabla>_id_seq`.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [legacy])
+        legacy_sequence = cursor.fetchone()[0]
+    schema_editor.execute(
+        f"ALTER SEQUENCE {legacy_sequence} "
+        f"RENAME TO {quote_name(f'{legacy}_id_seq')}"
+    )
+    schema_editor.execute(
+        f"CREATE TABLE {quote_name(table)} "
+        f"(LIKE {quote_name(legacy)} "
+        "INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (created_at)"
+    )
+    _use_id_sequence(schema_editor, StockMovement)
+
+    today = timezone.localdate()
+    start = (
+        timezone.localtime(first_created_at).date()
+        if first_created_at is not None
+        else today
+    )
+    year, month = start.year, start.month
+    last_year, last_month = _add_months(
+        today.year,
+        today.month,
+        MONTHS_AHEAD,
+    )
+
+    while (year, month) <= (last_year, last_month):
+        next_year, next_month = _add_months(year, month, 1)
+        schema_editor.execute(
+            f"CREATE TABLE {quote_name(f'{table}_p{year:04d}{month:02d}')} "
+            f"PARTITION OF {quote_name(table)} "
+            "FOR VALUES FROM (%s) TO (%s)",
+            [
+                _month_start(year, month),
+                _month_start(next_year, next_month),
+            ],
+        )
+        year, month = next_year, next_month
+
+    schema_editor.execute(
+        f"CREATE TABLE {quote_name(f'{table}_default')} "
+        f"PARTITION OF {quote_name(table)} DEFAULT"
+    )
+
+    _copy_rows(schema_editor, StockMovement, source=legacy, target=table)
+    schema_editor.execute(f"DROP TABLE {quote_name(legacy)}")
+    _add_keys_and_indexes(schema_editor, StockMovement, partitioned=True)
+    _add_public_id_registry(schema_editor, StockMovement)
+
+
+def unpartition_stock_movements(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    StockMovement = apps.get_model("core", "StockMovement")
+    quote_name = schema_editor.quote_name
+    table = StockMovement._meta.db_table
+    partitioned = f"{table}_partitioned"
+
+    with schema_editor.connection.cursor() as cursor:
+        if not _is_partitioned(cursor, table):
+            return
+
+    _drop_public_id_registry(schema_editor, StockMovement)
+    schema_editor.execute(
+        f"ALTER TABLE {quote_name(table)} RENAME TO {quote_name(partitioned)}"
+    )
+    schema_editor.execute(
+        f"ALTER SEQUENCE {quote_name(f'{table}_id_seq')} "
+        f"RENAME TO {quote_name(f'{partitioned}_id_seq')}"
+    )
+    schema_editor.execute(
+        f"CREATE TABLE {quote_name(table)} "
+        f"(LIKE {quote_name(partitioned)} "
+        "INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    _use_id_identity(schema_editor, StockMovement)
+    _copy_rows(schema_editor, StockMovement, source=partitioned, target=table)
+    schema_editor.execute(f"DROP TABLE {quote_name(partitioned)} CASCADE")
+    _add_keys_and_indexes(schema_editor, StockMovement, partitioned=False)
+
+
+class Migration(migrations.Migration):
+    """
+    Particiona StockMovement por mes de created_at en PostgreSQL. En otros
+    motores la tabla queda sin cambios.
+
+    `public_id` sigue siendo único en toda la tabla gracias a
+    `core_stockmovement_public_ids`, así que el estado del modelo
+    (`unique=True`) no cambia. `id` pasa a usar una secuencia en lugar de
+    IDENTITY para funcionar en PostgreSQL anterior a 17.
+    """
+
+    atomic = True
+
+    dependencies = [
+        ('core', '0006_product_stock_snapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            partition_stock_movements,
+            reverse_code=unpartition_stock_movements,
+        ),
+    ]
@@ -0,0 +1,117 @@
+# Generated by Django 5.2.5 on 2026-10-19 02:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_partition_stock_movement'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedDebt',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('public_id', models.UUIDField(editable=False, unique=True)),
+                ('total_amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('paid_amount', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('interest_rate', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('term_months', models.IntegerField(default=0)),
+                ('due_date', models.DateField()),
+                ('is_settled', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('public_id', models.UUIDField(editable=False, unique=True)),
+                ('type', models.CharField(choices=[('sale', 'Sale'), ('purchase', 'Purchase'), ('expense', 'Expense')], max_length=20)),
+                ('is_debt', models.BooleanField(default=False)),
+                ('discount_percent', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('concept', models.TextField(blank=True)),
+                ('total_value', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('invoice_number', models.CharField(blank=True, max_length=100, null=True)),
+                ('payment_status', models.CharField(choices=[('paid', 'Paid'), ('partial', 'Partial'), ('pending', 'Pending')], default='paid', max_length=20)),
+                ('invoice_series', models.CharField(blank=True, max_length=50, null=True)),
+                ('invoice_file_url', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_transactions', to='core.business')),
+                ('cash_register', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.cashregister')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('customer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.customer')),
+                ('employee', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.employee')),
+                ('payment_method', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.paymentmethod')),
+                ('status', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.entitystatus')),
+                ('supplier', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.supplier')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedDebtPayment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('public_id', models.UUIDField(editable=False, unique=True)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('payment_date', models.DateField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('cash_register', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='core.cashregister')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('debt', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payments', to='core.archiveddebt')),
+                ('payment_method', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.paymentmethod')),
+                ('transaction', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='debt_payments', to='core.archivedtransaction')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='archiveddebt',
+            name='transaction',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='debts', to='core.archivedtransaction'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedTransactionDetail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('public_id', models.UUIDField(editable=False, unique=True)),
+                ('quantity', models.PositiveIntegerField()),
+                ('unit_price', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('total_price', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to='core.product')),
+                ('transaction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='details', to='core.archivedtransaction')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedStockMovement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('public_id', models.UUIDField(editable=False, unique=True)),
+                ('note', models.CharField(blank=True, max_length=255)),
+                ('type', models.CharField(choices=[('entry', 'Entry'), ('sale', 'Sale'), ('adjustment', 'Adjustment')], max_length=20)),
+                ('quantity', models.IntegerField()),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_stock_movements', to='core.product')),
+                ('transaction', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_movements', to='core.archivedtransaction')),
+                ('transaction_detail', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_movements', to='core.archivedtransactiondetail')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedtransaction',
+            index=models.Index(fields=['business', 'created_at'], name='archived_tx_business_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedstockmovement',
+            index=models.Index(fields=['product', 'created_at'], name='archived_movement_product_idx'),
+        ),
+    ]
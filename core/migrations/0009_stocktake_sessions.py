@@ -0,0 +1,55 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:02
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_archive_tables'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StocktakeSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('public_id', models.UUIDField(db_index=True, default=uuid.uuid4, editable=False, unique=True)),
+                ('status', models.CharField(choices=[('open', 'Abierta'), ('applied', 'Aplicada'), ('cancelled', 'Cancelada')], default='open', max_length=20)),
+                ('note', models.TextField(blank=True)),
+                ('applied_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('applied_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='applied_stocktake_sessions', to=settings.AUTH_USER_MODEL)),
+                ('business', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stocktake_sessions', to='core.business')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='created_stocktake_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StocktakeCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('counted_quantity', models.PositiveIntegerField()),
+                ('expected_stock', models.IntegerField(blank=True, null=True)),
+                ('difference', models.IntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stocktake_counts', to='core.product')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='counts', to='core.stocktakesession')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='stocktakesession',
+            index=models.Index(fields=['business', 'status'], name='stocktake_biz_status_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='stocktakecount',
+            constraint=models.UniqueConstraint(fields=('session', 'product'), name='unique_stocktake_count_per_product'),
+        ),
+    ]
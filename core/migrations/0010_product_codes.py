@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_stocktake_sessions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='barcode',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='sku',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name='product',
+            constraint=models.UniqueConstraint(condition=models.Q(('barcode', ''), _negated=True), fields=('business', 'barcode'), name='unique_product_barcode_per_business'),
+        ),
+        migrations.AddConstraint(
+            model_name='product',
+            constraint=models.UniqueConstraint(condition=models.Q(('sku', ''), _negated=True), fields=('business', 'sku'), name='unique_product_sku_per_business'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.5 on 2026-10-19 03:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_product_codes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['business', 'updated_at'], name='customer_biz_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['business', 'updated_at'], name='employee_biz_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymentmethod',
+            index=models.Index(fields=['business', 'updated_at'], name='paymethod_biz_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['business', 'updated_at'], name='product_biz_updated_idx'),
+        ),
+    ]
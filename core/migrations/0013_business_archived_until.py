@@ -0,0 +1,79 @@
+# Generated by Django 5.2.5 on 2026-10-19 09:12
+
+from datetime import date, datetime, time
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_archived_until(apps, schema_editor):
+    Business = apps.get_model("core", "Business")
+    ArchivedTransaction = apps.get_model("core", "ArchivedTransaction")
+    ArchivedDebtPayment = apps.get_model("core", "ArchivedDebtPayment")
+    ArchivedStockMovement = apps.get_model("core", "ArchivedStockMovement")
+
+    latest_days = {}
+
+    def add(business_id, day):
+        if day is not None and (
+            business_id not in latest_days
+            or day > latest_days[business_id]
+        ):
+            latest_days[business_id] = day
+
+    for row in (
+        ArchivedTransaction.objects
+        .values("business_id")
+        .annotate(latest=models.Max("created_at"))
+    ):
+        add(row["business_id"], timezone.localdate(row["latest"]))
+
+    for row in (
+        ArchivedStockMovement.objects
+        .values("product__business_id")
+        .annotate(latest=models.Max("created_at"))
+    ):
+        add(row["product__business_id"], timezone.localdate(row["latest"]))
+
+    for row in (
+        ArchivedDebtPayment.objects
+        .values("debt__transaction__business_id")
+        .annotate(
+            latest=models.Max("created_at"),
+            latest_payment=models.Max("payment_date"),
+        )
+    ):
+        add(row["debt__transaction__business_id"], timezone.localdate(row["latest"]))
+        add(row["debt__transaction__business_id"], row["latest_payment"])
+
+    for business_id, day in latest_days.items():
+        next_month = (
+            date(day.year + 1, 1, 1)
+            if day.month == 12
+            else date(day.year, day.month + 1, 1)
+        )
+        Business.objects.filter(pk=business_id).update(
+            archived_until=timezone.make_aware(
+                datetime.combine(next_month, time.min),
+                timezone.get_current_timezone(),
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_report_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='business',
+            name='archived_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(
+            backfill_archived_until,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
@@ -1,10 +1,27 @@
 # core/mixins.py
 
+import csv
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import timedelta
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.db import transaction as db_tx
+from django.db.models import BooleanField, F, Q, Value
+from django.http import Http404, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status as drf_status
+from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+from rest_framework.utils.urls import replace_query_param
 from drf_spectacular.utils import (
     OpenApiParameter,
+    OpenApiResponse,
     OpenApiTypes,
     extend_schema,
 )
@@ -21,6 +38,12 @@ from core.models import (
     Business,
     BusinessMembership,
 )
+from core.fast_serializers import fast_list_plan
+from core.renderers import FastJSONRenderer, StreamingJSONRenderer
+from core.serializers import ReportJobSerializer
+from core.services.archive import hydrate_archived
+from core.services.report_jobs import enqueue_report_job, register_report
+from core.utils import log_action
 
 class SoftDeleteByStatusMixin:
     """
@@ -113,6 +136,41 @@ class SoftDeleteByStatusMixin:
             status=drf_status.HTTP_204_NO_CONTENT
         )
 
+BUSINESS_PUBLIC_ID_LIST_PARAMETER = OpenApiParameter(
+    name="business_public_id",
+    type=OpenApiTypes.UUID,
+    location=OpenApiParameter.QUERY,
+    required=True,
+    description=(
+        "Public ID del negocio que delimita el listado."
+    ),
+)
+
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description=(
+            "Campos a devolver, separados por comas. Las relaciones "
+            "anidadas solo se incluyen si se nombran aquí o en `expand`."
+        ),
+    ),
+    OpenApiParameter(
+        name="expand",
+        type=OpenApiTypes.STR,
+        location=OpenApiParameter.QUERY,
+        required=False,
+        description=(
+            "Relaciones anidadas a incluir, separadas por comas "
+            "(por ejemplo `details`). Si se envía, las no nombradas se "
+            "omiten."
+        ),
+    ),
+]
+
+
 class RequireBusinessPublicIdListMixin:
     require_business_public_id_for_list = True
 
@@ -125,15 +183,7 @@ class RequireBusinessPublicIdListMixin:
 
     @extend_schema(
         parameters=[
-            OpenApiParameter(
-                name="business_public_id",
-                type=OpenApiTypes.UUID,
-                location=OpenApiParameter.QUERY,
-                required=True,
-                description=(
-                    "Public ID del negocio que delimita el listado."
-                ),
-            ),
+            BUSINESS_PUBLIC_ID_LIST_PARAMETER,
         ],
     )
     def list(self, request, *args, **kwargs):
@@ -240,3 +290,908 @@ class RequireBusinessPublicIdListMixin:
         return super().filter_queryset(
             queryset
         )
+
+
+def _query_param_names(value):
+    return [
+        name.strip()
+        for name in value.split(",")
+        if name.strip()
+    ]
+
+
+class SparseFieldsetMixin:
+    """
+    Respuestas parciales con `?fields=` y `?expand=` en las lecturas.
+
+    Sin ninguno de los dos parámetros la respuesta no cambia. Con
+    `fields` solo se devuelven los campos nombrados; las relaciones
+    anidadas (campos que son serializers, como `details`) se consideran
+    opcionales y solo se incluyen si aparecen en `fields` o en `expand`.
+    Como los campos se quitan del serializer antes de construir el
+    queryset, las relaciones omitidas tampoco se unen ni se precargan.
+    """
+
+    sparse_fieldset_actions = (
+        "list",
+        "retrieve",
+    )
+
+    fields_query_param = "fields"
+    expand_query_param = "expand"
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+
+        if getattr(self, "action", None) in self.sparse_fieldset_actions:
+            self.apply_sparse_fieldset(
+                getattr(serializer, "child", serializer)
+            )
+
+        return serializer
+
+    def apply_sparse_fieldset(self, serializer):
+        params = self.request.query_params
+        fields = params.get(self.fields_query_param)
+        expand = params.get(self.expand_query_param)
+
+        if fields is None and expand is None:
+            return
+
+        available = serializer.fields
+        nested = {
+            name
+            for name, field in available.items()
+            if isinstance(field, BaseSerializer)
+        }
+
+        requested = (
+            set(_query_param_names(fields))
+            if fields is not None
+            else set(available) - nested
+        )
+        expanded = set(_query_param_names(expand or ""))
+
+        errors = {}
+
+        unknown_fields = requested - set(available)
+        if unknown_fields:
+            errors[self.fields_query_param] = (
+                "Campos desconocidos: "
+                f"{', '.join(sorted(unknown_fields))}."
+            )
+
+        unknown_expand = expanded - nested
+        if unknown_expand:
+            errors[self.expand_query_param] = (
+                "Relaciones no expandibles: "
+                f"{', '.join(sorted(unknown_expand))}."
+            )
+
+        if errors:
+            raise ValidationError(errors)
+
+        keep = requested | expanded
+        for name in list(available):
+            if name not in keep:
+                available.pop(name)
+
+
+class DeltaSyncMixin:
+    """
+    Acción `sync` para clientes que mantienen una copia local del catálogo.
+
+    Sin `updated_since` devuelve todas las filas vigentes; con él, solo las
+    modificadas después de esa marca y, en `deleted`, los public_id de las
+    que pasaron a Eliminado o dejaron de ser visibles para el usuario. La
+    marca devuelta retrocede SYNC_WATERMARK_OVERLAP_SECONDS para cubrir
+    transacciones que aún no habían confirmado al leer; el cliente debe
+    aplicar los cambios de forma idempotente.
+
+    `changed` se pagina por (`updated_at`, `pk`) en bloques de
+    SYNC_PAGE_SIZE filas. Mientras `next` no sea nulo, `watermark` lo es:
+    el cliente sigue `next` y guarda la marca solo al recibir la última
+    página, que además trae `deleted`.
+    """
+
+    sync_deleted_status_name = "Eliminado"
+
+    @staticmethod
+    def _encode_sync_cursor(watermark, updated_at, pk):
+        payload = json.dumps([
+            watermark.isoformat(),
+            updated_at.isoformat(),
+            pk,
+        ])
+
+        return urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def _decode_sync_cursor(cursor):
+        try:
+            watermark, updated_at, pk = json.loads(
+                urlsafe_b64decode(cursor.encode())
+            )
+            position = (
+                parse_datetime(watermark),
+                parse_datetime(updated_at),
+                int(pk),
+            )
+        except (TypeError, ValueError):
+            position = None
+
+        if position is None or None in position:
+            raise ValidationError({
+                "cursor": "El cursor de sincronización no es válido."
+            })
+
+        return position
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="business_public_id",
+                type=OpenApiTypes.UUID,
+                location=OpenApiParameter.QUERY,
+                required=True,
+            ),
+            OpenApiParameter(
+                name="updated_since",
+                type=OpenApiTypes.DATETIME,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description=(
+                    "Marca `watermark` de la sincronización anterior."
+                ),
+            ),
+            OpenApiParameter(
+                name="cursor",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description=(
+                    "Posición de la página siguiente; viene en `next`."
+                ),
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                description=(
+                    "Filas modificadas, public_id eliminados, enlace a la "
+                    "página siguiente y, en la última, la nueva marca de "
+                    "sincronización."
+                )
+            ),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="sync",
+        filter_backends=[],
+        pagination_class=None,
+    )
+    def sync(self, request):
+        business = self._get_required_list_business()
+        self._validate_list_business_access(business)
+
+        updated_since = request.query_params.get("updated_since")
+        if updated_since:
+            parsed = parse_datetime(updated_since)
+            if parsed is None:
+                raise ValidationError({
+                    "updated_since": (
+                        "Debe ser una fecha y hora ISO 8601 válida."
+                    )
+                })
+            updated_since = (
+                parsed
+                if timezone.is_aware(parsed)
+                else timezone.make_aware(parsed)
+            )
+
+        cursor = request.query_params.get("cursor")
+        if cursor:
+            # La marca se fija en la primera página y viaja en el cursor.
+            watermark, last_updated_at, last_pk = (
+                self._decode_sync_cursor(cursor)
+            )
+        else:
+            watermark = timezone.now() - timedelta(
+                seconds=settings.SYNC_WATERMARK_OVERLAP_SECONDS,
+            )
+        business_filter = {
+            self.business_lookup: business,
+        }
+        deleted_filter = {
+            "status__name__iexact": self.sync_deleted_status_name,
+        }
+
+        changed = (
+            self.filter_queryset(self.get_queryset())
+            .filter(**business_filter)
+            .exclude(**deleted_filter)
+        )
+
+        if updated_since:
+            changed = changed.filter(updated_at__gt=updated_since)
+
+        page = changed
+        if cursor:
+            page = page.filter(
+                Q(updated_at__gt=last_updated_at)
+                | Q(updated_at=last_updated_at, pk__gt=last_pk)
+            )
+
+        page_size = max(settings.SYNC_PAGE_SIZE, 1)
+        rows = list(page.order_by("updated_at", "pk")[:page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+
+        next_link = None
+        deleted = []
+
+        if has_next:
+            next_link = replace_query_param(
+                request.build_absolute_uri(),
+                "cursor",
+                self._encode_sync_cursor(
+                    watermark,
+                    rows[-1].updated_at,
+                    rows[-1].pk,
+                ),
+            )
+        elif updated_since:
+            deleted = list(
+                self.get_queryset().model.objects
+                .filter(
+                    **business_filter,
+                    updated_at__gt=updated_since,
+                )
+                .exclude(pk__in=changed.values("pk"))
+                .values_list("public_id", flat=True)
+            )
+
+        serializer = self.get_serializer(rows, many=True)
+
+        return Response({
+            "watermark": None if has_next else watermark,
+            "next": next_link,
+            "changed": serializer.data,
+            "deleted": deleted,
+        })
+
+
+class FastListMixin:
+    """
+    Listados serializados directamente desde `values()`.
+
+    Si el serializer del listado admite la ruta rápida (ver
+    core.fast_serializers), la página se lee como diccionarios y se
+    convierte sin crear instancias de modelo; en otro caso se usa el
+    listado normal de DRF. La respuesta es idéntica en ambos casos.
+
+    Cada ViewSet lo activa con `fast_list = True`: la ruta rápida ignora
+    los `Prefetch` del queryset de la vista.
+    """
+
+    fast_list = False
+
+    def fast_list_available(self):
+        return True
+
+    def get_fast_list_plan(self, queryset):
+        if not (self.fast_list and self.fast_list_available()):
+            return None
+
+        return fast_list_plan(
+            self.get_serializer(),
+            annotations=queryset.query.annotations,
+        )
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        plan = self.get_fast_list_plan(queryset)
+
+        if plan is None:
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data)
+
+            serializer = self.get_serializer(queryset, many=True)
+            return Response(serializer.data)
+
+        queryset = plan.values(queryset)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(plan.represent(page))
+
+        return Response(plan.represent(queryset))
+
+
+class StreamingListResponseMixin:
+    """
+    Envía por bloques las páginas grandes cuando el renderer negociado es
+    `StreamingJSONRenderer` (API_JSON_RENDERER="streaming").
+
+    El cuerpo es idéntico al de la respuesta normal; solo cambia que no
+    se construye entero en memoria antes de empezar a enviarlo.
+    """
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request,
+            response,
+            *args,
+            **kwargs,
+        )
+
+        renderer = getattr(response, "accepted_renderer", None)
+        if not (
+            isinstance(response, Response)
+            and not response.exception
+            and isinstance(renderer, StreamingJSONRenderer)
+            and renderer.should_stream(response.data)
+        ):
+            return response
+
+        streaming = StreamingHttpResponse(
+            renderer.stream(
+                response.data,
+                response.accepted_media_type,
+                response.renderer_context,
+            ),
+            status=response.status_code,
+            content_type=renderer.media_type,
+        )
+
+        for header, value in response.items():
+            if header.lower() != "content-type":
+                streaming[header] = value
+        streaming.cookies = response.cookies
+
+        return streaming
+
+
+EXPORT_FORMAT_CSV = "csv"
+EXPORT_FORMAT_NDJSON = "ndjson"
+
+EXPORT_CONTENT_TYPES = {
+    EXPORT_FORMAT_CSV: "text/csv; charset=utf-8",
+    EXPORT_FORMAT_NDJSON: "application/x-ndjson",
+}
+
+# Prefijos que una hoja de cálculo interpretaría como fórmula.
+_CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class _EchoBuffer:
+    """
+    Pseudo-archivo para csv.writer: devuelve la línea en lugar de
+    acumularla.
+    """
+
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+
+    if isinstance(value, bool):
+        return "true" if value else "false"
+
+    value = str(value)
+
+    if value.startswith(_CSV_FORMULA_PREFIXES):
+        try:
+            float(value)
+        except ValueError:
+            return "'" + value
+
+    return value
+
+
+class StreamingExportMixin:
+    """
+    Acción `export` que descarga todas las filas filtradas en CSV o NDJSON.
+
+    Respeta el filterset, la búsqueda y el orden del listado, pero no
+    pagina ni cuenta: lee con `.iterator(chunk_size=EXPORT_CHUNK_SIZE)`
+    (cursor del lado del servidor en PostgreSQL) y serializa bloque a
+    bloque, así que la memoria no depende del número de filas. El CSV
+    omite las listas anidadas; el NDJSON incluye cada fila completa.
+    """
+
+    export_formats = (
+        EXPORT_FORMAT_CSV,
+        EXPORT_FORMAT_NDJSON,
+    )
+
+    @extend_schema(
+        parameters=[
+            BUSINESS_PUBLIC_ID_LIST_PARAMETER,
+            OpenApiParameter(
+                name="export_format",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                enum=[EXPORT_FORMAT_CSV, EXPORT_FORMAT_NDJSON],
+                description="Formato del archivo; por defecto `csv`.",
+            ),
+        ],
+        responses={
+            (200, EXPORT_CONTENT_TYPES[EXPORT_FORMAT_CSV]): OpenApiResponse(
+                response=OpenApiTypes.BINARY,
+                description="Una fila por registro, con encabezado.",
+            ),
+            (200, EXPORT_CONTENT_TYPES[EXPORT_FORMAT_NDJSON]): (
+                OpenApiResponse(
+                    response=OpenApiTypes.BINARY,
+                    description="Un objeto JSON por línea.",
+                )
+            ),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        pagination_class=None,
+    )
+    def export(self, request):
+        business = self._get_required_list_business()
+        self._validate_list_business_access(business)
+
+        export_format = request.query_params.get(
+            "export_format",
+            EXPORT_FORMAT_CSV,
+        ).lower()
+        if export_format not in self.export_formats:
+            raise ValidationError({
+                "export_format": (
+                    "Debe ser uno de: "
+                    + ", ".join(self.export_formats)
+                    + "."
+                )
+            })
+
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.business_lookup: business}
+        )
+        rows = self._export_rows(queryset)
+
+        if export_format == EXPORT_FORMAT_CSV:
+            content = self._csv_lines(rows)
+        else:
+            content = self._ndjson_lines(rows)
+
+        log_action(
+            request.user,
+            "EXPORT",
+            queryset.model.__name__,
+            business.pk,
+            extra={"format": export_format},
+        )
+
+        response = StreamingHttpResponse(
+            content,
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.basename}-'
+            f'{timezone.localdate().isoformat()}.{export_format}"'
+        )
+
+        return response
+
+    def get_export_sources(self, queryset):
+        """
+        Querysets a recorrer, en orden, con la función que adapta cada
+        instancia antes de serializarla (o None).
+        """
+        return [(queryset, None)]
+
+    def _export_rows(self, queryset):
+        chunk_size = max(settings.EXPORT_CHUNK_SIZE, 1)
+        serializer = self.get_serializer()
+
+        for source, adapt in self.get_export_sources(queryset):
+            plan = None
+            if adapt is None and self.fast_list:
+                plan = fast_list_plan(
+                    serializer,
+                    annotations=source.query.annotations,
+                )
+
+            if plan is not None:
+                rows = plan.values(source).iterator(chunk_size=chunk_size)
+                for chunk in _batched(rows, chunk_size):
+                    yield from plan.represent(chunk)
+                continue
+
+            instances = source.iterator(chunk_size=chunk_size)
+            for chunk in _batched(instances, chunk_size):
+                if adapt is not None:
+                    chunk = [adapt(instance) for instance in chunk]
+                yield from self.get_serializer(chunk, many=True).data
+
+    def _csv_lines(self, rows):
+        columns = [
+            name
+            for name, field in self.get_serializer().fields.items()
+            if not field.write_only
+            and not isinstance(field, BaseSerializer)
+        ]
+        writer = csv.writer(_EchoBuffer())
+
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow([
+                _csv_cell(row.get(column))
+                for column in columns
+            ])
+
+    def _ndjson_lines(self, rows):
+        renderer = FastJSONRenderer()
+
+        for row in rows:
+            yield renderer.render(row) + b"\n"
+
+
+class ArchiveUnionListMixin:
+    """
+    Une al listado las filas archivadas que cumplen los mismos filtros.
+
+    El archivo solo se consulta cuando tiene filas para el negocio y los
+    filtros pedidos; en ese caso se pagina la unión de claves de ambas
+    tablas y solo se cargan las filas de la página.
+    """
+
+    archive_queryset = None
+
+    def get_archive_queryset(self):
+        return self.scope_queryset(
+            self.archive_queryset.all()
+        )
+
+    def filter_archive_queryset(
+        self,
+        queryset,
+    ):
+        queryset = queryset.filter(
+            **{
+                (
+                    f"{self.business_lookup}"
+                    "__public_id"
+                ): self.request.query_params.get(
+                    self.business_query_param
+                ),
+            }
+        )
+
+        for backend in self.filter_backends:
+            if issubclass(backend, DjangoFilterBackend):
+                queryset = self.filterset_class(
+                    self.request.query_params,
+                    queryset=queryset,
+                    request=self.request,
+                ).qs
+            else:
+                queryset = backend().filter_queryset(
+                    self.request,
+                    queryset,
+                    self,
+                )
+
+        return queryset
+
+    def _get_archive_list_queryset(self):
+        """
+        Queryset de archivo filtrado como el listado y si tiene filas;
+        se calcula una sola vez por petición.
+        """
+        if not hasattr(self, "_archive_list_queryset"):
+            queryset = self.filter_archive_queryset(
+                self.get_archive_queryset()
+            )
+            self._archive_list_queryset = (
+                queryset,
+                queryset.exists(),
+            )
+
+        return self._archive_list_queryset
+
+    def get_export_sources(self, queryset):
+        # Las filas archivadas son de períodos cerrados, anteriores a las
+        # activas: con orden descendente van después y, si no, antes.
+        # Con otros órdenes cada bloque se ordena por separado.
+        sources = super().get_export_sources(queryset)
+        archive_queryset, has_archived_rows = (
+            self._get_archive_list_queryset()
+        )
+
+        if not has_archived_rows:
+            return sources
+
+        archived = [(archive_queryset, hydrate_archived)]
+        ordering = [
+            field
+            for field in queryset.query.order_by
+            if isinstance(field, str)
+        ] or list(self.ordering or [])
+
+        if ordering and ordering[0].startswith("-"):
+            return sources + archived
+
+        return archived + sources
+
+    def fast_list_available(self):
+        # La unión con el archivo hidrata instancias de modelo; la ruta
+        # rápida solo se usa cuando el archivo no aporta filas.
+        _, has_archived_rows = self._get_archive_list_queryset()
+
+        return not has_archived_rows and super().fast_list_available()
+
+    def _union_keys(
+        self,
+        queryset,
+        *,
+        ordering,
+        archived,
+    ):
+        sort_fields = {
+            f"sort_{index}": F(field.lstrip("-"))
+            for index, field in enumerate(ordering)
+        }
+
+        return (
+            queryset
+            .order_by()
+            .prefetch_related(None)
+            .annotate(
+                **sort_fields,
+                archived=Value(
+                    archived,
+                    output_field=BooleanField(),
+                ),
+            )
+            .values(
+                "id",
+                "archived",
+                *sort_fields,
+            )
+        )
+
+    def paginate_queryset(
+        self,
+        queryset,
+    ):
+        if getattr(self, "action", None) != "list":
+            return super().paginate_queryset(
+                queryset
+            )
+
+        archive_queryset, has_archived_rows = (
+            self._get_archive_list_queryset()
+        )
+
+        if not has_archived_rows:
+            return super().paginate_queryset(
+                queryset
+            )
+
+        ordering = [
+            field
+            for field in queryset.query.order_by
+            if isinstance(field, str)
+        ] or list(self.ordering or [])
+
+        if not any(
+            field.lstrip("-") in ("id", "pk")
+            for field in ordering
+        ):
+            ordering.append("-id")
+
+        keys = (
+            self._union_keys(
+                queryset,
+                ordering=ordering,
+                archived=False,
+            )
+            .union(
+                self._union_keys(
+                    archive_queryset,
+                    ordering=ordering,
+                    archived=True,
+                ),
+                all=True,
+            )
+            .order_by(
+                *(
+                    f"{'-' if field.startswith('-') else ''}sort_{index}"
+                    for index, field in enumerate(ordering)
+                )
+            )
+        )
+
+        page = super().paginate_queryset(keys)
+
+        if page is None:
+            return None
+
+        hot_rows = queryset.in_bulk([
+            row["id"]
+            for row in page
+            if not row["archived"]
+        ])
+        archived_rows = archive_queryset.in_bulk([
+            row["id"]
+            for row in page
+            if row["archived"]
+        ])
+
+        return [
+            hydrate_archived(archived_rows[row["id"]])
+            if row["archived"]
+            else hot_rows[row["id"]]
+            for row in page
+        ]
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            if getattr(self, "action", None) != "retrieve":
+                raise
+
+        lookup_url_kwarg = (
+            self.lookup_url_kwarg
+            or self.lookup_field
+        )
+        archived = get_object_or_404(
+            self.get_archive_queryset(),
+            **{
+                self.lookup_field: self.kwargs[
+                    lookup_url_kwarg
+                ],
+            },
+        )
+
+        return hydrate_archived(archived)
+
+ASYNC_REPORT_PARAM = "async"
+
+ASYNC_REPORT_PARAMETER = OpenApiParameter(
+    name=ASYNC_REPORT_PARAM,
+    type=OpenApiTypes.BOOL,
+    location=OpenApiParameter.QUERY,
+    required=False,
+    description=(
+        "Encola el reporte y responde 202 con el trabajo; el resultado "
+        "se consulta en `status_url`."
+    ),
+)
+
+
+class AsyncReportMixin:
+    """
+    Reporte que también puede calcularse fuera de la petición.
+
+    La vista define `report_name`, `report_builder` y
+    `get_report_kwargs(user=..., params=...)`, que valida la consulta,
+    comprueba el acceso y devuelve los argumentos del builder, incluido
+    `business`. Con `?async=true` la validación ocurre igual, pero el
+    reporte se encola como `ReportJob` y la respuesta es 202 con el
+    trabajo; `run_report_worker` lo calcula con `run_report`.
+
+    `areport_response` es la misma respuesta para handlers `async def`;
+    las vistas pueden sobrescribir `aget_report_kwargs` con consultas
+    asíncronas.
+    """
+
+    report_name = None
+    report_builder = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Las variantes asíncronas heredan el nombre; el worker usa la
+        # vista que lo declara.
+        if cls.__dict__.get("report_name"):
+            register_report(cls.report_name, cls)
+
+    def get_report_kwargs(self, *, user, params):
+        raise NotImplementedError
+
+    async def aget_report_kwargs(self, *, user, params):
+        return await sync_to_async(self.get_report_kwargs)(
+            user=user,
+            params=params,
+        )
+
+    @classmethod
+    def run_report(cls, *, user, params):
+        return cls.report_builder(
+            **cls().get_report_kwargs(
+                user=user,
+                params=params,
+            )
+        )
+
+    def _runs_in_background(self, request):
+        return (
+            request.query_params.get(ASYNC_REPORT_PARAM, "")
+            .lower()
+            in ("1", "true")
+        )
+
+    def _enqueue(self, request, report_kwargs):
+        return enqueue_report_job(
+            business=report_kwargs["business"],
+            user=request.user,
+            report=self.report_name,
+            params={
+                key: value
+                for key, value in request.query_params.items()
+                if key != ASYNC_REPORT_PARAM
+            },
+        )
+
+    def _job_response(self, request, job):
+        data = ReportJobSerializer(
+            job,
+            context={"request": request},
+        ).data
+
+        return Response(
+            data,
+            status=drf_status.HTTP_202_ACCEPTED,
+            headers={"Location": data["status_url"]},
+        )
+
+    def report_response(self, request):
+        report_kwargs = self.get_report_kwargs(
+            user=request.user,
+            params=request.query_params,
+        )
+
+        if self._runs_in_background(request):
+            return self._job_response(
+                request,
+                self._enqueue(request, report_kwargs),
+            )
+
+        return Response(
+            type(self).report_builder(**report_kwargs),
+            status=drf_status.HTTP_200_OK,
+        )
+
+    async def areport_response(self, request):
+        report_kwargs = await self.aget_report_kwargs(
+            user=request.user,
+            params=request.query_params,
+        )
+
+        if self._runs_in_background(request):
+            return self._job_response(
+                request,
+                await sync_to_async(self._enqueue)(request, report_kwargs),
+            )
+
+        # Los builders son síncronos: corren en el hilo de la petición
+        # sin bloquear el event loop.
+        return Response(
+            await sync_to_async(type(self).report_builder)(**report_kwargs),
+            status=drf_status.HTTP_200_OK,
+        )
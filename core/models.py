@@ -109,6 +109,9 @@ class Business(models.Model):
     description = models.TextField(blank=True)
     currency = models.CharField(max_length=10)
     status = models.ForeignKey('EntityStatus', on_delete=models.PROTECT)
+    # Fin del último mes con filas en las tablas de archivo; lo mantiene
+    # `core.services.archive`. Los reportes posteriores no leen el archivo.
+    archived_until = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -305,6 +308,8 @@ class Product(models.Model):
     business = models.ForeignKey(Business, on_delete=models.CASCADE, related_name='products')
     category = models.ForeignKey(ProductCategory, on_delete=models.SET_NULL, null=True, blank=True, related_name='products')
     title = models.CharField(max_length=255)
+    sku = models.CharField(max_length=64, blank=True, default="")
+    barcode = models.CharField(max_length=64, blank=True, default="")
     description = models.TextField(blank=True)
     image_url = models.TextField(blank=True)
     base_price = models.DecimalField(max_digits=12, decimal_places=2)
@@ -317,9 +322,25 @@ class Product(models.Model):
     class Meta:
         constraints = [
             models.CheckConstraint(check=models.Q(stock__gte=0), name="product_stock_gte_0"),
+            # Índices únicos parciales: también resuelven la búsqueda por
+            # código del punto de venta sin recorrer el catálogo.
+            models.UniqueConstraint(
+                fields=["business", "barcode"],
+                condition=~models.Q(barcode=""),
+                name="unique_product_barcode_per_business",
+            ),
+            models.UniqueConstraint(
+                fields=["business", "sku"],
+                condition=~models.Q(sku=""),
+                name="unique_product_sku_per_business",
+            ),
         ]
         indexes = [
             models.Index(fields=["business", "created_at"]),
+            models.Index(
+                fields=["business", "updated_at"],
+                name="product_biz_updated_idx",
+            ),
             models.Index(fields=["status"]),
         ]
 
@@ -338,6 +359,14 @@ class Employee(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["business", "updated_at"],
+                name="employee_biz_updated_idx",
+            ),
+        ]
+
     def __str__(self):
         return (
             f"{self.full_name} - "
@@ -353,7 +382,15 @@ class Customer(models.Model):
     status = models.ForeignKey(EntityStatus, on_delete=models.PROTECT)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["business", "updated_at"],
+                name="customer_biz_updated_idx",
+            ),
+        ]
+
     def __str__(self):
         phone = f" · {self.phone}" if self.phone else ""
         return f"{self.full_name}{phone}"
@@ -440,6 +477,10 @@ class PaymentMethod(models.Model):
                 fields=["business", "method_type"],
                 name="paymethod_biz_type_idx",
             ),
+            models.Index(
+                fields=["business", "updated_at"],
+                name="paymethod_biz_updated_idx",
+            ),
         ]
 
         ordering = ["name"]
@@ -855,6 +896,8 @@ class Transaction(models.Model):
     supplier = models.ForeignKey('Supplier', on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions')
     employee = models.ForeignKey('Employee', on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions')
     payment_method = models.ForeignKey('PaymentMethod', on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions')
+    # Caja abierta al registrar la transacción; nulo en registros previos.
+    cash_register = models.ForeignKey('CashRegister', on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions')
     type = models.CharField(max_length=20, choices=TRANSACTION_TYPES)
     is_debt = models.BooleanField(default=False)
     discount_percent = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
@@ -1104,6 +1147,8 @@ class DebtPayment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     payment_method = models.ForeignKey(PaymentMethod, on_delete=models.PROTECT, related_name='debt_payments')
+    # Caja abierta al registrar el pago; nulo en registros previos.
+    cash_register = models.ForeignKey('CashRegister', on_delete=models.SET_NULL, null=True, blank=True, related_name='debt_payments')
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.SET_NULL,
@@ -1276,6 +1321,178 @@ class StockMovement(models.Model):
         qty = f"{self.quantity:+d}"
         return f"{self.type} {qty} · {self.product.title}"
     
+class ProductStockSnapshot(models.Model):
+    """
+    Stock de un producto en un instante, antes de los movimientos con
+    `created_at >= taken_at`. Permite reconstruir el inventario histórico
+    desde la foto más cercana en lugar de recorrer todo el historial.
+    """
+
+    business = models.ForeignKey(
+        "Business",
+        on_delete=models.CASCADE,
+        related_name="stock_snapshots",
+    )
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="stock_snapshots",
+    )
+
+    taken_at = models.DateTimeField()
+
+    stock = models.IntegerField()
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "taken_at"],
+                name="unique_stock_snapshot_per_product_instant",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["business", "taken_at"],
+                name="stock_snapshot_business_idx",
+            ),
+        ]
+        ordering = ["-taken_at"]
+
+    def __str__(self):
+        return f"{self.product.title} · {self.stock} @ {self.taken_at}"
+
+class StocktakeSession(models.Model):
+    """
+    Conteo físico de inventario. Los conteos se registran mientras la
+    sesión está abierta y las diferencias se aplican de una sola vez.
+    """
+
+    STATUS_OPEN = "open"
+    STATUS_APPLIED = "applied"
+    STATUS_CANCELLED = "cancelled"
+
+    STATUS_CHOICES = [
+        (STATUS_OPEN, "Abierta"),
+        (STATUS_APPLIED, "Aplicada"),
+        (STATUS_CANCELLED, "Cancelada"),
+    ]
+
+    public_id = models.UUIDField(
+        default=uuid.uuid4,
+        unique=True,
+        db_index=True,
+        editable=False,
+    )
+
+    business = models.ForeignKey(
+        "Business",
+        on_delete=models.CASCADE,
+        related_name="stocktake_sessions",
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_OPEN,
+    )
+
+    note = models.TextField(
+        blank=True,
+    )
+
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        related_name="created_stocktake_sessions",
+    )
+
+    applied_by = models.ForeignKey(
+        User,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="applied_stocktake_sessions",
+    )
+
+    applied_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["business", "status"],
+                name="stocktake_biz_status_idx",
+            ),
+        ]
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"Conteo {self.public_id} · {self.status}"
+
+class StocktakeCount(models.Model):
+    """
+    Cantidad contada de un producto. `expected_stock` y `difference` se
+    guardan al aplicar la sesión con el stock bloqueado en ese momento.
+    """
+
+    session = models.ForeignKey(
+        StocktakeSession,
+        on_delete=models.CASCADE,
+        related_name="counts",
+    )
+
+    product = models.ForeignKey(
+        Product,
+        on_delete=models.CASCADE,
+        related_name="stocktake_counts",
+    )
+
+    counted_quantity = models.PositiveIntegerField()
+
+    expected_stock = models.IntegerField(
+        null=True,
+        blank=True,
+    )
+
+    difference = models.IntegerField(
+        null=True,
+        blank=True,
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["session", "product"],
+                name="unique_stocktake_count_per_product",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product.title} · {self.counted_quantity}"
+
 class EmployeeCommissionPlan(models.Model):
     public_id = models.UUIDField(
         default=uuid.uuid4,
@@ -1480,6 +1697,81 @@ class CommissionSettlement(models.Model):
             f"{self.period_start} - {self.period_end}"
         )
 
+class EmployeeCommissionAccrual(models.Model):
+    """
+    Ventas acumuladas por empleado y día.
+
+    Se mantiene de forma incremental al crear, modificar o anular
+    ventas, para que las comisiones se calculen sobre días y no sobre
+    transacciones individuales. No guarda el porcentaje: el plan vigente
+    se aplica al leer, como en el reporte de comisiones.
+    `rebuild_commission_accruals` reconstruye la tabla desde el
+    historial.
+    """
+
+    business = models.ForeignKey(
+        Business,
+        on_delete=models.CASCADE,
+        related_name="commission_accruals",
+    )
+
+    employee = models.ForeignKey(
+        Employee,
+        on_delete=models.CASCADE,
+        related_name="commission_accruals",
+    )
+
+    date = models.DateField()
+
+    sales_count = models.IntegerField(
+        default=0,
+    )
+
+    sales_total = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+    )
+
+    updated_at = models.DateTimeField(
+        auto_now=True,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=[
+                    "employee",
+                    "date",
+                ],
+                name=(
+                    "unique_commission_accrual_"
+                    "per_employee_day"
+                ),
+            ),
+        ]
+
+        indexes = [
+            models.Index(
+                fields=[
+                    "business",
+                    "date",
+                ],
+                name="accrual_business_date_idx",
+            ),
+        ]
+
+        ordering = [
+            "-date",
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.employee.full_name} · "
+            f"{self.date} · "
+            f"{self.sales_total}"
+        )
+
 class MonthlyClosure(models.Model):
     STATUS_CLOSED = "closed"
     STATUS_REOPENED = "reopened"
@@ -1682,3 +1974,202 @@ class MonthlyClosure(models.Model):
             f"v{self.version} · "
             f"{self.status}"
         )
+
+
+# ---------------------------------------------------------------------------
+# Archivo de períodos cerrados
+# ---------------------------------------------------------------------------
+# Tablas frías con las mismas columnas que Transaction, TransactionDetail,
+# Debt, DebtPayment y StockMovement. Las filas se trasladan conservando su
+# id y public_id mediante core.services.archive; nunca se editan aquí.
+
+class ArchivedTransaction(models.Model):
+    public_id = models.UUIDField(unique=True, editable=False)
+    business = models.ForeignKey('Business', on_delete=models.CASCADE, related_name='archived_transactions')
+    customer = models.ForeignKey('Customer', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    supplier = models.ForeignKey('Supplier', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    employee = models.ForeignKey('Employee', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    payment_method = models.ForeignKey('PaymentMethod', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    cash_register = models.ForeignKey('CashRegister', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    type = models.CharField(max_length=20, choices=Transaction.TRANSACTION_TYPES)
+    is_debt = models.BooleanField(default=False)
+    discount_percent = models.DecimalField(max_digits=5, decimal_places=2, null=True, blank=True)
+    concept = models.TextField(blank=True)
+    total_value = models.DecimalField(max_digits=12, decimal_places=2)
+    status = models.ForeignKey('EntityStatus', on_delete=models.PROTECT, related_name='+')
+    invoice_number = models.CharField(max_length=100, blank=True, null=True)
+    payment_status = models.CharField(max_length=20, choices=Transaction.PAYMENT_STATUSES, default="paid")
+    invoice_series = models.CharField(max_length=50, blank=True, null=True)
+    invoice_file_url = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    created_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name='+')
+    updated_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name='+', null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["business", "created_at"],
+                name="archived_tx_business_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_type_display()} archivada · {self.public_id}"
+
+class ArchivedTransactionDetail(models.Model):
+    public_id = models.UUIDField(unique=True, editable=False)
+    transaction = models.ForeignKey(ArchivedTransaction, on_delete=models.CASCADE, related_name='details')
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='+')
+    quantity = models.PositiveIntegerField()
+    unit_price = models.DecimalField(max_digits=12, decimal_places=2)
+    total_price = models.DecimalField(max_digits=12, decimal_places=2)
+
+class ArchivedDebt(models.Model):
+    public_id = models.UUIDField(unique=True, editable=False)
+    transaction = models.OneToOneField(ArchivedTransaction, on_delete=models.CASCADE, related_name='debts')
+    total_amount = models.DecimalField(max_digits=12, decimal_places=2)
+    paid_amount = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    interest_rate = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    term_months = models.IntegerField(default=0)
+    due_date = models.DateField()
+    is_settled = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+class ArchivedDebtPayment(models.Model):
+    public_id = models.UUIDField(unique=True, editable=False)
+    debt = models.ForeignKey(ArchivedDebt, on_delete=models.CASCADE, related_name='payments')
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    payment_date = models.DateField()
+    transaction = models.ForeignKey(ArchivedTransaction, on_delete=models.SET_NULL, null=True, blank=True, related_name='debt_payments')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    payment_method = models.ForeignKey(PaymentMethod, on_delete=models.PROTECT, related_name='+')
+    cash_register = models.ForeignKey('CashRegister', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+
+class ArchivedStockMovement(models.Model):
+    public_id = models.UUIDField(unique=True, editable=False)
+    product = models.ForeignKey('Product', on_delete=models.PROTECT, related_name='archived_stock_movements')
+    transaction = models.ForeignKey(ArchivedTransaction, on_delete=models.SET_NULL, null=True, blank=True, related_name='stock_movements')
+    note = models.CharField(max_length=255, blank=True)
+    type = models.CharField(max_length=20, choices=[('entry', 'Entry'), ('sale', 'Sale'), ('adjustment', 'Adjustment')])
+    quantity = models.IntegerField()
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    transaction_detail = models.ForeignKey(
+        ArchivedTransactionDetail, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='stock_movements'
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["product", "created_at"],
+                name="archived_movement_product_idx",
+            ),
+        ]
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.type} {self.quantity:+d} archivado · {self.product.title}"
+
+class ReportJob(models.Model):
+    """
+    Reporte pedido con `?async=true`. Guarda los parámetros de la
+    consulta tal como llegaron; `run_report_worker` los vuelve a validar,
+    calcula el reporte y deja el JSON en `result`.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pendiente"),
+        (STATUS_RUNNING, "En proceso"),
+        (STATUS_DONE, "Terminado"),
+        (STATUS_FAILED, "Fallido"),
+    ]
+
+    public_id = models.UUIDField(
+        default=uuid.uuid4,
+        unique=True,
+        db_index=True,
+        editable=False,
+    )
+
+    business = models.ForeignKey(
+        "Business",
+        on_delete=models.CASCADE,
+        related_name="report_jobs",
+    )
+
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="report_jobs",
+    )
+
+    report = models.CharField(
+        max_length=50,
+    )
+
+    params = models.JSONField(
+        default=dict,
+        blank=True,
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING,
+    )
+
+    result = models.JSONField(
+        null=True,
+        blank=True,
+    )
+
+    error = models.TextField(
+        blank=True,
+    )
+
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+    )
+
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+    )
+
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "created_at"],
+                name="report_job_queue_idx",
+            ),
+        ]
+        ordering = ["-created_at"]
+
+    def __str__(self):
+        return f"{self.report} {self.public_id} · {self.status}"
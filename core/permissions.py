@@ -1,3 +1,6 @@
+import hmac
+
+from django.conf import settings
 from rest_framework.permissions import BasePermission
 
 from core.models import (
@@ -428,4 +431,35 @@ class IsOwnerOrBusinessOwner(BasePermission):
                 None,
             )
 
-        return current
\ No newline at end of file
+        return current
+
+class CanReadMetrics(BasePermission):
+    """
+    Acceso a `/api/metrics/`: usuarios staff o el scraper con
+    `Authorization: Token <METRICS_TOKEN>`.
+    """
+
+    message = "No tienes permiso para ver las métricas."
+
+    def has_permission(
+        self,
+        request,
+        view,
+    ):
+        token = settings.METRICS_TOKEN
+        header = request.META.get(
+            "HTTP_AUTHORIZATION",
+            "",
+        )
+
+        if token and hmac.compare_digest(
+            header.encode(),
+            f"Token {token}".encode(),
+        ):
+            return True
+
+        return bool(
+            request.user
+            and request.user.is_authenticated
+            and request.user.is_staff
+        )
@@ -0,0 +1,436 @@
+"""
+Planes de consulta derivados de los campos de lectura de un serializer.
+
+Los listados cargan sus relaciones con select_related y prefetch_related
+completos, incluidos textos largos que la respuesta nunca usa. Aquí se
+recorren los campos de lectura del serializer para deducir qué
+relaciones unir, qué columnas cargar de cada modelo y qué prefetch
+hacen falta, cada uno con su propio queryset reducido.
+
+Cuando un campo depende de algo que no se puede deducir (una propiedad,
+un SerializerMethodField sin `Meta.method_field_sources` o
+`source="*"`), ese modelo se carga completo y se conservan las
+relaciones que la vista ya pedía a partir de él.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+@dataclass(frozen=True)
+class SerializerQueryPlan:
+    """
+    Columnas y relaciones que necesita un serializer de lectura.
+
+    `levels` asocia cada ruta de select_related (`()` es el modelo
+    principal) con su modelo y los campos a cargar, o None si el modelo
+    debe cargarse completo. `prefetches` contiene pares
+    (lookup, plan del modelo relacionado o None).
+    """
+
+    model: type
+    levels: dict
+    prefetches: tuple
+
+    def _full_paths(self):
+        return {
+            path
+            for path, (_, names) in self.levels.items()
+            if names is None
+        }
+
+    def _deferred_fields(self):
+        deferred = []
+
+        for path, (model, names) in self.levels.items():
+            if names is None:
+                continue
+
+            prefix = "".join(f"{name}__" for name in path)
+            deferred.extend(
+                f"{prefix}{field.name}"
+                for field in model._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in names
+            )
+
+        return deferred
+
+    def _kept_select_related(self, query):
+        """
+        Relaciones de la vista que cuelgan de un modelo cargado completo.
+        """
+        full_paths = self._full_paths()
+        kept = []
+
+        for path in sorted(
+            _select_related_paths(query.select_related),
+            key=len,
+        ):
+            if path in self.levels or path[:-1] not in full_paths:
+                continue
+
+            kept.append(path)
+            full_paths.add(path)
+
+        return kept
+
+    def _kept_prefetches(self, queryset, known_paths, full_paths):
+        planned = [lookup for lookup, _ in self.prefetches]
+        kept = []
+
+        for lookup in queryset._prefetch_related_lookups:
+            name = (
+                lookup.prefetch_to
+                if isinstance(lookup, Prefetch)
+                else lookup
+            )
+
+            if any(
+                name == planned_lookup
+                or name.startswith(f"{planned_lookup}__")
+                for planned_lookup in planned
+            ):
+                continue
+
+            parts = tuple(name.split("__"))
+            owner = next(
+                parts[:index]
+                for index in range(len(parts) - 1, -1, -1)
+                if parts[:index] in known_paths
+            )
+
+            if owner in full_paths:
+                kept.append(lookup)
+
+        return kept
+
+    def apply(self, queryset):
+        """
+        Aplica el plan sobre un queryset de `self.model`.
+
+        Sustituye select_related y prefetch_related por los del plan y
+        difiere las columnas que el serializer no lee. Los querysets que
+        ya restringen columnas, usan values() o select_related() sin
+        argumentos se devuelven sin cambios.
+        """
+        query = queryset.query
+
+        if (
+            queryset.model is not self.model
+            or query.select_related is True
+            or query.values_select
+            or query.deferred_loading != (frozenset(), True)
+        ):
+            return queryset
+
+        kept_related = self._kept_select_related(query)
+        known_paths = {*self.levels, *kept_related}
+        kept_prefetches = self._kept_prefetches(
+            queryset,
+            known_paths,
+            self._full_paths() | set(kept_related),
+        )
+
+        related = [
+            "__".join(path)
+            for path in (*self.levels, *kept_related)
+            if path
+        ]
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+
+        if related:
+            queryset = queryset.select_related(*related)
+
+        prefetches = [
+            (
+                Prefetch(
+                    lookup,
+                    queryset=plan.apply(
+                        plan.model._default_manager.all()
+                    ),
+                )
+                if plan is not None
+                else lookup
+            )
+            for lookup, plan in self.prefetches
+        ]
+
+        if prefetches or kept_prefetches:
+            queryset = queryset.prefetch_related(
+                *prefetches,
+                *kept_prefetches,
+            )
+
+        deferred = self._deferred_fields()
+        if deferred:
+            queryset = queryset.defer(*deferred)
+
+        return queryset
+
+
+def _select_related_paths(select_related, prefix=()):
+    if not isinstance(select_related, dict):
+        return []
+
+    paths = []
+    for name, nested in select_related.items():
+        path = (*prefix, name)
+        paths.append(path)
+        paths.extend(_select_related_paths(nested, path))
+
+    return paths
+
+
+class _PlanBuilder:
+    def __init__(self, model, *, annotations=frozenset(), required=()):
+        self.annotations = annotations
+        self.models = {(): model}
+        self.columns = {(): set(required)}
+        self.prefetches = {}
+
+    def load_all(self, path):
+        self.columns[path] = None
+
+    def add(self, path, name):
+        if self.columns[path] is not None:
+            self.columns[path].add(name)
+
+    def require(self, path, attrs):
+        """
+        Recorre `attrs` desde `path` anotando columnas y relaciones.
+
+        Devuelve la ruta alcanzada si el recorrido termina en una
+        relación, o None si termina en una columna o en algo que no se
+        puede deducir.
+        """
+        model = self.models[path]
+
+        for index, attr in enumerate(attrs):
+            if attr == "pk":
+                return None
+
+            try:
+                model_field = model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                if not (
+                    path == ()
+                    and index == len(attrs) - 1
+                    and attr in self.annotations
+                ):
+                    self.load_all(path)
+                return None
+
+            if not model_field.is_relation:
+                self.add(path, model_field.name)
+                return None
+
+            remote_name = None
+            if model_field.concrete and (
+                model_field.many_to_one
+                or model_field.one_to_one
+            ):
+                self.add(path, model_field.name)
+            elif model_field.one_to_one:
+                remote_name = model_field.field.name
+            else:
+                self.load_all(path)
+                return None
+
+            path = (*path, attr)
+            model = model_field.related_model
+            self.models.setdefault(path, model)
+            self.columns.setdefault(path, set())
+
+            if remote_name is not None:
+                self.add(path, remote_name)
+
+        return path
+
+    def prefetch(self, path, attrs, child):
+        *head, last = attrs
+
+        owner = self.require(path, head) if head else path
+        if owner is None:
+            return
+
+        try:
+            relation = self.models[owner]._meta.get_field(last)
+        except FieldDoesNotExist:
+            self.load_all(owner)
+            return
+
+        lookup = "__".join((*owner, last))
+
+        if relation.one_to_many and not relation.concrete:
+            self.prefetches[lookup] = _build_plan(
+                child,
+                model=relation.related_model,
+                required={relation.field.name},
+            )
+        elif relation.many_to_many:
+            self.prefetches[lookup] = None
+        else:
+            self.load_all(owner)
+
+    def collect(self, serializer, path=()):
+        meta = getattr(serializer, "Meta", None)
+        method_sources = getattr(meta, "method_field_sources", {})
+
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if isinstance(field, serializers.SerializerMethodField):
+                sources = method_sources.get(name)
+
+                if sources is None:
+                    self.load_all(path)
+                    continue
+
+                for source in sources:
+                    target = self.require(path, source.split("."))
+                    if target is not None:
+                        self.load_all(target)
+
+                continue
+
+            if field.source == "*":
+                if isinstance(field, serializers.Serializer):
+                    self.collect(field, path)
+                else:
+                    self.load_all(path)
+                continue
+
+            if isinstance(field, serializers.ListSerializer):
+                self.prefetch(path, field.source_attrs, field.child)
+                continue
+
+            if isinstance(field, serializers.ManyRelatedField):
+                self.load_all(path)
+                continue
+
+            target = self.require(path, field.source_attrs)
+            if target is None:
+                continue
+
+            if isinstance(field, serializers.Serializer):
+                self.collect(field, target)
+            elif isinstance(field, serializers.RelatedField):
+                slug_field = getattr(field, "slug_field", None)
+                if slug_field:
+                    self.require(target, slug_field.split("__"))
+            else:
+                self.load_all(target)
+
+    def build(self):
+        return SerializerQueryPlan(
+            model=self.models[()],
+            levels={
+                path: (
+                    self.models[path],
+                    None if names is None else frozenset(names),
+                )
+                for path, names in self.columns.items()
+            },
+            prefetches=tuple(self.prefetches.items()),
+        )
+
+
+def _build_plan(serializer, *, model, annotations=frozenset(), required=()):
+    builder = _PlanBuilder(
+        model,
+        annotations=annotations,
+        required=required,
+    )
+    builder.collect(serializer)
+    return builder.build()
+
+
+class PlanCache:
+    """
+    Caché LRU de planes con tamaño máximo. La clave incluye los campos
+    que el cliente elige con `?fields=`/`?omit=`, así que sin límite cada
+    combinación dejaría una entrada más en la memoria del proceso.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._plans)
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._plans:
+                self._plans.move_to_end(key)
+                return self._plans[key]
+
+        plan = build()
+
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+
+        return plan
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+
+
+_PLANS = PlanCache()
+
+
+def serializer_query_plan(serializer, *, annotations=()):
+    """
+    Plan de consulta de un ModelSerializer, cacheado por clase y por el
+    conjunto de campos que expone (ver SparseFieldsetMixin).
+
+    `annotations` son los nombres anotados en el queryset, que el
+    serializer puede leer sin que sean columnas del modelo.
+    """
+    model = getattr(getattr(serializer, "Meta", None), "model", None)
+    if model is None:
+        return None
+
+    annotations = frozenset(annotations)
+    key = (
+        type(serializer),
+        tuple(serializer.fields),
+        annotations,
+    )
+
+    return _PLANS.get_or_build(
+        key,
+        lambda: _build_plan(
+            serializer,
+            model=model,
+            annotations=annotations,
+        ),
+    )
+
+
+def prune_queryset_for_serializer(queryset, serializer):
+    """
+    Limita un queryset de lectura a lo que `serializer` necesita.
+    """
+    plan = serializer_query_plan(
+        serializer,
+        annotations=queryset.query.annotations,
+    )
+
+    if plan is None:
+        return queryset
+
+    return plan.apply(queryset)
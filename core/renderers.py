@@ -0,0 +1,189 @@
+"""
+Renderers JSON de la API.
+
+`FastJSONRenderer` produce los mismos bytes que el `JSONRenderer` de DRF
+(importes como cadena, UUID con guiones, fechas ECMA 262 con `Z`), pero
+codifica con `orjson` cuando está instalado. Se activa por despliegue con
+`API_JSON_RENDERER`; el renderer por defecto sigue siendo el de DRF.
+Cualquier caso en el que la salida pudiera diferir se delega al renderer
+de DRF:
+
+- indentación pedida por el cliente o ajustes `UNICODE_JSON`,
+  `COMPACT_JSON` y `STRICT_JSON` distintos de los de fábrica;
+- valores que `orjson` no codifica (enteros de más de 64 bits, claves
+  no textuales, anidamiento excesivo, tipos que el `default()` de DRF
+  no conoce);
+- `Decimal` no finitos, que el encoder estricto de DRF rechaza;
+- floats que DRF escribe en notación exponencial y `orjson` no, o al
+  revés (`1e-05` frente a `0.00001`, `1e+16` frente a `1e16`). Se
+  buscan en los bytes de salida; las cadenas solo se descartan cuando
+  aparece un candidato.
+
+La única diferencia restante son los floats NaN o infinitos, que
+`orjson` escribe como `null` y DRF rechaza con `ValueError`; la API no
+tiene campos float.
+
+`StreamingJSONRenderer` añade `stream()`, que emite la lista
+`results` de una página por bloques; concatenados, los bloques son
+idénticos a `render()`.
+
+`PrometheusTextRenderer` no es JSON: entrega tal cual el texto de
+`/api/metrics/`.
+"""
+
+import math
+import re
+
+from django.conf import settings
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_LINE_SEPARATORS = (
+    ("\u2028".encode(), b"\\u2028"),
+    ("\u2029".encode(), b"\\u2029"),
+)
+
+# Cadenas JSON completas, para buscar números fuera de ellas.
+_JSON_STRING = re.compile(rb'"(?:[^"\\]|\\.)*"')
+
+# Números sueltos que `orjson` escribe distinto que `repr()`: con
+# exponente o menores que 1e-4. Solo los delimitadores JSON los rodean.
+_FLOAT_MISMATCH = re.compile(
+    rb"(?:^|[:,\[])-?(?:[0-9]+(?:\.[0-9]+)?[eE][-+]?[0-9]+|0\.0000[0-9]*)"
+    rb"(?=[,\]}]|$)"
+)
+
+
+def _floats_differ(ret):
+    if _FLOAT_MISMATCH.search(ret) is None:
+        return False
+
+    # El candidato puede estar dentro de una cadena: se descartan antes
+    # de confirmar.
+    return _FLOAT_MISMATCH.search(_JSON_STRING.sub(b'""', ret)) is not None
+
+
+class FastJSONRenderer(JSONRenderer):
+    def __init__(self):
+        self._encoder = self.encoder_class()
+
+    def _default(self, obj):
+        value = self._encoder.default(obj)
+
+        # `Decimal` llega aquí y DRF lo convierte en float.
+        if isinstance(value, float) and not math.isfinite(value):
+            raise ValueError("Out of range float values are not JSON compliant")
+
+        return value
+
+    def _can_render_fast(self, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and not self.ensure_ascii
+            and self.compact
+            and self.strict
+            and self.get_indent(
+                accepted_media_type,
+                renderer_context or {},
+            ) is None
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            data is None
+            or not self._can_render_fast(accepted_media_type, renderer_context)
+        ):
+            return super().render(
+                data,
+                accepted_media_type,
+                renderer_context,
+            )
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self._default,
+                option=(
+                    orjson.OPT_PASSTHROUGH_DATETIME
+                    | orjson.OPT_PASSTHROUGH_DATACLASS
+                ),
+            )
+        except orjson.JSONEncodeError:
+            ret = None
+
+        if ret is None or _floats_differ(ret):
+            return super().render(
+                data,
+                accepted_media_type,
+                renderer_context,
+            )
+
+        for separator, escaped in _LINE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+
+        return ret
+
+
+class StreamingJSONRenderer(FastJSONRenderer):
+    stream_key = "results"
+
+    @staticmethod
+    def chunk_size():
+        return max(settings.JSON_STREAM_CHUNK_SIZE, 1)
+
+    def should_stream(self, data):
+        """
+        Solo compensa trocear páginas con más de un bloque de filas.
+        """
+        return (
+            isinstance(data, dict)
+            and isinstance(data.get(self.stream_key), list)
+            and len(data[self.stream_key]) > self.chunk_size()
+        )
+
+    def stream(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Genera el JSON de `data` por bloques: primero las claves previas a
+        `results`, después las filas en grupos de `JSON_STREAM_CHUNK_SIZE`
+        y al final las claves restantes.
+        """
+        def render(value):
+            return self.render(value, accepted_media_type, renderer_context)
+
+        keys = list(data)
+        position = keys.index(self.stream_key)
+        before = {key: data[key] for key in keys[:position]}
+        after = {key: data[key] for key in keys[position + 1:]}
+        rows = data[self.stream_key]
+        chunk_size = self.chunk_size()
+
+        head = render(before)[:-1]
+        if before:
+            head += b","
+        yield head + render(self.stream_key) + b":["
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = render(rows[start:start + chunk_size])[1:-1]
+            yield chunk if start == 0 else b"," + chunk
+
+        tail = render(after)[1:]
+        yield b"]," + tail if after else b"]}"
+
+
+class PrometheusTextRenderer(BaseRenderer):
+    media_type = "text/plain"
+    format = "txt"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):
+            # Errores de autenticación o permisos.
+            data = f"{data.get('detail', '')}\n"
+
+        return data.encode(self.charset)
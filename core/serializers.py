@@ -1,23 +1,40 @@
+import uuid
+from collections.abc import Mapping
 from decimal import Decimal
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction as db_tx
-from django.db.models import Sum, Q
+from django.db.models import Q
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.encoding import smart_str
 from drf_spectacular.utils import (
     extend_schema_field,
     extend_schema_serializer,
 )
 from rest_framework import serializers
 
+from core.services.cash_registers import open_cash_register_id
+from core.services.commissions import employee_sales_totals
 from core.services.debt_payments import (
     get_locked_active_payment_method,
     register_debt_payment,
 )
 from core.services.financial_flows import (
-    exclude_terminal_transactions,
     is_terminal_transaction_status,
 )
-from core.utils import calculate_employee_advance_summary
+from core.services.product_import import (
+    IMPORT_FORMAT_CSV,
+    IMPORT_FORMAT_JSON,
+    IMPORT_FORMATS,
+    MAX_IMPORT_ROWS,
+    PRICE_FIELDS,
+    parse_product_rows,
+)
+from core.services.product_lookup import MAX_LOOKUP_CODES
+from core.utils import (
+    STOCK_CHANGE_MESSAGE,
+    calculate_employee_advance_summary,
+)
 from .models import (
     BusinessMembership, MonthlyClosure, User, Business, EntityStatus,
     ProductCategory, Product,
@@ -26,7 +43,7 @@ from .models import (
     Debt, DebtPayment, Notification, Reminder,
     Budget, Goal, GoalProgress,
     CommissionSettlement, EmployeeCommissionPlan,
-    CashMovement, CashRegister
+    CashMovement, CashRegister, StocktakeSession, ReportJob,
 )
 
 
@@ -82,6 +99,105 @@ class SecurePublicIdRelatedField(
         ),
     }
 
+    _prefetched = None
+
+    def __init__(self, *, business_lookup="business", **kwargs):
+        self.business_lookup = business_lookup
+        super().__init__(**kwargs)
+
+    def prefetch_public_ids(self, values):
+        """
+        Resuelve de una vez los public_id que luego validará el campo.
+
+        Parte del queryset del campo y lo limita a los negocios con
+        membresía activa del usuario del contexto, de modo que un
+        public_id ajeno falla en su índice. Los valores que no son UUID
+        se dejan a la validación normal.
+        """
+        public_ids = set()
+
+        for value in values:
+            if value is None:
+                continue
+            try:
+                public_ids.add(uuid.UUID(str(value)))
+            except (TypeError, ValueError, AttributeError):
+                continue
+
+        queryset = self.get_queryset()
+        business_ids = active_membership_business_ids(self.context)
+
+        if business_ids is not None:
+            queryset = queryset.filter(**{
+                f"{self.business_lookup}__in": business_ids,
+            })
+
+        self._prefetched = {
+            obj.public_id: obj
+            for obj in (
+                queryset.filter(public_id__in=public_ids)
+                if public_ids
+                else []
+            )
+        }
+
+    def clear_prefetched(self):
+        self._prefetched = None
+
+    def to_internal_value(self, data):
+        if self._prefetched is not None:
+            try:
+                public_id = uuid.UUID(str(data))
+            except (TypeError, ValueError, AttributeError):
+                public_id = None
+
+            if public_id is not None:
+                if public_id in self._prefetched:
+                    return self._prefetched[public_id]
+
+                self.fail(
+                    "does_not_exist",
+                    slug_name=self.slug_field,
+                    value=smart_str(data),
+                )
+
+        return super().to_internal_value(data)
+
+
+class PublicIdBatchListSerializer(
+    serializers.ListSerializer
+):
+    """
+    Valida listas resolviendo los public_id con una consulta por campo.
+
+    Antes de validar cada elemento reúne los UUID de todos los campos
+    SecurePublicIdRelatedField del hijo y los resuelve con
+    `public_id__in`. Los errores siguen indicándose por índice y con los
+    mismos mensajes que la validación individual.
+    """
+
+    def to_internal_value(self, data):
+        fields = [
+            field
+            for field in self.child.fields.values()
+            if isinstance(field, SecurePublicIdRelatedField)
+            and not field.read_only
+        ]
+
+        if isinstance(data, list):
+            for field in fields:
+                field.prefetch_public_ids(
+                    item.get(field.field_name)
+                    for item in data
+                    if isinstance(item, Mapping)
+                )
+
+        try:
+            return super().to_internal_value(data)
+        finally:
+            for field in fields:
+                field.clear_prefetched()
+
 
 def secure_public_id_field(
     model,
@@ -89,12 +205,19 @@ def secure_public_id_field(
     source=None,
     required=True,
     allow_null=False,
+    queryset=None,
+    business_lookup="business",
 ):
     kwargs = {
         "slug_field": "public_id",
-        "queryset": model.objects.all(),
+        "queryset": (
+            queryset
+            if queryset is not None
+            else model.objects.all()
+        ),
         "required": required,
         "allow_null": allow_null,
+        "business_lookup": business_lookup,
     }
 
     if source is not None:
@@ -618,6 +741,8 @@ class ProductSerializer(
             "category_name",
 
             "title",
+            "sku",
+            "barcode",
             "description",
             "image_url",
 
@@ -648,10 +773,7 @@ class ProductSerializer(
             and attrs["stock"] != self.instance.stock
         ):
             raise serializers.ValidationError({
-                "stock": (
-                    "El stock de un producto existente solo puede "
-                    "cambiar mediante movimientos de inventario."
-                )
+                "stock": STOCK_CHANGE_MESSAGE,
             })
 
         business = attrs.get(
@@ -810,6 +932,7 @@ class TransactionDetailSerializer(
     product_public_id = secure_public_id_field(
         Product,
         source="product",
+        queryset=Product.objects.select_related("status"),
     )
 
     quantity = serializers.IntegerField(
@@ -831,6 +954,7 @@ class TransactionDetailSerializer(
 
     class Meta:
         model = TransactionDetail
+        list_serializer_class = PublicIdBatchListSerializer
 
         fields = (
             "public_id",
@@ -853,6 +977,7 @@ class TransactionSerializer(
     business_public_id = secure_public_id_field(
         Business,
         source="business",
+        business_lookup="pk",
     )
     customer_public_id = secure_public_id_field(
         Customer,
@@ -1035,7 +1160,9 @@ class TransactionSerializer(
         )
         self.fields["details"].child.fields[
             "product_public_id"
-        ].queryset = Product.objects.filter(
+        ].queryset = Product.objects.select_related(
+            "status",
+        ).filter(
             business_id__in=business_ids,
         )
 
@@ -1581,6 +1708,9 @@ class TransactionSerializer(
 
         transaction = Transaction.objects.create(
             **validated_data,
+            cash_register_id=open_cash_register_id(
+                business_id=validated_data["business"].id,
+            ),
             total_value=Decimal("0.00"),
         )
 
@@ -1944,6 +2074,9 @@ class DebtSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Debt
+        method_field_sources = {
+            "direction": ("transaction.type",),
+        }
         fields = (
             "public_id",
             "business_public_id",
@@ -1980,6 +2113,7 @@ class DebtPaymentSerializer(serializers.ModelSerializer):
     debt_public_id = secure_public_id_field(
         Debt,
         source="debt",
+        business_lookup="transaction__business",
     )
     payment_method_public_id = secure_public_id_field(
         PaymentMethod,
@@ -2734,34 +2868,15 @@ class CommissionSettlementCreateSerializer(
             "commission_plan"
         ]
 
-        sales = (
-            Transaction.objects
-            .filter(
-                business=employee.business,
-                employee=employee,
-                type="sale",
-                created_at__date__gte=(
-                    period_start
-                ),
-                created_at__date__lte=(
-                    period_end
-                ),
-            )
+        summary = employee_sales_totals(
+            employee=employee,
+            period_start=period_start,
+            period_end=period_end,
         )
-        sales = exclude_terminal_transactions(sales)
 
-        summary = sales.aggregate(
-            sales_total=Sum("total_value"),
-        )
+        sales_count = summary["sales_count"]
 
-        sales_count = sales.count()
-
-        sales_total = (
-            summary["sales_total"]
-            or Decimal("0.00")
-        ).quantize(
-            Decimal("0.01")
-        )
+        sales_total = summary["sales_total"]
 
         commission_percentage = (
             commission_plan.percentage
@@ -2842,6 +2957,31 @@ class CommissionSettlementCreateSerializer(
             created_by=request.user,
         )
         
+class CommissionSettlementBulkCreateSerializer(
+    serializers.Serializer
+):
+    business_public_id = (
+        serializers.UUIDField()
+    )
+
+    period_start = serializers.DateField()
+
+    period_end = serializers.DateField()
+
+    def validate(self, attrs):
+        if (
+            attrs["period_end"]
+            < attrs["period_start"]
+        ):
+            raise serializers.ValidationError({
+                "period_end": (
+                    "La fecha final no puede ser "
+                    "anterior a la fecha inicial."
+                )
+            })
+
+        return attrs
+
 class CashRegisterSerializer(
     serializers.ModelSerializer
 ):
@@ -3761,6 +3901,293 @@ class StockMovementSerializer(serializers.ModelSerializer):
         )
         read_only_fields = fields
 
+class StocktakeSessionSerializer(
+    serializers.ModelSerializer
+):
+    business_public_id = public_id_read_only(
+        source="business",
+    )
+
+    created_by_email = serializers.EmailField(
+        source="created_by.email",
+        read_only=True,
+    )
+
+    applied_by_email = serializers.EmailField(
+        source="applied_by.email",
+        read_only=True,
+        allow_null=True,
+    )
+
+    counts_count = serializers.IntegerField(
+        read_only=True,
+    )
+
+    class Meta:
+        model = StocktakeSession
+        fields = (
+            "public_id",
+            "business_public_id",
+            "status",
+            "note",
+            "counts_count",
+            "created_by_email",
+            "applied_by_email",
+            "applied_at",
+            "created_at",
+            "updated_at",
+        )
+        read_only_fields = fields
+
+class StocktakeSessionCreateSerializer(
+    serializers.ModelSerializer
+):
+    business_public_id = public_id_field(
+        Business,
+        source="business",
+    )
+
+    note = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        max_length=1000,
+    )
+
+    class Meta:
+        model = StocktakeSession
+        fields = (
+            "business_public_id",
+            "note",
+        )
+
+class StocktakeCountEntrySerializer(
+    serializers.Serializer
+):
+    product_public_id = serializers.UUIDField()
+
+    counted_quantity = serializers.IntegerField(
+        min_value=0,
+        max_value=1_000_000,
+    )
+
+class StocktakeCountsSerializer(
+    serializers.Serializer
+):
+    counts = StocktakeCountEntrySerializer(
+        many=True,
+        allow_empty=False,
+        max_length=5000,
+    )
+
+class StocktakeDifferenceSerializer(
+    serializers.Serializer
+):
+    product_public_id = serializers.UUIDField()
+    product_name = serializers.CharField()
+    counted_quantity = serializers.IntegerField()
+    expected_stock = serializers.IntegerField()
+    difference = serializers.IntegerField()
+
+class ProductImportRowSerializer(
+    serializers.Serializer
+):
+    public_id = serializers.UUIDField(
+        required=False,
+    )
+
+    title = serializers.CharField(
+        required=False,
+        max_length=255,
+    )
+
+    sku = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        max_length=64,
+    )
+
+    barcode = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        max_length=64,
+    )
+
+    description = serializers.CharField(
+        required=False,
+        allow_blank=True,
+    )
+
+    image_url = serializers.URLField(
+        required=False,
+        allow_blank=True,
+    )
+
+    base_price = serializers.DecimalField(
+        required=False,
+        max_digits=12,
+        decimal_places=2,
+        min_value=Decimal("0"),
+    )
+
+    base_cost = serializers.DecimalField(
+        required=False,
+        max_digits=12,
+        decimal_places=2,
+        min_value=Decimal("0"),
+    )
+
+    stock = serializers.IntegerField(
+        required=False,
+        min_value=0,
+    )
+
+    is_visible = serializers.BooleanField(
+        required=False,
+    )
+
+    category_public_id = serializers.UUIDField(
+        required=False,
+        allow_null=True,
+    )
+
+    status_public_id = serializers.UUIDField(
+        required=False,
+    )
+
+def validate_product_import_rows(rows) -> list[dict]:
+    """
+    Valida en memoria todas las filas de una importación de productos.
+
+    Los errores se agrupan por índice de fila para que el archivo completo
+    pueda corregirse de una vez.
+    """
+    if not rows:
+        raise serializers.ValidationError({
+            "rows": "El archivo no contiene productos.",
+        })
+
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise serializers.ValidationError({
+            "rows": (
+                f"Se permiten como máximo {MAX_IMPORT_ROWS} "
+                "productos por importación."
+            ),
+        })
+
+    serializer = ProductImportRowSerializer(
+        data=rows,
+        many=True,
+    )
+
+    if not serializer.is_valid():
+        raise serializers.ValidationError({
+            "rows": {
+                index: row_errors
+                for index, row_errors in enumerate(serializer.errors)
+                if row_errors
+            },
+        })
+
+    return serializer.validated_data
+
+class ProductBulkUpsertSerializer(
+    serializers.Serializer
+):
+    business_public_id = serializers.UUIDField()
+
+    products = serializers.ListField(
+        child=serializers.DictField(),
+        required=False,
+    )
+
+    file = serializers.FileField(
+        required=False,
+    )
+
+    format = serializers.ChoiceField(
+        choices=IMPORT_FORMATS,
+        required=False,
+    )
+
+    def validate(self, attrs):
+        if ("products" in attrs) == ("file" in attrs):
+            raise serializers.ValidationError({
+                "products": "Envía una lista de productos o un archivo.",
+            })
+
+        if "file" in attrs:
+            upload = attrs.pop("file")
+            import_format = attrs.get("format") or (
+                IMPORT_FORMAT_JSON
+                if upload.name.lower().endswith(".json")
+                else IMPORT_FORMAT_CSV
+            )
+            rows = parse_product_rows(
+                upload.read(),
+                import_format=import_format,
+            )
+        else:
+            rows = attrs.pop("products")
+
+        attrs["rows"] = validate_product_import_rows(rows)
+
+        return attrs
+
+class ProductPriceUpdateSerializer(
+    serializers.Serializer
+):
+    business_public_id = serializers.UUIDField()
+
+    category_public_id = serializers.UUIDField(
+        required=False,
+    )
+
+    percent = serializers.DecimalField(
+        max_digits=7,
+        decimal_places=2,
+        min_value=Decimal("-99.99"),
+        max_value=Decimal("1000"),
+    )
+
+    field = serializers.ChoiceField(
+        choices=PRICE_FIELDS,
+        default="base_price",
+    )
+
+class ProductCodeLookupSerializer(
+    serializers.Serializer
+):
+    public_id = serializers.UUIDField()
+    sku = serializers.CharField()
+    barcode = serializers.CharField()
+    title = serializers.CharField()
+    base_price = serializers.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+    )
+    stock = serializers.IntegerField()
+
+class ProductCodeLookupQuerySerializer(
+    serializers.Serializer
+):
+    business_public_id = serializers.UUIDField()
+
+class PosBootstrapQuerySerializer(
+    serializers.Serializer
+):
+    business_public_id = serializers.UUIDField()
+
+class ProductCodeBatchLookupSerializer(
+    serializers.Serializer
+):
+    business_public_id = serializers.UUIDField()
+
+    codes = serializers.ListField(
+        child=serializers.CharField(max_length=64),
+        allow_empty=False,
+        max_length=MAX_LOOKUP_CODES,
+    )
+
 class PaymentSummaryQuerySerializer(
     serializers.Serializer
 ):
@@ -3881,6 +4308,31 @@ class DashboardOverviewQuerySerializer(
 
         return attrs
 
+class EmployeeCommissionBatchQuerySerializer(
+    serializers.Serializer
+):
+    business_public_id = (
+        serializers.UUIDField()
+    )
+
+    date_from = serializers.DateField()
+
+    date_to = serializers.DateField()
+
+    def validate(self, attrs):
+        if (
+            attrs["date_from"]
+            > attrs["date_to"]
+        ):
+            raise serializers.ValidationError({
+                "date_to": (
+                    "La fecha final no puede ser "
+                    "anterior a la fecha inicial."
+                )
+            })
+
+        return attrs
+
 class CurrentMembershipSerializer(
     serializers.Serializer
 ):
@@ -3903,3 +4355,45 @@ class CurrentUserSerializer(
     memberships = CurrentMembershipSerializer(
         many=True
     )
+
+
+class ReportJobSerializer(
+    serializers.ModelSerializer
+):
+    business_public_id = public_id_read_only(
+        source="business",
+    )
+
+    status_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = (
+            "public_id",
+            "business_public_id",
+            "report",
+            "params",
+            "status",
+            "status_url",
+            "result",
+            "error",
+            "attempts",
+            "created_at",
+            "started_at",
+            "finished_at",
+        )
+        read_only_fields = fields
+
+    @extend_schema_field(serializers.URLField())
+    def get_status_url(self, obj):
+        path = reverse(
+            "report-job-detail",
+            kwargs={"public_id": obj.public_id},
+        )
+        request = self.context.get("request")
+
+        return (
+            request.build_absolute_uri(path)
+            if request is not None
+            else path
+        )
@@ -0,0 +1,476 @@
+from django.conf import settings
+from django.db import connections, router
+from django.db import transaction as db_tx
+from django.db.models import Exists, Max, OuterRef, Q
+from django.utils import timezone as django_timezone
+
+from core.models import (
+    ArchivedDebt,
+    ArchivedDebtPayment,
+    ArchivedStockMovement,
+    ArchivedTransaction,
+    ArchivedTransactionDetail,
+    Business,
+    Debt,
+    DebtPayment,
+    GoalProgress,
+    MonthlyClosure,
+    Notification,
+    Reminder,
+    StockMovement,
+    Transaction,
+    TransactionDetail,
+)
+from core.services.monthly_summary import get_month_period
+from core.services.partitions import add_months
+
+
+# Orden de inserción: padres antes que hijos. El borrado usa el inverso.
+ARCHIVE_MODELS = (
+    (Transaction, ArchivedTransaction),
+    (TransactionDetail, ArchivedTransactionDetail),
+    (Debt, ArchivedDebt),
+    (DebtPayment, ArchivedDebtPayment),
+    (StockMovement, ArchivedStockMovement),
+)
+
+HOT_MODEL_BY_ARCHIVE = {
+    archive_model: hot_model
+    for hot_model, archive_model in ARCHIVE_MODELS
+}
+
+
+def archive_cutoff(*, older_than_months=None):
+    """
+    Inicio del mes que queda `older_than_months` meses antes del actual.
+    Solo se archivan filas anteriores a este instante.
+    """
+    if older_than_months is None:
+        older_than_months = settings.ARCHIVE_HORIZON_MONTHS
+
+    today = django_timezone.localdate()
+    year, month = add_months(today.year, today.month, -older_than_months)
+
+    return get_month_period(year=year, month=month)["start_datetime"]
+
+
+def closed_period_ranges(*, business, cutoff) -> list[tuple]:
+    """
+    Rangos `[inicio, fin)` de los meses cerrados del negocio que terminan
+    antes de `cutoff`. Los meses consecutivos se fusionan en un solo rango.
+    """
+    periods = sorted(
+        MonthlyClosure.objects
+        .filter(
+            business=business,
+            status=MonthlyClosure.STATUS_CLOSED,
+        )
+        .values_list("year", "month")
+    )
+
+    ranges = []
+
+    for year, month in periods:
+        period = get_month_period(year=year, month=month)
+        start = period["start_datetime"]
+        end = period["end_datetime"]
+
+        if end > cutoff:
+            continue
+
+        if ranges and ranges[-1][1] == start:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((start, end))
+
+    return ranges
+
+
+def _in_ranges_q(ranges, field="created_at") -> Q:
+    condition = Q()
+
+    for start, end in ranges:
+        condition |= Q(**{
+            f"{field}__gte": start,
+            f"{field}__lt": end,
+        })
+
+    return condition
+
+
+def archivable_transactions(*, business, ranges):
+    """
+    Transacciones liquidadas de meses cerrados cuya actividad completa
+    (detalles, deuda, pagos y movimientos) también cae en meses cerrados.
+
+    Se omiten las referenciadas por notificaciones, recordatorios o
+    progreso de metas para no romper esos vínculos.
+    """
+    if not ranges:
+        return Transaction.objects.none()
+
+    in_closed_periods = _in_ranges_q(ranges)
+    transaction_ref = OuterRef("pk")
+
+    return (
+        Transaction.objects
+        .filter(
+            in_closed_periods,
+            business=business,
+            payment_status="paid",
+            is_debt=False,
+        )
+        .exclude(
+            Exists(
+                StockMovement.objects
+                .filter(transaction=transaction_ref)
+                .exclude(in_closed_periods)
+            )
+        )
+        .exclude(
+            Exists(
+                DebtPayment.objects
+                .filter(
+                    Q(debt__transaction=transaction_ref)
+                    | Q(transaction=transaction_ref)
+                )
+                .filter(
+                    ~in_closed_periods
+                    | ~Q(debt__transaction=transaction_ref)
+                    | (
+                        Q(transaction__isnull=False)
+                        & ~Q(transaction=transaction_ref)
+                    )
+                )
+            )
+        )
+        .exclude(Exists(Notification.objects.filter(transaction=transaction_ref)))
+        .exclude(Exists(Reminder.objects.filter(transaction=transaction_ref)))
+        .exclude(Exists(GoalProgress.objects.filter(transaction=transaction_ref)))
+    )
+
+
+def archivable_stock_movements(*, business, ranges):
+    """Movimientos sin transacción (entradas y ajustes) de meses cerrados."""
+    if not ranges:
+        return StockMovement.objects.none()
+
+    return StockMovement.objects.filter(
+        _in_ranges_q(ranges),
+        product__business=business,
+        transaction__isnull=True,
+    )
+
+
+def archive_watermark(*, business):
+    """
+    Fin del último mes con filas archivadas del negocio, o None si el
+    archivo no tiene filas suyas.
+    """
+    payments = (
+        ArchivedDebtPayment.objects
+        .filter(debt__transaction__business=business)
+        .aggregate(
+            latest=Max("created_at"),
+            latest_payment=Max("payment_date"),
+        )
+    )
+    latest = (
+        ArchivedTransaction.objects
+        .filter(business=business)
+        .aggregate(value=Max("created_at"))["value"],
+        ArchivedStockMovement.objects
+        .filter(product__business=business)
+        .aggregate(value=Max("created_at"))["value"],
+        payments["latest"],
+    )
+    days = [
+        django_timezone.localdate(instant)
+        for instant in latest
+        if instant is not None
+    ]
+    if payments["latest_payment"] is not None:
+        days.append(payments["latest_payment"])
+
+    if not days:
+        return None
+
+    day = max(days)
+
+    return get_month_period(year=day.year, month=day.month)["end_datetime"]
+
+
+def _set_archive_watermark(business, watermark):
+    business.archived_until = watermark
+    # Con `update()` no cambia `updated_at`, que versiona el catálogo del POS.
+    Business.objects.filter(pk=business.pk).update(archived_until=watermark)
+
+
+def refresh_archive_watermark(*, business):
+    """Recalcula `Business.archived_until` desde las tablas de archivo."""
+    _set_archive_watermark(business, archive_watermark(business=business))
+
+    return business.archived_until
+
+
+def _transaction_scopes(*, reverse) -> dict:
+    """
+    Condición SQL por modelo que selecciona las filas ligadas a las
+    transacciones `{ids}` en la tabla de origen.
+    """
+    connection = connections[router.db_for_write(Transaction)]
+    debt_table = connection.ops.quote_name(
+        (ArchivedDebt if reverse else Debt)._meta.db_table
+    )
+
+    return {
+        Transaction: "id IN ({ids})",
+        TransactionDetail: "transaction_id IN ({ids})",
+        Debt: "transaction_id IN ({ids})",
+        DebtPayment: (
+            f"debt_id IN (SELECT id FROM {debt_table} "
+            "WHERE transaction_id IN ({ids}))"
+        ),
+        StockMovement: "transaction_id IN ({ids})",
+    }
+
+
+def _move_rows(*, pairs, scopes, ids, reverse=False) -> dict[str, int]:
+    """
+    Copia con INSERT ... SELECT las filas de cada par y luego las borra
+    del origen, hijos primero. Conserva id, public_id y fechas.
+    """
+    if not ids:
+        return {}
+
+    connection = connections[router.db_for_write(Transaction)]
+    quote_name = connection.ops.quote_name
+    placeholders = ", ".join(["%s"] * len(ids))
+    moves = []
+
+    for hot_model, archive_model in pairs:
+        source, target = (
+            (archive_model, hot_model)
+            if reverse
+            else (hot_model, archive_model)
+        )
+        columns = ", ".join(
+            quote_name(field.column)
+            for field in hot_model._meta.concrete_fields
+        )
+        moves.append((
+            hot_model,
+            quote_name(source._meta.db_table),
+            quote_name(target._meta.db_table),
+            columns,
+            scopes[hot_model].replace("{ids}", placeholders),
+        ))
+
+    moved = {}
+
+    with connection.cursor() as cursor:
+        for hot_model, source, target, columns, where in moves:
+            cursor.execute(
+                f"INSERT INTO {target} ({columns}) "
+                f"SELECT {columns} FROM {source} WHERE {where}",
+                ids,
+            )
+            moved[hot_model.__name__] = max(cursor.rowcount, 0)
+
+        for hot_model, source, target, columns, where in reversed(moves):
+            cursor.execute(f"DELETE FROM {source} WHERE {where}", ids)
+
+    return moved
+
+
+def _add_counts(totals, moved):
+    for name, count in moved.items():
+        totals[name] = totals.get(name, 0) + count
+
+
+def archive_closed_periods(
+    *,
+    business,
+    older_than_months=None,
+    batch_size=500,
+    dry_run=False,
+) -> dict[str, int]:
+    """
+    Traslada a las tablas de archivo el historial liquidado de los meses
+    cerrados anteriores al horizonte.
+
+    Cada lote se procesa en su propia transacción y solo bloquea las filas
+    del lote, de modo que el tiempo de bloqueo queda acotado por
+    `batch_size` y no por el tamaño del historial.
+    """
+    cutoff = archive_cutoff(older_than_months=older_than_months)
+    ranges = closed_period_ranges(business=business, cutoff=cutoff)
+    transactions = archivable_transactions(business=business, ranges=ranges)
+    movements = archivable_stock_movements(business=business, ranges=ranges)
+
+    if dry_run:
+        return {
+            Transaction.__name__: transactions.count(),
+            StockMovement.__name__: movements.count(),
+        }
+
+    if not ranges:
+        return {}
+
+    # Cada lote queda visible al confirmarse, así que la marca avanza
+    # antes de mover filas; al terminar se ajusta a lo archivado.
+    if (
+        business.archived_until is None
+        or business.archived_until < ranges[-1][1]
+    ):
+        _set_archive_watermark(business, ranges[-1][1])
+
+    totals = {}
+    scopes = _transaction_scopes(reverse=False)
+    last_id = 0
+
+    while True:
+        with db_tx.atomic():
+            ids = list(
+                transactions
+                .filter(pk__gt=last_id)
+                .order_by("pk")
+                .select_for_update(of=("self",))
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            _add_counts(
+                totals,
+                _move_rows(pairs=ARCHIVE_MODELS, scopes=scopes, ids=ids),
+            )
+            last_id = ids[-1]
+
+    movement_pairs = ((StockMovement, ArchivedStockMovement),)
+    movement_scopes = {StockMovement: "id IN ({ids})"}
+    last_id = 0
+
+    while True:
+        with db_tx.atomic():
+            ids = list(
+                movements
+                .filter(pk__gt=last_id)
+                .order_by("pk")
+                .select_for_update(of=("self",))
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            _add_counts(
+                totals,
+                _move_rows(pairs=movement_pairs, scopes=movement_scopes, ids=ids),
+            )
+            last_id = ids[-1]
+
+    refresh_archive_watermark(business=business)
+
+    return totals
+
+
+def restore_archived_month(*, business, year, month) -> dict[str, int]:
+    """
+    Devuelve a las tablas activas el historial archivado de un mes, por
+    ejemplo al reabrir su cierre. Las transacciones se restauran completas
+    aunque parte de su actividad pertenezca a otro mes.
+    """
+    period = get_month_period(year=year, month=month)
+    in_period = Q(
+        created_at__gte=period["start_datetime"],
+        created_at__lt=period["end_datetime"],
+    )
+    transaction_ids = list(
+        ArchivedTransaction.objects
+        .filter(business=business)
+        .filter(
+            in_period
+            | Q(stock_movements__in=ArchivedStockMovement.objects.filter(in_period))
+            | Q(debt_payments__in=ArchivedDebtPayment.objects.filter(in_period))
+        )
+        .values_list("pk", flat=True)
+        .distinct()
+    )
+    movement_ids = list(
+        ArchivedStockMovement.objects
+        .filter(
+            in_period,
+            product__business=business,
+            transaction__isnull=True,
+        )
+        .values_list("pk", flat=True)
+    )
+
+    totals = {}
+    scopes = _transaction_scopes(reverse=True)
+
+    with db_tx.atomic():
+        _add_counts(
+            totals,
+            _move_rows(
+                pairs=ARCHIVE_MODELS,
+                scopes=scopes,
+                ids=transaction_ids,
+                reverse=True,
+            ),
+        )
+        _add_counts(
+            totals,
+            _move_rows(
+                pairs=((StockMovement, ArchivedStockMovement),),
+                scopes={StockMovement: "id IN ({ids})"},
+                ids=movement_ids,
+                reverse=True,
+            ),
+        )
+
+    refresh_archive_watermark(business=business)
+
+    return totals
+
+
+def hydrate_archived(archived, *, _hydrated=None):
+    """
+    Convierte una fila archivada en una instancia del modelo activo, sin
+    guardarla, para reutilizar los serializers existentes. Las relaciones
+    ya cargadas con select_related o prefetch_related se conservan.
+    """
+    if _hydrated is None:
+        _hydrated = {}
+
+    if id(archived) in _hydrated:
+        return _hydrated[id(archived)]
+
+    hot_model = HOT_MODEL_BY_ARCHIVE[type(archived)]
+    field_names = [
+        field.attname
+        for field in hot_model._meta.concrete_fields
+    ]
+    instance = hot_model.from_db(
+        archived._state.db,
+        field_names,
+        [getattr(archived, name) for name in field_names],
+    )
+    _hydrated[id(archived)] = instance
+
+    for name, related in archived._state.fields_cache.items():
+        if type(related) in HOT_MODEL_BY_ARCHIVE:
+            related = hydrate_archived(related, _hydrated=_hydrated)
+        instance._state.fields_cache[name] = related
+
+    prefetched = getattr(archived, "_prefetched_objects_cache", None)
+    if prefetched:
+        instance._prefetched_objects_cache = {
+            name: [
+                hydrate_archived(obj, _hydrated=_hydrated)
+                for obj in objects
+            ]
+            for name, objects in prefetched.items()
+        }
+
+    return instance
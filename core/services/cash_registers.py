@@ -0,0 +1,46 @@
+from django.db.models import Q, QuerySet
+
+from core.models import CashRegister
+
+
+def open_cash_register_id(*, business_id):
+    """
+    Caja abierta del negocio a la que se asocia un movimiento nuevo.
+
+    Un negocio admite una sola caja abierta, por lo que es la caja en la
+    que trabaja quien registra la operación.
+    """
+    return (
+        CashRegister.objects
+        .filter(
+            business_id=business_id,
+            status=CashRegister.STATUS_OPEN,
+        )
+        .values_list("id", flat=True)
+        .first()
+    )
+
+
+def filter_cash_register_activity(
+    queryset: QuerySet,
+    *,
+    cash_register,
+    until,
+    business_lookup="business",
+) -> QuerySet:
+    """
+    Filtra los registros que pertenecen a la sesión de una caja.
+
+    Los registros enlazados se buscan por la FK `cash_register`. Los
+    registros previos a ese enlace se siguen atribuyendo por la ventana
+    de tiempo de la sesión.
+    """
+    return queryset.filter(
+        Q(cash_register=cash_register)
+        | Q(
+            cash_register__isnull=True,
+            created_at__gte=cash_register.open_time,
+            **{business_lookup: cash_register.business_id},
+        ),
+        created_at__lte=until,
+    )
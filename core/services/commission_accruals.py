@@ -0,0 +1,226 @@
+from decimal import Decimal
+
+from django.db import transaction as db_tx
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone as django_timezone
+
+from core.models import (
+    ArchivedTransaction,
+    EmployeeCommissionAccrual,
+    Transaction,
+)
+from core.services.financial_flows import (
+    exclude_terminal_transactions,
+    is_terminal_transaction_status,
+)
+
+
+def sale_accrual_key(transaction):
+    """
+    Aporte de una transacción al libro de comisiones.
+
+    Devuelve `(business_id, employee_id, date, total_value)` para ventas
+    vigentes con empleado, o None si la transacción no suma comisión.
+    El resultado es inmutable para poder compararlo antes y después de
+    una modificación.
+    """
+    if (
+        transaction.type != "sale"
+        or transaction.employee_id is None
+        or is_terminal_transaction_status(transaction.status)
+    ):
+        return None
+
+    return (
+        transaction.business_id,
+        transaction.employee_id,
+        django_timezone.localdate(transaction.created_at),
+        transaction.total_value,
+    )
+
+
+def apply_commission_accrual(
+    *,
+    business_id,
+    employee_id,
+    day,
+    sales_count: int,
+    sales_total: Decimal,
+):
+    """
+    Suma un delta de ventas al día del empleado.
+
+    El libro solo guarda ventas: el porcentaje del plan se aplica al
+    leerlo, así que crear o editar un plan no deja filas desactualizadas.
+    El UPDATE con F() es atómico frente a ventas concurrentes; la fila
+    del día solo se crea con la primera venta.
+    """
+    accruals = EmployeeCommissionAccrual.objects.filter(
+        employee_id=employee_id,
+        date=day,
+    )
+    delta = {
+        "sales_count": F("sales_count") + sales_count,
+        "sales_total": F("sales_total") + sales_total,
+        "updated_at": django_timezone.now(),
+    }
+
+    if accruals.update(**delta):
+        return
+
+    _, created = EmployeeCommissionAccrual.objects.get_or_create(
+        employee_id=employee_id,
+        date=day,
+        defaults={
+            "business_id": business_id,
+            "sales_count": sales_count,
+            "sales_total": sales_total,
+        },
+    )
+
+    if not created:
+        # Otra venta del mismo día creó la fila entre ambas consultas.
+        accruals.update(**delta)
+
+
+@db_tx.atomic
+def sync_sale_accrual(*, before, after):
+    """
+    Traslada al libro el cambio entre dos claves de `sale_accrual_key`.
+
+    Crear una venta es `before=None`; anularla es `after=None`.
+    """
+    if before == after:
+        return
+
+    if before is not None:
+        business_id, employee_id, day, total = before
+        apply_commission_accrual(
+            business_id=business_id,
+            employee_id=employee_id,
+            day=day,
+            sales_count=-1,
+            sales_total=-total,
+        )
+
+    if after is not None:
+        business_id, employee_id, day, total = after
+        apply_commission_accrual(
+            business_id=business_id,
+            employee_id=employee_id,
+            day=day,
+            sales_count=1,
+            sales_total=total,
+        )
+
+
+def build_commission_accruals(*, business) -> list[EmployeeCommissionAccrual]:
+    """
+    Calcula desde el historial las filas del libro de un negocio. Incluye
+    las ventas archivadas para que una reconstrucción no las pierda.
+    """
+    totals = {}
+
+    for model in (Transaction, ArchivedTransaction):
+        sales = exclude_terminal_transactions(
+            model.objects.filter(
+                business=business,
+                employee__isnull=False,
+                type="sale",
+            )
+        )
+
+        for row in (
+            sales
+            .annotate(
+                day=TruncDate(
+                    "created_at",
+                    tzinfo=django_timezone.get_current_timezone(),
+                )
+            )
+            .values("employee_id", "day")
+            .annotate(
+                sales_count=Count("id"),
+                sales_total=Sum("total_value"),
+            )
+        ):
+            key = (row["employee_id"], row["day"])
+            count, total = totals.get(key, (0, Decimal("0.00")))
+            totals[key] = (
+                count + row["sales_count"],
+                total + (row["sales_total"] or Decimal("0.00")),
+            )
+
+    return [
+        EmployeeCommissionAccrual(
+            business=business,
+            employee_id=employee_id,
+            date=day,
+            sales_count=sales_count,
+            sales_total=sales_total,
+        )
+        for (employee_id, day), (sales_count, sales_total)
+        in sorted(totals.items())
+    ]
+
+
+@db_tx.atomic
+def rebuild_commission_accruals(*, business) -> int:
+    accruals = build_commission_accruals(business=business)
+
+    EmployeeCommissionAccrual.objects.filter(
+        business=business,
+    ).delete()
+    EmployeeCommissionAccrual.objects.bulk_create(
+        accruals,
+        batch_size=1000,
+    )
+
+    return len(accruals)
+
+
+def find_commission_accrual_drift(*, business) -> list[dict]:
+    """
+    Compara el libro con el historial sin modificar datos.
+
+    Devuelve una entrada por empleado y día cuyo conteo o total difiere.
+    """
+    expected = {
+        (accrual.employee_id, accrual.date): accrual
+        for accrual in build_commission_accruals(business=business)
+    }
+    stored = {
+        (accrual.employee_id, accrual.date): accrual
+        for accrual in EmployeeCommissionAccrual.objects.filter(
+            business=business,
+        )
+    }
+
+    drift = []
+
+    for key in sorted(expected.keys() | stored.keys()):
+        expected_row = expected.get(key)
+        stored_row = stored.get(key)
+        expected_values = (
+            (expected_row.sales_count, expected_row.sales_total)
+            if expected_row is not None
+            else (0, Decimal("0.00"))
+        )
+        stored_values = (
+            (stored_row.sales_count, stored_row.sales_total)
+            if stored_row is not None
+            else (0, Decimal("0.00"))
+        )
+
+        if expected_values != stored_values:
+            drift.append({
+                "employee_id": key[0],
+                "date": key[1],
+                "expected_sales_count": expected_values[0],
+                "expected_sales_total": expected_values[1],
+                "stored_sales_count": stored_values[0],
+                "stored_sales_total": stored_values[1],
+            })
+
+    return drift
@@ -0,0 +1,490 @@
+from datetime import date
+from decimal import Decimal
+
+from django.db import transaction as db_tx
+from django.db.models import Q, Sum
+
+from core.models import (
+    CashMovement,
+    CommissionSettlement,
+    Employee,
+    EmployeeCommissionAccrual,
+    EmployeeCommissionPlan,
+)
+from core.services.customer_supplier_reports import decimal_or_zero
+
+
+def applicable_commission_plans(
+    *,
+    business,
+    period_start: date,
+    period_end: date,
+) -> dict[int, EmployeeCommissionPlan]:
+    """
+    Plan vigente por empleado para el período, resuelto en una sola
+    consulta. Aplica la misma regla que la vista previa individual:
+    el plan activo más reciente que se solape con el período.
+    """
+    plans = (
+        EmployeeCommissionPlan.objects
+        .filter(
+            employee__business=business,
+            is_active=True,
+            valid_from__lte=period_end,
+        )
+        .filter(
+            Q(valid_until__isnull=True)
+            | Q(valid_until__gte=period_start)
+        )
+        .order_by(
+            "employee_id",
+            "-valid_from",
+            "-created_at",
+        )
+    )
+
+    plans_by_employee = {}
+
+    for plan in plans:
+        plans_by_employee.setdefault(
+            plan.employee_id,
+            plan,
+        )
+
+    return plans_by_employee
+
+
+def sales_totals_by_employee(
+    *,
+    business,
+    period_start: date,
+    period_end: date,
+    employee=None,
+) -> dict[int, dict]:
+    """
+    Ventas por empleado leídas del libro diario de comisiones, de modo
+    que el costo depende de los días del período y no del volumen de
+    ventas.
+    """
+    accruals = EmployeeCommissionAccrual.objects.filter(
+        business=business,
+        date__gte=period_start,
+        date__lte=period_end,
+    )
+
+    if employee is not None:
+        accruals = accruals.filter(employee=employee)
+
+    rows = (
+        accruals
+        .values("employee_id")
+        .annotate(
+            sales_count=Sum("sales_count"),
+            sales_total=Sum("sales_total"),
+        )
+        .order_by()
+    )
+
+    return {
+        row["employee_id"]: {
+            "sales_count": row["sales_count"] or 0,
+            "sales_total": decimal_or_zero(
+                row["sales_total"]
+            ),
+        }
+        for row in rows
+    }
+
+
+def employee_sales_totals(
+    *,
+    employee,
+    period_start: date,
+    period_end: date,
+) -> dict:
+    return sales_totals_by_employee(
+        business=employee.business,
+        period_start=period_start,
+        period_end=period_end,
+        employee=employee,
+    ).get(
+        employee.pk,
+        {
+            "sales_count": 0,
+            "sales_total": Decimal("0.00"),
+        },
+    )
+
+
+def advance_totals_by_employee(
+    *,
+    business,
+    period_start: date,
+    period_end: date,
+) -> dict[int, dict]:
+    """
+    Equivalente agrupado de calculate_employee_advance_summary para
+    todos los empleados del negocio.
+    """
+    rows = (
+        CashMovement.objects
+        .filter(
+            employee__business=business,
+            created_at__date__gte=period_start,
+            created_at__date__lte=period_end,
+            movement_type__in=[
+                CashMovement.TYPE_EMPLOYEE_ADVANCE,
+                CashMovement.TYPE_EMPLOYEE_REPAYMENT,
+            ],
+        )
+        .values("employee_id")
+        .annotate(
+            employee_advances=Sum(
+                "amount",
+                filter=Q(
+                    movement_type=(
+                        CashMovement.TYPE_EMPLOYEE_ADVANCE
+                    ),
+                ),
+            ),
+            employee_repayments=Sum(
+                "amount",
+                filter=Q(
+                    movement_type=(
+                        CashMovement.TYPE_EMPLOYEE_REPAYMENT
+                    ),
+                ),
+            ),
+        )
+        .order_by()
+    )
+
+    totals = {}
+
+    for row in rows:
+        employee_advances = decimal_or_zero(
+            row["employee_advances"]
+        )
+        employee_repayments = decimal_or_zero(
+            row["employee_repayments"]
+        )
+
+        totals[row["employee_id"]] = {
+            "employee_advances": employee_advances,
+            "employee_repayments": employee_repayments,
+            "advance_balance": max(
+                employee_advances - employee_repayments,
+                Decimal("0.00"),
+            ).quantize(Decimal("0.01")),
+        }
+
+    return totals
+
+
+EMPTY_ADVANCE_SUMMARY = {
+    "employee_advances": Decimal("0.00"),
+    "employee_repayments": Decimal("0.00"),
+    "advance_balance": Decimal("0.00"),
+}
+
+
+def calculate_commission_amounts(
+    *,
+    sales_total: Decimal,
+    percentage: Decimal,
+    advance_balance: Decimal,
+) -> dict:
+    commission_total = (
+        sales_total
+        * percentage
+        / Decimal("100.00")
+    ).quantize(Decimal("0.01"))
+
+    return {
+        "commission_total": commission_total,
+        "net_commission_payable": max(
+            commission_total - advance_balance,
+            Decimal("0.00"),
+        ).quantize(Decimal("0.01")),
+        "remaining_advance_balance": max(
+            advance_balance - commission_total,
+            Decimal("0.00"),
+        ).quantize(Decimal("0.01")),
+    }
+
+
+def build_commission_roster(
+    *,
+    business,
+    date_from: date,
+    date_to: date,
+) -> dict:
+    """
+    Vista previa de comisiones de todos los empleados del negocio.
+
+    Usa un número constante de consultas sin importar la cantidad de
+    empleados: empleados, planes vigentes, ventas agrupadas y
+    adelantos agrupados.
+    """
+    employees = list(
+        Employee.objects
+        .filter(business=business)
+        .order_by("full_name", "pk")
+    )
+
+    plans = applicable_commission_plans(
+        business=business,
+        period_start=date_from,
+        period_end=date_to,
+    )
+    sales = sales_totals_by_employee(
+        business=business,
+        period_start=date_from,
+        period_end=date_to,
+    )
+    advances = advance_totals_by_employee(
+        business=business,
+        period_start=date_from,
+        period_end=date_to,
+    )
+
+    results = []
+    employees_without_plan = []
+    totals = {
+        "sales_total": Decimal("0.00"),
+        "commission_total": Decimal("0.00"),
+        "net_commission_payable": Decimal("0.00"),
+    }
+
+    for employee in employees:
+        plan = plans.get(employee.pk)
+
+        if plan is None:
+            employees_without_plan.append({
+                "public_id": str(employee.public_id),
+                "full_name": employee.full_name,
+            })
+            continue
+
+        employee_sales = sales.get(
+            employee.pk,
+            {
+                "sales_count": 0,
+                "sales_total": Decimal("0.00"),
+            },
+        )
+        advance_summary = advances.get(
+            employee.pk,
+            EMPTY_ADVANCE_SUMMARY,
+        )
+        amounts = calculate_commission_amounts(
+            sales_total=employee_sales["sales_total"],
+            percentage=plan.percentage,
+            advance_balance=advance_summary["advance_balance"],
+        )
+
+        totals["sales_total"] += employee_sales["sales_total"]
+        totals["commission_total"] += amounts["commission_total"]
+        totals["net_commission_payable"] += (
+            amounts["net_commission_payable"]
+        )
+
+        results.append({
+            "employee": {
+                "public_id": str(employee.public_id),
+                "full_name": employee.full_name,
+            },
+            "sales_count": employee_sales["sales_count"],
+            "sales_total": str(employee_sales["sales_total"]),
+            "commission_percentage": str(
+                plan.percentage.quantize(Decimal("0.01"))
+            ),
+            "commission_total": str(
+                amounts["commission_total"]
+            ),
+            "employee_advances": str(
+                advance_summary["employee_advances"]
+            ),
+            "employee_repayments": str(
+                advance_summary["employee_repayments"]
+            ),
+            "advance_balance": str(
+                advance_summary["advance_balance"]
+            ),
+            "net_commission_payable": str(
+                amounts["net_commission_payable"]
+            ),
+            "remaining_advance_balance": str(
+                amounts["remaining_advance_balance"]
+            ),
+            "commission_plan_public_id": str(plan.public_id),
+        })
+
+    return {
+        "business": {
+            "public_id": str(business.public_id),
+            "name": business.business_name,
+            "currency": business.currency,
+        },
+        "period": {
+            "date_from": date_from.isoformat(),
+            "date_to": date_to.isoformat(),
+        },
+        "totals": {
+            "employees_count": len(results),
+            "sales_total": str(
+                totals["sales_total"].quantize(Decimal("0.01"))
+            ),
+            "commission_total": str(
+                totals["commission_total"].quantize(Decimal("0.01"))
+            ),
+            "net_commission_payable": str(
+                totals["net_commission_payable"].quantize(
+                    Decimal("0.01")
+                )
+            ),
+        },
+        "results": results,
+        "employees_without_plan": employees_without_plan,
+    }
+
+
+SKIP_ALREADY_SETTLED = "already_settled"
+SKIP_NO_COMMISSION_PLAN = "no_commission_plan"
+
+SKIP_REASON_MESSAGES = {
+    SKIP_ALREADY_SETTLED: (
+        "Ya existe una liquidación para este empleado y período."
+    ),
+    SKIP_NO_COMMISSION_PLAN: (
+        "El empleado no tiene un plan de comisión vigente para "
+        "este período."
+    ),
+}
+
+
+@db_tx.atomic
+def settle_business_commissions(
+    *,
+    business,
+    period_start: date,
+    period_end: date,
+    created_by,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Liquida en una sola pasada atómica a todos los empleados elegibles
+    del negocio para el período.
+
+    Un empleado se omite si ya tiene una liquidación para el mismo
+    período o si no tiene un plan de comisión vigente. Los totales se
+    calculan con las mismas reglas que la liquidación individual.
+    """
+    employees = list(
+        Employee.objects
+        .select_related("business")
+        .filter(business=business)
+        .order_by("full_name", "pk")
+    )
+
+    already_settled = set(
+        CommissionSettlement.objects
+        .filter(
+            employee__business=business,
+            period_start=period_start,
+            period_end=period_end,
+        )
+        .values_list("employee_id", flat=True)
+    )
+
+    plans = applicable_commission_plans(
+        business=business,
+        period_start=period_start,
+        period_end=period_end,
+    )
+    sales = sales_totals_by_employee(
+        business=business,
+        period_start=period_start,
+        period_end=period_end,
+    )
+    advances = advance_totals_by_employee(
+        business=business,
+        period_start=period_start,
+        period_end=period_end,
+    )
+
+    settlements = []
+    skipped = []
+
+    for employee in employees:
+        if employee.pk in already_settled:
+            reason = SKIP_ALREADY_SETTLED
+        elif employee.pk not in plans:
+            reason = SKIP_NO_COMMISSION_PLAN
+        else:
+            reason = None
+
+        if reason is not None:
+            skipped.append({
+                "employee": employee,
+                "reason": reason,
+                "detail": SKIP_REASON_MESSAGES[reason],
+            })
+            continue
+
+        plan = plans[employee.pk]
+        employee_sales = sales.get(
+            employee.pk,
+            {
+                "sales_count": 0,
+                "sales_total": Decimal("0.00"),
+            },
+        )
+        advance_summary = advances.get(
+            employee.pk,
+            EMPTY_ADVANCE_SUMMARY,
+        )
+        amounts = calculate_commission_amounts(
+            sales_total=employee_sales["sales_total"],
+            percentage=plan.percentage,
+            advance_balance=advance_summary["advance_balance"],
+        )
+
+        settlements.append(
+            CommissionSettlement(
+                employee=employee,
+                period_start=period_start,
+                period_end=period_end,
+                sales_count=employee_sales["sales_count"],
+                sales_total=employee_sales["sales_total"],
+                commission_percentage=plan.percentage,
+                commission_total=amounts["commission_total"],
+                employee_advances=(
+                    advance_summary["employee_advances"]
+                ),
+                employee_repayments=(
+                    advance_summary["employee_repayments"]
+                ),
+                advance_balance=(
+                    advance_summary["advance_balance"]
+                ),
+                net_commission_payable=(
+                    amounts["net_commission_payable"]
+                ),
+                remaining_advance_balance=(
+                    amounts["remaining_advance_balance"]
+                ),
+                status=CommissionSettlement.STATUS_PENDING,
+                created_by=created_by,
+            )
+        )
+
+    if settlements and not dry_run:
+        CommissionSettlement.objects.bulk_create(
+            settlements
+        )
+
+    return {
+        "created": settlements,
+        "skipped": skipped,
+    }
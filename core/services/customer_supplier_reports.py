@@ -2,7 +2,6 @@ from datetime import date, datetime, time, timedelta
 from decimal import Decimal
 
 from django.db.models import (
-    Avg,
     Count,
     Max,
     Sum,
@@ -13,6 +12,7 @@ from core.models import Transaction
 from core.services.financial_flows import (
     exclude_terminal_transactions,
 )
+from core.services.report_sources import report_sources
 
 
 
@@ -60,6 +60,86 @@ def get_report_datetime_range(
     return start_datetime, end_datetime
 
 
+def _group_by_party(
+    querysets,
+    *,
+    fields: tuple,
+    name_field: str,
+) -> list[dict]:
+    """
+    Agrupa las transacciones de cada fuente por las columnas de la
+    contraparte y une los grupos: conteo y total se suman, la última
+    fecha es la mayor. Orden: total descendente y nombre.
+    """
+    grouped = {}
+
+    for queryset in querysets:
+        for row in (
+            queryset
+            .values(*fields)
+            .annotate(
+                transactions_count=Count("id"),
+                total_amount=Sum("total_value"),
+                last_transaction_at=Max("created_at"),
+            )
+            .order_by()
+        ):
+            key = tuple(row[field] for field in fields)
+            merged = grouped.get(key)
+
+            if merged is None:
+                grouped[key] = {
+                    **row,
+                    "total_amount": decimal_or_zero(
+                        row["total_amount"]
+                    ),
+                }
+                continue
+
+            merged["transactions_count"] += row["transactions_count"]
+            merged["total_amount"] += decimal_or_zero(
+                row["total_amount"]
+            )
+            merged["last_transaction_at"] = max(
+                merged["last_transaction_at"],
+                row["last_transaction_at"],
+            )
+
+    return sorted(
+        grouped.values(),
+        key=lambda row: (
+            -row["total_amount"],
+            row[name_field],
+        ),
+    )
+
+
+def _average(total: Decimal, count: int) -> Decimal:
+    return decimal_or_zero(
+        total / count
+        if count
+        else None
+    )
+
+
+def _group_totals(rows) -> dict:
+    transactions_count = sum(
+        row["transactions_count"]
+        for row in rows
+    )
+    total_amount = sum(
+        (row["total_amount"] for row in rows),
+        Decimal("0.00"),
+    )
+
+    return {
+        "parties_count": len(rows),
+        "transactions_count": transactions_count,
+        "total_amount": total_amount,
+        "average": _average(total_amount, transactions_count),
+    }
+
+
 def build_customers_summary(
     *,
     business,
@@ -74,43 +154,39 @@ def build_customers_summary(
         )
     )
 
-    transactions = (
-        Transaction.objects
-        .filter(
+    transactions = [
+        exclude_terminal_transactions(
+            models[Transaction].objects.filter(
+                business=business,
+                type="sale",
+                customer__isnull=False,
+                created_at__gte=start_datetime,
+                created_at__lt=end_datetime,
+            )
+        )
+        for models in report_sources(
             business=business,
-            type="sale",
-            customer__isnull=False,
-            created_at__gte=start_datetime,
-            created_at__lt=end_datetime,
+            start=start_datetime,
         )
-    )
-    transactions = exclude_terminal_transactions(
-        transactions
-    )
+    ]
 
     if customer is not None:
-        transactions = transactions.filter(
-            customer=customer
-        )
+        transactions = [
+            queryset.filter(
+                customer=customer
+            )
+            for queryset in transactions
+        ]
 
-    grouped_customers = (
-        transactions
-        .values(
+    grouped_customers = _group_by_party(
+        transactions,
+        fields=(
             "customer__public_id",
             "customer__full_name",
             "customer__phone",
             "customer__email",
-        )
-        .annotate(
-            transactions_count=Count("id"),
-            total_amount=Sum("total_value"),
-            average_ticket=Avg("total_value"),
-            last_transaction_at=Max("created_at"),
-        )
-        .order_by(
-            "-total_amount",
-            "customer__full_name",
-        )
+        ),
+        name_field="customer__full_name",
     )
 
     results = []
@@ -140,8 +216,9 @@ def build_customers_summary(
                 )
             ),
             "average_ticket": str(
-                decimal_or_zero(
-                    row["average_ticket"]
+                _average(
+                    row["total_amount"],
+                    row["transactions_count"],
                 )
             ),
             "last_transaction_at": (
@@ -149,15 +226,7 @@ def build_customers_summary(
             ),
         })
 
-    totals = transactions.aggregate(
-        customers_count=Count(
-            "customer",
-            distinct=True,
-        ),
-        transactions_count=Count("id"),
-        total_amount=Sum("total_value"),
-        average_ticket=Avg("total_value"),
-    )
+    totals = _group_totals(grouped_customers)
 
     return {
         "business": {
@@ -173,7 +242,7 @@ def build_customers_summary(
         },
         "totals": {
             "customers_count": (
-                totals["customers_count"]
+                totals["parties_count"]
             ),
             "transactions_count": (
                 totals["transactions_count"]
@@ -184,9 +253,7 @@ def build_customers_summary(
                 )
             ),
             "average_ticket": str(
-                decimal_or_zero(
-                    totals["average_ticket"]
-                )
+                totals["average"]
             ),
         },
         "results": results,
@@ -207,43 +274,39 @@ def build_suppliers_summary(
         )
     )
 
-    transactions = (
-        Transaction.objects
-        .filter(
+    transactions = [
+        exclude_terminal_transactions(
+            models[Transaction].objects.filter(
+                business=business,
+                type="purchase",
+                supplier__isnull=False,
+                created_at__gte=start_datetime,
+                created_at__lt=end_datetime,
+            )
+        )
+        for models in report_sources(
             business=business,
-            type="purchase",
-            supplier__isnull=False,
-            created_at__gte=start_datetime,
-            created_at__lt=end_datetime,
+            start=start_datetime,
         )
-    )
-    transactions = exclude_terminal_transactions(
-        transactions
-    )
+    ]
 
     if supplier is not None:
-        transactions = transactions.filter(
-            supplier=supplier
-        )
+        transactions = [
+            queryset.filter(
+                supplier=supplier
+            )
+            for queryset in transactions
+        ]
 
-    grouped_suppliers = (
-        transactions
-        .values(
+    grouped_suppliers = _group_by_party(
+        transactions,
+        fields=(
             "supplier__public_id",
             "supplier__name",
             "supplier__phone",
             "supplier__email",
-        )
-        .annotate(
-            transactions_count=Count("id"),
-            total_amount=Sum("total_value"),
-            average_purchase=Avg("total_value"),
-            last_transaction_at=Max("created_at"),
-        )
-        .order_by(
-            "-total_amount",
-            "supplier__name",
-        )
+        ),
+        name_field="supplier__name",
     )
 
     results = []
@@ -273,8 +336,9 @@ def build_suppliers_summary(
                 )
             ),
             "average_purchase": str(
-                decimal_or_zero(
-                    row["average_purchase"]
+                _average(
+                    row["total_amount"],
+                    row["transactions_count"],
                 )
             ),
             "last_transaction_at": (
@@ -282,15 +346,7 @@ def build_suppliers_summary(
             ),
         })
 
-    totals = transactions.aggregate(
-        suppliers_count=Count(
-            "supplier",
-            distinct=True,
-        ),
-        transactions_count=Count("id"),
-        total_amount=Sum("total_value"),
-        average_purchase=Avg("total_value"),
-    )
+    totals = _group_totals(grouped_suppliers)
 
     return {
         "business": {
@@ -306,7 +362,7 @@ def build_suppliers_summary(
         },
         "totals": {
             "suppliers_count": (
-                totals["suppliers_count"]
+                totals["parties_count"]
             ),
             "transactions_count": (
                 totals["transactions_count"]
@@ -317,9 +373,7 @@ def build_suppliers_summary(
                 )
             ),
             "average_purchase": str(
-                decimal_or_zero(
-                    totals["average_purchase"]
-                )
+                totals["average"]
             ),
         },
         "results": results,
@@ -1,6 +1,8 @@
 from datetime import date
 from decimal import Decimal
+from functools import partial
 
+from django.conf import settings
 from django.db.models import Count, DecimalField, F, Q, Sum, Value
 from django.db.models.functions import Coalesce
 
@@ -21,6 +23,11 @@ from core.services.financial_flows import (
     exclude_terminal_transactions,
     recognized_debt_payments,
 )
+from core.services.parallel_queries import run_query_groups
+from core.services.report_sources import (
+    aggregate_sources,
+    report_sources,
+)
 
 
 MONEY_FIELD = DecimalField(max_digits=12, decimal_places=2)
@@ -40,15 +47,27 @@ def build_dashboard_overview(
         )
     )
 
-    transactions = exclude_terminal_transactions(
-        Transaction.objects.filter(
-            business=business,
-            created_at__gte=start_datetime,
-            created_at__lt=end_datetime,
-        )
+    # Los saldos se acumulan desde el inicio, pero lo archivado está
+    # saldado antes de la marca: no cambia el saldo de un rango posterior.
+    sources = report_sources(
+        business=business,
+        start=start_datetime,
     )
 
-    transaction_totals = transactions.aggregate(
+    transactions = [
+        exclude_terminal_transactions(
+            models[Transaction].objects.filter(
+                business=business,
+                created_at__gte=start_datetime,
+                created_at__lt=end_datetime,
+            )
+        )
+        for models in sources
+    ]
+
+    transaction_totals_query = partial(
+        aggregate_sources,
+        transactions,
         sales_count=Count(
             "id",
             filter=Q(type="sale"),
@@ -75,89 +94,88 @@ def build_dashboard_overview(
         ),
     )
 
-    direct_payments = direct_payment_transactions(transactions)
-    direct_payment_totals = direct_payments.aggregate(
+    direct_payment_totals_query = partial(
+        aggregate_sources,
+        [
+            direct_payment_transactions(queryset)
+            for queryset in transactions
+        ],
         sales=Sum("total_value", filter=Q(type="sale")),
         purchases=Sum("total_value", filter=Q(type="purchase")),
         expenses=Sum("total_value", filter=Q(type="expense")),
     )
 
-    debt_payments = recognized_debt_payments(
-        DebtPayment.objects.filter(
-            debt__transaction__business=business,
-            payment_date__gte=date_from,
-            payment_date__lte=date_to,
-        )
-    )
-    debt_payment_totals = debt_payments.aggregate(
+    debt_payment_totals_query = partial(
+        aggregate_sources,
+        [
+            recognized_debt_payments(
+                models[DebtPayment].objects.filter(
+                    debt__transaction__business=business,
+                    payment_date__gte=date_from,
+                    payment_date__lte=date_to,
+                )
+            )
+            for models in sources
+        ],
         count=Count("id"),
         received=Sum("amount", filter=Q(debt__transaction__type="sale")),
         made=Sum("amount", filter=Q(debt__transaction__type="purchase")),
     )
 
-    valid_debts = exclude_terminal_transactions(
-        Debt.objects.filter(
-            transaction__business=business,
-            transaction__created_at__lt=end_datetime,
-        ),
-        status_lookup="transaction__status__name",
-    )
-    debts_at_end = valid_debts.annotate(
-        paid_until_end=Coalesce(
-            Sum("payments__amount", filter=Q(payments__payment_date__lte=date_to)),
-            Value(Decimal("0.00")),
-            output_field=MONEY_FIELD,
+    valid_debts = [
+        exclude_terminal_transactions(
+            models[Debt].objects.filter(
+                transaction__business=business,
+                transaction__created_at__lt=end_datetime,
+            ),
+            status_lookup="transaction__status__name",
         )
-    )
+        for models in sources
+    ]
 
     def debt_position(transaction_type):
-        directional = (
-            valid_debts.filter(transaction__type=transaction_type)
-            if transaction_type is not None
-            else valid_debts.exclude(transaction__type__in=("sale", "purchase"))
-        )
-        queryset = debts_at_end.filter(pk__in=directional.values("pk"))
-        original = directional.aggregate(
-            total=Sum("total_amount")
+        directional = [
+            (
+                queryset.filter(transaction__type=transaction_type)
+                if transaction_type is not None
+                else queryset.exclude(transaction__type__in=("sale", "purchase"))
+            )
+            for queryset in valid_debts
+        ]
+        original = aggregate_sources(
+            directional,
+            total=Sum("total_amount"),
+        )["total"]
+        paid = aggregate_sources(
+            directional,
+            total=Sum(
+                "payments__amount",
+                filter=Q(payments__payment_date__lte=date_to),
+            ),
         )["total"]
-        paid = DebtPayment.objects.filter(
-            debt__in=directional,
-            payment_date__lte=date_to,
-        ).aggregate(total=Sum("amount"))["total"]
         outstanding = max(
             decimal_or_zero(original) - decimal_or_zero(paid),
             Decimal("0.00"),
         ).quantize(Decimal("0.01"))
+        pending_count = sum(
+            queryset
+            .annotate(
+                paid_until_end=Coalesce(
+                    Sum("payments__amount", filter=Q(payments__payment_date__lte=date_to)),
+                    Value(Decimal("0.00")),
+                    output_field=MONEY_FIELD,
+                )
+            )
+            .filter(paid_until_end__lt=F("total_amount"))
+            .count()
+            for queryset in directional
+        )
         return {
             "outstanding": outstanding,
-            "pending_count": queryset.filter(paid_until_end__lt=F("total_amount")).count(),
+            "pending_count": pending_count,
         }
 
-    receivables = debt_position("sale")
-    payables = debt_position("purchase")
-    unclassified_debts = debt_position(None)
-    outstanding_debt = (
-        receivables["outstanding"]
-        + payables["outstanding"]
-        + unclassified_debts["outstanding"]
-    ).quantize(Decimal("0.01"))
-    pending_debts_count = (
-        receivables["pending_count"]
-        + payables["pending_count"]
-        + unclassified_debts["pending_count"]
-    )
-
-    direct_received = decimal_or_zero(direct_payment_totals["sales"])
-    direct_made = (
-        decimal_or_zero(direct_payment_totals["purchases"])
-        + decimal_or_zero(direct_payment_totals["expenses"])
-    ).quantize(Decimal("0.01"))
-    debt_received = decimal_or_zero(debt_payment_totals["received"])
-    debt_made = decimal_or_zero(debt_payment_totals["made"])
-    payments_received = (direct_received + debt_received).quantize(Decimal("0.01"))
-    payments_made = (direct_made + debt_made).quantize(Decimal("0.01"))
-
-    closed_cash_registers = (
+    cash_totals_query = partial(
         CashRegister.objects
         .filter(
             business=business,
@@ -165,42 +183,36 @@ def build_dashboard_overview(
             close_time__gte=start_datetime,
             close_time__lt=end_datetime,
         )
+        .aggregate,
+        closed_count=Count("id"),
+        expected_total=Sum(
+            "expected_closing_balance"
+        ),
+        counted_total=Sum(
+            "closing_balance"
+        ),
+        difference_total=Sum(
+            "difference"
+        ),
     )
 
-    cash_totals = (
-        closed_cash_registers.aggregate(
-            closed_count=Count("id"),
-            expected_total=Sum(
-                "expected_closing_balance"
-            ),
-            counted_total=Sum(
-                "closing_balance"
-            ),
-            difference_total=Sum(
-                "difference"
-            ),
-        )
-    )
-
-    open_cash_register = (
+    open_cash_register_query = (
         CashRegister.objects
         .filter(
             business=business,
             status=CashRegister.STATUS_OPEN,
         )
-        .exists()
+        .exists
     )
 
-    commissions = (
+    commission_totals_query = partial(
         CommissionSettlement.objects
         .filter(
             employee__business=business,
             period_start__gte=date_from,
             period_end__lte=date_to,
         )
-    )
-
-    commission_totals = commissions.aggregate(
+        .aggregate,
         gross_total=Sum(
             "commission_total"
         ),
@@ -227,24 +239,76 @@ def build_dashboard_overview(
         ),
     )
 
-    inventory = (
+    inventory_query = partial(
         Product.objects
         .filter(business=business)
-        .aggregate(
-            current_units=Sum("stock"),
-            low_stock_count=Count(
-                "id",
-                filter=Q(
-                    stock__lte=low_stock_threshold
-                ),
-            ),
-            out_of_stock_count=Count(
-                "id",
-                filter=Q(stock=0),
+        .aggregate,
+        current_units=Sum("stock"),
+        low_stock_count=Count(
+            "id",
+            filter=Q(
+                stock__lte=low_stock_threshold
             ),
-        )
+        ),
+        out_of_stock_count=Count(
+            "id",
+            filter=Q(stock=0),
+        ),
+    )
+
+    # Grupos independientes; con DASHBOARD_QUERY_PARALLELISM > 1 corren
+    # a la vez sobre la misma instantánea.
+    results = run_query_groups(
+        {
+            "transaction_totals": transaction_totals_query,
+            "direct_payment_totals": direct_payment_totals_query,
+            "debt_payment_totals": debt_payment_totals_query,
+            "receivables": partial(debt_position, "sale"),
+            "payables": partial(debt_position, "purchase"),
+            "unclassified_debts": partial(debt_position, None),
+            "cash_totals": cash_totals_query,
+            "open_cash_register": open_cash_register_query,
+            "commission_totals": commission_totals_query,
+            "inventory": inventory_query,
+        },
+        parallelism=settings.DASHBOARD_QUERY_PARALLELISM,
+        # La instantánea se toma donde se leen los datos: en la réplica si
+        # la petición puede usarla.
+        model=Transaction,
+    )
+
+    transaction_totals = results["transaction_totals"]
+    direct_payment_totals = results["direct_payment_totals"]
+    debt_payment_totals = results["debt_payment_totals"]
+    receivables = results["receivables"]
+    payables = results["payables"]
+    unclassified_debts = results["unclassified_debts"]
+    cash_totals = results["cash_totals"]
+    open_cash_register = results["open_cash_register"]
+    commission_totals = results["commission_totals"]
+    inventory = results["inventory"]
+
+    outstanding_debt = (
+        receivables["outstanding"]
+        + payables["outstanding"]
+        + unclassified_debts["outstanding"]
+    ).quantize(Decimal("0.01"))
+    pending_debts_count = (
+        receivables["pending_count"]
+        + payables["pending_count"]
+        + unclassified_debts["pending_count"]
     )
 
+    direct_received = decimal_or_zero(direct_payment_totals["sales"])
+    direct_made = (
+        decimal_or_zero(direct_payment_totals["purchases"])
+        + decimal_or_zero(direct_payment_totals["expenses"])
+    ).quantize(Decimal("0.01"))
+    debt_received = decimal_or_zero(debt_payment_totals["received"])
+    debt_made = decimal_or_zero(debt_payment_totals["made"])
+    payments_received = (direct_received + debt_received).quantize(Decimal("0.01"))
+    payments_made = (direct_made + debt_made).quantize(Decimal("0.01"))
+
     current_inventory_units = (
         int(inventory["current_units"] or 0)
     )
@@ -10,6 +10,7 @@ from core.models import (
     PaymentMethod,
     Transaction,
 )
+from core.services.cash_registers import open_cash_register_id
 from core.services.financial_flows import (
     is_terminal_transaction_status,
 )
@@ -185,6 +186,9 @@ def register_debt_payment(
         payment_date=payment_date,
         payment_method=payment_method,
         transaction=transaction,
+        cash_register_id=open_cash_register_id(
+            business_id=transaction.business_id,
+        ),
         created_by=actor,
     )
 
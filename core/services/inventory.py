@@ -1,7 +1,39 @@
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, router
 from django.db import transaction as db_tx
+from django.utils import timezone as django_timezone
 from rest_framework.exceptions import ValidationError
 
-from core.models import Product, StockMovement
+from core.models import EntityStatus, Product, StockMovement
+
+
+STOCK_ENGINE_LOCKING = "locking"
+STOCK_ENGINE_CONDITIONAL = "conditional"
+
+STOCK_ENGINES = (
+    STOCK_ENGINE_LOCKING,
+    STOCK_ENGINE_CONDITIONAL,
+)
+
+INVALID_INVENTORY_PRODUCTS_MESSAGE = (
+    "Uno o más productos no son válidos, no pertenecen "
+    "al negocio o no se encuentran Activos."
+)
+
+
+def get_stock_engine():
+    engine = getattr(
+        settings,
+        "INVENTORY_STOCK_ENGINE",
+        STOCK_ENGINE_LOCKING,
+    )
+    if engine not in STOCK_ENGINES:
+        raise ImproperlyConfigured(
+            f"INVENTORY_STOCK_ENGINE debe ser uno de: "
+            f"{', '.join(STOCK_ENGINES)}."
+        )
+    return engine
 
 
 def lock_products_for_inventory(
@@ -22,10 +54,7 @@ def lock_products_for_inventory(
     locked_products = list(queryset.order_by("pk"))
     if len(locked_products) != len(ordered_ids):
         raise ValidationError({
-            "details": (
-                "Uno o más productos no son válidos, no pertenecen "
-                "al negocio o no se encuentran Activos."
-            ),
+            "details": INVALID_INVENTORY_PRODUCTS_MESSAGE,
         })
 
     return {
@@ -57,7 +86,7 @@ def record_locked_stock_movement(
         })
 
     product.stock = new_stock
-    product.save(update_fields=["stock"])
+    product.save(update_fields=["stock", "updated_at"])
 
     return StockMovement.objects.create(
         product=product,
@@ -99,3 +128,162 @@ def record_stock_movement(
         note=note,
         insufficient_stock_message=insufficient_stock_message,
     )
+
+
+def apply_conditional_stock_delta(
+    *,
+    product_id,
+    business_id,
+    quantity,
+    require_active=False,
+):
+    """
+    Aplica un delta de stock con un único UPDATE condicionado y devuelve
+    el stock nuevo.
+
+    No se lee ni se bloquea la fila antes: el WHERE rechaza el delta si
+    dejaría stock negativo, así que el bloqueo dura solo desde esta
+    sentencia hasta el commit. Devuelve None si ninguna fila coincide.
+    """
+    connection = connections[router.db_for_write(Product)]
+    quote_name = connection.ops.quote_name
+
+    sql = (
+        f"UPDATE {quote_name(Product._meta.db_table)} "
+        "SET stock = stock + %s, updated_at = %s "
+        "WHERE id = %s AND business_id = %s AND stock + %s >= 0"
+    )
+    params = [
+        quantity,
+        django_timezone.now(),
+        product_id,
+        business_id,
+        quantity,
+    ]
+
+    if require_active:
+        sql += (
+            " AND status_id IN ("
+            f"SELECT id FROM {quote_name(EntityStatus._meta.db_table)} "
+            "WHERE UPPER(name) = UPPER(%s))"
+        )
+        params.append("Activo")
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"{sql} RETURNING stock", params)
+        row = cursor.fetchone()
+
+    return row[0] if row is not None else None
+
+
+def record_conditional_stock_movement(
+    *,
+    product,
+    quantity,
+    movement_type,
+    created_by,
+    transaction=None,
+    transaction_detail=None,
+    note="",
+    insufficient_stock_message=None,
+    require_active=False,
+):
+    """Aplica un delta de stock sin bloqueo previo y registra su movimiento."""
+    new_stock = apply_conditional_stock_delta(
+        product_id=product.pk,
+        business_id=product.business_id,
+        quantity=quantity,
+        require_active=require_active,
+    )
+
+    if new_stock is None:
+        valid_products = Product.objects.filter(
+            pk=product.pk,
+            business_id=product.business_id,
+        )
+        if require_active:
+            valid_products = valid_products.filter(
+                status__name__iexact="Activo",
+            )
+        if not valid_products.exists():
+            raise ValidationError({
+                "details": INVALID_INVENTORY_PRODUCTS_MESSAGE,
+            })
+
+        raise ValidationError({
+            "details": (
+                insufficient_stock_message
+                or f"Stock insuficiente en {product.title}."
+            )
+        })
+
+    product.stock = new_stock
+
+    return StockMovement.objects.create(
+        product=product,
+        transaction=transaction,
+        transaction_detail=transaction_detail,
+        created_by=created_by,
+        type=movement_type,
+        quantity=quantity,
+        note=note,
+    )
+
+
+@db_tx.atomic
+def record_transaction_stock_movements(
+    *,
+    transaction,
+    sign,
+    movement_type,
+    created_by,
+    note="",
+    engine=None,
+):
+    """
+    Aplica al inventario todos los detalles de una transacción.
+
+    El motor `locking` bloquea primero todos los productos por orden de
+    PK; el `conditional` lanza un UPDATE condicionado por detalle, también
+    por orden de PK para que ventas concurrentes de varios productos no
+    se interbloqueen.
+    """
+    engine = engine or get_stock_engine()
+    details = sorted(
+        transaction.details.select_related("product"),
+        key=lambda detail: (detail.product_id, detail.pk),
+    )
+
+    if engine == STOCK_ENGINE_CONDITIONAL:
+        return [
+            record_conditional_stock_movement(
+                product=detail.product,
+                transaction=transaction,
+                transaction_detail=detail,
+                created_by=created_by,
+                movement_type=movement_type,
+                quantity=sign * detail.quantity,
+                note=note,
+                require_active=True,
+            )
+            for detail in details
+        ]
+
+    locked_products = lock_products_for_inventory(
+        product_ids=(detail.product_id for detail in details),
+        business_id=transaction.business_id,
+        require_active=True,
+    )
+
+    return [
+        record_locked_stock_movement(
+            product=locked_products[detail.product_id],
+            transaction=transaction,
+            transaction_detail=detail,
+            created_by=created_by,
+            movement_type=movement_type,
+            quantity=sign * detail.quantity,
+            note=note,
+        )
+        for detail in details
+    ]
@@ -6,10 +6,12 @@ from django.db.models import (
 )
 from django.db.models.functions import Coalesce
 
-from core.models import Product, StockMovement
+from core.models import ArchivedStockMovement, Product, StockMovement
 from core.services.customer_supplier_reports import (
     get_report_datetime_range,
 )
+from core.services.report_sources import reads_archive
+from core.services.stock_snapshots import stock_at
 
 
 def integer_or_zero(value) -> int:
@@ -29,7 +31,8 @@ def build_inventory_summary(
     Reglas:
 
     - Cada fila representa un Product individual.
-    - El stock histórico se reconstruye usando StockMovement.
+    - El stock histórico se reconstruye usando StockMovement, desde la
+      foto de stock más cercana al cierre del período.
     """
     start_datetime, end_datetime = (
         get_report_datetime_range(
@@ -58,108 +61,108 @@ def build_inventory_summary(
             )
         )
 
-    movements = (
-        StockMovement.objects
-        .filter(
-            product__business=business,
-        )
+    # Los movimientos archivados de meses cerrados cuentan igual que los
+    # activos; el archivo solo se lee si el período empieza antes de su
+    # marca.
+    period_map = {}
+    models = (
+        (StockMovement, ArchivedStockMovement)
+        if reads_archive(business=business, start=start_datetime)
+        else (StockMovement,)
     )
 
-    if product is not None:
-        movements = movements.filter(
-            product=product,
+    for model in models:
+        movements = (
+            model.objects
+            .filter(
+                product__business=business,
+            )
         )
 
-    period_movements = movements.filter(
-        created_at__gte=start_datetime,
-        created_at__lt=end_datetime,
-    )
-
-    movements_after_period = movements.filter(
-        created_at__gte=end_datetime,
-    )
+        if product is not None:
+            movements = movements.filter(
+                product=product,
+            )
 
-    period_grouped = (
-        period_movements
-        .values(
-            "product_id",
+        period_movements = movements.filter(
+            created_at__gte=start_datetime,
+            created_at__lt=end_datetime,
         )
-        .annotate(
-            movements_count=Count("id"),
-            entries=Coalesce(
-                Sum(
-                    "quantity",
-                    filter=Q(
-                        type="entry",
-                        quantity__gt=0,
+
+        period_grouped = (
+            period_movements
+            .values(
+                "product_id",
+            )
+            .annotate(
+                movements_count=Count("id"),
+                entries=Coalesce(
+                    Sum(
+                        "quantity",
+                        filter=Q(
+                            type="entry",
+                            quantity__gt=0,
+                        ),
                     ),
+                    0,
                 ),
-                0,
-            ),
-            sales_signed=Coalesce(
-                Sum(
-                    "quantity",
-                    filter=Q(
-                        type="sale",
+                sales_signed=Coalesce(
+                    Sum(
+                        "quantity",
+                        filter=Q(
+                            type="sale",
+                        ),
                     ),
+                    0,
                 ),
-                0,
-            ),
-            positive_adjustments=Coalesce(
-                Sum(
-                    "quantity",
-                    filter=Q(
-                        type="adjustment",
-                        quantity__gt=0,
+                positive_adjustments=Coalesce(
+                    Sum(
+                        "quantity",
+                        filter=Q(
+                            type="adjustment",
+                            quantity__gt=0,
+                        ),
                     ),
+                    0,
                 ),
-                0,
-            ),
-            negative_adjustments_signed=Coalesce(
-                Sum(
-                    "quantity",
-                    filter=Q(
-                        type="adjustment",
-                        quantity__lt=0,
+                negative_adjustments_signed=Coalesce(
+                    Sum(
+                        "quantity",
+                        filter=Q(
+                            type="adjustment",
+                            quantity__lt=0,
+                        ),
                     ),
+                    0,
                 ),
-                0,
-            ),
-            net_movement=Coalesce(
-                Sum("quantity"),
-                0,
-            ),
+                net_movement=Coalesce(
+                    Sum("quantity"),
+                    0,
+                ),
+            )
         )
-    )
 
-    after_grouped = (
-        movements_after_period
-        .values(
-            "product_id",
-        )
-        .annotate(
-            net_after_period=Coalesce(
-                Sum("quantity"),
-                0,
+        for row in period_grouped:
+            merged = period_map.setdefault(
+                (row["product_id"],),
+                {"product_id": row["product_id"]},
             )
-        )
-    )
 
-    period_map = {
-        (
-            row["product_id"],
-        ): row
-        for row in period_grouped
-    }
+            for name, value in row.items():
+                if name != "product_id":
+                    merged[name] = merged.get(name, 0) + value
 
-    after_map = {
-        (
-            row["product_id"],
-        ): integer_or_zero(
-            row["net_after_period"]
-        )
-        for row in after_grouped
-    }
+    closing_stock_map = stock_at(
+        business=business,
+        at=end_datetime,
+        products=(
+            Product.objects.filter(
+                pk=product.pk,
+            )
+            if product is not None
+            else None
+        ),
+    )
 
     results = []
 
@@ -235,17 +238,9 @@ def build_inventory_summary(
             )
         )
 
-        net_after_period = (
-            after_map.get(
-                key,
-                0,
-            )
-        )
-
-        closing_stock = (
-            current_stock
-            - net_after_period
-        )
+        closing_stock = closing_stock_map[
+            current_product.pk
+        ]
 
         opening_stock = (
             closing_stock
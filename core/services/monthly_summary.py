@@ -25,6 +25,10 @@ from core.services.financial_flows import (
     exclude_terminal_transactions,
     recognized_debt_payments,
 )
+from core.services.report_sources import (
+    aggregate_sources,
+    report_sources,
+)
 
 def decimal_or_zero(
     value,
@@ -131,26 +135,36 @@ def build_monthly_summary(
         "end_datetime"
     ]
 
-    base_transactions = exclude_terminal_transactions(
-        Transaction.objects.filter(
-            business=business,
-            created_at__gte=period_start,
-            created_at__lt=period_end,
-        )
+    # Los saldos se acumulan desde el inicio, pero lo archivado está
+    # saldado antes de la marca: no cambia el saldo de un mes posterior.
+    sources = report_sources(
+        business=business,
+        start=period_start,
     )
 
+    base_transactions = [
+        exclude_terminal_transactions(
+            models[Transaction].objects.filter(
+                business=business,
+                created_at__gte=period_start,
+                created_at__lt=period_end,
+            )
+        )
+        for models in sources
+    ]
+
     def transaction_summary(
         transaction_type: str,
     ) -> dict:
-        result = (
-            base_transactions
-            .filter(
-                type=transaction_type,
-            )
-            .aggregate(
-                count=Count("id"),
-                total=Sum("total_value"),
-            )
+        result = aggregate_sources(
+            [
+                queryset.filter(
+                    type=transaction_type,
+                )
+                for queryset in base_transactions
+            ],
+            count=Count("id"),
+            total=Sum("total_value"),
         )
 
         return {
@@ -174,92 +188,111 @@ def build_monthly_summary(
         "expense"
     )
 
-    direct_payments = direct_payment_transactions(base_transactions)
-    paid_sales = (
-        direct_payments.filter(type="sale")
-        .aggregate(
-            count=Count("id"),
-            total=Sum("total_value"),
-        )
+    direct_payments = [
+        direct_payment_transactions(queryset)
+        for queryset in base_transactions
+    ]
+    paid_sales = aggregate_sources(
+        [
+            queryset.filter(type="sale")
+            for queryset in direct_payments
+        ],
+        count=Count("id"),
+        total=Sum("total_value"),
     )
 
-    debt_sales = (
-        base_transactions.filter(type="sale", debts__isnull=False)
-        .aggregate(
-            count=Count("id"),
-            total=Sum("total_value"),
-        )
+    debt_sales = aggregate_sources(
+        [
+            queryset.filter(type="sale", debts__isnull=False)
+            for queryset in base_transactions
+        ],
+        count=Count("id"),
+        total=Sum("total_value"),
     )
 
-    debt_generated = exclude_terminal_transactions(
-        Debt.objects.filter(
-            transaction__business=business,
-            transaction__created_at__gte=(
-                period_start
-            ),
-            transaction__created_at__lt=(
-                period_end
-            ),
-        ),
-        status_lookup="transaction__status__name",
-    ).aggregate(
-            count=Count("id"),
-            total=Sum("total_amount"),
+    debt_generated = aggregate_sources(
+        [
+            exclude_terminal_transactions(
+                models[Debt].objects.filter(
+                    transaction__business=business,
+                    transaction__created_at__gte=(
+                        period_start
+                    ),
+                    transaction__created_at__lt=(
+                        period_end
+                    ),
+                ),
+                status_lookup="transaction__status__name",
+            )
+            for models in sources
+        ],
+        count=Count("id"),
+        total=Sum("total_amount"),
     )
 
-    debt_payment_queryset = recognized_debt_payments(
-        DebtPayment.objects.filter(
-            debt__transaction__business=business,
-            payment_date__gte=start_date,
-            payment_date__lte=end_date,
-        )
-    )
-    debt_payments = debt_payment_queryset.aggregate(
+    debt_payments = aggregate_sources(
+        [
+            recognized_debt_payments(
+                models[DebtPayment].objects.filter(
+                    debt__transaction__business=business,
+                    payment_date__gte=start_date,
+                    payment_date__lte=end_date,
+                )
+            )
+            for models in sources
+        ],
         count=Count("id"),
         total=Sum("amount"),
         received=Sum("amount", filter=Q(debt__transaction__type="sale")),
         made=Sum("amount", filter=Q(debt__transaction__type="purchase")),
     )
-    direct_payment_totals = direct_payments.aggregate(
+    direct_payment_totals = aggregate_sources(
+        direct_payments,
         sales=Sum("total_value", filter=Q(type="sale")),
         purchases=Sum("total_value", filter=Q(type="purchase")),
         expenses=Sum("total_value", filter=Q(type="expense")),
     )
 
-    valid_debts = exclude_terminal_transactions(
-        Debt.objects.filter(
-            transaction__business=business,
-            transaction__created_at__lt=period_end,
-        ),
-        status_lookup="transaction__status__name",
-    )
+    valid_debts = [
+        exclude_terminal_transactions(
+            models[Debt].objects.filter(
+                transaction__business=business,
+                transaction__created_at__lt=period_end,
+            ),
+            status_lookup="transaction__status__name",
+        )
+        for models in sources
+    ]
 
-    def outstanding_for(transaction_type):
-        directional = valid_debts.filter(transaction__type=transaction_type)
-        original = directional.aggregate(total=Sum("total_amount"))["total"]
-        paid = DebtPayment.objects.filter(
-            debt__in=directional,
-            payment_date__lte=end_date,
-        ).aggregate(total=Sum("amount"))["total"]
+    def outstanding_of(debts):
+        original = aggregate_sources(
+            debts,
+            total=Sum("total_amount"),
+        )["total"]
+        paid = aggregate_sources(
+            debts,
+            total=Sum(
+                "payments__amount",
+                filter=Q(payments__payment_date__lte=end_date),
+            ),
+        )["total"]
         return max(
             decimal_or_zero(original) - decimal_or_zero(paid),
             Decimal("0.00"),
         ).quantize(Decimal("0.01"))
 
-    outstanding_receivables = outstanding_for("sale")
-    outstanding_payables = outstanding_for("purchase")
-    unclassified_debts = valid_debts.exclude(
-        transaction__type__in=("sale", "purchase")
-    )
-    unclassified_original = unclassified_debts.aggregate(total=Sum("total_amount"))["total"]
-    unclassified_paid = DebtPayment.objects.filter(
-        debt__in=unclassified_debts,
-        payment_date__lte=end_date,
-    ).aggregate(total=Sum("amount"))["total"]
-    outstanding_unclassified = max(
-        decimal_or_zero(unclassified_original) - decimal_or_zero(unclassified_paid),
-        Decimal("0.00"),
-    ).quantize(Decimal("0.01"))
+    outstanding_receivables = outstanding_of([
+        queryset.filter(transaction__type="sale")
+        for queryset in valid_debts
+    ])
+    outstanding_payables = outstanding_of([
+        queryset.filter(transaction__type="purchase")
+        for queryset in valid_debts
+    ])
+    outstanding_unclassified = outstanding_of([
+        queryset.exclude(transaction__type__in=("sale", "purchase"))
+        for queryset in valid_debts
+    ])
     outstanding_total = (
         outstanding_receivables
         + outstanding_payables
@@ -0,0 +1,134 @@
+"""
+Ejecución concurrente de consultas de lectura independientes.
+
+`run_query_groups` recibe funciones sin argumentos (cada una hace una o
+varias consultas) y devuelve sus resultados por nombre, en el orden en
+que se declararon, sin importar cuál terminó primero.
+
+En PostgreSQL los grupos corren en un pool de hilos, cada uno con su
+propia conexión. Todas las conexiones leen la misma instantánea: el hilo
+que llama abre una transacción REPEATABLE READ de solo lectura, exporta
+su snapshot con `pg_export_snapshot()` y cada hilo lo adopta con
+`SET TRANSACTION SNAPSHOT`. El resultado es el mismo que el de ejecutar
+los grupos uno tras otro dentro de esa transacción.
+
+Sin `using`, la instantánea se toma en la base que el router elige para
+las lecturas (`router.db_for_read`), antes de abrir la transacción: con
+una transacción abierta en `default`, `core.db_routers` ya no enviaría
+las lecturas a la réplica.
+
+Con otros motores, con `parallelism <= 1` o dentro de una transacción
+abierta (cuyas escrituras sin confirmar no verían los otros hilos), los
+grupos se ejecutan en secuencia en el hilo actual.
+"""
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.db import close_old_connections, connections, router
+from django.db import transaction as db_tx
+
+
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers):
+    # Un pool por proceso: `workers` limita las consultas concurrentes de
+    # todas las peticiones, no solo las de una.
+    global _executor, _executor_workers
+
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+
+            _executor = ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix="query-group",
+            )
+            _executor_workers = workers
+
+        return _executor
+
+
+def _set_read_only_snapshot(cursor, snapshot=None):
+    cursor.execute(
+        "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY"
+    )
+
+    if snapshot is not None:
+        cursor.execute("SET TRANSACTION SNAPSHOT %s", [snapshot])
+
+
+def _run_in_snapshot(group, using, snapshot):
+    # Igual que al inicio y fin de una petición: se descartan conexiones
+    # vencidas o rotas y las sanas se reutilizan según CONN_MAX_AGE.
+    close_old_connections()
+
+    try:
+        with db_tx.atomic(using=using):
+            with connections[using].cursor() as cursor:
+                _set_read_only_snapshot(cursor, snapshot)
+
+            return group()
+    finally:
+        close_old_connections()
+
+
+def run_query_groups(
+    groups,
+    *,
+    parallelism,
+    model=None,
+    using=None,
+) -> dict:
+    """
+    `model` solo sirve de pista al router cuando no se indica `using`.
+    """
+    if using is None:
+        using = router.db_for_read(model)
+
+    connection = connections[using]
+
+    if (
+        parallelism <= 1
+        or len(groups) <= 1
+        or connection.vendor != "postgresql"
+        or connection.in_atomic_block
+    ):
+        return {
+            name: group()
+            for name, group in groups.items()
+        }
+
+    executor = _get_executor(parallelism)
+
+    with db_tx.atomic(using=using):
+        with connection.cursor() as cursor:
+            _set_read_only_snapshot(cursor)
+            cursor.execute("SELECT pg_export_snapshot()")
+            snapshot = cursor.fetchone()[0]
+
+        # El snapshot solo puede adoptarse mientras esta transacción siga
+        # abierta: se espera a todos los grupos antes de salir.
+        # Cada hilo hereda el contexto de la petición, incluida la
+        # política de lectura de `core.db_routers`.
+        futures = {
+            name: executor.submit(
+                contextvars.copy_context().run,
+                _run_in_snapshot,
+                group,
+                using,
+                snapshot,
+            )
+            for name, group in groups.items()
+        }
+        wait(futures.values())
+
+        return {
+            name: future.result()
+            for name, future in futures.items()
+        }
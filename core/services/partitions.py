@@ -0,0 +1,145 @@
+from django.db import connections, router
+from django.db import transaction as db_tx
+from django.utils import timezone as django_timezone
+
+from core.models import StockMovement
+from core.services.monthly_summary import get_month_period
+
+
+# Transaction no se particiona: TransactionDetail, Debt, DebtPayment,
+# StockMovement y otras tablas la referencian por `id`, y PostgreSQL exige
+# que la clave referenciada de una tabla particionada incluya `created_at`.
+PARTITIONED_MODELS = (
+    StockMovement,
+)
+
+
+def partitioning_available(*, model) -> bool:
+    connection = connections[router.db_for_write(model)]
+    return connection.vendor == "postgresql"
+
+
+def is_partitioned(*, model) -> bool:
+    connection = connections[router.db_for_write(model)]
+    if connection.vendor != "postgresql":
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT 1
+            FROM pg_partitioned_table pt
+            JOIN pg_class c ON c.oid = pt.partrelid
+            WHERE c.relname = %s
+              AND c.relnamespace = to_regnamespace(current_schema())
+            """,
+            [model._meta.db_table],
+        )
+        return cursor.fetchone() is not None
+
+
+def monthly_partition_name(table, *, year, month) -> str:
+    return f"{table}_p{year:04d}{month:02d}"
+
+
+def default_partition_name(table) -> str:
+    return f"{table}_default"
+
+
+def public_id_registry_name(table) -> str:
+    return f"{table}_public_ids"
+
+
+def add_months(year, month, months):
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def existing_partitions(*, model) -> set[str]:
+    connection = connections[router.db_for_write(model)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+              AND parent.relnamespace = to_regnamespace(current_schema())
+            """,
+            [model._meta.db_table],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+@db_tx.atomic
+def create_monthly_partition(*, model, year, month) -> bool:
+    """
+    Crea la partición mensual si no existe.
+
+    Las filas que hubieran caído en la partición por defecto para ese mes
+    se trasladan a la nueva partición antes de adjuntarla. El borrado en
+    la partición por defecto retira sus public_id del registro global, así
+    que se vuelven a registrar tras adjuntarla.
+    """
+    table = model._meta.db_table
+    name = monthly_partition_name(table, year=year, month=month)
+    if name in existing_partitions(model=model):
+        return False
+
+    connection = connections[router.db_for_write(model)]
+    quote_name = connection.ops.quote_name
+    period = get_month_period(year=year, month=month)
+    bounds = [period["start_datetime"], period["end_datetime"]]
+    default_name = default_partition_name(table)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {quote_name(name)} "
+            f"(LIKE {quote_name(table)} "
+            "INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        if default_name in existing_partitions(model=model):
+            cursor.execute(
+                f"WITH moved AS ("
+                f"DELETE FROM {quote_name(default_name)} "
+                "WHERE created_at >= %s AND created_at < %s "
+                "RETURNING *) "
+                f"INSERT INTO {quote_name(name)} SELECT * FROM moved",
+                bounds,
+            )
+        cursor.execute(
+            f"ALTER TABLE {quote_name(table)} "
+            f"ATTACH PARTITION {quote_name(name)} "
+            "FOR VALUES FROM (%s) TO (%s)",
+            bounds,
+        )
+        cursor.execute(
+            f"INSERT INTO {quote_name(public_id_registry_name(table))} "
+            f"(public_id) SELECT public_id FROM {quote_name(name)}"
+        )
+
+    return True
+
+
+def ensure_monthly_partitions(*, months_ahead=3, months_back=0) -> list[str]:
+    """Crea las particiones del mes actual y de los meses indicados."""
+    today = django_timezone.localdate()
+    created = []
+
+    for model in PARTITIONED_MODELS:
+        if not is_partitioned(model=model):
+            continue
+
+        for offset in range(-months_back, months_ahead + 1):
+            year, month = add_months(today.year, today.month, offset)
+            if create_monthly_partition(model=model, year=year, month=month):
+                created.append(
+                    monthly_partition_name(
+                        model._meta.db_table,
+                        year=year,
+                        month=month,
+                    )
+                )
+
+    return created
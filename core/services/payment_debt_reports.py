@@ -11,23 +11,30 @@ from core.services.financial_flows import (
     exclude_terminal_transactions,
     recognized_debt_payments,
 )
+from core.services.report_sources import aggregate_sources, report_sources
 
 
 MONEY_FIELD = DecimalField(max_digits=12, decimal_places=2)
 
 
-def _group_by_method(queryset, prefix, amount_field):
-    return {
-        row["payment_method_id"]: row
+def _group_by_method(querysets, prefix, amount_field):
+    grouped = {}
+    for queryset in querysets:
         for row in queryset.values("payment_method_id").annotate(**{
             f"{prefix}_count": Count("id"),
             f"{prefix}_total": Sum(amount_field),
-        })
-    }
+        }):
+            merged = grouped.setdefault(row["payment_method_id"], {
+                f"{prefix}_count": 0,
+                f"{prefix}_total": Decimal("0.00"),
+            })
+            merged[f"{prefix}_count"] += row[f"{prefix}_count"]
+            merged[f"{prefix}_total"] += row[f"{prefix}_total"] or Decimal("0.00")
+    return grouped
 
 
-def _summary(queryset, amount_field):
-    result = queryset.aggregate(count=Count("id"), total=Sum(amount_field))
+def _summary(querysets, amount_field):
+    result = aggregate_sources(querysets, count=Count("id"), total=Sum(amount_field))
     return {"count": result["count"], "total": decimal_or_zero(result["total"])}
 
 
@@ -40,31 +47,44 @@ def build_payments_summary(*, business, date_from: date, date_to: date, payment_
     start_datetime, end_datetime = get_report_datetime_range(
         date_from=date_from, date_to=date_to,
     )
-    transactions = exclude_terminal_transactions(Transaction.objects.filter(
-        business=business,
-        created_at__gte=start_datetime,
-        created_at__lt=end_datetime,
-    ))
-    direct = direct_payment_transactions(transactions)
-    debt_payments = recognized_debt_payments(DebtPayment.objects.filter(
-        debt__transaction__business=business,
-        payment_date__gte=date_from,
-        payment_date__lte=date_to,
-    ))
+    # Los pagos archivados tienen `payment_date` anterior a la marca de
+    # archivo, así que un rango posterior no los necesita.
+    models_by_source = report_sources(business=business, start=start_datetime)
+    direct = []
+    debt_payments = []
+    for models in models_by_source:
+        direct.append(direct_payment_transactions(exclude_terminal_transactions(
+            models[Transaction].objects.filter(
+                business=business,
+                created_at__gte=start_datetime,
+                created_at__lt=end_datetime,
+            )
+        )))
+        debt_payments.append(recognized_debt_payments(models[DebtPayment].objects.filter(
+            debt__transaction__business=business,
+            payment_date__gte=date_from,
+            payment_date__lte=date_to,
+        )))
     if payment_method is not None:
-        direct = direct.filter(payment_method=payment_method)
-        debt_payments = debt_payments.filter(payment_method=payment_method)
+        direct = [queryset.filter(payment_method=payment_method) for queryset in direct]
+        debt_payments = [queryset.filter(payment_method=payment_method) for queryset in debt_payments]
 
     sources = {
-        "sales": (direct.filter(type="sale"), "total_value"),
-        "purchases": (direct.filter(type="purchase"), "total_value"),
-        "expenses": (direct.filter(type="expense"), "total_value"),
-        "received": (debt_payments.filter(debt__transaction__type="sale"), "amount"),
-        "made": (debt_payments.filter(debt__transaction__type="purchase"), "amount"),
+        "sales": ([queryset.filter(type="sale") for queryset in direct], "total_value"),
+        "purchases": ([queryset.filter(type="purchase") for queryset in direct], "total_value"),
+        "expenses": ([queryset.filter(type="expense") for queryset in direct], "total_value"),
+        "received": (
+            [queryset.filter(debt__transaction__type="sale") for queryset in debt_payments],
+            "amount",
+        ),
+        "made": (
+            [queryset.filter(debt__transaction__type="purchase") for queryset in debt_payments],
+            "amount",
+        ),
     }
     grouped = {
-        name: _group_by_method(queryset, name, amount_field)
-        for name, (queryset, amount_field) in sources.items()
+        name: _group_by_method(querysets, name, amount_field)
+        for name, (querysets, amount_field) in sources.items()
     }
     method_ids = set().union(*(set(rows) for rows in grouped.values()))
     methods = PaymentMethod.objects.filter(
@@ -111,8 +131,8 @@ def build_payments_summary(*, business, date_from: date, date_to: date, payment_
         })
 
     summaries = {
-        name: _summary(queryset, amount_field)
-        for name, (queryset, amount_field) in sources.items()
+        name: _summary(querysets, amount_field)
+        for name, (querysets, amount_field) in sources.items()
     }
     incoming = (summaries["sales"]["total"] + summaries["received"]["total"]).quantize(Decimal("0.01"))
     outgoing = (
@@ -152,14 +172,20 @@ def _annotate_paid_until(queryset, date_to):
     ))
 
 
-def _debt_direction_summary(queryset, date_to):
-    original = queryset.aggregate(count=Count("id"), total=Sum("total_amount"))
-    paid = DebtPayment.objects.filter(debt__in=queryset, payment_date__lte=date_to).aggregate(total=Sum("amount"))
+def _debt_direction_summary(querysets, date_to):
+    original = aggregate_sources(querysets, count=Count("id"), total=Sum("total_amount"))
+    paid = aggregate_sources(
+        querysets,
+        total=Sum("payments__amount", filter=Q(payments__payment_date__lte=date_to)),
+    )
     original_total = decimal_or_zero(original["total"])
     paid_total = decimal_or_zero(paid["total"])
-    settled_count = _annotate_paid_until(queryset, date_to).filter(
-        paid_until_end__gte=F("total_amount")
-    ).count()
+    settled_count = sum(
+        _annotate_paid_until(queryset, date_to).filter(
+            paid_until_end__gte=F("total_amount")
+        ).count()
+        for queryset in querysets
+    )
     return {
         "count": original["count"],
         "settled_count": settled_count,
@@ -174,30 +200,48 @@ def build_debts_summary(*, business, date_from: date, date_to: date) -> dict:
     start_datetime, end_datetime = get_report_datetime_range(
         date_from=date_from, date_to=date_to,
     )
-    valid = exclude_terminal_transactions(
-        Debt.objects.filter(
-            transaction__business=business,
-            transaction__created_at__lt=end_datetime,
-        ),
-        status_lookup="transaction__status__name",
-    )
-    generated = valid.filter(transaction__created_at__gte=start_datetime)
+    # La cartera se acumula desde el inicio, pero las deudas archivadas
+    # están saldadas antes de la marca: un rango posterior no las cuenta.
+    models_by_source = report_sources(business=business, start=start_datetime)
+    valid = [
+        exclude_terminal_transactions(
+            models[Debt].objects.filter(
+                transaction__business=business,
+                transaction__created_at__lt=end_datetime,
+            ),
+            status_lookup="transaction__status__name",
+        )
+        for models in models_by_source
+    ]
+    generated = [queryset.filter(transaction__created_at__gte=start_datetime) for queryset in valid]
     direction_querysets = {
-        "receivable": valid.filter(transaction__type="sale"),
-        "payable": valid.filter(transaction__type="purchase"),
-        "unclassified": valid.exclude(transaction__type__in=("sale", "purchase")),
+        "receivable": [queryset.filter(transaction__type="sale") for queryset in valid],
+        "payable": [queryset.filter(transaction__type="purchase") for queryset in valid],
+        "unclassified": [
+            queryset.exclude(transaction__type__in=("sale", "purchase"))
+            for queryset in valid
+        ],
     }
     direction_summaries = {
-        name: _debt_direction_summary(queryset, date_to)
-        for name, queryset in direction_querysets.items()
+        name: _debt_direction_summary(querysets, date_to)
+        for name, querysets in direction_querysets.items()
     }
-    period_payments = recognized_debt_payments(DebtPayment.objects.filter(
-        debt__transaction__business=business,
-        payment_date__gte=date_from,
-        payment_date__lte=date_to,
-    ))
-    received = _summary(period_payments.filter(debt__transaction__type="sale"), "amount")
-    made = _summary(period_payments.filter(debt__transaction__type="purchase"), "amount")
+    period_payments = [
+        recognized_debt_payments(models[DebtPayment].objects.filter(
+            debt__transaction__business=business,
+            payment_date__gte=date_from,
+            payment_date__lte=date_to,
+        ))
+        for models in models_by_source
+    ]
+    received = _summary(
+        [queryset.filter(debt__transaction__type="sale") for queryset in period_payments],
+        "amount",
+    )
+    made = _summary(
+        [queryset.filter(debt__transaction__type="purchase") for queryset in period_payments],
+        "amount",
+    )
 
     original_total = sum(
         (item["original_total"] for item in direction_summaries.values()),
@@ -208,13 +252,23 @@ def build_debts_summary(*, business, date_from: date, date_to: date) -> dict:
         Decimal("0.00"),
     ).quantize(Decimal("0.01"))
     outstanding = max(original_total - paid_total, Decimal("0.00")).quantize(Decimal("0.01"))
-    overdue = _debt_direction_summary(valid.filter(due_date__lt=date_to), date_to)
-    generated_summary = generated.aggregate(count=Count("id"), total=Sum("total_amount"))
+    overdue = _debt_direction_summary(
+        [queryset.filter(due_date__lt=date_to) for queryset in valid],
+        date_to,
+    )
+    generated_summary = aggregate_sources(generated, count=Count("id"), total=Sum("total_amount"))
 
     results = []
-    generated_rows = _annotate_paid_until(generated, date_to).select_related(
-        "transaction", "transaction__customer", "transaction__supplier", "transaction__employee",
-    ).order_by("due_date", "created_at")
+    generated_rows = sorted(
+        (
+            debt
+            for queryset in generated
+            for debt in _annotate_paid_until(queryset, date_to).select_related(
+                "transaction", "transaction__customer", "transaction__supplier", "transaction__employee",
+            ).order_by("due_date", "created_at")
+        ),
+        key=lambda debt: (debt.due_date, debt.created_at),
+    )
     for debt in generated_rows:
         transaction = debt.transaction
         paid = decimal_or_zero(debt.paid_until_end)
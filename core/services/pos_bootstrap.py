@@ -0,0 +1,179 @@
+import hashlib
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.utils import timezone
+
+from core.models import (
+    Business,
+    Customer,
+    Employee,
+    PaymentMethod,
+    Product,
+    ProductCategory,
+)
+from core.utils import ACTIVE_STATUS_NAME
+
+
+# Prefijo de las generaciones calculadas dentro de la ventana de
+# SYNC_WATERMARK_OVERLAP_SECONDS; nunca se repiten ni se cachean.
+UNSETTLED_GENERATION_PREFIX = "live-"
+
+# (clave del bundle, modelo, columnas, columnas renombradas, orden)
+BOOTSTRAP_SECTIONS = (
+    (
+        "categories",
+        ProductCategory,
+        ("public_id", "name"),
+        {},
+        ("name",),
+    ),
+    (
+        "products",
+        Product,
+        ("public_id", "title", "sku", "barcode", "base_price", "stock"),
+        {"category_public_id": F("category__public_id")},
+        ("title", "pk"),
+    ),
+    (
+        "payment_methods",
+        PaymentMethod,
+        ("public_id", "name", "method_type"),
+        {},
+        ("name",),
+    ),
+    (
+        "employees",
+        Employee,
+        ("public_id", "full_name", "position"),
+        {},
+        ("full_name", "pk"),
+    ),
+    (
+        "customers",
+        Customer,
+        ("public_id", "full_name", "phone"),
+        {},
+        ("full_name", "pk"),
+    ),
+)
+
+
+def _section_subquery(model, aggregate):
+    return Subquery(
+        model.objects
+        .filter(business=OuterRef("pk"))
+        .order_by()
+        .values("business")
+        .annotate(value=aggregate)
+        .values("value")
+    )
+
+
+def pos_bootstrap_generation(business) -> str:
+    """
+    Generación del catálogo del punto de venta de un negocio.
+
+    Se calcula en una sola consulta con el último `updated_at` y el número
+    de filas de cada sección, de modo que cualquier alta, cambio, baja
+    lógica o movimiento de stock produce una generación distinta sin
+    necesidad de invalidar la caché desde cada escritura.
+
+    `updated_at` se fija antes del commit: una transacción que confirma
+    tarde puede traer una marca anterior al máximo ya visto sin cambiar ni
+    el máximo ni el recuento. Igual que la marca de `sync`, mientras el
+    último cambio tenga menos de SYNC_WATERMARK_OVERLAP_SECONDS la
+    generación se considera abierta y es única en cada llamada.
+    """
+    annotations = {"business_updated_at": F("updated_at")}
+
+    for name, model, *_ in BOOTSTRAP_SECTIONS:
+        annotations[f"{name}_updated_at"] = _section_subquery(
+            model,
+            Max("updated_at"),
+        )
+        annotations[f"{name}_count"] = _section_subquery(
+            model,
+            Count("pk"),
+        )
+
+    row = (
+        Business.objects
+        .filter(pk=business.pk)
+        .values(**annotations)
+        .get()
+    )
+
+    generation = hashlib.sha1(
+        repr(sorted(row.items())).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+
+    latest_update = max(
+        (
+            value
+            for key, value in row.items()
+            if key.endswith("_updated_at") and value is not None
+        ),
+        default=None,
+    )
+    settled_before = timezone.now() - timedelta(
+        seconds=settings.SYNC_WATERMARK_OVERLAP_SECONDS,
+    )
+    if latest_update is not None and latest_update > settled_before:
+        return f"{UNSETTLED_GENERATION_PREFIX}{generation}-{uuid.uuid4().hex}"
+
+    return generation
+
+
+def _build_bundle(business) -> dict:
+    bundle = {
+        "business": {
+            "public_id": business.public_id,
+            "business_name": business.business_name,
+            "currency": business.currency,
+        },
+    }
+
+    for name, model, columns, renamed, ordering in BOOTSTRAP_SECTIONS:
+        bundle[name] = list(
+            model.objects
+            .filter(
+                business=business,
+                status__name__iexact=ACTIVE_STATUS_NAME,
+            )
+            .order_by(*ordering)
+            .values(*columns, **renamed)
+        )
+
+    return bundle
+
+
+def get_pos_bootstrap(business, *, generation=None) -> dict:
+    """
+    Catálogo activo que un punto de venta necesita al arrancar.
+
+    Cada sección se lee con una consulta `values()` limitada a las
+    columnas que usa la caja. El resultado se cachea por negocio y
+    generación, así que una generación nueva nunca sirve datos viejos.
+    Las generaciones abiertas se leen siempre de la base de datos.
+    """
+    generation = generation or pos_bootstrap_generation(business)
+    if generation.startswith(UNSETTLED_GENERATION_PREFIX):
+        return _build_bundle(business)
+
+    cache_key = f"pos-bootstrap:{business.pk}:{generation}"
+
+    bundle = cache.get(cache_key)
+    if bundle is None:
+        bundle = _build_bundle(business)
+        cache.set(
+            cache_key,
+            bundle,
+            timeout=settings.POS_BOOTSTRAP_CACHE_SECONDS,
+        )
+
+    return bundle
@@ -0,0 +1,369 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
+from django.db import DataError
+from django.db import transaction as db_tx
+from django.db.models import F, Max, Q
+from django.db.models.functions import Round
+from django.utils import timezone as django_timezone
+from rest_framework.exceptions import ValidationError
+
+from core.models import EntityStatus, Product, ProductCategory
+from core.utils import STOCK_CHANGE_MESSAGE
+
+
+IMPORT_FORMAT_CSV = "csv"
+IMPORT_FORMAT_JSON = "json"
+
+IMPORT_FORMATS = (
+    IMPORT_FORMAT_CSV,
+    IMPORT_FORMAT_JSON,
+)
+
+IMPORT_CHUNK_SIZE = 1000
+
+MAX_IMPORT_ROWS = 20_000
+
+REQUIRED_CREATE_FIELDS = (
+    "title",
+    "base_price",
+    "base_cost",
+)
+
+UPDATABLE_FIELDS = (
+    "title",
+    "sku",
+    "barcode",
+    "description",
+    "image_url",
+    "base_price",
+    "base_cost",
+    "is_visible",
+    "category",
+    "status",
+)
+
+CODE_FIELDS = (
+    "sku",
+    "barcode",
+)
+
+PRICE_FIELDS = (
+    "base_price",
+    "base_cost",
+)
+
+
+def parse_product_rows(content, *, import_format) -> list[dict]:
+    """
+    Convierte un archivo CSV o JSON en una lista de filas.
+
+    En CSV una celda vacía equivale a no enviar la columna, de modo que
+    una actualización solo modifica las columnas con valor.
+    """
+    if isinstance(content, bytes):
+        content = content.decode("utf-8-sig")
+
+    if import_format == IMPORT_FORMAT_CSV:
+        return [
+            {
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key and value is not None and value.strip() != ""
+            }
+            for row in csv.DictReader(io.StringIO(content))
+        ]
+
+    if import_format == IMPORT_FORMAT_JSON:
+        try:
+            rows = json.loads(content)
+        except json.JSONDecodeError:
+            raise ValidationError({
+                "file": "El archivo JSON no es válido.",
+            })
+
+        if isinstance(rows, dict):
+            rows = rows.get("products")
+
+        if not isinstance(rows, list):
+            raise ValidationError({
+                "file": "El JSON debe ser una lista de productos.",
+            })
+
+        return rows
+
+    raise ValidationError({
+        "format": f"Formato no soportado. Usa: {', '.join(IMPORT_FORMATS)}.",
+    })
+
+
+def _resolve_by_public_id(queryset, public_ids):
+    if not public_ids:
+        return {}
+
+    return {
+        obj.public_id: obj
+        for obj in queryset.filter(public_id__in=public_ids)
+    }
+
+
+def _code_owners(business, rows) -> dict[tuple[str, str], int]:
+    """
+    PK del producto que ya usa cada SKU o código de barras del archivo.
+    """
+    codes = {
+        field: {row[field] for row in rows if row.get(field)}
+        for field in CODE_FIELDS
+    }
+    if not any(codes.values()):
+        return {}
+
+    owners = {}
+    products = Product.objects.filter(business=business).filter(
+        Q(sku__in=codes["sku"]) | Q(barcode__in=codes["barcode"]),
+    )
+
+    for pk, sku, barcode in products.values_list("pk", "sku", "barcode"):
+        owners[("sku", sku)] = pk
+        owners[("barcode", barcode)] = pk
+
+    return owners
+
+
+def _active_status():
+    status = (
+        EntityStatus.objects
+        .filter(name__iexact="Activo")
+        .first()
+    )
+
+    if status is None:
+        raise ValidationError({
+            "status_public_id": (
+                "No existe el estado inicial 'Activo'. "
+                "Ejecuta el comando seed_statuses."
+            )
+        })
+
+    return status
+
+
+def upsert_products(
+    *,
+    business,
+    rows,
+    chunk_size=IMPORT_CHUNK_SIZE,
+    dry_run=False,
+) -> dict[str, int]:
+    """
+    Crea o actualiza productos del negocio en bloque.
+
+    `rows` son filas ya validadas por ProductImportRowSerializer. Las filas
+    con `public_id` actualizan ese producto; el resto crea uno nuevo.
+    Productos, categorías y estados se resuelven con una consulta cada
+    uno y todo el lote se valida antes de escribir: si una fila falla no
+    se escribe ninguna. La escritura usa bulk_create y bulk_update por
+    bloques de `chunk_size`.
+    """
+    product_public_ids = {
+        row["public_id"]
+        for row in rows
+        if row.get("public_id")
+    }
+    existing = _resolve_by_public_id(
+        Product.objects.filter(business=business),
+        product_public_ids,
+    )
+    categories = _resolve_by_public_id(
+        ProductCategory.objects.filter(business=business),
+        {
+            row["category_public_id"]
+            for row in rows
+            if row.get("category_public_id")
+        },
+    )
+    statuses = _resolve_by_public_id(
+        EntityStatus.objects.all(),
+        {
+            row["status_public_id"]
+            for row in rows
+            if row.get("status_public_id")
+        },
+    )
+
+    code_owners = _code_owners(business, rows)
+
+    errors = {}
+    seen_public_ids = set()
+    seen_codes = set()
+    to_create = []
+    to_update = []
+    update_fields = set()
+    default_status = None
+    now = django_timezone.now()
+
+    for index, row in enumerate(rows):
+        row_errors = {}
+        values = {
+            field: row[field]
+            for field in UPDATABLE_FIELDS
+            if field in row
+        }
+
+        if "category_public_id" in row:
+            category_public_id = row["category_public_id"]
+            values["category"] = categories.get(category_public_id)
+            if category_public_id and values["category"] is None:
+                row_errors["category_public_id"] = (
+                    "La categoría no pertenece al negocio seleccionado."
+                )
+
+        if row.get("status_public_id"):
+            values["status"] = statuses.get(row["status_public_id"])
+            if values["status"] is None:
+                row_errors["status_public_id"] = "El estado no existe."
+
+        public_id = row.get("public_id")
+        product = existing.get(public_id) if public_id else None
+
+        for field in CODE_FIELDS:
+            code = row.get(field)
+            if not code:
+                continue
+
+            owner_pk = code_owners.get((field, code))
+            if (field, code) in seen_codes:
+                row_errors[field] = (
+                    "El código aparece más de una vez en el archivo."
+                )
+            elif owner_pk is not None and (
+                product is None or owner_pk != product.pk
+            ):
+                row_errors[field] = (
+                    "Ya existe otro producto del negocio con este código."
+                )
+
+            seen_codes.add((field, code))
+
+        if public_id:
+            if product is None:
+                row_errors["public_id"] = (
+                    "El producto no existe en el negocio seleccionado."
+                )
+            elif public_id in seen_public_ids:
+                row_errors["public_id"] = (
+                    "El producto aparece más de una vez en el archivo."
+                )
+            elif "stock" in row and row["stock"] != product.stock:
+                row_errors["stock"] = STOCK_CHANGE_MESSAGE
+
+            seen_public_ids.add(public_id)
+
+            if not row_errors:
+                for field, value in values.items():
+                    setattr(product, field, value)
+                product.updated_at = now
+                update_fields.update(values)
+                to_update.append(product)
+        else:
+            for field in REQUIRED_CREATE_FIELDS:
+                if field not in row:
+                    row_errors[field] = "Este campo es requerido."
+
+            if not row_errors:
+                if "status" not in values:
+                    default_status = default_status or _active_status()
+                    values["status"] = default_status
+
+                to_create.append(
+                    Product(
+                        business=business,
+                        stock=row.get("stock", 0),
+                        **values,
+                    )
+                )
+
+        if row_errors:
+            errors[index] = row_errors
+
+    if errors:
+        raise ValidationError({
+            "rows": errors,
+        })
+
+    if not dry_run:
+        with db_tx.atomic():
+            Product.objects.bulk_create(
+                to_create,
+                batch_size=chunk_size,
+            )
+
+            if to_update:
+                Product.objects.bulk_update(
+                    to_update,
+                    sorted(update_fields | {"updated_at"}),
+                    batch_size=chunk_size,
+                )
+
+    return {
+        "created": len(to_create),
+        "updated": len(to_update),
+    }
+
+
+def adjust_product_prices(
+    *,
+    business,
+    percent,
+    category=None,
+    field="base_price",
+) -> int:
+    """
+    Cambia un porcentaje el precio o el costo de los productos del negocio,
+    opcionalmente de una sola categoría, con una única sentencia UPDATE.
+
+    Antes se comprueba que el mayor valor resultante quepa en la columna;
+    si no, se responde con un error de validación en lugar de dejar que
+    la base de datos rechace el UPDATE.
+    """
+    if field not in PRICE_FIELDS:
+        raise ValidationError({
+            "field": f"Campo no soportado. Usa: {', '.join(PRICE_FIELDS)}.",
+        })
+
+    factor = Decimal("1") + Decimal(percent) / Decimal("100")
+    products = Product.objects.filter(business=business)
+
+    if category is not None:
+        products = products.filter(category=category)
+
+    model_field = Product._meta.get_field(field)
+    limit = Decimal(10) ** (
+        model_field.max_digits - model_field.decimal_places
+    )
+    overflow_error = ValidationError({
+        "percent": (
+            "El ajuste dejaría algún producto con un valor mayor al "
+            "máximo permitido."
+        ),
+    })
+
+    largest = products.aggregate(largest=Max(field))["largest"]
+    if largest is not None and (
+        (largest * factor).quantize(Decimal("0.01")) >= limit
+    ):
+        raise overflow_error
+
+    try:
+        with db_tx.atomic():
+            return products.update(
+                **{
+                    field: Round(F(field) * factor, precision=2),
+                    "updated_at": django_timezone.now(),
+                }
+            )
+    except DataError:
+        # Un precio modificado entre la comprobación y el UPDATE.
+        raise overflow_error
@@ -0,0 +1,65 @@
+from django.db.models import Q
+
+from core.models import Product
+from core.utils import ACTIVE_STATUS_NAME
+
+
+MAX_LOOKUP_CODES = 500
+
+LOOKUP_FIELDS = (
+    "public_id",
+    "sku",
+    "barcode",
+    "title",
+    "base_price",
+    "stock",
+)
+
+
+def _lookup_queryset(business):
+    # Mismo criterio que el bundle de `/pos/bootstrap/`: solo se venden
+    # productos activos.
+    return Product.objects.filter(
+        business=business,
+        status__name__iexact=ACTIVE_STATUS_NAME,
+    )
+
+
+def _match_codes(rows, codes) -> dict:
+    """
+    Asocia cada código con su fila; el código de barras tiene prioridad
+    sobre un SKU idéntico de otro producto.
+    """
+    matches = {}
+
+    for code_field in ("barcode", "sku"):
+        for row in rows:
+            code = row[code_field]
+            if code and code in codes:
+                matches.setdefault(code, row)
+
+    return matches
+
+
+def lookup_products_by_code(*, business, codes) -> dict[str, dict]:
+    """
+    Resuelve códigos de barras o SKU del negocio en productos vendibles
+    con una sola consulta sobre los índices únicos (business, barcode) y
+    (business, sku). Precio y stock salen siempre de la fila actual.
+    """
+    codes = list(dict.fromkeys(code for code in codes if code))
+    if not codes:
+        return {}
+
+    rows = list(
+        _lookup_queryset(business)
+        .filter(Q(barcode__in=codes) | Q(sku__in=codes))
+        .values(*LOOKUP_FIELDS)
+    )
+    matches = _match_codes(rows, set(codes))
+
+    return {
+        code: matches[code]
+        for code in codes
+        if code in matches
+    }
@@ -0,0 +1,186 @@
+"""
+Cola de reportes en la base de datos.
+
+Un reporte pedido con `?async=true` se guarda como `ReportJob` con los
+parámetros originales de la consulta. `run_report_worker` reclama
+trabajos con `SELECT ... FOR UPDATE SKIP LOCKED`, de modo que varios
+workers pueden leer la misma tabla sin repartirse dos veces el mismo
+trabajo, y guarda el JSON del reporte para consultarlo después.
+
+Los reportes se registran desde sus vistas (`AsyncReportMixin`): el
+worker vuelve a validar parámetros y acceso con el mismo código que la
+petición síncrona.
+"""
+
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction as db_tx
+from django.db.models import F, Q
+from django.http import Http404
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+from rest_framework.utils.encoders import JSONEncoder
+
+from core.db_routers import replica_reads
+from core.models import ReportJob
+
+
+logger = logging.getLogger(__name__)
+
+REPORT_VIEWS = {}
+
+
+def register_report(name, view_class):
+    REPORT_VIEWS[name] = view_class
+
+
+def _report_views():
+    # Las vistas se registran al importarse; el worker no pasa por las URLs.
+    import core.views  # noqa: F401
+
+    return REPORT_VIEWS
+
+
+def enqueue_report_job(*, business, user, report, params) -> ReportJob:
+    return ReportJob.objects.create(
+        business=business,
+        requested_by=user,
+        report=report,
+        params=params,
+    )
+
+
+def claim_report_jobs(*, limit) -> list[ReportJob]:
+    """
+    Marca como `running` hasta `limit` trabajos pendientes, del más
+    antiguo al más nuevo. También recupera los que quedaron en `running`
+    más de REPORT_JOB_STALE_SECONDS (un worker que murió a mitad); tras
+    REPORT_JOB_MAX_ATTEMPTS intentos se dan por fallidos.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(
+        seconds=settings.REPORT_JOB_STALE_SECONDS,
+    )
+
+    with db_tx.atomic():
+        jobs = list(
+            ReportJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status=ReportJob.STATUS_PENDING)
+                | Q(
+                    status=ReportJob.STATUS_RUNNING,
+                    started_at__lt=stale_before,
+                )
+            )
+            .order_by("created_at", "pk")[:limit]
+        )
+
+        exhausted = [
+            job.pk
+            for job in jobs
+            if job.attempts >= settings.REPORT_JOB_MAX_ATTEMPTS
+        ]
+        if exhausted:
+            ReportJob.objects.filter(pk__in=exhausted).update(
+                status=ReportJob.STATUS_FAILED,
+                error="El reporte superó el número máximo de intentos.",
+                finished_at=now,
+            )
+
+        claimed = [
+            job
+            for job in jobs
+            if job.pk not in exhausted
+        ]
+        ReportJob.objects.filter(
+            pk__in=[job.pk for job in claimed],
+        ).update(
+            status=ReportJob.STATUS_RUNNING,
+            started_at=now,
+            attempts=F("attempts") + 1,
+        )
+
+    for job in claimed:
+        job.status = ReportJob.STATUS_RUNNING
+        job.started_at = now
+        job.attempts += 1
+
+    return claimed
+
+
+def _error_message(exc) -> str:
+    if isinstance(exc, APIException):
+        return json.dumps(exc.detail, ensure_ascii=False)
+
+    if isinstance(exc, Http404):
+        return "No encontrado."
+
+    return "Error interno al calcular el reporte."
+
+
+def run_report_job(job) -> ReportJob:
+    """
+    Calcula el reporte del trabajo y guarda el resultado o el error. Si
+    otro worker recuperó el trabajo mientras tanto (el intento cambió),
+    el resultado de este se descarta.
+    """
+    view_class = _report_views().get(job.report)
+
+    try:
+        if view_class is None:
+            raise ValueError(f"Reporte desconocido: {job.report}")
+
+        with replica_reads():
+            result = view_class.run_report(
+                user=job.requested_by,
+                params=job.params,
+            )
+    except (APIException, Http404) as exc:
+        fields = {
+            "status": ReportJob.STATUS_FAILED,
+            "error": _error_message(exc),
+        }
+    except Exception as exc:
+        logger.exception(
+            "Falló el reporte %s (%s)",
+            job.public_id,
+            job.report,
+        )
+        fields = {
+            "status": ReportJob.STATUS_FAILED,
+            "error": _error_message(exc),
+        }
+    else:
+        fields = {
+            "status": ReportJob.STATUS_DONE,
+            # Mismo JSON que devolvería la respuesta síncrona.
+            "result": json.loads(json.dumps(result, cls=JSONEncoder)),
+        }
+
+    fields["finished_at"] = timezone.now()
+    ReportJob.objects.filter(
+        pk=job.pk,
+        status=ReportJob.STATUS_RUNNING,
+        attempts=job.attempts,
+    ).update(**fields)
+
+    for name, value in fields.items():
+        setattr(job, name, value)
+
+    return job
+
+
+def purge_report_jobs(*, older_than) -> int:
+    deleted, _ = ReportJob.objects.filter(
+        status__in=[
+            ReportJob.STATUS_DONE,
+            ReportJob.STATUS_FAILED,
+        ],
+        finished_at__lt=older_than,
+    ).delete()
+
+    return deleted
@@ -0,0 +1,90 @@
+"""
+Tablas que leen los reportes.
+
+`archive_closed_periods` traslada el historial liquidado de los meses
+cerrados a las tablas Archived*, que repiten los campos y las relaciones
+de las activas. Un reporte cuyo rango empieza antes de
+`Business.archived_until` consulta las dos tablas con la misma consulta
+y suma los resultados; uno posterior solo lee las activas.
+"""
+
+from core.models import (
+    ArchivedDebt,
+    ArchivedDebtPayment,
+    ArchivedStockMovement,
+    ArchivedTransaction,
+    ArchivedTransactionDetail,
+    Debt,
+    DebtPayment,
+    StockMovement,
+    Transaction,
+    TransactionDetail,
+)
+
+
+HOT_MODELS = {
+    Transaction: Transaction,
+    TransactionDetail: TransactionDetail,
+    Debt: Debt,
+    DebtPayment: DebtPayment,
+    StockMovement: StockMovement,
+}
+
+ARCHIVED_MODELS = {
+    Transaction: ArchivedTransaction,
+    TransactionDetail: ArchivedTransactionDetail,
+    Debt: ArchivedDebt,
+    DebtPayment: ArchivedDebtPayment,
+    StockMovement: ArchivedStockMovement,
+}
+
+
+def reads_archive(*, business, start=None) -> bool:
+    """
+    Indica si un rango que empieza en `start` puede tocar filas archivadas
+    del negocio. Se decide con `Business.archived_until`, sin consultas.
+    """
+    watermark = business.archived_until
+
+    if watermark is None:
+        return False
+
+    return start is None or start < watermark
+
+
+def report_sources(*, business, start=None) -> list[dict]:
+    """
+    Modelos que debe consultar un reporte de `business` para el rango de
+    `created_at` que empieza en `start`, indexados por el modelo activo.
+
+    Lo archivado está liquidado y pertenece a meses cerrados: un pago
+    archivado tiene `payment_date` anterior a la marca y una deuda
+    archivada está saldada antes de ella. Los reportes de pagos o saldos
+    pasan el inicio de su rango igual que los de transacciones.
+    """
+    if reads_archive(business=business, start=start):
+        return [HOT_MODELS, ARCHIVED_MODELS]
+
+    return [HOT_MODELS]
+
+
+def aggregate_sources(querysets, **aggregates) -> dict:
+    """
+    `aggregate()` de cada queryset con los resultados sumados. Solo es
+    válido para agregados aditivos (`Count` y `Sum`); un valor es None
+    cuando lo es en todas las fuentes, igual que `Sum` sin filas.
+    """
+    totals = dict.fromkeys(aggregates)
+
+    for queryset in querysets:
+        for name, value in queryset.aggregate(**aggregates).items():
+            if value is None:
+                continue
+
+            totals[name] = (
+                value
+                if totals[name] is None
+                else totals[name] + value
+            )
+
+    return totals
@@ -0,0 +1,249 @@
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone as django_timezone
+
+from core.models import (
+    ArchivedStockMovement,
+    Product,
+    ProductStockSnapshot,
+    StockMovement,
+)
+from core.services.report_sources import reads_archive
+
+
+def _net_movements(
+    *,
+    business,
+    product_ids,
+    start=None,
+    end=None,
+) -> dict[int, int]:
+    """
+    Suma de movimientos por producto. Los archivados solo se leen si el
+    rango empieza antes de la marca de archivo del negocio.
+    """
+    net = {}
+    models = (
+        (StockMovement, ArchivedStockMovement)
+        if reads_archive(business=business, start=start)
+        else (StockMovement,)
+    )
+
+    for model in models:
+        movements = model.objects.filter(
+            product_id__in=product_ids,
+        )
+
+        if start is not None:
+            movements = movements.filter(created_at__gte=start)
+
+        if end is not None:
+            movements = movements.filter(created_at__lt=end)
+
+        for row in (
+            movements
+            .values("product_id")
+            .annotate(net=Coalesce(Sum("quantity"), 0))
+        ):
+            net[row["product_id"]] = (
+                net.get(row["product_id"], 0)
+                + int(row["net"])
+            )
+
+    return net
+
+
+def _stock_from_current(*, business, products, at) -> dict[int, int]:
+    """Stock en `at` restando al stock actual los movimientos posteriores."""
+    current = {
+        product.pk: product.stock
+        for product in products
+    }
+    after = _net_movements(
+        business=business,
+        product_ids=list(current),
+        start=at,
+    )
+
+    return {
+        product_id: stock - after.get(product_id, 0)
+        for product_id, stock in current.items()
+    }
+
+
+def nearest_snapshot_instant(*, business, at):
+    """
+    Instante de foto del negocio más cercano a `at`, o None cuando el
+    stock actual queda más cerca que cualquier foto.
+    """
+    before = (
+        ProductStockSnapshot.objects
+        .filter(business=business, taken_at__lte=at)
+        .order_by("-taken_at")
+        .values_list("taken_at", flat=True)
+        .first()
+    )
+    after = (
+        ProductStockSnapshot.objects
+        .filter(business=business, taken_at__gt=at)
+        .order_by("taken_at")
+        .values_list("taken_at", flat=True)
+        .first()
+    )
+
+    candidates = [
+        instant
+        for instant in (before, after)
+        if instant is not None
+    ]
+    if not candidates:
+        return None
+
+    instant = min(candidates, key=lambda value: abs(value - at))
+    now = django_timezone.now()
+    if abs(now - at) <= abs(instant - at):
+        return None
+
+    return instant
+
+
+def stock_at(*, business, at, products=None) -> dict[int, int]:
+    """
+    Reconstruye el stock por producto en el instante `at`.
+
+    Parte de la foto más cercana y suma o resta solo los movimientos entre
+    la foto y `at`. Los productos sin foto en ese instante se reconstruyen
+    desde el stock actual.
+    """
+    if products is None:
+        products = Product.objects.filter(business=business)
+
+    products = list(products.only("pk", "stock"))
+    instant = nearest_snapshot_instant(business=business, at=at)
+
+    if instant is None:
+        return _stock_from_current(business=business, products=products, at=at)
+
+    snapshots = dict(
+        ProductStockSnapshot.objects
+        .filter(
+            business=business,
+            taken_at=instant,
+            product_id__in=[product.pk for product in products],
+        )
+        .values_list("product_id", "stock")
+    )
+
+    if instant <= at:
+        delta = _net_movements(
+            business=business,
+            product_ids=list(snapshots),
+            start=instant,
+            end=at,
+        )
+        stock = {
+            product_id: snapshot_stock + delta.get(product_id, 0)
+            for product_id, snapshot_stock in snapshots.items()
+        }
+    else:
+        delta = _net_movements(
+            business=business,
+            product_ids=list(snapshots),
+            start=at,
+            end=instant,
+        )
+        stock = {
+            product_id: snapshot_stock - delta.get(product_id, 0)
+            for product_id, snapshot_stock in snapshots.items()
+        }
+
+    missing = [
+        product
+        for product in products
+        if product.pk not in snapshots
+    ]
+    if missing:
+        stock.update(
+            _stock_from_current(business=business, products=missing, at=at)
+        )
+
+    return stock
+
+
+def take_stock_snapshots(*, business, taken_at) -> int:
+    """
+    Guarda la foto de stock de todos los productos del negocio en
+    `taken_at`. Los productos que ya tienen foto en ese instante se omiten.
+    """
+    existing = set(
+        ProductStockSnapshot.objects
+        .filter(business=business, taken_at=taken_at)
+        .values_list("product_id", flat=True)
+    )
+    products = (
+        Product.objects
+        .filter(business=business)
+        .exclude(pk__in=existing)
+    )
+    stock = _stock_from_current(
+        business=business,
+        products=products.only("pk", "stock"),
+        at=taken_at,
+    )
+
+    created = ProductStockSnapshot.objects.bulk_create(
+        [
+            ProductStockSnapshot(
+                business=business,
+                product_id=product_id,
+                taken_at=taken_at,
+                stock=product_stock,
+            )
+            for product_id, product_stock in stock.items()
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+    return len(created)
+
+
+def find_stock_snapshot_drift(*, business) -> list[dict]:
+    """
+    Compara cada foto del negocio con el registro de movimientos.
+
+    El stock esperado en una foto es el stock actual menos los movimientos
+    posteriores; una diferencia indica stock modificado sin movimiento.
+    """
+    drift = []
+    instants = (
+        ProductStockSnapshot.objects
+        .filter(business=business)
+        .order_by("taken_at")
+        .values_list("taken_at", flat=True)
+        .distinct()
+    )
+
+    for instant in instants:
+        snapshots = list(
+            ProductStockSnapshot.objects
+            .filter(business=business, taken_at=instant)
+            .select_related("product")
+        )
+        expected = _stock_from_current(
+            business=business,
+            products=[snapshot.product for snapshot in snapshots],
+            at=instant,
+        )
+
+        for snapshot in snapshots:
+            expected_stock = expected[snapshot.product_id]
+            if snapshot.stock != expected_stock:
+                drift.append({
+                    "product_public_id": str(snapshot.product.public_id),
+                    "taken_at": instant,
+                    "snapshot_stock": snapshot.stock,
+                    "expected_stock": expected_stock,
+                })
+
+    return drift
@@ -0,0 +1,217 @@
+from django.db import transaction as db_tx
+from django.db.models import F, OuterRef, Subquery
+from django.utils import timezone as django_timezone
+from rest_framework.exceptions import ValidationError
+
+from core.models import (
+    Product,
+    StockMovement,
+    StocktakeCount,
+    StocktakeSession,
+)
+from core.services.inventory import lock_products_for_inventory
+
+
+BULK_BATCH_SIZE = 1000
+
+
+def _lock_open_session(session):
+    session = (
+        StocktakeSession.objects
+        .select_for_update()
+        .get(pk=session.pk)
+    )
+
+    if session.status != StocktakeSession.STATUS_OPEN:
+        raise ValidationError({
+            "status": "El conteo físico ya no está abierto.",
+        })
+
+    return session
+
+
+@db_tx.atomic
+def record_stocktake_counts(*, session, counts) -> int:
+    """
+    Registra o reemplaza las cantidades contadas de una sesión abierta.
+
+    `counts` es una lista de `(product_public_id, counted_quantity)`; si un
+    producto aparece varias veces prevalece la última cantidad. Los
+    productos se resuelven en una consulta y los conteos se escriben con
+    un único upsert por lote.
+    """
+    session = _lock_open_session(session)
+
+    quantities = {
+        product_public_id: counted_quantity
+        for product_public_id, counted_quantity in counts
+    }
+    product_ids = dict(
+        Product.objects
+        .filter(
+            business_id=session.business_id,
+            public_id__in=quantities,
+        )
+        .values_list("public_id", "pk")
+    )
+
+    if len(product_ids) != len(quantities):
+        raise ValidationError({
+            "counts": (
+                "Uno o más productos no existen o no pertenecen "
+                "al negocio del conteo."
+            ),
+        })
+
+    StocktakeCount.objects.bulk_create(
+        [
+            StocktakeCount(
+                session=session,
+                product_id=product_ids[product_public_id],
+                counted_quantity=counted_quantity,
+            )
+            for product_public_id, counted_quantity in quantities.items()
+        ],
+        batch_size=BULK_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=["session", "product"],
+        update_fields=["counted_quantity", "updated_at"],
+    )
+
+    return len(quantities)
+
+
+def stocktake_differences(*, session, only_changed=True) -> list[dict]:
+    """
+    Diferencias entre lo contado y el stock, calculadas en una consulta.
+
+    En una sesión abierta se comparan con el stock actual; en una
+    aplicada se devuelven las diferencias guardadas al aplicarla.
+    """
+    counts = session.counts.all()
+
+    if session.status == StocktakeSession.STATUS_OPEN:
+        counts = counts.annotate(
+            current_expected_stock=F("product__stock"),
+            current_difference=(
+                F("counted_quantity")
+                - F("product__stock")
+            ),
+        )
+        expected_field = "current_expected_stock"
+        difference_field = "current_difference"
+    else:
+        expected_field = "expected_stock"
+        difference_field = "difference"
+
+    if only_changed:
+        counts = counts.exclude(**{difference_field: 0})
+
+    return [
+        {
+            "product_public_id": row["product__public_id"],
+            "product_name": row["product__title"],
+            "counted_quantity": row["counted_quantity"],
+            "expected_stock": row[expected_field],
+            "difference": row[difference_field],
+        }
+        for row in (
+            counts
+            .order_by("product__title", "product_id")
+            .values(
+                "product__public_id",
+                "product__title",
+                "counted_quantity",
+                expected_field,
+                difference_field,
+            )
+        )
+    ]
+
+
+@db_tx.atomic
+def apply_stocktake(*, session, applied_by) -> int:
+    """
+    Ajusta el stock de todos los productos contados en una sola pasada.
+
+    Los productos se bloquean una vez en orden de PK. Con el stock ya
+    bloqueado, las diferencias de los conteos y el nuevo stock se escriben
+    con un UPDATE para toda la sesión, y los movimientos de ajuste con
+    bulk_create. Devuelve el número de productos ajustados.
+    """
+    session = _lock_open_session(session)
+    counts = list(
+        session.counts
+        .order_by("product_id")
+        .values_list("product_id", "counted_quantity")
+    )
+
+    if counts:
+        products = lock_products_for_inventory(
+            product_ids=[product_id for product_id, _ in counts],
+            business_id=session.business_id,
+        )
+    else:
+        products = {}
+
+    product_stock = Subquery(
+        Product.objects
+        .filter(pk=OuterRef("product_id"))
+        .values("stock")[:1]
+    )
+    session.counts.update(
+        expected_stock=product_stock,
+        difference=F("counted_quantity") - product_stock,
+    )
+
+    adjusted = session.counts.exclude(difference=0)
+    Product.objects.filter(
+        pk__in=adjusted.values("product_id"),
+    ).update(
+        stock=Subquery(
+            adjusted
+            .filter(product_id=OuterRef("pk"))
+            .values("counted_quantity")[:1]
+        ),
+        updated_at=django_timezone.now(),
+    )
+
+    note = f"Conteo físico {session.public_id}"
+    movements = [
+        StockMovement(
+            product_id=product_id,
+            created_by=applied_by,
+            type="adjustment",
+            quantity=counted_quantity - products[product_id].stock,
+            note=note,
+        )
+        for product_id, counted_quantity in counts
+        if counted_quantity != products[product_id].stock
+    ]
+    StockMovement.objects.bulk_create(
+        movements,
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+    session.status = StocktakeSession.STATUS_APPLIED
+    session.applied_by = applied_by
+    session.applied_at = django_timezone.now()
+    session.save(
+        update_fields=[
+            "status",
+            "applied_by",
+            "applied_at",
+            "updated_at",
+        ]
+    )
+
+    return len(movements)
+
+
+@db_tx.atomic
+def cancel_stocktake(*, session) -> StocktakeSession:
+    session = _lock_open_session(session)
+    session.status = StocktakeSession.STATUS_CANCELLED
+    session.save(update_fields=["status", "updated_at"])
+
+    return session
@@ -0,0 +1,681 @@
+"""
+Volcado y carga de todas las filas de un negocio.
+
+El archivo es NDJSON comprimido con gzip:
+
+- una cabecera con formato, versión y public_id del negocio;
+- los usuarios y estados referenciados, que se emparejan por correo y
+  por nombre en el destino en lugar de copiarse con su id;
+- por cada modelo de TENANT_MODELS, una línea con sus columnas seguida
+  de una fila por línea como arreglo JSON, y una línea de cierre con el
+  número de filas.
+
+La carga lee el archivo en orden, reserva ids nuevos por bloque y
+reescribe las claves foráneas con los ids asignados a los padres, que
+siempre aparecen antes que los hijos. Las tablas de archivo toman sus
+ids de la secuencia de su tabla activa. En PostgreSQL cada bloque entra
+con COPY; en otros motores, con un INSERT por lotes. Se evita
+`bulk_create` porque `auto_now` y `auto_now_add` sobrescribirían las
+fechas originales.
+"""
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+from django.db import connections, router
+from django.db import transaction as db_tx
+from django.db.models import JSONField
+from django.utils import timezone as django_timezone
+from rest_framework.exceptions import ValidationError
+
+from core.models import (
+    ActivityLog,
+    ArchivedDebt,
+    ArchivedDebtPayment,
+    ArchivedStockMovement,
+    ArchivedTransaction,
+    ArchivedTransactionDetail,
+    Budget,
+    Business,
+    BusinessMembership,
+    CashMovement,
+    CashRegister,
+    CommissionSettlement,
+    Customer,
+    Debt,
+    DebtPayment,
+    Employee,
+    EmployeeCommissionAccrual,
+    EmployeeCommissionPlan,
+    EntityStatus,
+    Goal,
+    GoalProgress,
+    MonthlyClosure,
+    Notification,
+    PaymentMethod,
+    Product,
+    ProductCategory,
+    ProductStockSnapshot,
+    Reminder,
+    ReportJob,
+    StockMovement,
+    StocktakeCount,
+    StocktakeSession,
+    Supplier,
+    Transaction,
+    TransactionDetail,
+    User,
+)
+from core.services.archive import (
+    ARCHIVE_MODELS,
+    HOT_MODEL_BY_ARCHIVE,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+DUMP_FORMAT = "playnow-tenant"
+DUMP_VERSION = 1
+DUMP_CHUNK_SIZE = 5000
+
+# Modelo y ruta hasta Business. Orden de carga: padres antes que hijos.
+TENANT_MODELS = (
+    (Business, "pk"),
+    (Employee, "business"),
+    (BusinessMembership, "business"),
+    (ProductCategory, "business"),
+    (Product, "business"),
+    (Customer, "business"),
+    (Supplier, "business"),
+    (PaymentMethod, "business"),
+    (CashRegister, "business"),
+    (CashMovement, "cash_register__business"),
+    (Transaction, "business"),
+    (TransactionDetail, "transaction__business"),
+    (Debt, "transaction__business"),
+    (DebtPayment, "debt__transaction__business"),
+    (StockMovement, "product__business"),
+    (Notification, "business"),
+    (Reminder, "business"),
+    (Budget, "business"),
+    (Goal, "business"),
+    (GoalProgress, "goal__business"),
+    (ActivityLog, "business"),
+    (ProductStockSnapshot, "business"),
+    (StocktakeSession, "business"),
+    (StocktakeCount, "session__business"),
+    (EmployeeCommissionPlan, "employee__business"),
+    (CommissionSettlement, "employee__business"),
+    (EmployeeCommissionAccrual, "business"),
+    (MonthlyClosure, "business"),
+    (ArchivedTransaction, "business"),
+    (ArchivedTransactionDetail, "transaction__business"),
+    (ArchivedDebt, "transaction__business"),
+    (ArchivedDebtPayment, "debt__transaction__business"),
+    (ArchivedStockMovement, "product__business"),
+)
+
+# Filas del negocio que no se vuelcan: resultados efímeros.
+TENANT_EXCLUDED_MODELS = (
+    ReportJob,
+)
+
+# Modelos compartidos entre negocios: se emparejan en el destino.
+SHARED_USER_FIELDS = ("id", "email", "full_name", "phone")
+SHARED_STATUS_FIELDS = ("id", "name")
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return str(value)
+
+    if isinstance(value, UUID):
+        return str(value)
+
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def _dumps(value) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=_json_default)
+
+    return json.dumps(
+        value,
+        default=_json_default,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode()
+
+
+def _loads(line):
+    if orjson is not None:
+        return orjson.loads(line)
+
+    return json.loads(line)
+
+
+def _invalid_dump(message):
+    raise ValidationError({"dump": message})
+
+
+def _label(model) -> str:
+    return model._meta.label_lower
+
+
+def _columns(model) -> list[str]:
+    return [
+        field.attname
+        for field in model._meta.concrete_fields
+    ]
+
+
+def _tenant_queryset(model, lookup, business):
+    return model._default_manager.filter(**{lookup: business.pk})
+
+
+def _referenced_ids(business, related_model) -> set:
+    ids = set()
+
+    for model, lookup in TENANT_MODELS:
+        for field in model._meta.concrete_fields:
+            if not (
+                field.is_relation
+                and field.related_model is related_model
+            ):
+                continue
+
+            ids.update(
+                _tenant_queryset(model, lookup, business)
+                .exclude(**{f"{field.attname}__isnull": True})
+                .values_list(field.attname, flat=True)
+                .distinct()
+            )
+
+    return ids
+
+
+def export_tenant(
+    *,
+    business,
+    stream,
+    chunk_size=DUMP_CHUNK_SIZE,
+) -> dict[str, int]:
+    """
+    Escribe en `stream` (binario) todas las filas del negocio. Cada tabla
+    se lee con un cursor del lado del servidor en bloques de
+    `chunk_size`; la memoria no depende del tamaño del negocio.
+
+    En PostgreSQL todo el volcado lee la misma instantánea (REPEATABLE
+    READ), así que un hijo creado durante la exportación no puede
+    aparecer sin su padre.
+    """
+    connection = connections[router.db_for_write(Business)]
+    outermost = not connection.in_atomic_block
+
+    with db_tx.atomic(using=connection.alias):
+        if connection.vendor == "postgresql" and outermost:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SET TRANSACTION ISOLATION LEVEL REPEATABLE READ"
+                )
+
+        return _write_tenant(
+            business=business,
+            stream=stream,
+            chunk_size=chunk_size,
+        )
+
+
+def _write_tenant(*, business, stream, chunk_size):
+    write = stream.write
+
+    write(_dumps({
+        "type": "header",
+        "format": DUMP_FORMAT,
+        "version": DUMP_VERSION,
+        "business_public_id": business.public_id,
+        "exported_at": django_timezone.now(),
+    }) + b"\n")
+
+    write(_dumps({
+        "type": "users",
+        "rows": list(
+            User.objects
+            .filter(pk__in=_referenced_ids(business, User))
+            .order_by("pk")
+            .values(*SHARED_USER_FIELDS)
+        ),
+    }) + b"\n")
+    write(_dumps({
+        "type": "statuses",
+        "rows": list(
+            EntityStatus.objects
+            .filter(pk__in=_referenced_ids(business, EntityStatus))
+            .order_by("pk")
+            .values(*SHARED_STATUS_FIELDS)
+        ),
+    }) + b"\n")
+
+    counts = {}
+
+    for model, lookup in TENANT_MODELS:
+        columns = _columns(model)
+        write(_dumps({
+            "type": "table",
+            "model": _label(model),
+            "columns": columns,
+        }) + b"\n")
+
+        rows = (
+            _tenant_queryset(model, lookup, business)
+            .order_by("pk")
+            .values_list(*columns)
+            .iterator(chunk_size=chunk_size)
+        )
+        count = 0
+        for row in rows:
+            write(_dumps(row) + b"\n")
+            count += 1
+
+        write(_dumps({
+            "type": "end",
+            "model": _label(model),
+            "rows": count,
+        }) + b"\n")
+        counts[model.__name__] = count
+
+    return counts
+
+
+class _TenantLoader:
+    def __init__(self, *, create_missing_users, batch_size):
+        self.create_missing_users = create_missing_users
+        self.batch_size = batch_size
+        self.connection = connections[router.db_for_write(Business)]
+        self.tenant_models = {
+            _label(model): model
+            for model, _ in TENANT_MODELS
+        }
+        self.id_maps = {
+            model: {}
+            for model, _ in TENANT_MODELS
+        }
+        self.next_ids = {}
+        self.counts = {}
+
+    # -- Cabecera y modelos compartidos ---------------------------------
+
+    def load_header(self, record):
+        if (
+            record.get("type") != "header"
+            or record.get("format") != DUMP_FORMAT
+        ):
+            _invalid_dump("El archivo no es un volcado de negocio.")
+
+        if record.get("version") != DUMP_VERSION:
+            _invalid_dump(
+                f"Versión de volcado no soportada: {record.get('version')}."
+            )
+
+        if Business.objects.filter(
+            public_id=record["business_public_id"],
+        ).exists():
+            _invalid_dump(
+                "Ya existe un negocio con el public_id del volcado."
+            )
+
+    def load_users(self, rows):
+        emails = {
+            row["email"].strip().lower(): row
+            for row in rows
+        }
+        existing = dict(
+            User.objects
+            .filter(email__in=emails)
+            .values_list("email", "pk")
+        )
+        missing = sorted(set(emails) - set(existing))
+
+        if missing and not self.create_missing_users:
+            _invalid_dump(
+                "Faltan usuarios en el destino: " + ", ".join(missing)
+            )
+
+        for email in missing:
+            user = User.objects.create_user(
+                email=email,
+                full_name=emails[email]["full_name"],
+                phone=emails[email]["phone"],
+            )
+            existing[email] = user.pk
+
+        self.id_maps[User] = {
+            row["id"]: existing[email]
+            for email, row in emails.items()
+        }
+
+    def load_statuses(self, rows):
+        status_map = {}
+
+        for row in rows:
+            status, _ = EntityStatus.objects.get_or_create(
+                name=row["name"],
+            )
+            status_map[row["id"]] = status.pk
+
+        self.id_maps[EntityStatus] = status_map
+
+    # -- Tablas ----------------------------------------------------------
+
+    def start_table(self, record):
+        model = self.tenant_models.get(record["model"])
+        if model is None:
+            _invalid_dump(f"Modelo desconocido: {record['model']}.")
+
+        fields = {
+            field.attname: field
+            for field in model._meta.concrete_fields
+        }
+        unknown = set(record["columns"]) - set(fields)
+        if unknown:
+            _invalid_dump(
+                f"{record['model']} tiene columnas que el destino no "
+                f"conoce: {', '.join(sorted(unknown))}."
+            )
+
+        self.model = model
+        self.source_columns = record["columns"]
+        self.fields = [fields[name] for name in record["columns"]]
+        # Columnas añadidas al modelo después del volcado: su default.
+        self.defaults = [
+            field
+            for name, field in fields.items()
+            if name not in record["columns"]
+        ]
+        self.pk_index = record["columns"].index(model._meta.pk.attname)
+        self.fk_maps = [
+            self._fk_map(field)
+            for field in self.fields
+        ]
+        self.buffer = []
+        self.counts[model.__name__] = 0
+
+    def _fk_map(self, field):
+        if not field.is_relation:
+            return None
+
+        related = field.related_model
+        if related not in self.id_maps:
+            _invalid_dump(
+                f"{self.model.__name__}.{field.name} apunta a "
+                f"{related.__name__}, que no forma parte del volcado."
+            )
+
+        return self.id_maps[related]
+
+    def add_row(self, row):
+        self.buffer.append(row)
+
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    def end_table(self, record):
+        self.flush()
+
+        if record["rows"] != self.counts[self.model.__name__]:
+            _invalid_dump(
+                f"{record['model']}: se esperaban {record['rows']} filas "
+                f"y se leyeron {self.counts[self.model.__name__]}."
+            )
+
+    def _allocate_ids(self, count) -> list[int]:
+        # Las filas archivadas viven en el espacio de ids de su tabla
+        # activa: el archivo copia los ids y reabrir un mes los devuelve.
+        id_model = HOT_MODEL_BY_ARCHIVE.get(self.model, self.model)
+        table = id_model._meta.db_table
+
+        with self.connection.cursor() as cursor:
+            if self.connection.vendor == "postgresql":
+                cursor.execute(
+                    "SELECT nextval(pg_get_serial_sequence(%s, %s)) "
+                    "FROM generate_series(1, %s)",
+                    [table, id_model._meta.pk.column, count],
+                )
+                return [row[0] for row in cursor.fetchall()]
+
+            if id_model not in self.next_ids:
+                self.next_ids[id_model] = self._max_id(cursor, id_model) + 1
+
+            start = self.next_ids[id_model]
+            self.next_ids[id_model] = start + count
+
+            if (
+                self.model is not id_model
+                and self.connection.vendor == "sqlite"
+            ):
+                # Como `nextval`, reserva los ids en la secuencia de la
+                # tabla activa para que sus inserciones no los reutilicen.
+                cursor.execute(
+                    "UPDATE sqlite_sequence SET seq = MAX(seq, %s) "
+                    "WHERE name = %s",
+                    [start + count - 1, table],
+                )
+                if not cursor.rowcount:
+                    cursor.execute(
+                        "INSERT INTO sqlite_sequence (name, seq) "
+                        "VALUES (%s, %s)",
+                        [table, start + count - 1],
+                    )
+
+        return list(range(start, start + count))
+
+    def _max_id(self, cursor, id_model) -> int:
+        quote_name = self.connection.ops.quote_name
+        models = [id_model] + [
+            archive_model
+            for hot_model, archive_model in ARCHIVE_MODELS
+            if hot_model is id_model
+        ]
+        highest = 0
+
+        for model in models:
+            cursor.execute(
+                f"SELECT MAX({quote_name(model._meta.pk.column)}) "
+                f"FROM {quote_name(model._meta.db_table)}"
+            )
+            highest = max(highest, cursor.fetchone()[0] or 0)
+
+        if self.connection.vendor == "sqlite":
+            # AUTOINCREMENT no reutiliza ids de filas ya archivadas.
+            cursor.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = %s",
+                [id_model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            highest = max(highest, row[0] if row else 0)
+
+        return highest
+
+    def _remap(self, rows, new_ids):
+        id_map = self.id_maps[self.model]
+        pk_index = self.pk_index
+        remapped = []
+
+        for row, new_id in zip(rows, new_ids):
+            id_map[row[pk_index]] = new_id
+            row = list(row)
+            row[pk_index] = new_id
+
+            for index, fk_map in enumerate(self.fk_maps):
+                if fk_map is None or index == pk_index:
+                    continue
+
+                value = row[index]
+                if value is None:
+                    continue
+
+                try:
+                    row[index] = fk_map[value]
+                except KeyError:
+                    _invalid_dump(
+                        f"{self.model.__name__}.{self.fields[index].name} "
+                        f"referencia la fila {value}, que no está en el "
+                        "volcado."
+                    )
+
+            remapped.append(row)
+
+        return remapped
+
+    def flush(self):
+        if not self.buffer:
+            return
+
+        rows = self._remap(
+            self.buffer,
+            self._allocate_ids(len(self.buffer)),
+        )
+        self.buffer = []
+
+        if self.connection.vendor == "postgresql":
+            self._copy(rows)
+        else:
+            self._insert(rows)
+
+        self.counts[self.model.__name__] += len(rows)
+
+    def _default_values(self):
+        now = django_timezone.now()
+
+        return [
+            field.get_db_prep_save(
+                now
+                if getattr(field, "auto_now", False)
+                or getattr(field, "auto_now_add", False)
+                else field.get_default(),
+                self.connection,
+            )
+            for field in self.defaults
+        ]
+
+    def _column_sql(self):
+        quote_name = self.connection.ops.quote_name
+
+        return ", ".join(
+            quote_name(field.column)
+            for field in (*self.fields, *self.defaults)
+        )
+
+    def _copy(self, rows):
+        # COPY en formato texto: PostgreSQL interpreta las cadenas ISO,
+        # los decimales y los UUID del volcado; solo los JSONField
+        # necesitan volver a codificarse.
+        json_indexes = [
+            index
+            for index, field in enumerate(self.fields)
+            if isinstance(field, JSONField)
+        ]
+        defaults = self._default_values()
+        table = self.connection.ops.quote_name(self.model._meta.db_table)
+
+        with self.connection.cursor() as cursor:
+            with cursor.cursor.copy(
+                f"COPY {table} ({self._column_sql()}) FROM STDIN"
+            ) as copy:
+                for row in rows:
+                    for index in json_indexes:
+                        if row[index] is not None:
+                            row[index] = _dumps(row[index]).decode()
+                    copy.write_row((*row, *defaults))
+
+    def _insert(self, rows):
+        connection = self.connection
+        defaults = self._default_values()
+        prepared = [
+            [
+                None
+                if value is None
+                else field.get_db_prep_save(
+                    field.to_python(value),
+                    connection,
+                )
+                for field, value in zip(self.fields, row)
+            ] + defaults
+            for row in rows
+        ]
+        placeholders = ", ".join(
+            ["%s"] * (len(self.fields) + len(self.defaults))
+        )
+        table = connection.ops.quote_name(self.model._meta.db_table)
+
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {table} ({self._column_sql()}) "
+                f"VALUES ({placeholders})",
+                prepared,
+            )
+
+    def new_business(self):
+        return Business.objects.get(
+            pk=next(iter(self.id_maps[Business].values()))
+        )
+
+
+def import_tenant(
+    *,
+    stream,
+    create_missing_users=False,
+    batch_size=DUMP_CHUNK_SIZE,
+):
+    """
+    Carga un volcado de `export_tenant` en una sola transacción y
+    devuelve el negocio creado y las filas cargadas por modelo. Los ids
+    son nuevos; public_id, fechas y el resto de columnas se conservan.
+    """
+    loader = _TenantLoader(
+        create_missing_users=create_missing_users,
+        batch_size=batch_size,
+    )
+    handlers = {
+        "users": lambda record: loader.load_users(record["rows"]),
+        "statuses": lambda record: loader.load_statuses(record["rows"]),
+        "table": loader.start_table,
+        "end": loader.end_table,
+    }
+
+    with db_tx.atomic(using=loader.connection.alias):
+        lines = iter(stream)
+        try:
+            loader.load_header(_loads(next(lines)))
+        except StopIteration:
+            _invalid_dump("El archivo está vacío.")
+
+        for line in lines:
+            if not line.strip():
+                continue
+
+            record = _loads(line)
+
+            if isinstance(record, list):
+                loader.add_row(record)
+                continue
+
+            handler = handlers.get(record.get("type"))
+            if handler is None:
+                _invalid_dump(
+                    f"Registro desconocido: {record.get('type')}."
+                )
+            handler(record)
+
+        if not loader.id_maps[Business]:
+            _invalid_dump("El volcado no contiene el negocio.")
+
+        return loader.new_business(), loader.counts
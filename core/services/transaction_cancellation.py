@@ -4,6 +4,10 @@ from decimal import Decimal
 from django.db import transaction as db_tx
 
 from core.models import Debt, DebtPayment, Transaction
+from core.services.commission_accruals import (
+    sale_accrual_key,
+    sync_sale_accrual,
+)
 from core.services.debt_payments import DebtPaymentConflict
 from core.services.financial_flows import is_terminal_transaction_status
 from core.services.inventory import (
@@ -89,6 +93,11 @@ def cancel_transaction(
                 ),
             )
 
+    accrual_before = sale_accrual_key(transaction)
     transaction.status = terminal_status
     transaction.save(update_fields=["status", "updated_at"])
+    sync_sale_accrual(
+        before=accrual_before,
+        after=sale_accrual_key(transaction),
+    )
     return transaction
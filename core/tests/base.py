@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from rest_framework import status
 from rest_framework.test import APITestCase
 
@@ -46,6 +47,10 @@ class BusinessIsolationTestCase(
         )
 
     def setUp(self):
+        # Los contadores de throttling viven en la caché y no se revierten
+        # con la transacción de cada prueba.
+        cache.clear()
+
         self.authenticate_as(
             self.user_a
         )
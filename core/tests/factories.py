@@ -23,6 +23,10 @@ from core.models import (
     TransactionDetail,
     User,
 )
+from core.services.commission_accruals import (
+    sale_accrual_key,
+    sync_sale_accrual,
+)
 from core.services.inventory import record_stock_movement
 
 _sequence = count(1)
@@ -250,6 +254,11 @@ def create_transaction(
 
         tx.refresh_from_db()
 
+    sync_sale_accrual(
+        before=None,
+        after=sale_accrual_key(tx),
+    )
+
     return tx
 
 
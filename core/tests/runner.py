@@ -0,0 +1,28 @@
+import tempfile
+
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class PlayNowTestRunner(DiscoverRunner):
+    """
+    Las métricas de las peticiones de prueba se vuelcan a un directorio
+    temporal en lugar de `logs/metrics/` del repositorio.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+
+        self._metrics_dir = tempfile.TemporaryDirectory(
+            prefix="playnow-metrics-",
+        )
+        self._metrics_settings = override_settings(
+            METRICS_DIR=self._metrics_dir.name,
+        )
+        self._metrics_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._metrics_settings.disable()
+        self._metrics_dir.cleanup()
+
+        super().teardown_test_environment(**kwargs)
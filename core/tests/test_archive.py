@@ -0,0 +1,628 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone as django_timezone
+from rest_framework import status
+
+from core.models import (
+    ArchivedStockMovement,
+    ArchivedTransaction,
+    ArchivedTransactionDetail,
+    Debt,
+    DebtPayment,
+    MonthlyClosure,
+    PaymentMethod,
+    StockMovement,
+    Transaction,
+    TransactionDetail,
+)
+from core.services.archive import (
+    ARCHIVE_MODELS,
+    archive_closed_periods,
+    archive_cutoff,
+)
+from core.services.commission_accruals import find_commission_accrual_drift
+from core.services.monthly_summary import get_month_period
+from core.tests.base import (
+    BusinessIsolationTestCase,
+)
+from core.tests.factories import (
+    create_cash_register,
+    create_customer,
+    create_debt,
+    create_debt_payment,
+    create_employee,
+    create_payment_method,
+    create_product,
+    create_stock_movement,
+    create_supplier,
+    create_transaction,
+    create_transaction_detail,
+)
+
+
+@override_settings(ARCHIVE_HORIZON_MONTHS=12)
+class ArchiveClosedPeriodsTests(
+    BusinessIsolationTestCase
+):
+    def setUp(self):
+        super().setUp()
+
+        self.old_at = archive_cutoff() - timedelta(days=20)
+        local_old_at = django_timezone.localtime(self.old_at)
+
+        self.closure = MonthlyClosure.objects.create(
+            business=self.business_a,
+            year=local_old_at.year,
+            month=local_old_at.month,
+            summary={},
+            closed_by=self.user_a,
+        )
+
+        self.product = create_product(
+            business=self.business_a,
+            status=self.active_status,
+            stock=20,
+        )
+
+        self.sale = create_transaction(
+            business=self.business_a,
+            created_by=self.user_a,
+            status=self.active_status,
+            created_at=self.old_at,
+        )
+        self.detail = create_transaction_detail(
+            transaction=self.sale,
+            product=self.product,
+            quantity=2,
+        )
+        self.sale_movement = create_stock_movement(
+            product=self.product,
+            created_by=self.user_a,
+            movement_type="sale",
+            quantity=-2,
+            transaction=self.sale,
+            transaction_detail=self.detail,
+            created_at=self.old_at,
+        )
+        self.entry = create_stock_movement(
+            product=self.product,
+            created_by=self.user_a,
+            movement_type="entry",
+            quantity=5,
+            created_at=self.old_at,
+        )
+
+        self.pending_sale = create_transaction(
+            business=self.business_a,
+            created_by=self.user_a,
+            status=self.active_status,
+            is_debt=True,
+            created_at=self.old_at,
+        )
+        self.recent_sale = create_transaction(
+            business=self.business_a,
+            created_by=self.user_a,
+            status=self.active_status,
+        )
+
+    def _list(self, endpoint, **params):
+        return self.client.get(
+            endpoint,
+            {
+                "business_public_id": str(
+                    self.business_a.public_id
+                ),
+                **params,
+            },
+        )
+
+    def _public_ids(self, response):
+        return {
+            row["public_id"]
+            for row in response.data["results"]
+        }
+
+    def test_archive_tables_share_hot_columns(self):
+        for hot_model, archive_model in ARCHIVE_MODELS:
+            self.assertEqual(
+                [
+                    field.column
+                    for field in hot_model._meta.concrete_fields
+                ],
+                [
+                    field.column
+                    for field in archive_model._meta.concrete_fields
+                ],
+            )
+
+    def test_command_moves_only_settled_rows_of_closed_months(self):
+        output = StringIO()
+
+        call_command(
+            "archive_closed_periods",
+            "--business-public-id",
+            str(self.business_a.public_id),
+            "--batch-size",
+            "1",
+            stdout=output,
+        )
+
+        self.assertIn("Transaction=1", output.getvalue())
+        self.assertFalse(
+            Transaction.objects.filter(pk=self.sale.pk).exists()
+        )
+        self.assertFalse(
+            TransactionDetail.objects.filter(pk=self.detail.pk).exists()
+        )
+        self.assertFalse(
+            StockMovement.objects.filter(
+                pk__in=[self.sale_movement.pk, self.entry.pk],
+            ).exists()
+        )
+
+        archived = ArchivedTransaction.objects.get(pk=self.sale.pk)
+        self.assertEqual(archived.public_id, self.sale.public_id)
+        self.assertEqual(archived.created_at, self.sale.created_at)
+        self.assertEqual(
+            ArchivedTransactionDetail.objects.get(
+                pk=self.detail.pk,
+            ).transaction_id,
+            self.sale.pk,
+        )
+        self.assertEqual(
+            ArchivedStockMovement.objects.get(
+                pk=self.sale_movement.pk,
+            ).transaction_detail_id,
+            self.detail.pk,
+        )
+
+        self.assertTrue(
+            Transaction.objects.filter(
+                pk__in=[self.pending_sale.pk, self.recent_sale.pk],
+            ).count()
+            == 2
+        )
+
+    def test_dry_run_does_not_move_rows(self):
+        moved = archive_closed_periods(
+            business=self.business_a,
+            dry_run=True,
+        )
+
+        self.assertEqual(
+            moved,
+            {"Transaction": 1, "StockMovement": 1},
+        )
+        self.assertFalse(ArchivedTransaction.objects.exists())
+
+    def test_reopened_month_is_not_archived(self):
+        self.closure.status = MonthlyClosure.STATUS_REOPENED
+        self.closure.save(update_fields=["status"])
+
+        archive_closed_periods(business=self.business_a)
+
+        self.assertFalse(ArchivedTransaction.objects.exists())
+        self.assertFalse(ArchivedStockMovement.objects.exists())
+
+    def test_lists_and_detail_include_archived_rows(self):
+        archive_closed_periods(business=self.business_a)
+
+        response = self._list("/api/transactions/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self._public_ids(response),
+            {
+                str(self.sale.public_id),
+                str(self.pending_sale.public_id),
+                str(self.recent_sale.public_id),
+            },
+        )
+        self.assertEqual(response.data["count"], 3)
+
+        archived_row = next(
+            row
+            for row in response.data["results"]
+            if row["public_id"] == str(self.sale.public_id)
+        )
+        self.assertEqual(
+            [detail["public_id"] for detail in archived_row["details"]],
+            [str(self.detail.public_id)],
+        )
+
+        recent_only = self._list(
+            "/api/transactions/",
+            date_from=django_timezone.localdate().isoformat(),
+        )
+        self.assertEqual(
+            self._public_ids(recent_only),
+            {str(self.recent_sale.public_id)},
+        )
+
+        movements = self._list("/api/stock-movements/")
+        self.assertEqual(
+            self._public_ids(movements),
+            {
+                str(self.sale_movement.public_id),
+                str(self.entry.public_id),
+            },
+        )
+
+        detail_response = self.client.get(
+            f"/api/transactions/{self.sale.public_id}/"
+        )
+        self.assertEqual(
+            detail_response.status_code,
+            status.HTTP_200_OK,
+        )
+        self.assertEqual(
+            detail_response.data["total_value"],
+            "100.00",
+        )
+
+    def test_exports_include_archived_rows(self):
+        archive_closed_periods(business=self.business_a)
+
+        response = self._list(
+            "/api/transactions/export/",
+            export_format="ndjson",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(
+            rows[0]["public_id"],
+            str(self.recent_sale.public_id),
+        )
+        self.assertEqual(
+            {row["public_id"] for row in rows},
+            {
+                str(self.sale.public_id),
+                str(self.pending_sale.public_id),
+                str(self.recent_sale.public_id),
+            },
+        )
+
+        archived_row = next(
+            row
+            for row in rows
+            if row["public_id"] == str(self.sale.public_id)
+        )
+        self.assertEqual(
+            [detail["public_id"] for detail in archived_row["details"]],
+            [str(self.detail.public_id)],
+        )
+
+    def test_archived_rows_stay_isolated_between_businesses(self):
+        archive_closed_periods(business=self.business_a)
+        self.authenticate_as(self.user_b)
+
+        response = self.client.get(
+            f"/api/transactions/{self.sale.public_id}/"
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+
+    def test_inventory_report_and_commissions_are_unchanged(self):
+        params = {
+            "date_from": django_timezone.localdate(self.old_at).replace(
+                day=1,
+            ).isoformat(),
+            "date_to": django_timezone.localdate().isoformat(),
+        }
+        before = self._list("/api/reports/inventory-summary/", **params)
+
+        archive_closed_periods(business=self.business_a)
+
+        after = self._list("/api/reports/inventory-summary/", **params)
+        self.assertEqual(before.status_code, status.HTTP_200_OK)
+        self.assertEqual(before.data, after.data)
+        self.assertEqual(
+            find_commission_accrual_drift(business=self.business_a),
+            [],
+        )
+
+    def test_reopening_month_restores_archived_rows(self):
+        archive_closed_periods(business=self.business_a)
+
+        response = self.client.post(
+            f"/api/monthly-closures/{self.closure.public_id}/reopen/",
+            {"reason": "Corrección de una venta archivada."},
+            format="json",
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+        self.assertTrue(
+            Transaction.objects.filter(pk=self.sale.pk).exists()
+        )
+        self.assertEqual(
+            StockMovement.objects.filter(
+                pk__in=[self.sale_movement.pk, self.entry.pk],
+            ).count(),
+            2,
+        )
+        self.assertFalse(ArchivedTransaction.objects.exists())
+        self.assertFalse(ArchivedStockMovement.objects.exists())
+        self.business_a.refresh_from_db()
+        self.assertIsNone(self.business_a.archived_until)
+
+
+@override_settings(ARCHIVE_HORIZON_MONTHS=12)
+class ArchivedReportsTests(
+    BusinessIsolationTestCase
+):
+    """
+    Los reportes dan las mismas cifras antes y después de archivar el
+    mes que consultan.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        self.old_at = archive_cutoff() - timedelta(days=20)
+        self.old_date = django_timezone.localdate(self.old_at)
+        self.month_start = self.old_date.replace(day=1)
+        self.month_end = (
+            self.month_start + timedelta(days=32)
+        ).replace(day=1) - timedelta(days=1)
+
+        MonthlyClosure.objects.create(
+            business=self.business_a,
+            year=self.old_date.year,
+            month=self.old_date.month,
+            summary={},
+            closed_by=self.user_a,
+        )
+
+        self.cash = create_payment_method(
+            business=self.business_a,
+            status=self.active_status,
+            method_type=PaymentMethod.TYPE_CASH,
+        )
+        self.customer = create_customer(
+            business=self.business_a,
+            status=self.active_status,
+        )
+        self.supplier = create_supplier(
+            business=self.business_a,
+            status=self.active_status,
+        )
+        self.seller = create_employee(
+            business=self.business_a,
+            status=self.active_status,
+        )
+        self.register = create_cash_register(
+            business=self.business_a,
+            employee=self.seller,
+            opened_by=self.user_a,
+            open_time=self.old_at - timedelta(days=1),
+        )
+
+        for total_value in (Decimal("120.00"), Decimal("80.00")):
+            sale = self._old_transaction(
+                total_value=total_value,
+                customer=self.customer,
+                employee=self.seller,
+            )
+            Transaction.objects.filter(pk=sale.pk).update(
+                cash_register=self.register,
+            )
+
+        self._old_transaction(
+            transaction_type="purchase",
+            total_value=Decimal("50.00"),
+            supplier=self.supplier,
+        )
+        self._old_transaction(
+            transaction_type="expense",
+            total_value=Decimal("30.00"),
+        )
+
+        # Venta a crédito saldada dentro del mes: se archiva con su deuda
+        # y su pago.
+        debt_sale = self._old_transaction(
+            total_value=Decimal("60.00"),
+            customer=self.customer,
+        )
+        debt = create_debt(
+            transaction=debt_sale,
+            paid_amount=Decimal("60.00"),
+        )
+        Debt.objects.filter(pk=debt.pk).update(due_date=self.old_date)
+        payment = create_debt_payment(
+            debt=debt,
+            payment_method=self.cash,
+            amount=Decimal("60.00"),
+            created_by=self.user_a,
+        )
+        DebtPayment.objects.filter(pk=payment.pk).update(
+            payment_date=self.old_date,
+            created_at=self.old_at,
+            cash_register=self.register,
+        )
+
+        create_transaction(
+            business=self.business_a,
+            created_by=self.user_a,
+            status=self.active_status,
+            payment_method=self.cash,
+            customer=self.customer,
+        )
+
+    def _old_transaction(self, **kwargs):
+        return create_transaction(
+            business=self.business_a,
+            created_by=self.user_a,
+            status=self.active_status,
+            payment_method=self.cash,
+            created_at=self.old_at,
+            **kwargs,
+        )
+
+    def _month_params(self):
+        return {
+            "business_public_id": str(self.business_a.public_id),
+            "date_from": self.month_start.isoformat(),
+            "date_to": self.month_end.isoformat(),
+        }
+
+    def _assert_unchanged_by_archive(self, endpoint, params, ignore=()):
+        before = self.client.get(endpoint, params)
+        self.assertEqual(
+            before.status_code,
+            status.HTTP_200_OK,
+            msg=before.data,
+        )
+
+        moved = archive_closed_periods(business=self.business_a)
+        self.assertEqual(moved["Transaction"], 5)
+        self.assertEqual(moved["DebtPayment"], 1)
+
+        after = self.client.get(endpoint, params)
+        self.assertEqual(after.status_code, status.HTTP_200_OK)
+        for key in ignore:
+            before.data.pop(key)
+            after.data.pop(key)
+        self.assertEqual(after.data, before.data)
+
+        return after.data
+
+    def test_monthly_summary(self):
+        data = self._assert_unchanged_by_archive(
+            "/api/reports/monthly-summary/",
+            {
+                "business_public_id": str(self.business_a.public_id),
+                "year": self.old_date.year,
+                "month": self.old_date.month,
+            },
+        )
+
+        self.assertEqual(data["transactions"]["sales"]["count"], 3)
+        self.assertEqual(data["transactions"]["sales"]["total"], "260.00")
+        self.assertEqual(data["debts"]["payments_received"], "60.00")
+
+    def test_customers_summary(self):
+        data = self._assert_unchanged_by_archive(
+            "/api/reports/customers-summary/",
+            self._month_params(),
+        )
+
+        self.assertEqual(data["totals"]["transactions_count"], 3)
+        self.assertEqual(data["totals"]["total_amount"], "260.00")
+
+    def test_suppliers_summary(self):
+        data = self._assert_unchanged_by_archive(
+            "/api/reports/suppliers-summary/",
+            self._month_params(),
+        )
+
+        self.assertEqual(data["totals"]["total_amount"], "50.00")
+
+    def test_payments_summary(self):
+        data = self._assert_unchanged_by_archive(
+            "/api/reports/payments-summary/",
+            self._month_params(),
+        )
+
+        self.assertEqual(data["totals"]["payments_received"], "260.00")
+        self.assertEqual(data["totals"]["payments_made"], "80.00")
+
+    def test_debts_summary(self):
+        data = self._assert_unchanged_by_archive(
+            "/api/reports/debts-summary/",
+            self._month_params(),
+        )
+
+        self.assertEqual(data["generated"]["total"], "60.00")
+        self.assertEqual(data["payments_received"]["total"], "60.00")
+        self.assertEqual(len(data["results"]), 1)
+
+    def test_dashboard(self):
+        data = self._assert_unchanged_by_archive(
+            "/api/dashboard/overview/",
+            {
+                **self._month_params(),
+                "date_to": django_timezone.localdate().isoformat(),
+            },
+        )
+
+        self.assertEqual(data["cards"]["sales_total"], "360.00")
+        self.assertEqual(data["cards"]["payments_received"], "360.00")
+
+    def test_cash_register_closing_preview(self):
+        data = self._assert_unchanged_by_archive(
+            f"/api/cash-registers/{self.register.public_id}/closing-preview/",
+            {},
+            # Fin de la sesión: el momento de cada consulta.
+            ignore=("period",),
+        )
+
+        # Las dos ventas archivadas y la reciente, en efectivo.
+        self.assertEqual(data["sales"]["cash"], Decimal("300.00"))
+        self.assertEqual(
+            data["cash_debt_payments_received"],
+            Decimal("60.00"),
+        )
+
+    def test_reports_after_watermark_skip_archive_tables(self):
+        archive_closed_periods(business=self.business_a)
+
+        self.business_a.refresh_from_db()
+        self.assertEqual(
+            self.business_a.archived_until,
+            get_month_period(
+                year=self.old_date.year,
+                month=self.old_date.month,
+            )["end_datetime"],
+        )
+
+        today = django_timezone.localdate()
+        archive_tables = [
+            model._meta.db_table
+            for _, model in ARCHIVE_MODELS
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                "/api/dashboard/overview/",
+                {
+                    "business_public_id": str(self.business_a.public_id),
+                    "date_from": today.replace(day=1).isoformat(),
+                    "date_to": today.isoformat(),
+                },
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([
+            query["sql"]
+            for query in queries.captured_queries
+            if any(table in query["sql"] for table in archive_tables)
+        ])
+
+    def test_employee_sales(self):
+        data = self._assert_unchanged_by_archive(
+            "/api/reports/employee-sales/",
+            {
+                **self._month_params(),
+                "employee_public_id": str(self.seller.public_id),
+            },
+        )
+
+        self.assertEqual(data["summary"]["sales_count"], 2)
+        self.assertEqual(len(data["transactions"]), 2)
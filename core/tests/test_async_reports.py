@@ -0,0 +1,217 @@
+import json
+from datetime import timedelta
+from uuid import uuid4
+
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.test import AsyncClient, override_settings
+from django.urls import path, resolve
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.async_views import async_report_view
+from core.models import ReportJob
+from core.tests.base import BusinessIsolationTestCase
+from core.tests.factories import (
+    create_customer,
+    create_debt,
+    create_product,
+    create_transaction,
+)
+from core.views import (
+    CustomerSummaryView,
+    DashboardOverviewView,
+    DebtSummaryView,
+    InventorySummaryView,
+    MonthlySummaryView,
+    PaymentSummaryView,
+    SupplierSummaryView,
+)
+
+
+# URLconf de `test_asgi_stack_runs_without_sync_adapters`.
+urlpatterns = [
+    path(
+        "api/dashboard/overview/",
+        async_report_view(DashboardOverviewView).as_view(),
+    ),
+]
+
+
+class AsyncReportViewTests(BusinessIsolationTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.customer = create_customer(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+        create_product(
+            business=cls.business_a,
+            status=cls.active_status,
+            stock=2,
+        )
+        sale = create_transaction(
+            business=cls.business_a,
+            created_by=cls.user_a,
+            status=cls.active_status,
+            customer=cls.customer,
+            is_debt=True,
+        )
+        create_debt(transaction=sale)
+
+    def setUp(self):
+        super().setUp()
+
+        today = timezone.localdate()
+        self.factory = APIRequestFactory()
+        self.period = {
+            "business_public_id": str(self.business_a.public_id),
+            "date_from": str(today - timedelta(days=30)),
+            "date_to": str(today),
+        }
+
+    async def _async_get(self, view_class, params, user=None):
+        request = self.factory.get("/", params)
+        force_authenticate(request, user=user or self.user_a)
+
+        response = await async_report_view(view_class).as_view()(request)
+        response.render()
+
+        return response
+
+    async def test_async_views_return_the_synchronous_report(self):
+        today = timezone.localdate()
+        reports = (
+            (
+                MonthlySummaryView,
+                "/api/reports/monthly-summary/",
+                {
+                    "business_public_id": str(self.business_a.public_id),
+                    "year": today.year,
+                    "month": today.month,
+                },
+            ),
+            (
+                CustomerSummaryView,
+                "/api/reports/customers-summary/",
+                {
+                    **self.period,
+                    "customer_public_id": str(self.customer.public_id),
+                },
+            ),
+            (
+                SupplierSummaryView,
+                "/api/reports/suppliers-summary/",
+                self.period,
+            ),
+            (
+                PaymentSummaryView,
+                "/api/reports/payments-summary/",
+                self.period,
+            ),
+            (
+                DebtSummaryView,
+                "/api/reports/debts-summary/",
+                self.period,
+            ),
+            (
+                InventorySummaryView,
+                "/api/reports/inventory-summary/",
+                self.period,
+            ),
+            (
+                DashboardOverviewView,
+                "/api/dashboard/overview/",
+                self.period,
+            ),
+        )
+
+        for view_class, endpoint, params in reports:
+            with self.subTest(view=view_class.__name__):
+                response = await self._async_get(view_class, params)
+                synchronous = await sync_to_async(self.client.get)(
+                    endpoint,
+                    params,
+                )
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(
+                    json.loads(response.content),
+                    json.loads(synchronous.content),
+                )
+
+    async def test_async_views_keep_validation_and_access_rules(self):
+        invalid = await self._async_get(
+            DebtSummaryView,
+            {**self.period, "date_from": "no-es-fecha"},
+        )
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+        unknown = await self._async_get(
+            CustomerSummaryView,
+            {**self.period, "customer_public_id": str(uuid4())},
+        )
+        self.assertEqual(unknown.status_code, status.HTTP_404_NOT_FOUND)
+
+        foreign = await self._async_get(
+            DebtSummaryView,
+            self.period,
+            user=self.user_b,
+        )
+        self.assertEqual(foreign.status_code, status.HTTP_403_FORBIDDEN)
+
+        request = self.factory.get("/", self.period)
+        anonymous = await async_report_view(DebtSummaryView).as_view()(
+            request
+        )
+        self.assertEqual(
+            anonymous.status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+    async def test_async_views_can_enqueue_jobs(self):
+        response = await self._async_get(
+            DebtSummaryView,
+            {**self.period, "async": "true"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job = await ReportJob.objects.aget(
+            public_id=json.loads(response.content)["public_id"],
+        )
+        self.assertEqual(job.report, "debts-summary")
+        self.assertNotIn("async", job.params)
+
+    @override_settings(
+        DEBUG=True,
+        ROOT_URLCONF="core.tests.test_async_reports",
+    )
+    async def test_asgi_stack_runs_without_sync_adapters(self):
+        self.assertTrue(
+            iscoroutinefunction(resolve("/api/dashboard/overview/").func)
+        )
+
+        with mock.patch("django.core.handlers.base.logger") as logger:
+            response = await AsyncClient().get(
+                "/api/dashboard/overview/",
+                self.period,
+                headers={
+                    "Authorization": (
+                        f"Bearer {AccessToken.for_user(self.user_a)}"
+                    ),
+                },
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Con DEBUG, Django avisa de cada middleware que tuvo que adaptar.
+        adapted = [
+            call.args
+            for call in logger.debug.call_args_list
+            if "adapted" in call.args[0]
+        ]
+        self.assertEqual(adapted, [])
@@ -0,0 +1,154 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from core.models import (
+    BusinessMembership,
+    Product,
+)
+from core.serializers import TransactionDetailSerializer
+from core.tests.base import (
+    BusinessIsolationTestCase,
+)
+from core.tests.factories import (
+    create_payment_method,
+    create_product,
+    create_role_user,
+)
+
+
+class BatchedPublicIdResolutionTests(
+    BusinessIsolationTestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        (
+            cls.seller_user,
+            cls.seller_employee,
+            _,
+        ) = create_role_user(
+            business=cls.business_a,
+            role=(
+                BusinessMembership
+                .ROLE_SELLER
+            ),
+            status=cls.active_status,
+        )
+
+        cls.method = create_payment_method(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+
+        cls.products = [
+            create_product(
+                business=cls.business_a,
+                status=cls.active_status,
+                stock=50,
+            )
+            for _ in range(30)
+        ]
+
+        cls.foreign_product = create_product(
+            business=cls.business_b,
+            status=cls.active_status,
+        )
+
+    def _sale(self, product_public_ids):
+        return self.client.post(
+            "/api/transactions/",
+            {
+                "business_public_id": str(self.business_a.public_id),
+                "employee_public_id": str(
+                    self.seller_employee.public_id
+                ),
+                "payment_method_public_id": str(self.method.public_id),
+                "type": "sale",
+                "details": [
+                    {
+                        "product_public_id": str(public_id),
+                        "quantity": 1,
+                    }
+                    for public_id in product_public_ids
+                ],
+            },
+            format="json",
+        )
+
+    def test_detail_products_are_resolved_with_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._sale(
+                product.public_id
+                for product in self.products
+            )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_201_CREATED,
+            msg=response.data,
+        )
+
+        product_table = f'"{Product._meta.db_table}"'
+        resolve_queries = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+            and f"FROM {product_table}" in query["sql"]
+            and f'{product_table}."public_id"'
+            in query["sql"].split("WHERE")[-1]
+        ]
+
+        self.assertEqual(len(resolve_queries), 1)
+        self.assertIn(" IN (", resolve_queries[0])
+
+    def test_errors_keep_their_index_and_message(self):
+        response = self._sale(
+            [
+                self.products[0].public_id,
+                self.foreign_product.public_id,
+                "no-es-uuid",
+            ]
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+        errors = response.data["details"]
+        self.assertEqual(errors[0], {})
+        self.assertEqual(
+            [str(error) for error in errors[1]["product_public_id"]],
+            ["La relación indicada no es válida."],
+        )
+        self.assertIn("product_public_id", errors[2])
+
+    def test_prefetch_is_limited_to_member_businesses(self):
+        request = APIRequestFactory().post("/api/transactions/")
+        request.user = self.user_a
+
+        # Sin el serializer padre nadie limita el queryset del campo.
+        serializer = TransactionDetailSerializer(
+            data=[
+                {
+                    "product_public_id": str(self.products[0].public_id),
+                    "quantity": 1,
+                },
+                {
+                    "product_public_id": str(self.foreign_product.public_id),
+                    "quantity": 1,
+                },
+            ],
+            many=True,
+            context={"request": request},
+        )
+
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors[0], {})
+        self.assertEqual(
+            [str(error) for error in serializer.errors[1]["product_public_id"]],
+            ["La relación indicada no es válida."],
+        )
@@ -6,11 +6,13 @@ from core.models import (
     BusinessMembership,
     CashRegister,
     PaymentMethod,
+    Transaction,
 )
 from core.tests.base import (
     BusinessIsolationTestCase,
 )
 from core.tests.factories import (
+    create_cash_register,
     create_payment_method,
     create_role_user,
     create_transaction,
@@ -508,3 +510,104 @@ class CashRegisterTests(
             response.status_code,
             status.HTTP_404_NOT_FOUND,
         )
+
+    def test_transactions_are_linked_to_open_register(
+        self,
+    ):
+        open_response = (
+            self._open_register(
+                opening_balance="1000.00"
+            )
+        )
+
+        register_id = open_response.data[
+            "public_id"
+        ]
+
+        self.authenticate_as(
+            self.admin_user
+        )
+
+        expense_response = self.client.post(
+            "/api/transactions/",
+            {
+                "business_public_id": str(
+                    self.business_a.public_id
+                ),
+                "payment_method_public_id": str(
+                    self.cash_method.public_id
+                ),
+                "type": "expense",
+                "expense_amount": "100.00",
+                "payment_status": "paid",
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            expense_response.status_code,
+            status.HTTP_201_CREATED,
+            msg=expense_response.data,
+        )
+
+        expense = Transaction.objects.select_related(
+            "cash_register"
+        ).get(
+            public_id=expense_response.data[
+                "public_id"
+            ]
+        )
+
+        self.assertEqual(
+            str(expense.cash_register.public_id),
+            str(register_id),
+        )
+
+        other_register = create_cash_register(
+            business=self.business_a,
+            employee=self.admin_employee,
+            opened_by=self.admin_user,
+            register_status=CashRegister.STATUS_CLOSED,
+        )
+
+        other_sale = create_transaction(
+            business=self.business_a,
+            created_by=self.admin_user,
+            employee=self.seller_employee,
+            payment_method=self.cash_method,
+            status=self.active_status,
+            transaction_type="sale",
+            total_value=Decimal("999.00"),
+        )
+
+        Transaction.objects.filter(
+            pk=other_sale.pk
+        ).update(
+            cash_register=other_register
+        )
+
+        response = self.client.get(
+            (
+                "/api/cash-registers/"
+                f"{register_id}/"
+                "closing-preview/"
+            )
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+
+        self.assertEqual(
+            response.data["sales"]["cash"],
+            Decimal("0.00"),
+        )
+
+        self.assertEqual(
+            response.data[
+                "expected_closing_balance"
+            ],
+            Decimal("900.00"),
+        )
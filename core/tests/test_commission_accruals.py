@@ -0,0 +1,222 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from rest_framework import status
+
+from core.models import (
+    BusinessMembership,
+    EmployeeCommissionAccrual,
+    Transaction,
+)
+from core.services.commission_accruals import (
+    apply_commission_accrual,
+    find_commission_accrual_drift,
+    sale_accrual_key,
+)
+from core.tests.base import (
+    BusinessIsolationTestCase,
+)
+from core.tests.factories import (
+    create_commission_plan,
+    create_payment_method,
+    create_product,
+    create_role_user,
+)
+
+
+class EmployeeCommissionAccrualTests(
+    BusinessIsolationTestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.cashier_user, _, _ = create_role_user(
+            business=cls.business_a,
+            role=BusinessMembership.ROLE_CASHIER,
+            status=cls.active_status,
+        )
+
+        _, cls.seller, _ = create_role_user(
+            business=cls.business_a,
+            role=BusinessMembership.ROLE_SELLER,
+            status=cls.active_status,
+        )
+
+        cls.plan = create_commission_plan(
+            employee=cls.seller,
+            percentage=Decimal("10.00"),
+            valid_from=timezone.localdate().replace(day=1),
+        )
+
+        cls.payment_method = create_payment_method(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+
+    def setUp(self):
+        super().setUp()
+
+        self.product = create_product(
+            business=self.business_a,
+            status=self.active_status,
+            base_price=Decimal("100.00"),
+            stock=20,
+        )
+
+    def _create_sale(self, *, quantity):
+        self.authenticate_as(
+            self.cashier_user
+        )
+
+        response = self.client.post(
+            "/api/transactions/",
+            {
+                "business_public_id": str(
+                    self.business_a.public_id
+                ),
+                "employee_public_id": str(
+                    self.seller.public_id
+                ),
+                "payment_method_public_id": str(
+                    self.payment_method.public_id
+                ),
+                "type": "sale",
+                "details": [
+                    {
+                        "product_public_id": str(
+                            self.product.public_id
+                        ),
+                        "quantity": quantity,
+                    }
+                ],
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_201_CREATED,
+            msg=response.data,
+        )
+
+        return response.data["public_id"]
+
+    def _today_accrual(self):
+        return EmployeeCommissionAccrual.objects.get(
+            employee=self.seller,
+            date=timezone.localdate(),
+        )
+
+    def test_sales_accumulate_in_daily_accrual(self):
+        self._create_sale(quantity=2)
+        self._create_sale(quantity=1)
+
+        accrual = self._today_accrual()
+
+        self.assertEqual(accrual.business_id, self.business_a.id)
+        self.assertEqual(accrual.sales_count, 2)
+        self.assertEqual(accrual.sales_total, Decimal("300.00"))
+
+    def test_cancelled_sale_is_removed_from_accrual(self):
+        self._create_sale(quantity=2)
+        public_id = self._create_sale(quantity=1)
+
+        self.authenticate_as(self.user_a)
+        response = self.client.delete(
+            f"/api/transactions/{public_id}/"
+        )
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_204_NO_CONTENT,
+        )
+
+        accrual = self._today_accrual()
+
+        self.assertEqual(accrual.sales_count, 1)
+        self.assertEqual(accrual.sales_total, Decimal("200.00"))
+        self.assertEqual(
+            find_commission_accrual_drift(business=self.business_a),
+            [],
+        )
+
+    def test_rebuild_command_repairs_drift(self):
+        self._create_sale(quantity=2)
+        EmployeeCommissionAccrual.objects.update(
+            sales_count=7,
+            sales_total=Decimal("1.00"),
+        )
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "rebuild_commission_accruals",
+                "--business-public-id",
+                str(self.business_a.public_id),
+                "--check",
+                stdout=StringIO(),
+            )
+
+        stdout = StringIO()
+        call_command(
+            "rebuild_commission_accruals",
+            "--business-public-id",
+            str(self.business_a.public_id),
+            stdout=stdout,
+        )
+
+        self.assertIn("rows=1", stdout.getvalue())
+        accrual = self._today_accrual()
+        self.assertEqual(accrual.sales_count, 1)
+        self.assertEqual(accrual.sales_total, Decimal("200.00"))
+
+    def test_plan_edited_after_the_sales_applies_on_read(self):
+        self._create_sale(quantity=3)
+        self.plan.percentage = Decimal("4.00")
+        self.plan.save(update_fields=["percentage"])
+
+        self.authenticate_as(self.user_a)
+        today = timezone.localdate()
+        response = self.client.get(
+            "/api/reports/employee-commission/",
+            {
+                "business_public_id": str(self.business_a.public_id),
+                "employee_public_id": str(self.seller.public_id),
+                "date_from": str(today.replace(day=1)),
+                "date_to": str(today),
+            },
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+        self.assertEqual(response.data["sales_total"], "300.00")
+        self.assertEqual(response.data["commission_percentage"], "4.00")
+        self.assertEqual(response.data["commission_total"], "12.00")
+        self.assertEqual(
+            find_commission_accrual_drift(business=self.business_a),
+            [],
+        )
+
+    def test_later_sales_of_the_day_update_the_row_in_one_query(self):
+        self._create_sale(quantity=1)
+        before = sale_accrual_key(
+            Transaction.objects.filter(employee=self.seller).get()
+        )
+
+        with self.assertNumQueries(1):
+            apply_commission_accrual(
+                business_id=self.business_a.id,
+                employee_id=self.seller.id,
+                day=before[2],
+                sales_count=1,
+                sales_total=Decimal("50.00"),
+            )
+
+        accrual = self._today_accrual()
+        self.assertEqual(accrual.sales_count, 2)
+        self.assertEqual(accrual.sales_total, Decimal("150.00"))
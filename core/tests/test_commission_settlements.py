@@ -4,7 +4,9 @@ from datetime import (
     timezone,
 )
 from decimal import Decimal
+from io import StringIO
 
+from django.core.management import call_command
 from rest_framework import status
 
 from core.models import (
@@ -28,7 +30,7 @@ class CommissionSettlementTests(
     def setUpTestData(cls):
         super().setUpTestData()
 
-        cls.admin_user, _, _ = (
+        cls.admin_user, cls.admin_employee, _ = (
             create_role_user(
                 business=cls.business_a,
                 role=(
@@ -313,6 +315,141 @@ class CommissionSettlementTests(
             status.HTTP_405_METHOD_NOT_ALLOWED,
         )
 
+    def _bulk_settle(self):
+        return self.client.post(
+            "/api/commission-settlements/bulk/",
+            {
+                "business_public_id": str(
+                    self.business_a.public_id
+                ),
+                "period_start": (
+                    "2026-08-01"
+                ),
+                "period_end": (
+                    "2026-08-31"
+                ),
+            },
+            format="json",
+        )
+
+    def test_bulk_settlement_matches_individual_settlement(
+        self,
+    ):
+        response = self._bulk_settle()
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_201_CREATED,
+            msg=response.data,
+        )
+
+        self.assertEqual(
+            len(response.data["created"]),
+            1,
+        )
+
+        created = response.data["created"][0]
+
+        self.assertEqual(
+            str(created["employee_public_id"]),
+            str(self.seller.public_id),
+        )
+
+        self.assertEqual(
+            created["sales_count"],
+            2,
+        )
+
+        self.assertEqual(
+            created["commission_total"],
+            "75.00",
+        )
+
+        skipped_reasons = {
+            skip["employee_public_id"]: skip["reason"]
+            for skip in response.data["skipped"]
+        }
+
+        self.assertEqual(
+            skipped_reasons[
+                str(self.admin_employee.public_id)
+            ],
+            "no_commission_plan",
+        )
+
+    def test_bulk_settlement_skips_already_settled_employees(
+        self,
+    ):
+        self._create_settlement()
+
+        response = self._bulk_settle()
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_201_CREATED,
+            msg=response.data,
+        )
+
+        self.assertEqual(
+            response.data["created"],
+            [],
+        )
+
+        skipped_reasons = {
+            skip["employee_public_id"]: skip["reason"]
+            for skip in response.data["skipped"]
+        }
+
+        self.assertEqual(
+            skipped_reasons[
+                str(self.seller.public_id)
+            ],
+            "already_settled",
+        )
+
+        self.assertEqual(
+            CommissionSettlement.objects
+            .filter(employee=self.seller)
+            .count(),
+            1,
+        )
+
+    def test_settle_commissions_command(
+        self,
+    ):
+        stdout = StringIO()
+
+        call_command(
+            "settle_commissions",
+            business_public_id=str(
+                self.business_a.public_id
+            ),
+            period_start="2026-08-01",
+            period_end="2026-08-31",
+            created_by_email=self.admin_user.email,
+            stdout=stdout,
+        )
+
+        self.assertIn(
+            "created=1",
+            stdout.getvalue(),
+        )
+
+        settlement = (
+            CommissionSettlement.objects
+            .get(employee=self.seller)
+        )
+
+        self.assertEqual(
+            settlement.commission_total,
+            Decimal("75.00"),
+        )
+
+        self.assertEqual(
+            settlement.created_by,
+            self.admin_user,
+        )
+
 class CommissionSettlementPermissionTests(
     BusinessIsolationTestCase
 ):
@@ -411,3 +548,35 @@ class CommissionSettlementPermissionTests(
             response.status_code,
             status.HTTP_403_FORBIDDEN,
         )
+
+    def test_cashier_cannot_bulk_settle(
+        self,
+    ):
+        self.authenticate_as(
+            self.cashier_user
+        )
+
+        response = self.client.post(
+            "/api/commission-settlements/bulk/",
+            {
+                "business_public_id": str(
+                    self.business_a.public_id
+                ),
+                "period_start": (
+                    "2026-08-01"
+                ),
+                "period_end": (
+                    "2026-08-31"
+                ),
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+        self.assertFalse(
+            CommissionSettlement.objects.exists()
+        )
@@ -5,6 +5,8 @@ from datetime import (
 )
 from decimal import Decimal
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 
 from core.models import (
@@ -146,4 +148,139 @@ class EmployeeCommissionTests(
                 "commission_total"
             ],
             "75.00",
-        )
\ No newline at end of file
+        )
+
+    def _get_batch_preview(
+        self,
+    ):
+        return self.client.get(
+            "/api/reports/employee-commission/batch/",
+            {
+                "business_public_id": str(
+                    self.business_a.public_id
+                ),
+                "date_from": "2026-08-01",
+                "date_to": "2026-08-31",
+            },
+        )
+
+    def test_batch_preview_matches_individual_preview(
+        self,
+    ):
+        response = self._get_batch_preview()
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+
+        results = {
+            row["employee"]["public_id"]: row
+            for row in response.data["results"]
+        }
+
+        seller_row = results[
+            str(self.seller.public_id)
+        ]
+
+        self.assertEqual(
+            seller_row["sales_count"],
+            2,
+        )
+
+        self.assertEqual(
+            seller_row["sales_total"],
+            "1500.00",
+        )
+
+        self.assertEqual(
+            seller_row["commission_total"],
+            "75.00",
+        )
+
+        self.assertEqual(
+            seller_row["commission_plan_public_id"],
+            str(self.plan.public_id),
+        )
+
+        without_plan = {
+            row["public_id"]
+            for row in response.data[
+                "employees_without_plan"
+            ]
+        }
+
+        self.assertNotIn(
+            str(self.seller.public_id),
+            without_plan,
+        )
+
+    def test_batch_preview_uses_constant_queries(
+        self,
+    ):
+        with CaptureQueriesContext(
+            connection
+        ) as single_employee:
+            self._get_batch_preview()
+
+        for _ in range(3):
+            _, employee, _ = create_role_user(
+                business=self.business_a,
+                role=(
+                    BusinessMembership
+                    .ROLE_SELLER
+                ),
+                status=self.active_status,
+            )
+
+            EmployeeCommissionPlan.objects.create(
+                employee=employee,
+                percentage=Decimal("3.00"),
+                valid_from=date(2026, 8, 1),
+            )
+
+            create_transaction(
+                business=self.business_a,
+                created_by=self.admin_user,
+                employee=employee,
+                status=self.active_status,
+                total_value=Decimal("200.00"),
+                created_at=datetime(
+                    2026,
+                    8,
+                    15,
+                    12,
+                    0,
+                    tzinfo=timezone.utc,
+                ),
+            )
+
+        with CaptureQueriesContext(
+            connection
+        ) as many_employees:
+            response = self._get_batch_preview()
+
+        self.assertEqual(
+            response.data["totals"]["employees_count"],
+            4,
+        )
+
+        self.assertEqual(
+            len(many_employees),
+            len(single_employee),
+        )
+
+    def test_batch_preview_requires_management_role(
+        self,
+    ):
+        self.authenticate_as(
+            self.user_b
+        )
+
+        response = self._get_batch_preview()
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
@@ -4,7 +4,10 @@ from datetime import (
     timezone,
 )
 from decimal import Decimal
+from unittest import mock
 
+from django.db import DEFAULT_DB_ALIAS
+from django.test import override_settings
 from rest_framework import status
 
 from core.models import (
@@ -12,7 +15,9 @@ from core.models import (
     CashRegister,
     CommissionSettlement,
     PaymentMethod,
+    Transaction,
 )
+from core.services.parallel_queries import run_query_groups
 from core.tests.base import (
     BusinessIsolationTestCase,
 )
@@ -500,3 +505,69 @@ class DashboardOverviewTests(
             response.status_code,
             status.HTTP_400_BAD_REQUEST,
         )
+
+    def test_parallel_setting_keeps_the_same_overview(
+        self,
+    ):
+        sale = create_transaction(
+            business=self.business_a,
+            created_by=self.cashier_user,
+            is_debt=True,
+            created_at=datetime(2026, 8, 10, 15, tzinfo=timezone.utc),
+        )
+        create_debt_payment(
+            debt=create_debt(transaction=sale),
+            payment_method=self.cash_method,
+            created_by=self.admin_user,
+        )
+
+        sequential = self._get_dashboard()
+
+        with override_settings(DASHBOARD_QUERY_PARALLELISM=4):
+            parallel = self._get_dashboard()
+
+        self.assertEqual(parallel.status_code, status.HTTP_200_OK)
+        self.assertEqual(parallel.data, sequential.data)
+
+    def test_query_groups_are_merged_in_declaration_order(
+        self,
+    ):
+        calls = []
+
+        def group(name):
+            calls.append(name)
+            return name.upper()
+
+        results = run_query_groups(
+            {
+                name: (lambda name=name: group(name))
+                for name in ("inventory", "cash", "debts")
+            },
+            parallelism=3,
+        )
+
+        self.assertEqual(
+            list(results.items()),
+            [
+                ("inventory", "INVENTORY"),
+                ("cash", "CASH"),
+                ("debts", "DEBTS"),
+            ],
+        )
+        # Dentro de una transacción abierta no se usan otros hilos.
+        self.assertEqual(calls, ["inventory", "cash", "debts"])
+
+    def test_query_groups_read_from_the_router_alias(
+        self,
+    ):
+        with mock.patch(
+            "core.services.parallel_queries.router.db_for_read",
+            return_value=DEFAULT_DB_ALIAS,
+        ) as db_for_read:
+            run_query_groups(
+                {"inventory": lambda: None},
+                parallelism=3,
+                model=Transaction,
+            )
+
+        db_for_read.assert_called_once_with(Transaction)
@@ -0,0 +1,281 @@
+from datetime import timedelta
+
+from django.test import override_settings
+from django.utils import timezone as django_timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+
+from core.models import (
+    BusinessMembership,
+    Employee,
+    PaymentMethod,
+    Product,
+)
+from core.services.inventory import record_stock_movement
+from core.tests.base import (
+    BusinessIsolationTestCase,
+)
+from core.tests.factories import (
+    create_customer,
+    create_employee,
+    create_payment_method,
+    create_product,
+    create_role_user,
+    create_status,
+)
+
+
+@override_settings(SYNC_WATERMARK_OVERLAP_SECONDS=0)
+class DeltaSyncTests(
+    BusinessIsolationTestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        (
+            cls.cashier_user,
+            _,
+            _,
+        ) = create_role_user(
+            business=cls.business_a,
+            role=(
+                BusinessMembership
+                .ROLE_CASHIER
+            ),
+            status=cls.active_status,
+        )
+
+        cls.deleted_status = create_status("Eliminado")
+        cls.inactive_status = create_status("Inactivo")
+
+    def setUp(self):
+        super().setUp()
+
+        self.products = [
+            create_product(
+                business=self.business_a,
+                status=self.active_status,
+            )
+            for _ in range(3)
+        ]
+        self.foreign_product = create_product(
+            business=self.business_b,
+            status=self.active_status,
+        )
+
+    def _sync(self, resource, updated_since=None):
+        params = {
+            "business_public_id": str(self.business_a.public_id),
+        }
+        if updated_since:
+            params["updated_since"] = updated_since
+
+        response = self.client.get(f"/api/{resource}/sync/", params)
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+
+        return response.data
+
+    def _age(self, model, hours=1):
+        model.objects.update(
+            updated_at=django_timezone.now() - timedelta(hours=hours),
+        )
+
+    def test_full_sync_then_only_changes_and_tombstones(self):
+        full = self._sync("products")
+
+        self.assertEqual(
+            {row["public_id"] for row in full["changed"]},
+            {str(product.public_id) for product in self.products},
+        )
+        self.assertEqual(full["deleted"], [])
+
+        self._age(Product)
+        watermark = (
+            django_timezone.now() - timedelta(minutes=1)
+        ).isoformat()
+
+        record_stock_movement(
+            product=self.products[0],
+            quantity=-2,
+            movement_type="sale",
+            created_by=self.user_a,
+        )
+
+        response = self.client.delete(
+            f"/api/products/{self.products[1].public_id}/"
+        )
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_204_NO_CONTENT,
+        )
+
+        delta = self._sync("products", updated_since=watermark)
+
+        self.assertEqual(
+            [
+                (row["public_id"], row["stock"])
+                for row in delta["changed"]
+            ],
+            [(str(self.products[0].public_id), 8)],
+        )
+        self.assertEqual(
+            delta["deleted"],
+            [self.products[1].public_id],
+        )
+        self.assertLessEqual(
+            parse_datetime(str(delta["watermark"])),
+            django_timezone.now(),
+        )
+
+        empty = self._sync(
+            "products",
+            updated_since=delta["watermark"].isoformat(),
+        )
+        self.assertEqual(empty["changed"], [])
+        self.assertEqual(empty["deleted"], [])
+
+    def test_sync_keeps_role_specific_shape_and_visibility(self):
+        create_employee(
+            business=self.business_a,
+            status=self.active_status,
+        )
+        create_customer(
+            business=self.business_a,
+            status=self.active_status,
+        )
+        method = create_payment_method(
+            business=self.business_a,
+            status=self.active_status,
+        )
+        self._age(Employee)
+        self._age(PaymentMethod)
+        watermark = (
+            django_timezone.now() - timedelta(minutes=1)
+        ).isoformat()
+
+        self.authenticate_as(self.cashier_user)
+
+        employees = self._sync("employees")
+        self.assertEqual(
+            set(employees["changed"][0]),
+            {"public_id", "full_name", "position"},
+        )
+        self.assertEqual(len(self._sync("customers")["changed"]), 1)
+
+        PaymentMethod.objects.filter(pk=method.pk).update(
+            status=self.inactive_status,
+            updated_at=django_timezone.now(),
+        )
+
+        methods = self._sync(
+            "payment-methods",
+            updated_since=watermark,
+        )
+        self.assertEqual(methods["changed"], [])
+        self.assertEqual(methods["deleted"], [method.public_id])
+
+    def test_foreign_business_is_forbidden(self):
+        self.authenticate_as(self.user_b)
+
+        response = self.client.get(
+            "/api/products/sync/",
+            {"business_public_id": str(self.business_a.public_id)},
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    def test_invalid_watermark_is_rejected(self):
+        response = self.client.get(
+            "/api/products/sync/",
+            {
+                "business_public_id": str(self.business_a.public_id),
+                "updated_since": "ayer",
+            },
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    @override_settings(SYNC_PAGE_SIZE=2)
+    def test_changes_are_paginated_and_watermark_comes_last(self):
+        self._age(Product)
+        watermark = (
+            django_timezone.now() - timedelta(minutes=1)
+        ).isoformat()
+        Product.objects.filter(business=self.business_a).update(
+            updated_at=django_timezone.now(),
+        )
+        response = self.client.delete(
+            f"/api/products/{self.products[2].public_id}/"
+        )
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_204_NO_CONTENT,
+        )
+        extra = create_product(
+            business=self.business_a,
+            status=self.active_status,
+        )
+
+        first = self._sync("products", updated_since=watermark)
+
+        self.assertEqual(len(first["changed"]), 2)
+        self.assertIsNone(first["watermark"])
+        self.assertEqual(first["deleted"], [])
+        self.assertIsNotNone(first["next"])
+
+        response = self.client.get(first["next"])
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+        last = response.data
+
+        self.assertEqual(len(last["changed"]), 1)
+        self.assertIsNone(last["next"])
+        self.assertIsNotNone(last["watermark"])
+        self.assertEqual(last["deleted"], [self.products[2].public_id])
+        self.assertEqual(
+            [
+                row["public_id"]
+                for row in first["changed"] + last["changed"]
+            ],
+            [
+                str(public_id)
+                for public_id in Product.objects
+                .filter(business=self.business_a)
+                .exclude(pk=self.products[2].pk)
+                .order_by("updated_at", "pk")
+                .values_list("public_id", flat=True)
+            ],
+        )
+        self.assertIn(
+            str(extra.public_id),
+            [row["public_id"] for row in last["changed"]],
+        )
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(
+            "/api/products/sync/",
+            {
+                "business_public_id": str(self.business_a.public_id),
+                "cursor": "no-es-un-cursor",
+            },
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
@@ -0,0 +1,220 @@
+import csv
+import io
+import json
+
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from core.models import (
+    BusinessMembership,
+    Transaction,
+    TransactionDetail,
+)
+from core.services.inventory import record_stock_movement
+from core.tests.base import (
+    BusinessIsolationTestCase,
+)
+from core.tests.factories import (
+    create_debt,
+    create_debt_payment,
+    create_payment_method,
+    create_product,
+    create_role_user,
+    create_transaction,
+    create_transaction_detail,
+)
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class StreamingExportTests(
+    BusinessIsolationTestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.product = create_product(
+            business=cls.business_a,
+            status=cls.active_status,
+            stock=100,
+        )
+        cls.method = create_payment_method(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+
+        cls.sales = []
+        for index in range(5):
+            sale = create_transaction(
+                business=cls.business_a,
+                created_by=cls.user_a,
+                is_debt=index == 0,
+            )
+            detail = create_transaction_detail(
+                transaction=sale,
+                product=cls.product,
+            )
+            record_stock_movement(
+                product=cls.product,
+                quantity=-1,
+                movement_type="sale",
+                created_by=cls.user_a,
+                transaction=sale,
+                transaction_detail=detail,
+            )
+            cls.sales.append(sale)
+
+        cls.formula_sale = create_transaction(
+            business=cls.business_a,
+            created_by=cls.user_a,
+            transaction_type="purchase",
+        )
+        Transaction.objects.filter(pk=cls.formula_sale.pk).update(
+            concept="=HYPERLINK(\"http://evil.invalid\")",
+        )
+        create_transaction(
+            business=cls.business_b,
+            created_by=cls.user_b,
+        )
+
+        debt = create_debt(transaction=cls.sales[0])
+        create_debt_payment(
+            debt=debt,
+            payment_method=cls.method,
+            created_by=cls.user_a,
+        )
+
+    def _export(self, endpoint, **params):
+        response = self.client.get(
+            f"{endpoint}export/",
+            {
+                "business_public_id": str(self.business_a.public_id),
+                **params,
+            },
+        )
+
+        if isinstance(response, StreamingHttpResponse):
+            response.body = b"".join(response.streaming_content)
+
+        return response
+
+    def _list_rows(self, endpoint, **params):
+        response = self.client.get(
+            endpoint,
+            {
+                "business_public_id": str(self.business_a.public_id),
+                "page_size": 200,
+                **params,
+            },
+        )
+
+        return json.loads(response.content)["results"]
+
+    def test_csv_export_honors_transaction_filter(self):
+        response = self._export("/api/transactions/", type="sale")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["Content-Type"],
+            "text/csv; charset=utf-8",
+        )
+        self.assertIn("attachment;", response["Content-Disposition"])
+
+        rows = list(csv.DictReader(io.StringIO(response.body.decode())))
+
+        self.assertEqual(
+            [row["public_id"] for row in rows],
+            [
+                row["public_id"]
+                for row in self._list_rows("/api/transactions/", type="sale")
+            ],
+        )
+        self.assertEqual(len(rows), 5)
+        self.assertNotIn("details", rows[0])
+        self.assertEqual(rows[0]["is_debt"], "false")
+
+    def test_csv_cells_cannot_start_formulas(self):
+        response = self._export("/api/transactions/", type="purchase")
+        rows = list(csv.DictReader(io.StringIO(response.body.decode())))
+
+        self.assertEqual(
+            rows[0]["concept"],
+            "'=HYPERLINK(\"http://evil.invalid\")",
+        )
+
+    def test_ndjson_export_matches_list_rows(self):
+        for endpoint, params in (
+            ("/api/transactions/", {}),
+            ("/api/stock-movements/", {"type": "sale"}),
+            ("/api/debt-payments/", {}),
+        ):
+            with self.subTest(endpoint=endpoint):
+                response = self._export(
+                    endpoint,
+                    export_format="ndjson",
+                    **params,
+                )
+
+                self.assertEqual(
+                    response.status_code,
+                    status.HTTP_200_OK,
+                )
+                self.assertEqual(
+                    response["Content-Type"],
+                    "application/x-ndjson",
+                )
+                self.assertEqual(
+                    [
+                        json.loads(line)
+                        for line in response.body.splitlines()
+                    ],
+                    self._list_rows(endpoint, **params),
+                )
+
+    def test_rows_are_read_in_chunks(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._export(
+                "/api/transactions/",
+                export_format="ndjson",
+            )
+
+        detail_table = f'"{TransactionDetail._meta.db_table}"'
+        detail_queries = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+            and f"FROM {detail_table}" in query["sql"]
+        ]
+
+        self.assertEqual(len(response.body.splitlines()), 6)
+        self.assertEqual(len(detail_queries), 3)
+        self.assertFalse(
+            any(
+                "COUNT(" in query["sql"]
+                for query in queries.captured_queries
+            )
+        )
+
+    def test_export_requires_read_access_and_valid_format(self):
+        invalid = self._export(
+            "/api/transactions/",
+            export_format="xlsx",
+        )
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+        cashier, _, _ = create_role_user(
+            business=self.business_a,
+            role=BusinessMembership.ROLE_CASHIER,
+            status=self.active_status,
+        )
+        self.authenticate_as(cashier)
+
+        denied = self._export("/api/stock-movements/")
+        self.assertEqual(denied.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.authenticate_as(self.user_b)
+        foreign = self._export("/api/transactions/")
+        self.assertEqual(foreign.status_code, status.HTTP_403_FORBIDDEN)
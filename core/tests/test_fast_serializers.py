@@ -0,0 +1,263 @@
+from unittest import mock
+
+from rest_framework import serializers, status
+from rest_framework.renderers import JSONRenderer
+
+from core.fast_serializers import fast_list_plan
+from core.mixins import FastListMixin
+from core.models import (
+    BusinessMembership,
+    Product,
+    StockMovement,
+    Transaction,
+)
+from core.services.inventory import record_stock_movement
+from core.tests.base import (
+    BusinessIsolationTestCase,
+)
+from core.tests.factories import (
+    create_category,
+    create_customer,
+    create_debt,
+    create_debt_payment,
+    create_payment_method,
+    create_product,
+    create_role_user,
+    create_supplier,
+    create_transaction,
+    create_transaction_detail,
+)
+from core.views import BusinessScopedViewSet
+
+
+CONTRACT_ENDPOINTS = (
+    "/api/transactions/",
+    "/api/products/",
+    "/api/stock-movements/",
+    "/api/debt-payments/",
+    "/api/customers/",
+    "/api/employees/",
+    "/api/payment-methods/",
+)
+
+
+class FastListSerializerContractTests(
+    BusinessIsolationTestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        (
+            cls.cashier_user,
+            _,
+            _,
+        ) = create_role_user(
+            business=cls.business_a,
+            role=(
+                BusinessMembership
+                .ROLE_CASHIER
+            ),
+            status=cls.active_status,
+        )
+
+        category = create_category(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+        method = create_payment_method(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+        customer = create_customer(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+        supplier = create_supplier(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+
+        products = [
+            create_product(
+                business=cls.business_a,
+                status=cls.active_status,
+                category=category,
+            ),
+            create_product(
+                business=cls.business_a,
+                status=cls.active_status,
+            ),
+        ]
+
+        sale = create_transaction(
+            business=cls.business_a,
+            created_by=cls.user_a,
+            customer=customer,
+            payment_method=method,
+            is_debt=True,
+        )
+        for product in products:
+            detail = create_transaction_detail(
+                transaction=sale,
+                product=product,
+                quantity=2,
+            )
+            record_stock_movement(
+                product=product,
+                quantity=-2,
+                movement_type="sale",
+                created_by=cls.user_a,
+                transaction=sale,
+                transaction_detail=detail,
+            )
+
+        create_transaction(
+            business=cls.business_a,
+            created_by=cls.user_a,
+            supplier=supplier,
+            transaction_type="purchase",
+        )
+        record_stock_movement(
+            product=products[1],
+            quantity=5,
+            movement_type="adjustment",
+            created_by=cls.user_a,
+        )
+
+        debt = create_debt(transaction=sale)
+        create_debt_payment(
+            debt=debt,
+            payment_method=method,
+            created_by=cls.user_a,
+        )
+
+    def _content(self, endpoint, **params):
+        response = self.client.get(
+            endpoint,
+            {
+                "business_public_id": str(self.business_a.public_id),
+                **params,
+            },
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+
+        return response.content
+
+    def _assert_same_as_serializer(self, endpoint, **params):
+        # Se fuerza la ruta rápida también en las vistas que no la activan
+        # para comprobar cada serializer.
+        with mock.patch.object(
+            BusinessScopedViewSet,
+            "fast_list",
+            True,
+        ):
+            fast = self._content(endpoint, **params)
+
+        with mock.patch.object(
+            FastListMixin,
+            "get_fast_list_plan",
+            return_value=None,
+        ):
+            regular = self._content(endpoint, **params)
+
+        self.assertEqual(fast, regular)
+
+    def test_fast_list_is_opt_in(self):
+        self.assertFalse(BusinessScopedViewSet.fast_list)
+        self.assertEqual(
+            sorted(
+                viewset.queryset.model.__name__
+                for viewset in BusinessScopedViewSet.__subclasses__()
+                if viewset.fast_list
+            ),
+            ["Product", "StockMovement", "Transaction"],
+        )
+
+    def test_fast_lists_render_the_same_json(self):
+        for endpoint in CONTRACT_ENDPOINTS:
+            with self.subTest(endpoint=endpoint):
+                self._assert_same_as_serializer(endpoint)
+
+    def test_role_specific_serializers_render_the_same_json(self):
+        self.authenticate_as(self.cashier_user)
+
+        for endpoint in ("/api/employees/", "/api/products/"):
+            with self.subTest(endpoint=endpoint):
+                self._assert_same_as_serializer(endpoint)
+
+    def test_fast_lists_honor_sparse_fieldsets(self):
+        self._assert_same_as_serializer(
+            "/api/transactions/",
+            fields="public_id,customer_name",
+            expand="details",
+        )
+        self._assert_same_as_serializer(
+            "/api/transactions/",
+            expand="",
+        )
+
+    def test_supported_serializers_compile_to_a_plan(self):
+        for viewset_endpoint, model in (
+            ("/api/transactions/", Transaction),
+            ("/api/products/", Product),
+            ("/api/stock-movements/", StockMovement),
+        ):
+            with self.subTest(endpoint=viewset_endpoint):
+                serializer_class = next(
+                    viewset.serializer_class
+                    for viewset in BusinessScopedViewSet.__subclasses__()
+                    if getattr(viewset, "queryset", None) is not None
+                    and viewset.queryset.model is model
+                )
+
+                self.assertIsNotNone(
+                    fast_list_plan(serializer_class())
+                )
+
+    def test_null_intermediate_relation_matches_drf(self):
+        class CustomerNameSerializer(serializers.ModelSerializer):
+            customer_name = serializers.CharField(
+                source="customer.full_name",
+                read_only=True,
+            )
+            customer_phone = serializers.CharField(
+                source="customer.phone",
+                read_only=True,
+                allow_null=True,
+            )
+
+            class Meta:
+                model = Transaction
+                fields = ("public_id", "customer_name", "customer_phone")
+
+        queryset = Transaction.objects.filter(
+            business=self.business_a,
+        ).order_by("pk")
+        plan = fast_list_plan(CustomerNameSerializer())
+
+        renderer = JSONRenderer()
+        self.assertEqual(
+            renderer.render(plan.represent(plan.values(queryset))),
+            renderer.render(
+                CustomerNameSerializer(queryset, many=True).data
+            ),
+        )
+
+    def test_method_fields_fall_back_to_the_serializer(self):
+        class DirectionSerializer(serializers.ModelSerializer):
+            direction = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Transaction
+                fields = ("public_id", "direction")
+
+            def get_direction(self, obj):
+                return obj.type
+
+        self.assertIsNone(fast_list_plan(DirectionSerializer()))
@@ -126,13 +126,13 @@ class FinancialFlowRecognitionTests(TestCase):
     def test_dashboard_and_monthly_summary_share_payment_semantics(self):
         self.build_flow_matrix()
 
-        with self.assertNumQueries(16):
+        with self.assertNumQueries(17):
             dashboard = build_dashboard_overview(
                 business=self.business,
                 date_from=date(2026, 8, 1),
                 date_to=date(2026, 8, 31),
             )
-        with self.assertNumQueries(20):
+        with self.assertNumQueries(21):
             monthly = build_monthly_summary(business=self.business, year=2026, month=8)
 
         self.assertEqual(dashboard["cards"]["payments_received"], "300.00")
@@ -309,7 +309,7 @@ class FinancialFlowRecognitionTests(TestCase):
         self.add_payment(purchase, Decimal("30.00"))
         self.add_payment(expense, Decimal("5.00"))
 
-        with self.assertNumQueries(16):
+        with self.assertNumQueries(17):
             summary = build_debts_summary(
                 business=self.business,
                 date_from=date(2026, 8, 1),
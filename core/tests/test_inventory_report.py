@@ -3,11 +3,15 @@ from datetime import (
     timezone,
 )
 from decimal import Decimal
+from io import StringIO
 
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from rest_framework import status
 
 from core.models import (
     BusinessMembership,
+    Product,
     StockMovement,
 )
 from core.tests.base import (
@@ -268,6 +272,79 @@ class InventoryReportTests(
             0,
         )
     
+    def test_closing_stock_starts_from_nearest_snapshot(
+        self,
+    ):
+        self.product.stock = 10
+        self.product.save(
+            update_fields=["stock"]
+        )
+
+        create_stock_movement(
+            product=self.product,
+            created_by=self.inventory_user,
+            movement_type="entry",
+            quantity=7,
+            created_at=datetime(
+                2026,
+                9,
+                2,
+                12,
+                tzinfo=timezone.utc,
+            ),
+        )
+
+        call_command(
+            "take_stock_snapshots",
+            "--business-public-id",
+            str(self.business_a.public_id),
+            "--month",
+            "2026-08",
+            stdout=StringIO(),
+        )
+        call_command(
+            "verify_stock_snapshots",
+            "--business-public-id",
+            str(self.business_a.public_id),
+            stdout=StringIO(),
+        )
+
+        # Stock modificado sin movimiento: solo la foto conserva el
+        # cierre real de agosto.
+        Product.objects.filter(
+            pk=self.product.pk,
+        ).update(stock=30)
+
+        response = self._get_summary(
+            product=self.product
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+
+        row = response.data["results"][0]
+
+        self.assertEqual(
+            row["current_stock"],
+            30,
+        )
+
+        self.assertEqual(
+            row["closing_stock"],
+            10,
+        )
+
+        with self.assertRaises(CommandError):
+            call_command(
+                "verify_stock_snapshots",
+                "--business-public-id",
+                str(self.business_a.public_id),
+                stdout=StringIO(),
+            )
+
     def test_foreign_product_returns_not_found(
         self,
     ):
@@ -0,0 +1,293 @@
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from unittest import mock, skipIf
+
+from asgiref.sync import sync_to_async
+from django.test import AsyncClient, override_settings
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.metrics import MetricsStore, fcntl
+from core.tests.base import BusinessIsolationTestCase
+from core.tests.factories import create_user
+
+
+def _series(text, name, **labels):
+    """Valor de una serie de la exposición, o None si no aparece."""
+    expected = ",".join(
+        f'{label}="{value}"'
+        for label, value in labels.items()
+    )
+    match = re.search(
+        rf"^{re.escape(name)}\{{{re.escape(expected)}\}} (\S+)$",
+        text,
+        re.MULTILINE,
+    )
+
+    return float(match.group(1)) if match else None
+
+
+def _current_user_requests(count):
+    return {
+        "counters": [
+            [
+                "playnow_http_requests_total",
+                [
+                    ["route", "current-user"],
+                    ["method", "GET"],
+                    ["status", "200"],
+                ],
+                count,
+            ],
+        ],
+        "histograms": [],
+    }
+
+
+class RequestMetricsTests(BusinessIsolationTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.staff = create_user(is_superuser=True)
+
+    def setUp(self):
+        super().setUp()
+
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.metrics_dir = directory.name
+
+        # Un almacén limpio por prueba, compartido por middleware y vista.
+        store = MetricsStore()
+        for context in (
+            override_settings(
+                METRICS_DIR=self.metrics_dir,
+                METRICS_FLUSH_SECONDS=0,
+                METRICS_TOKEN="secreto-del-scraper",
+            ),
+            mock.patch("core.middleware.store", store),
+            mock.patch("core.views.metrics_store", store),
+        ):
+            context.__enter__()
+            self.addCleanup(context.__exit__, None, None, None)
+
+    def _scrape(self):
+        self.authenticate_as(self.staff)
+        response = self.client.get("/api/metrics/")
+        self.authenticate_as(self.user_a)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+
+        return response.content.decode()
+
+    def test_requests_are_recorded_per_route_and_method(self):
+        listing = self.client.get(
+            "/api/customers/",
+            {"business_public_id": str(self.business_a.public_id)},
+        )
+        self.client.get(
+            "/api/customers/",
+            {"business_public_id": str(self.business_a.public_id)},
+        )
+        self.client.get("/api/no-existe/")
+
+        text = self._scrape()
+        labels = {"route": "customer-list", "method": "GET"}
+
+        self.assertEqual(
+            _series(
+                text,
+                "playnow_http_requests_total",
+                **labels,
+                status="200",
+            ),
+            2.0,
+        )
+        self.assertEqual(
+            _series(
+                text,
+                "playnow_http_requests_total",
+                route="unmatched",
+                method="GET",
+                status="404",
+            ),
+            1.0,
+        )
+        self.assertEqual(
+            _series(
+                text,
+                "playnow_http_request_duration_seconds_count",
+                **labels,
+            ),
+            2.0,
+        )
+        self.assertEqual(
+            _series(
+                text,
+                "playnow_http_request_duration_seconds_bucket",
+                **labels,
+                le="+Inf",
+            ),
+            2.0,
+        )
+        self.assertGreater(
+            _series(text, "playnow_http_db_queries_total", **labels),
+            0,
+        )
+        self.assertGreater(
+            _series(
+                text,
+                "playnow_http_db_query_duration_seconds_total",
+                **labels,
+            ),
+            0,
+        )
+        self.assertEqual(
+            _series(text, "playnow_http_response_bytes_total", **labels),
+            2.0 * len(listing.content),
+        )
+
+    async def test_asgi_requests_are_recorded(self):
+        response = await AsyncClient().get(
+            "/api/customers/",
+            {"business_public_id": str(self.business_a.public_id)},
+            headers={
+                "Authorization": f"Bearer {AccessToken.for_user(self.user_a)}",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        text = await sync_to_async(self._scrape)()
+
+        self.assertEqual(
+            _series(
+                text,
+                "playnow_http_requests_total",
+                route="customer-list",
+                method="GET",
+                status="200",
+            ),
+            1.0,
+        )
+
+    def test_unknown_methods_share_one_series(self):
+        for method in ("FOO", "XYZ1"):
+            self.client.generic(method, "/api/customers/")
+
+        text = self._scrape()
+
+        self.assertIn('route="customer-list",method="OTHER"', text)
+        self.assertNotIn('method="FOO"', text)
+        self.assertNotIn('method="XYZ1"', text)
+
+    def test_throttle_rejections_are_counted(self):
+        self.client.force_authenticate(user=None)
+        for _ in range(6):
+            response = self.client.post(
+                "/api/auth/password/reset/",
+                {},
+                format="json",
+            )
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_429_TOO_MANY_REQUESTS,
+        )
+
+        text = self._scrape()
+
+        self.assertEqual(
+            _series(
+                text,
+                "playnow_http_throttled_total",
+                route="password-reset-request",
+                method="POST",
+            ),
+            1.0,
+        )
+
+    def test_series_from_every_worker_are_added(self):
+        self.client.get("/api/me/")
+
+        Path(self.metrics_dir, f"{os.getpid() + 1}.json").write_text(
+            json.dumps(_current_user_requests(4))
+        )
+
+        text = self._scrape()
+
+        self.assertEqual(
+            _series(
+                text,
+                "playnow_http_requests_total",
+                route="current-user",
+                method="GET",
+                status="200",
+            ),
+            5.0,
+        )
+
+    @skipIf(fcntl is None, "Requiere flock.")
+    def test_terminated_workers_are_folded_without_losing_counts(self):
+        self.client.get("/api/me/")
+        directory = Path(self.metrics_dir)
+
+        # Un worker terminado y otro vivo que recibió el mismo pid.
+        terminated = directory / "4242-1.json"
+        terminated.write_text(json.dumps(_current_user_requests(3)))
+        (directory / "4242-1.lock").touch()
+
+        alive = directory / "4242-2.json"
+        alive.write_text(json.dumps(_current_user_requests(4)))
+        descriptor = os.open(directory / "4242-2.lock", os.O_RDWR | os.O_CREAT)
+        self.addCleanup(os.close, descriptor)
+        fcntl.flock(descriptor, fcntl.LOCK_EX)
+
+        for _ in range(2):
+            text = self._scrape()
+
+            self.assertEqual(
+                _series(
+                    text,
+                    "playnow_http_requests_total",
+                    route="current-user",
+                    method="GET",
+                    status="200",
+                ),
+                8.0,
+            )
+            self.assertFalse(terminated.exists())
+            self.assertFalse((directory / "4242-1.lock").exists())
+            self.assertTrue(alive.exists())
+
+    def test_only_staff_or_the_scraper_token_can_read_metrics(self):
+        self.assertEqual(
+            self.client.get("/api/metrics/").status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+        self.client.force_authenticate(user=None)
+        self.assertEqual(
+            self.client.get("/api/metrics/").status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.assertEqual(
+            self.client.get(
+                "/api/metrics/",
+                HTTP_AUTHORIZATION="Token otro",
+            ).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+
+        response = self.client.get(
+            "/api/metrics/",
+            HTTP_AUTHORIZATION="Token secreto-del-scraper",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(
+            "# TYPE playnow_http_request_duration_seconds histogram",
+            response.content.decode(),
+        )
@@ -0,0 +1,148 @@
+from io import StringIO
+from unittest import skipIf, skipUnless
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.db import transaction as db_tx
+from django.utils import timezone
+
+from core.models import (
+    BusinessMembership,
+    StockMovement,
+)
+from core.services.monthly_summary import get_month_period
+from core.services.partitions import (
+    add_months,
+    existing_partitions,
+    monthly_partition_name,
+)
+from core.tests.base import (
+    BusinessIsolationTestCase,
+)
+from core.tests.factories import (
+    create_product,
+    create_role_user,
+    create_stock_movement,
+)
+
+
+IS_POSTGRESQL = connection.vendor == "postgresql"
+
+
+class StockMovementPartitionTests(
+    BusinessIsolationTestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.inventory_user, _, _ = create_role_user(
+            business=cls.business_a,
+            role=BusinessMembership.ROLE_INVENTORY,
+            status=cls.active_status,
+        )
+
+        cls.product = create_product(
+            business=cls.business_a,
+            status=cls.active_status,
+            stock=10,
+        )
+
+    def _ensure_partitions(self, *args):
+        stdout = StringIO()
+        call_command(
+            "ensure_partitions",
+            *args,
+            stdout=stdout,
+        )
+        return stdout.getvalue()
+
+    @skipIf(IS_POSTGRESQL, "Solo aplica a motores sin particionamiento.")
+    def test_ensure_partitions_is_noop_without_postgresql(self):
+        output = self._ensure_partitions()
+
+        self.assertIn("reason=unsupported_database", output)
+        self.assertIn("SUMMARY created=0", output)
+
+    @skipUnless(IS_POSTGRESQL, "Requiere PostgreSQL.")
+    def test_ensure_partitions_creates_future_months(self):
+        table = StockMovement._meta.db_table
+        today = timezone.localdate()
+        year, month = add_months(today.year, today.month, 6)
+        expected = monthly_partition_name(table, year=year, month=month)
+
+        output = self._ensure_partitions("--months-ahead", "6")
+
+        self.assertIn(f"created partition={expected}", output)
+        self.assertIn(expected, existing_partitions(model=StockMovement))
+        self.assertIn(
+            "SUMMARY created=0",
+            self._ensure_partitions("--months-ahead", "6"),
+        )
+
+    @skipUnless(IS_POSTGRESQL, "Requiere PostgreSQL.")
+    def test_public_id_stays_unique_across_partitions(self):
+        today = timezone.localdate()
+        next_year, next_month = add_months(today.year, today.month, 1)
+        first, second = (
+            create_stock_movement(
+                product=self.product,
+                created_by=self.inventory_user,
+                movement_type="entry",
+                quantity=5,
+            )
+            for _ in range(2)
+        )
+        StockMovement.objects.filter(pk=second.pk).update(
+            created_at=get_month_period(
+                year=next_year,
+                month=next_month,
+            )["start_datetime"],
+        )
+
+        with self.assertRaises(IntegrityError), db_tx.atomic():
+            StockMovement.objects.filter(pk=second.pk).update(
+                public_id=first.public_id,
+            )
+
+    @skipUnless(IS_POSTGRESQL, "Requiere PostgreSQL.")
+    def test_monthly_report_query_prunes_other_partitions(self):
+        table = StockMovement._meta.db_table
+        today = timezone.localdate()
+        period = get_month_period(year=today.year, month=today.month)
+        next_year, next_month = add_months(today.year, today.month, 1)
+
+        create_stock_movement(
+            product=self.product,
+            created_by=self.inventory_user,
+            movement_type="entry",
+            quantity=5,
+        )
+
+        plan = (
+            StockMovement.objects
+            .filter(
+                product__business=self.business_a,
+                created_at__gte=period["start_datetime"],
+                created_at__lt=period["end_datetime"],
+            )
+            .explain()
+        )
+
+        self.assertIn(
+            monthly_partition_name(
+                table,
+                year=today.year,
+                month=today.month,
+            ),
+            plan,
+        )
+        self.assertNotIn(
+            monthly_partition_name(
+                table,
+                year=next_year,
+                month=next_month,
+            ),
+            plan,
+        )
+        self.assertNotIn(f"{table}_default", plan)
@@ -0,0 +1,200 @@
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from core.models import (
+    BusinessMembership,
+)
+from core.services.inventory import record_stock_movement
+from core.tests.base import (
+    BusinessIsolationTestCase,
+)
+from core.tests.factories import (
+    create_category,
+    create_customer,
+    create_employee,
+    create_payment_method,
+    create_product,
+    create_role_user,
+    create_status,
+)
+
+
+class PosBootstrapTests(
+    BusinessIsolationTestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        (
+            cls.cashier_user,
+            _,
+            _,
+        ) = create_role_user(
+            business=cls.business_a,
+            role=(
+                BusinessMembership
+                .ROLE_CASHIER
+            ),
+            status=cls.active_status,
+        )
+
+        (
+            cls.inventory_user,
+            _,
+            _,
+        ) = create_role_user(
+            business=cls.business_a,
+            role=(
+                BusinessMembership
+                .ROLE_INVENTORY
+            ),
+            status=cls.active_status,
+        )
+
+        cls.deleted_status = create_status("Eliminado")
+
+        cls.category = create_category(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+        cls.method = create_payment_method(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+        create_employee(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+        create_customer(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+        create_product(
+            business=cls.business_b,
+            status=cls.active_status,
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate_as(self.cashier_user)
+
+        self.product = create_product(
+            business=self.business_a,
+            status=self.active_status,
+            category=self.category,
+        )
+        self.deleted_product = create_product(
+            business=self.business_a,
+            status=self.deleted_status,
+        )
+
+    def _bootstrap(self, **headers):
+        return self.client.get(
+            "/api/pos/bootstrap/",
+            {"business_public_id": str(self.business_a.public_id)},
+            headers=headers,
+        )
+
+    def test_bundle_contains_active_catalog_and_current_user(self):
+        response = self._bootstrap()
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+        self.assertEqual(
+            response.data["user"]["role"],
+            BusinessMembership.ROLE_CASHIER,
+        )
+        self.assertEqual(
+            response.data["products"],
+            [
+                {
+                    "public_id": self.product.public_id,
+                    "title": self.product.title,
+                    "sku": "",
+                    "barcode": "",
+                    "base_price": self.product.base_price,
+                    "stock": self.product.stock,
+                    "category_public_id": self.category.public_id,
+                },
+            ],
+        )
+        self.assertEqual(
+            [row["public_id"] for row in response.data["payment_methods"]],
+            [self.method.public_id],
+        )
+        self.assertIn(
+            response.data["user"]["employee_public_id"],
+            [row["public_id"] for row in response.data["employees"]],
+        )
+        self.assertEqual(len(response.data["customers"]), 1)
+        self.assertIn("ETag", response.headers)
+
+    @override_settings(SYNC_WATERMARK_OVERLAP_SECONDS=0)
+    def test_etag_and_cache_follow_catalog_generation(self):
+        with CaptureQueriesContext(connection) as cold_queries:
+            first = self._bootstrap()
+        etag = first.headers["ETag"]
+
+        with CaptureQueriesContext(connection) as cached_queries:
+            cached = self._bootstrap()
+
+        self.assertEqual(cached.headers["ETag"], etag)
+        self.assertEqual(cached.data, first.data)
+        self.assertEqual(
+            len(cold_queries.captured_queries)
+            - len(cached_queries.captured_queries),
+            5,
+        )
+
+        not_modified = self._bootstrap(if_none_match=etag)
+        self.assertEqual(
+            not_modified.status_code,
+            status.HTTP_304_NOT_MODIFIED,
+        )
+
+        record_stock_movement(
+            product=self.product,
+            quantity=-1,
+            movement_type="sale",
+            created_by=self.user_a,
+        )
+
+        changed = self._bootstrap(if_none_match=etag)
+
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+        self.assertEqual(
+            changed.data["products"][0]["stock"],
+            self.product.stock - 1,
+        )
+
+    @override_settings(SYNC_WATERMARK_OVERLAP_SECONDS=30)
+    def test_recent_changes_are_neither_cached_nor_revalidated(self):
+        first = self._bootstrap()
+
+        with CaptureQueriesContext(connection) as first_queries:
+            second = self._bootstrap(if_none_match=first.headers["ETag"])
+        with CaptureQueriesContext(connection) as second_queries:
+            self._bootstrap()
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(second.headers["ETag"], first.headers["ETag"])
+        self.assertEqual(
+            len(first_queries.captured_queries),
+            len(second_queries.captured_queries),
+        )
+
+    def test_non_sales_roles_and_other_businesses_are_forbidden(self):
+        for user in (self.inventory_user, self.user_b):
+            self.authenticate_as(user)
+
+            self.assertEqual(
+                self._bootstrap().status_code,
+                status.HTTP_403_FORBIDDEN,
+            )
@@ -0,0 +1,372 @@
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from core.models import (
+    BusinessMembership,
+    Product,
+)
+from core.tests.base import (
+    BusinessIsolationTestCase,
+)
+from core.tests.factories import (
+    create_category,
+    create_product,
+    create_role_user,
+)
+
+
+class ProductBulkImportTests(
+    BusinessIsolationTestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        (
+            cls.viewer_user,
+            _,
+            _,
+        ) = create_role_user(
+            business=cls.business_a,
+            role=(
+                BusinessMembership
+                .ROLE_VIEWER
+            ),
+            status=cls.active_status,
+        )
+
+        cls.drinks = create_category(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+        cls.snacks = create_category(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+        cls.foreign_category = create_category(
+            business=cls.business_b,
+            status=cls.active_status,
+        )
+
+    def setUp(self):
+        super().setUp()
+
+        self.product = create_product(
+            business=self.business_a,
+            status=self.active_status,
+            category=self.drinks,
+            base_price=Decimal("10.00"),
+            stock=5,
+        )
+
+    def _bulk_upsert(self, products):
+        return self.client.post(
+            "/api/products/bulk-upsert/",
+            {
+                "business_public_id": str(
+                    self.business_a.public_id
+                ),
+                "products": products,
+            },
+            format="json",
+        )
+
+    def test_json_rows_create_and_update_in_bulk(self):
+        new_rows = [
+            {
+                "title": f"Importado {index}",
+                "base_price": "5.50",
+                "base_cost": "3.00",
+                "stock": 2,
+                "category_public_id": str(self.snacks.public_id),
+            }
+            for index in range(20)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self._bulk_upsert(
+                [
+                    {
+                        "public_id": str(self.product.public_id),
+                        "base_price": "12.00",
+                    },
+                    *new_rows,
+                ]
+            )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+        self.assertEqual(
+            response.data,
+            {"created": 20, "updated": 1},
+        )
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.base_price, Decimal("12.00"))
+        self.assertEqual(self.product.category, self.drinks)
+        self.assertEqual(
+            Product.objects.filter(
+                business=self.business_a,
+                category=self.snacks,
+                status=self.active_status,
+            ).count(),
+            20,
+        )
+
+        product_inserts = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith(
+                f'INSERT INTO "{Product._meta.db_table}"'
+            )
+        ]
+        self.assertEqual(len(product_inserts), 1)
+
+    def test_invalid_row_rejects_whole_payload(self):
+        response = self._bulk_upsert(
+            [
+                {
+                    "title": "Válido",
+                    "base_price": "1.00",
+                    "base_cost": "1.00",
+                },
+                {
+                    "title": "Sin costo",
+                    "base_price": "1.00",
+                },
+                {
+                    "public_id": str(self.product.public_id),
+                    "stock": 50,
+                },
+                {
+                    "title": "Categoría ajena",
+                    "base_price": "1.00",
+                    "base_cost": "1.00",
+                    "category_public_id": str(
+                        self.foreign_category.public_id
+                    ),
+                },
+            ]
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            set(response.data["rows"]),
+            {1, 2, 3},
+        )
+        self.assertIn("base_cost", response.data["rows"][1])
+        self.assertIn("stock", response.data["rows"][2])
+        self.assertFalse(
+            Product.objects.filter(title="Válido").exists()
+        )
+
+    def test_duplicate_codes_are_rejected(self):
+        Product.objects.filter(pk=self.product.pk).update(
+            barcode="7501234567890",
+        )
+
+        response = self._bulk_upsert(
+            [
+                {
+                    "public_id": str(self.product.public_id),
+                    "barcode": "7501234567890",
+                },
+                {
+                    "title": "Código tomado",
+                    "base_price": "1.00",
+                    "base_cost": "1.00",
+                    "barcode": "7501234567890",
+                },
+                {
+                    "title": "SKU repetido A",
+                    "base_price": "1.00",
+                    "base_cost": "1.00",
+                    "sku": "REP-1",
+                },
+                {
+                    "title": "SKU repetido B",
+                    "base_price": "1.00",
+                    "base_cost": "1.00",
+                    "sku": "REP-1",
+                },
+            ]
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            {
+                index: set(row_errors)
+                for index, row_errors in response.data["rows"].items()
+            },
+            {
+                1: {"barcode"},
+                3: {"sku"},
+            },
+        )
+
+    def test_csv_file_upload(self):
+        upload = SimpleUploadedFile(
+            "productos.csv",
+            (
+                "public_id,title,base_price,base_cost,is_visible\n"
+                f"{self.product.public_id},Renombrado,,,false\n"
+                ",Nuevo,8.00,4.00,\n"
+            ).encode(),
+            content_type="text/csv",
+        )
+
+        response = self.client.post(
+            "/api/products/bulk-upsert/",
+            {
+                "business_public_id": str(
+                    self.business_a.public_id
+                ),
+                "file": upload,
+            },
+            format="multipart",
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.title, "Renombrado")
+        self.assertFalse(self.product.is_visible)
+        self.assertEqual(self.product.base_price, Decimal("10.00"))
+        self.assertTrue(
+            Product.objects.get(
+                business=self.business_a,
+                title="Nuevo",
+            ).is_visible
+        )
+
+    def test_price_update_by_category_is_single_update(self):
+        other = create_product(
+            business=self.business_a,
+            status=self.active_status,
+            category=self.snacks,
+            base_price=Decimal("10.00"),
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/products/price-update/",
+                {
+                    "business_public_id": str(
+                        self.business_a.public_id
+                    ),
+                    "category_public_id": str(self.drinks.public_id),
+                    "percent": "12.5",
+                },
+                format="json",
+            )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+        self.assertEqual(response.data["updated"], 1)
+
+        self.product.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.product.base_price, Decimal("11.25"))
+        self.assertEqual(other.base_price, Decimal("10.00"))
+        self.assertEqual(
+            sum(
+                query["sql"].startswith("UPDATE")
+                for query in queries.captured_queries
+            ),
+            1,
+        )
+
+    def test_price_update_that_overflows_is_rejected(self):
+        create_product(
+            business=self.business_a,
+            status=self.active_status,
+            category=self.drinks,
+            base_price=Decimal("9999999999.00"),
+        )
+
+        response = self.client.post(
+            "/api/products/price-update/",
+            {
+                "business_public_id": str(self.business_a.public_id),
+                "category_public_id": str(self.drinks.public_id),
+                "percent": "1000",
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertIn("percent", response.data)
+        self.product.refresh_from_db()
+        self.assertEqual(self.product.base_price, Decimal("10.00"))
+
+    def test_viewer_and_other_business_cannot_import(self):
+        for user in (self.viewer_user, self.user_b):
+            self.authenticate_as(user)
+
+            response = self._bulk_upsert(
+                [
+                    {
+                        "title": "Bloqueado",
+                        "base_price": "1.00",
+                        "base_cost": "1.00",
+                    },
+                ]
+            )
+
+            self.assertEqual(
+                response.status_code,
+                status.HTTP_403_FORBIDDEN,
+            )
+
+    def test_command_imports_json_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "productos.json"
+            path.write_text(
+                '[{"title": "Desde comando", '
+                '"base_price": "2.00", "base_cost": "1.00"}]'
+            )
+            output = StringIO()
+
+            call_command(
+                "import_products",
+                "--business-public-id",
+                str(self.business_a.public_id),
+                "--file",
+                str(path),
+                stdout=output,
+            )
+
+        self.assertIn("created=1 updated=0", output.getvalue())
+        self.assertTrue(
+            Product.objects.filter(
+                business=self.business_a,
+                title="Desde comando",
+            ).exists()
+        )
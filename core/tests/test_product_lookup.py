@@ -0,0 +1,191 @@
+from decimal import Decimal
+
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from core.models import (
+    BusinessMembership,
+    Product,
+)
+from core.tests.base import (
+    BusinessIsolationTestCase,
+)
+from core.tests.factories import (
+    create_product,
+    create_role_user,
+    create_status,
+)
+
+
+class ProductCodeLookupTests(
+    BusinessIsolationTestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        (
+            cls.cashier_user,
+            _,
+            _,
+        ) = create_role_user(
+            business=cls.business_a,
+            role=(
+                BusinessMembership
+                .ROLE_CASHIER
+            ),
+            status=cls.active_status,
+        )
+
+        cls.inactive_status = create_status("Inactivo")
+        cls.deleted_status = create_status("Eliminado")
+
+    def setUp(self):
+        super().setUp()
+        self.authenticate_as(self.cashier_user)
+
+        self.product = create_product(
+            business=self.business_a,
+            status=self.active_status,
+            base_price=Decimal("25.00"),
+            stock=7,
+        )
+        Product.objects.filter(pk=self.product.pk).update(
+            sku="CAF-01",
+            barcode="7501234567890",
+        )
+
+    def _get(self, code, business=None):
+        return self.client.get(
+            f"/api/products/by-code/{code}/",
+            {
+                "business_public_id": str(
+                    (business or self.business_a).public_id
+                ),
+            },
+        )
+
+    def test_lookup_by_barcode_or_sku_returns_till_fields(self):
+        for code in ("7501234567890", "CAF-01"):
+            response = self._get(code)
+
+            self.assertEqual(
+                response.status_code,
+                status.HTTP_200_OK,
+                msg=response.data,
+            )
+            self.assertEqual(
+                response.data,
+                {
+                    "public_id": str(self.product.public_id),
+                    "sku": "CAF-01",
+                    "barcode": "7501234567890",
+                    "title": self.product.title,
+                    "base_price": "25.00",
+                    "stock": 7,
+                },
+            )
+
+    def test_lookup_reads_the_current_row_in_one_query(self):
+        self._get("7501234567890")
+        Product.objects.filter(pk=self.product.pk).update(stock=3)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self._get("7501234567890")
+
+        self.assertEqual(response.data["stock"], 3)
+
+        product_queries = [
+            query["sql"]
+            for query in queries.captured_queries
+            if f'FROM "{Product._meta.db_table}"' in query["sql"]
+        ]
+        self.assertEqual(len(product_queries), 1)
+
+    def test_reassigned_code_returns_the_new_product(self):
+        self._get("7501234567890")
+
+        replacement = create_product(
+            business=self.business_a,
+            status=self.active_status,
+        )
+        Product.objects.filter(pk=self.product.pk).update(barcode="")
+        Product.objects.filter(pk=replacement.pk).update(
+            barcode="7501234567890",
+        )
+
+        response = self._get("7501234567890")
+
+        self.assertEqual(
+            response.data["public_id"],
+            str(replacement.public_id),
+        )
+
+    def test_inactive_deleted_and_foreign_products_are_not_found(self):
+        for unsellable_status in (
+            self.inactive_status,
+            self.deleted_status,
+        ):
+            with self.subTest(status=unsellable_status.name):
+                Product.objects.filter(pk=self.product.pk).update(
+                    status=unsellable_status,
+                )
+                self.assertEqual(
+                    self._get("CAF-01").status_code,
+                    status.HTTP_404_NOT_FOUND,
+                )
+
+        response = self._get("CAF-01", business=self.business_b)
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    def test_batch_lookup_reports_missing_codes(self):
+        response = self.client.post(
+            "/api/products/by-code/",
+            {
+                "business_public_id": str(self.business_a.public_id),
+                "codes": ["CAF-01", "NO-EXISTE", "CAF-01"],
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+        self.assertEqual(list(response.data["products"]), ["CAF-01"])
+        self.assertEqual(response.data["missing"], ["NO-EXISTE"])
+
+    def test_barcode_is_unique_per_business(self):
+        create_product(
+            business=self.business_b,
+            status=self.active_status,
+        )
+        Product.objects.filter(business=self.business_b).update(
+            barcode="7501234567890",
+        )
+
+        other = create_product(
+            business=self.business_a,
+            status=self.active_status,
+        )
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Product.objects.filter(pk=other.pk).update(
+                barcode="7501234567890",
+            )
+
+        self.authenticate_as(self.user_a)
+        response = self.client.patch(
+            f"/api/products/{other.public_id}/",
+            {"barcode": "7501234567890"},
+            format="json",
+        )
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
@@ -11,6 +11,7 @@ from core.serializers import (
     MonthlyClosureSerializer,
     ProductCategorySerializer,
     ProductSerializer,
+    PublicIdBatchListSerializer,
 )
 
 
@@ -52,6 +53,10 @@ class PublicIdSerializerContractTests(SimpleTestCase):
             if serializer_class.__module__ != core_serializers.__name__:
                 continue
 
+            # Envuelve al serializer hijo y no se construye sin él.
+            if serializer_class is PublicIdBatchListSerializer:
+                continue
+
             serializer = serializer_class()
 
             for field_name, field in self._iter_fields(serializer):
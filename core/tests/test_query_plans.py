@@ -0,0 +1,218 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers, status
+
+from core.models import (
+    Debt,
+    Product,
+    Transaction,
+)
+from core.query_plans import PlanCache, serializer_query_plan
+from core.services.inventory import record_stock_movement
+from core.tests.base import (
+    BusinessIsolationTestCase,
+)
+from core.tests.factories import (
+    create_customer,
+    create_debt,
+    create_debt_payment,
+    create_payment_method,
+    create_product,
+    create_transaction,
+    create_transaction_detail,
+)
+from core.views import BusinessScopedViewSet
+
+
+LIST_ENDPOINTS = (
+    "/api/transactions/",
+    "/api/stock-movements/",
+    "/api/debts/",
+    "/api/debt-payments/",
+    "/api/products/",
+)
+
+
+class SerializerQueryPlanTests(
+    BusinessIsolationTestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.customer = create_customer(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+        cls.method = create_payment_method(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+
+    def _create_sales(self, count):
+        for _ in range(count):
+            product = create_product(
+                business=self.business_a,
+                status=self.active_status,
+            )
+            Product.objects.filter(pk=product.pk).update(
+                description="Descripción larga " * 50,
+            )
+
+            transaction = create_transaction(
+                business=self.business_a,
+                created_by=self.user_a,
+                customer=self.customer,
+                payment_method=self.method,
+                is_debt=True,
+            )
+            detail = create_transaction_detail(
+                transaction=transaction,
+                product=product,
+            )
+            record_stock_movement(
+                product=product,
+                quantity=-1,
+                movement_type="sale",
+                created_by=self.user_a,
+                transaction=transaction,
+                transaction_detail=detail,
+            )
+            debt = create_debt(transaction=transaction)
+            create_debt_payment(
+                debt=debt,
+                payment_method=self.method,
+                created_by=self.user_a,
+            )
+
+    def _list(self, endpoint):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                endpoint,
+                {"business_public_id": str(self.business_a.public_id)},
+            )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+
+        return response, queries.captured_queries
+
+    def test_pruned_lists_match_unpruned_output(self):
+        self._create_sales(3)
+
+        for endpoint in LIST_ENDPOINTS:
+            with self.subTest(endpoint=endpoint):
+                pruned, _ = self._list(endpoint)
+
+                with mock.patch.object(
+                    BusinessScopedViewSet,
+                    "column_pruning_actions",
+                    (),
+                ):
+                    full, _ = self._list(endpoint)
+
+                self.assertEqual(pruned.data, full.data)
+
+    def test_query_count_does_not_grow_with_page_rows(self):
+        self._create_sales(1)
+        small = {
+            endpoint: len(self._list(endpoint)[1])
+            for endpoint in LIST_ENDPOINTS
+        }
+
+        self._create_sales(4)
+
+        for endpoint in LIST_ENDPOINTS:
+            with self.subTest(endpoint=endpoint):
+                self.assertEqual(
+                    len(self._list(endpoint)[1]),
+                    small[endpoint],
+                )
+
+    def test_unread_text_columns_are_not_fetched(self):
+        self._create_sales(2)
+
+        _, queries = self._list("/api/transactions/")
+
+        product_table = Product._meta.db_table
+        description = f'"{product_table}"."description"'
+        self.assertFalse(
+            any(description in query["sql"] for query in queries)
+        )
+        self.assertTrue(
+            any(
+                f'"{product_table}"."title"' in query["sql"]
+                for query in queries
+            )
+        )
+
+    def test_method_fields_without_sources_load_the_whole_model(self):
+        class DirectionSerializer(serializers.ModelSerializer):
+            direction = serializers.SerializerMethodField()
+            customer_name = serializers.CharField(
+                source="customer.full_name",
+            )
+
+            class Meta:
+                model = Transaction
+                fields = ("public_id", "direction", "customer_name")
+
+            def get_direction(self, obj):
+                return obj.type
+
+        plan = serializer_query_plan(DirectionSerializer())
+
+        self.assertIsNone(plan.levels[()][1])
+        self.assertEqual(
+            plan.levels[("customer",)][1],
+            frozenset({"full_name"}),
+        )
+
+        debt_plan = serializer_query_plan(
+            DebtListSerializer(),
+            annotations={"outstanding_amount"},
+        )
+        self.assertIn("type", debt_plan.levels[("transaction",)][1])
+        self.assertNotIn("concept", debt_plan.levels[("transaction",)][1])
+
+
+class PlanCacheTests(SimpleTestCase):
+    def test_cache_evicts_least_recently_used_plans(self):
+        cache = PlanCache(maxsize=2)
+        build = mock.Mock(side_effect=lambda: object())
+
+        first = cache.get_or_build(("a",), build)
+        cache.get_or_build(("b",), build)
+        self.assertIs(cache.get_or_build(("a",), build), first)
+
+        for key in ("c", "d", "e"):
+            cache.get_or_build((key,), build)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNot(cache.get_or_build(("a",), build), first)
+        self.assertEqual(build.call_count, 6)
+
+
+class DebtListSerializer(serializers.ModelSerializer):
+    direction = serializers.SerializerMethodField()
+    outstanding_amount = serializers.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        read_only=True,
+    )
+
+    class Meta:
+        model = Debt
+        method_field_sources = {
+            "direction": ("transaction.type",),
+        }
+        fields = ("public_id", "direction", "outstanding_amount")
+
+    def get_direction(self, obj):
+        return obj.transaction.type
@@ -0,0 +1,189 @@
+import datetime
+from decimal import Decimal
+from unittest import mock, skipIf
+from uuid import uuid4
+
+from django.http import StreamingHttpResponse
+from django.test import SimpleTestCase, override_settings
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import (
+    FastJSONRenderer,
+    StreamingJSONRenderer,
+    orjson,
+)
+from core.tests.base import (
+    BusinessIsolationTestCase,
+)
+from core.tests.factories import (
+    create_product,
+)
+from core.views import BusinessScopedViewSet
+
+
+def _sample_payload():
+    return {
+        "count": 3,
+        "next": None,
+        "results": [
+            {
+                "public_id": uuid4(),
+                "total_value": "1250.50",
+                "raw_decimal": Decimal("10.25"),
+                "created_at": datetime.datetime(
+                    2025, 3, 1, 12, 30, 15, 123456,
+                    tzinfo=datetime.timezone.utc,
+                ),
+                "local_at": datetime.datetime(
+                    2025, 3, 1, 6, 30,
+                    tzinfo=datetime.timezone(datetime.timedelta(hours=-6)),
+                ),
+                "date": datetime.date(2025, 3, 1),
+                "time": datetime.time(8, 15),
+                "elapsed": datetime.timedelta(minutes=90),
+                "label": gettext_lazy("Activo"),
+                "concept": "Café\u2028línea\u2029",
+                "tags": ("a", "b"),
+                "ratio": 0.1,
+                "flags": [True, False, None],
+                "index": index,
+            }
+            for index in range(3)
+        ],
+        "previous": None,
+    }
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def assertSameBytes(self, data, **kwargs):
+        self.assertEqual(
+            FastJSONRenderer().render(data, **kwargs),
+            JSONRenderer().render(data, **kwargs),
+        )
+
+    def test_output_matches_drf_renderer(self):
+        self.assertSameBytes(_sample_payload())
+        self.assertSameBytes([])
+        self.assertSameBytes(None)
+        self.assertSameBytes("texto")
+
+    def test_values_orjson_writes_differently_fall_back(self):
+        for value in (
+            {"big": 2 ** 70},
+            {1: "clave numérica"},
+            {"tiny": 1e-05, "huge": 1e16},
+            {"amount": Decimal("1E+20")},
+            {"name": "Producto 3e5"},
+            [1e-07, -2.5e+20],
+            1e16,
+        ):
+            with self.subTest(value=value):
+                self.assertSameBytes(value)
+
+    @skipIf(orjson is None, "orjson no está instalado.")
+    def test_exponent_like_strings_do_not_fall_back(self):
+        with mock.patch.object(
+            JSONRenderer,
+            "render",
+            side_effect=AssertionError("fallback"),
+        ):
+            for value in (
+                {"code": "1e5", "note": "a,1e5]", "ratio": 0.5},
+                [":0.00001,", 12, "0.0000"],
+            ):
+                with self.subTest(value=value):
+                    FastJSONRenderer().render(value)
+
+    @skipIf(orjson is None, "orjson no está instalado.")
+    def test_common_payloads_do_not_fall_back(self):
+        with mock.patch.object(
+            JSONRenderer,
+            "render",
+            side_effect=AssertionError("fallback"),
+        ):
+            for _ in range(20):
+                FastJSONRenderer().render(_sample_payload())
+
+    def test_indent_requests_use_drf_renderer(self):
+        self.assertSameBytes(
+            _sample_payload(),
+            accepted_media_type="application/json; indent=4",
+        )
+
+    def test_unserializable_values_raise_like_drf(self):
+        with self.assertRaises(TypeError):
+            FastJSONRenderer().render({"value": object()})
+
+    def test_non_finite_decimals_raise_like_drf(self):
+        for value in (
+            {"amount": Decimal("NaN"), "next": None},
+            {"rows": [{"amount": Decimal("Infinity")}], "next": None},
+            [None, Decimal("-Infinity")],
+        ):
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    JSONRenderer().render(value)
+                with self.assertRaises(ValueError):
+                    FastJSONRenderer().render(value)
+
+
+@override_settings(JSON_STREAM_CHUNK_SIZE=2)
+class StreamingJSONRendererTests(SimpleTestCase):
+    def test_stream_concatenates_to_the_full_render(self):
+        renderer = StreamingJSONRenderer()
+
+        for data in (
+            _sample_payload(),
+            {"results": _sample_payload()["results"]},
+            {"count": 0, "results": []},
+        ):
+            with self.subTest(keys=list(data)):
+                chunks = list(renderer.stream(data))
+
+                self.assertEqual(
+                    b"".join(chunks),
+                    JSONRenderer().render(data),
+                )
+
+        self.assertEqual(len(list(renderer.stream(_sample_payload()))), 4)
+
+    def test_only_pages_larger_than_a_chunk_stream(self):
+        renderer = StreamingJSONRenderer()
+
+        self.assertTrue(renderer.should_stream(_sample_payload()))
+        self.assertFalse(
+            renderer.should_stream({"results": [1, 2]})
+        )
+        self.assertFalse(renderer.should_stream([1, 2, 3]))
+
+
+@override_settings(JSON_STREAM_CHUNK_SIZE=2)
+class StreamingListResponseTests(
+    BusinessIsolationTestCase
+):
+    def test_large_pages_stream_the_same_body(self):
+        for _ in range(5):
+            create_product(
+                business=self.business_a,
+                status=self.active_status,
+            )
+
+        params = {"business_public_id": str(self.business_a.public_id)}
+        regular = self.client.get("/api/products/", params)
+
+        with mock.patch.object(
+            BusinessScopedViewSet,
+            "renderer_classes",
+            [StreamingJSONRenderer],
+        ):
+            streamed = self.client.get("/api/products/", params)
+
+        self.assertEqual(streamed.status_code, status.HTTP_200_OK)
+        self.assertIsInstance(streamed, StreamingHttpResponse)
+        self.assertEqual(streamed["Content-Type"], "application/json")
+        self.assertEqual(
+            b"".join(streamed.streaming_content),
+            regular.content,
+        )
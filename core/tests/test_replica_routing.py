@@ -0,0 +1,176 @@
+from contextlib import contextmanager
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import transaction as db_tx
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from core.db_routers import PrimaryReplicaRouter, replica_reads
+from core.models import Customer
+from core.tests.factories import (
+    create_business,
+    create_customer,
+    create_status,
+    create_user,
+)
+
+
+# La base de prueba (SQLite) hace de réplica: el router devuelve el alias
+# explícitamente cuando elige la réplica y None cuando deja `default`.
+# Es TransactionTestCase porque dentro de una transacción abierta todo se
+# lee de `default`.
+@override_settings(
+    REPLICA_DATABASE_ALIAS="default",
+    REPLICA_READ_YOUR_WRITES_SECONDS=60,
+)
+class ReplicaRoutingTests(APITransactionTestCase):
+    def setUp(self):
+        cache.clear()
+
+        self.active_status = create_status("Activo")
+        self.user_a = create_user(
+            email="owner.a@playnow.test",
+            full_name="Propietario A",
+        )
+        self.user_b = create_user(
+            email="owner.b@playnow.test",
+            full_name="Propietario B",
+        )
+        self.business = create_business(
+            user=self.user_a,
+            status=self.active_status,
+            business_name="Negocio A",
+        )
+        self.business_b = create_business(
+            user=self.user_b,
+            status=self.active_status,
+            business_name="Negocio B",
+        )
+        self.customer = create_customer(
+            business=self.business,
+            status=self.active_status,
+        )
+
+        self.client.force_authenticate(user=self.user_a)
+
+    @contextmanager
+    def _record_reads(self):
+        aliases = []
+        db_for_read = PrimaryReplicaRouter.db_for_read
+
+        def recording(router, model, **hints):
+            alias = db_for_read(router, model, **hints)
+            aliases.append(alias)
+
+            return alias
+
+        with mock.patch.object(
+            PrimaryReplicaRouter,
+            "db_for_read",
+            recording,
+        ):
+            yield aliases
+
+    def _debts_summary(self, **extra):
+        today = timezone.localdate()
+
+        return self.client.get(
+            "/api/reports/debts-summary/",
+            {
+                "business_public_id": str(self.business.public_id),
+                "date_from": str(today - timedelta(days=30)),
+                "date_to": str(today),
+                **extra,
+            },
+        )
+
+    def _customers(self):
+        return self.client.get(
+            "/api/customers/",
+            {"business_public_id": str(self.business.public_id)},
+        )
+
+    def test_reports_and_lists_read_from_the_replica(self):
+        for send in (self._debts_summary, self._customers):
+            with self.subTest(view=send.__name__):
+                with self._record_reads() as aliases:
+                    response = send()
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertTrue(aliases)
+                self.assertEqual(set(aliases), {"default"})
+
+    def test_other_reads_stay_on_primary(self):
+        with self._record_reads() as aliases:
+            response = self.client.get(
+                f"/api/customers/{self.customer.public_id}/",
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(aliases), {None})
+
+        with self._record_reads() as aliases:
+            with replica_reads():
+                Customer.objects.count()
+                Customer.objects.filter(pk=self.customer.pk).update(
+                    full_name="Cliente editado",
+                )
+                Customer.objects.count()
+
+                with db_tx.atomic():
+                    Customer.objects.count()
+
+            with replica_reads(), db_tx.atomic():
+                Customer.objects.count()
+        self.assertEqual(aliases, ["default", None, None, None])
+
+    def test_writes_pin_the_user_to_primary(self):
+        with self._record_reads() as aliases:
+            response = self._debts_summary(**{"async": "true"})
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(set(aliases), {"default"})
+
+        with self._record_reads() as aliases:
+            self._customers()
+        self.assertEqual(set(aliases), {None})
+
+        cache.clear()
+        with self._record_reads() as aliases:
+            self._customers()
+        self.assertEqual(set(aliases), {"default"})
+
+    def test_pin_is_per_user(self):
+        response = self.client.post(
+            "/api/customers/",
+            {
+                "business_public_id": str(self.business.public_id),
+                "full_name": "Cliente nuevo",
+                "phone": "88888888",
+                "email": "cliente.nuevo@test.com",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        with self._record_reads() as aliases:
+            self._customers()
+        self.assertEqual(set(aliases), {None})
+
+        self.client.force_authenticate(user=self.user_b)
+        with self._record_reads() as aliases:
+            self.client.get(
+                "/api/customers/",
+                {"business_public_id": str(self.business_b.public_id)},
+            )
+        self.assertEqual(set(aliases), {"default"})
+
+    @override_settings(REPLICA_DATABASE_ALIAS="replica")
+    def test_without_a_replica_everything_reads_from_primary(self):
+        with self._record_reads() as aliases:
+            response = self._debts_summary()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(aliases), {None})
@@ -0,0 +1,187 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+
+from core.models import (
+    BusinessMembership,
+    ReportJob,
+)
+from core.services.report_jobs import (
+    claim_report_jobs,
+    run_report_job,
+)
+from core.tests.base import BusinessIsolationTestCase
+from core.tests.factories import (
+    create_debt,
+    create_product,
+    create_transaction,
+)
+
+
+class ReportJobTests(BusinessIsolationTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        create_product(
+            business=cls.business_a,
+            status=cls.active_status,
+            stock=3,
+        )
+        sale = create_transaction(
+            business=cls.business_a,
+            created_by=cls.user_a,
+            status=cls.active_status,
+            is_debt=True,
+        )
+        create_debt(transaction=sale)
+
+    def setUp(self):
+        super().setUp()
+
+        today = timezone.localdate()
+        self.period = {
+            "business_public_id": str(self.business_a.public_id),
+            "date_from": str(today - timedelta(days=365)),
+            "date_to": str(today),
+        }
+
+    def _run_worker(self):
+        call_command(
+            "run_report_worker",
+            once=True,
+            threads=1,
+            stdout=StringIO(),
+        )
+
+    def test_async_reports_match_synchronous_responses(self):
+        today = timezone.localdate()
+        reports = (
+            ("/api/reports/debts-summary/", self.period),
+            ("/api/reports/inventory-summary/", self.period),
+            ("/api/reports/customers-summary/", self.period),
+            ("/api/reports/suppliers-summary/", self.period),
+            ("/api/reports/payments-summary/", self.period),
+            ("/api/dashboard/overview/", self.period),
+            (
+                "/api/reports/monthly-summary/",
+                {
+                    "business_public_id": str(self.business_a.public_id),
+                    "year": today.year,
+                    "month": today.month,
+                },
+            ),
+        )
+
+        for endpoint, params in reports:
+            with self.subTest(endpoint=endpoint):
+                queued = self.client.get(
+                    endpoint,
+                    {**params, "async": "true"},
+                )
+
+                self.assertEqual(
+                    queued.status_code,
+                    status.HTTP_202_ACCEPTED,
+                )
+                self.assertEqual(queued.data["status"], "pending")
+                self.assertIsNone(queued.data["result"])
+                self.assertEqual(
+                    queued["Location"],
+                    queued.data["status_url"],
+                )
+
+                self._run_worker()
+
+                job = self.client.get(queued.data["status_url"])
+                synchronous = self.client.get(endpoint, params)
+
+                self.assertEqual(job.status_code, status.HTTP_200_OK)
+                self.assertEqual(job.data["status"], "done")
+                self.assertEqual(
+                    job.data["result"],
+                    json.loads(synchronous.content),
+                )
+
+    def test_async_request_validates_before_enqueueing(self):
+        invalid = self.client.get(
+            "/api/reports/debts-summary/",
+            {**self.period, "date_from": "no-es-fecha", "async": "true"},
+        )
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.authenticate_as(self.user_b)
+        foreign = self.client.get(
+            "/api/reports/debts-summary/",
+            {**self.period, "async": "true"},
+        )
+        self.assertEqual(foreign.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.assertFalse(ReportJob.objects.exists())
+
+    def test_only_the_requester_can_read_a_job(self):
+        queued = self.client.get(
+            "/api/reports/debts-summary/",
+            {**self.period, "async": "true"},
+        )
+
+        self.authenticate_as(self.user_b)
+        response = self.client.get(queued.data["status_url"])
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_worker_rechecks_access_when_running(self):
+        queued = self.client.get(
+            "/api/reports/debts-summary/",
+            {**self.period, "async": "true"},
+        )
+        BusinessMembership.objects.filter(
+            business=self.business_a,
+            user=self.user_a,
+        ).update(is_active=False)
+
+        self._run_worker()
+
+        job = ReportJob.objects.get(public_id=queued.data["public_id"])
+        self.assertEqual(job.status, ReportJob.STATUS_FAILED)
+        self.assertIsNone(job.result)
+        self.assertTrue(job.error)
+
+    @override_settings(
+        REPORT_JOB_STALE_SECONDS=60,
+        REPORT_JOB_MAX_ATTEMPTS=2,
+    )
+    def test_abandoned_jobs_are_retried_until_the_limit(self):
+        job = ReportJob.objects.create(
+            business=self.business_a,
+            requested_by=self.user_a,
+            report="debts-summary",
+            params=self.period,
+        )
+
+        first = claim_report_jobs(limit=5)
+        self.assertEqual([claimed.pk for claimed in first], [job.pk])
+        self.assertEqual(claim_report_jobs(limit=5), [])
+
+        ReportJob.objects.filter(pk=job.pk).update(
+            started_at=timezone.now() - timedelta(minutes=5),
+        )
+        retried = claim_report_jobs(limit=5)
+        self.assertEqual(retried[0].attempts, 2)
+
+        # El primer intento termina tarde: su resultado se descarta.
+        run_report_job(first[0])
+        job.refresh_from_db()
+        self.assertEqual(job.status, ReportJob.STATUS_RUNNING)
+
+        ReportJob.objects.filter(pk=job.pk).update(
+            started_at=timezone.now() - timedelta(minutes=5),
+        )
+        self.assertEqual(claim_report_jobs(limit=5), [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, ReportJob.STATUS_FAILED)
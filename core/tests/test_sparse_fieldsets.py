@@ -0,0 +1,165 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from core.models import (
+    Customer,
+    Product,
+    TransactionDetail,
+)
+from core.tests.base import (
+    BusinessIsolationTestCase,
+)
+from core.tests.factories import (
+    create_customer,
+    create_debt,
+    create_product,
+    create_transaction,
+    create_transaction_detail,
+)
+
+
+class SparseFieldsetTests(
+    BusinessIsolationTestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.customer = create_customer(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+        cls.product = create_product(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+        cls.sale = create_transaction(
+            business=cls.business_a,
+            created_by=cls.user_a,
+            customer=cls.customer,
+            is_debt=True,
+        )
+        create_transaction_detail(
+            transaction=cls.sale,
+            product=cls.product,
+        )
+        create_debt(transaction=cls.sale)
+
+    def _get(self, path, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                path,
+                {
+                    "business_public_id": str(self.business_a.public_id),
+                    **params,
+                },
+            )
+
+        return response, [
+            query["sql"]
+            for query in queries.captured_queries
+        ]
+
+    @staticmethod
+    def _touches(queries, model):
+        table = f'"{model._meta.db_table}"'
+        return any(table in sql for sql in queries)
+
+    def test_fields_limit_output_and_skip_unrequested_relations(self):
+        response, queries = self._get(
+            "/api/transactions/",
+            fields="public_id,total_value",
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+        self.assertEqual(
+            list(response.data["results"][0]),
+            ["public_id", "total_value"],
+        )
+        self.assertFalse(self._touches(queries, TransactionDetail))
+        self.assertFalse(self._touches(queries, Customer))
+
+    def test_expand_controls_nested_relations(self):
+        collapsed, queries = self._get("/api/transactions/", expand="")
+
+        self.assertNotIn("details", collapsed.data["results"][0])
+        self.assertIn("customer_name", collapsed.data["results"][0])
+        self.assertFalse(self._touches(queries, TransactionDetail))
+
+        expanded, _ = self._get(
+            "/api/transactions/",
+            fields="public_id",
+            expand="details",
+        )
+
+        self.assertEqual(
+            set(expanded.data["results"][0]),
+            {"public_id", "details"},
+        )
+        self.assertEqual(
+            expanded.data["results"][0]["details"][0]["product_name"],
+            self.product.title,
+        )
+
+        default, _ = self._get("/api/transactions/")
+        self.assertIn("details", default.data["results"][0])
+
+    def test_fields_apply_to_retrieve_debts_and_products(self):
+        response, _ = self._get(
+            f"/api/transactions/{self.sale.public_id}/",
+            fields="public_id,customer_name",
+        )
+        self.assertEqual(
+            response.data,
+            {
+                "public_id": str(self.sale.public_id),
+                "customer_name": self.customer.full_name,
+            },
+        )
+
+        debts, _ = self._get(
+            "/api/debts/",
+            fields="public_id,outstanding_amount,direction",
+        )
+        self.assertEqual(
+            set(debts.data["results"][0]),
+            {"public_id", "outstanding_amount", "direction"},
+        )
+        self.assertEqual(debts.data["results"][0]["direction"], "receivable")
+
+        products, queries = self._get(
+            "/api/products/",
+            fields="public_id,title",
+        )
+        self.assertEqual(
+            set(products.data["results"][0]),
+            {"public_id", "title"},
+        )
+        product_table = Product._meta.db_table
+        self.assertFalse(
+            any(
+                f'"{product_table}"."description"' in sql
+                for sql in queries
+            )
+        )
+
+    def test_unknown_fields_are_rejected(self):
+        response, _ = self._get(
+            "/api/transactions/",
+            fields="public_id,secreto",
+            expand="customer_name",
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            set(response.data),
+            {"fields", "expand"},
+        )
@@ -3,7 +3,7 @@ from concurrent.futures import ThreadPoolExecutor
 from threading import Barrier
 
 from django.db import close_old_connections
-from django.test import TransactionTestCase
+from django.test import TransactionTestCase, override_settings
 from rest_framework import status
 from rest_framework.test import APIClient
 
@@ -233,3 +233,42 @@ class ConcurrentTransactionStockTests(TransactionTestCase):
         self.assertEqual(self.product.stock, 1)
         self.assertEqual(StockMovement.objects.count(), 1)
         self.assertEqual(Transaction.objects.filter(type="sale").count(), 1)
+
+
+@override_settings(INVENTORY_STOCK_ENGINE="conditional")
+class ConditionalEngineTransactionStockTests(TransactionStockTests):
+    def test_sale_of_inactive_product_is_rejected(self):
+        inactive_product = create_product(
+            business=self.business_a,
+            status=self.void_status,
+            stock=10,
+        )
+        self.authenticate_as(self.cashier)
+        response = self.client.post(
+            "/api/transactions/",
+            {
+                "business_public_id": str(self.business_a.public_id),
+                "customer_public_id": str(self.customer.public_id),
+                "employee_public_id": str(self.seller_employee.public_id),
+                "payment_method_public_id": str(self.method.public_id),
+                "type": "sale",
+                "details": [
+                    {"product_public_id": str(self.product.public_id), "quantity": 1},
+                    {"product_public_id": str(inactive_product.public_id), "quantity": 1},
+                ],
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.product.refresh_from_db()
+        inactive_product.refresh_from_db()
+        self.assertEqual(self.product.stock, 10)
+        self.assertEqual(inactive_product.stock, 10)
+        self.assertFalse(StockMovement.objects.exists())
+
+
+@override_settings(INVENTORY_STOCK_ENGINE="conditional")
+class ConditionalEngineConcurrentTransactionStockTests(
+    ConcurrentTransactionStockTests
+):
+    pass
@@ -0,0 +1,270 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from core.models import (
+    BusinessMembership,
+    Product,
+    StockMovement,
+    StocktakeSession,
+)
+from core.tests.base import (
+    BusinessIsolationTestCase,
+)
+from core.tests.factories import (
+    create_product,
+    create_role_user,
+)
+
+
+class StocktakeSessionTests(
+    BusinessIsolationTestCase
+):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        (
+            cls.inventory_user,
+            _,
+            _,
+        ) = create_role_user(
+            business=cls.business_a,
+            role=(
+                BusinessMembership
+                .ROLE_INVENTORY
+            ),
+            status=cls.active_status,
+        )
+
+        (
+            cls.viewer_user,
+            _,
+            _,
+        ) = create_role_user(
+            business=cls.business_a,
+            role=(
+                BusinessMembership
+                .ROLE_VIEWER
+            ),
+            status=cls.active_status,
+        )
+
+        cls.products = [
+            create_product(
+                business=cls.business_a,
+                status=cls.active_status,
+                stock=10,
+            )
+            for _ in range(3)
+        ]
+
+        cls.foreign_product = create_product(
+            business=cls.business_b,
+            status=cls.active_status,
+            stock=10,
+        )
+
+    def setUp(self):
+        self.authenticate_as(
+            self.inventory_user
+        )
+
+    def _open_session(self):
+        response = self.client.post(
+            "/api/stocktakes/",
+            {
+                "business_public_id": str(
+                    self.business_a.public_id
+                ),
+                "note": "Conteo de fin de mes",
+            },
+            format="json",
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_201_CREATED,
+            msg=response.data,
+        )
+
+        return response.data["public_id"]
+
+    def _post_counts(self, session_public_id, counts):
+        return self.client.post(
+            f"/api/stocktakes/{session_public_id}/counts/",
+            {
+                "counts": [
+                    {
+                        "product_public_id": str(
+                            product.public_id
+                        ),
+                        "counted_quantity": quantity,
+                    }
+                    for product, quantity in counts
+                ],
+            },
+            format="json",
+        )
+
+    def test_counts_are_upserted_and_differences_listed(self):
+        session_public_id = self._open_session()
+
+        self._post_counts(
+            session_public_id,
+            [
+                (self.products[0], 7),
+                (self.products[1], 10),
+            ],
+        )
+        response = self._post_counts(
+            session_public_id,
+            [(self.products[0], 8)],
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+        self.assertEqual(response.data["counts_count"], 2)
+
+        differences = self.client.get(
+            f"/api/stocktakes/{session_public_id}/differences/"
+        )
+
+        self.assertEqual(
+            [
+                (
+                    row["product_public_id"],
+                    row["expected_stock"],
+                    row["difference"],
+                )
+                for row in differences.data
+            ],
+            [
+                (
+                    str(self.products[0].public_id),
+                    10,
+                    -2,
+                ),
+            ],
+        )
+
+    def test_apply_adjusts_stock_with_bulk_writes(self):
+        session_public_id = self._open_session()
+        self._post_counts(
+            session_public_id,
+            [
+                (self.products[0], 4),
+                (self.products[1], 10),
+                (self.products[2], 15),
+            ],
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                f"/api/stocktakes/{session_public_id}/apply/"
+            )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_200_OK,
+            msg=response.data,
+        )
+        self.assertEqual(
+            response.data["status"],
+            StocktakeSession.STATUS_APPLIED,
+        )
+
+        stock = dict(
+            Product.objects
+            .filter(pk__in=[product.pk for product in self.products])
+            .values_list("pk", "stock")
+        )
+        self.assertEqual(
+            stock,
+            {
+                self.products[0].pk: 4,
+                self.products[1].pk: 10,
+                self.products[2].pk: 15,
+            },
+        )
+
+        movements = StockMovement.objects.filter(
+            type="adjustment",
+            product__in=self.products,
+        )
+        self.assertEqual(
+            sorted(movements.values_list("quantity", flat=True)),
+            [-6, 5],
+        )
+
+        movement_inserts = [
+            query
+            for query in queries.captured_queries
+            if query["sql"].startswith(
+                f'INSERT INTO "{StockMovement._meta.db_table}"'
+            )
+        ]
+        self.assertEqual(len(movement_inserts), 1)
+
+        applied = self.client.get(
+            f"/api/stocktakes/{session_public_id}/differences/"
+        )
+        self.assertEqual(
+            [row["difference"] for row in applied.data],
+            [-6, 5],
+        )
+
+        again = self.client.post(
+            f"/api/stocktakes/{session_public_id}/apply/"
+        )
+        self.assertEqual(
+            again.status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_foreign_products_are_rejected(self):
+        session_public_id = self._open_session()
+
+        response = self._post_counts(
+            session_public_id,
+            [(self.foreign_product, 3)],
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertIn("counts", response.data)
+
+    def test_viewer_can_read_but_not_apply(self):
+        session_public_id = self._open_session()
+        self.authenticate_as(self.viewer_user)
+
+        detail = self.client.get(
+            f"/api/stocktakes/{session_public_id}/"
+        )
+        self.assertEqual(detail.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(
+            f"/api/stocktakes/{session_public_id}/apply/"
+        )
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+
+    def test_other_business_cannot_see_session(self):
+        session_public_id = self._open_session()
+        self.authenticate_as(self.user_b)
+
+        response = self.client.get(
+            f"/api/stocktakes/{session_public_id}/"
+        )
+
+        self.assertEqual(
+            response.status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
@@ -0,0 +1,369 @@
+import gzip
+import io
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import override_settings
+from django.utils import timezone as django_timezone
+from rest_framework.exceptions import ValidationError
+
+from core.models import (
+    ArchivedTransaction,
+    Business,
+    DebtPayment,
+    EntityStatus,
+    MonthlyClosure,
+    StockMovement,
+    Transaction,
+    User,
+)
+from core.services.archive import (
+    archive_closed_periods,
+    archive_cutoff,
+    restore_archived_month,
+)
+from core.services.inventory import record_stock_movement
+from core.services.tenant_dump import (
+    TENANT_EXCLUDED_MODELS,
+    TENANT_MODELS,
+    export_tenant,
+    import_tenant,
+)
+from core.tests.base import BusinessIsolationTestCase
+from core.tests.factories import (
+    create_debt,
+    create_debt_payment,
+    create_payment_method,
+    create_product,
+    create_transaction,
+    create_transaction_detail,
+)
+
+
+def _delete_tenant(business):
+    for model, lookup in reversed(TENANT_MODELS):
+        model._default_manager.filter(**{lookup: business.pk}).delete()
+
+
+class TenantDumpTests(BusinessIsolationTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+
+        cls.product = create_product(
+            business=cls.business_a,
+            status=cls.active_status,
+            stock=50,
+        )
+        method = create_payment_method(
+            business=cls.business_a,
+            status=cls.active_status,
+        )
+
+        for index in range(3):
+            sale = create_transaction(
+                business=cls.business_a,
+                created_by=cls.user_a,
+                status=cls.active_status,
+                is_debt=index == 0,
+            )
+            detail = create_transaction_detail(
+                transaction=sale,
+                product=cls.product,
+            )
+            record_stock_movement(
+                product=cls.product,
+                quantity=-1,
+                movement_type="sale",
+                created_by=cls.user_a,
+                transaction=sale,
+                transaction_detail=detail,
+            )
+
+            if index == 0:
+                create_debt_payment(
+                    debt=create_debt(transaction=sale),
+                    payment_method=method,
+                    created_by=cls.user_a,
+                )
+
+        create_transaction(
+            business=cls.business_b,
+            created_by=cls.user_b,
+        )
+
+    def _dump(self, business=None, **kwargs):
+        stream = io.BytesIO()
+        counts = export_tenant(
+            business=business or self.business_a,
+            stream=stream,
+            chunk_size=2,
+            **kwargs,
+        )
+        stream.seek(0)
+
+        return stream, counts
+
+    def test_tenant_models_cover_every_business_table(self):
+        listed = [model for model, _ in TENANT_MODELS]
+        shared = {User, EntityStatus}
+
+        for position, model in enumerate(listed):
+            for field in model._meta.concrete_fields:
+                if not field.is_relation:
+                    continue
+
+                with self.subTest(model=model.__name__, field=field.name):
+                    related = field.related_model
+                    self.assertTrue(
+                        related in shared
+                        or related in listed[:position],
+                    )
+
+        self.assertEqual(
+            set(apps.get_app_config("core").get_models())
+            - shared
+            - set(TENANT_EXCLUDED_MODELS),
+            set(listed),
+        )
+
+    def test_round_trip_recreates_rows_with_new_ids(self):
+        sales = list(
+            Transaction.objects
+            .filter(business=self.business_a)
+            .order_by("pk")
+            .values("pk", "public_id", "created_at", "concept")
+        )
+        stream, counts = self._dump()
+
+        _delete_tenant(self.business_a)
+        self.assertFalse(
+            Business.objects.filter(pk=self.business_a.pk).exists()
+        )
+
+        # Filas nuevas con ids que el volcado ya usaba.
+        create_transaction(
+            business=self.business_b,
+            created_by=self.user_b,
+        )
+
+        business, loaded = import_tenant(stream=stream, batch_size=2)
+
+        self.assertEqual(loaded, counts)
+        self.assertEqual(business.public_id, self.business_a.public_id)
+        self.assertNotEqual(business.pk, self.business_a.pk)
+        self.assertEqual(counts["Transaction"], 3)
+        self.assertEqual(counts["DebtPayment"], 1)
+
+        restored = list(
+            Transaction.objects
+            .filter(business=business)
+            .order_by("pk")
+            .values("pk", "public_id", "created_at", "concept")
+        )
+        self.assertEqual(
+            [
+                (row["public_id"], row["created_at"], row["concept"])
+                for row in restored
+            ],
+            [
+                (row["public_id"], row["created_at"], row["concept"])
+                for row in sales
+            ],
+        )
+        self.assertTrue(
+            {row["pk"] for row in restored}.isdisjoint(
+                row["pk"] for row in sales
+            )
+        )
+
+        self.assertEqual(
+            StockMovement.objects.filter(
+                product__business=business,
+                transaction__business=business,
+                transaction_detail__transaction__business=business,
+            ).count(),
+            3,
+        )
+        self.assertEqual(
+            DebtPayment.objects.filter(
+                debt__transaction__business=business,
+                created_by=self.user_a,
+            ).count(),
+            1,
+        )
+        self.assertTrue(
+            business.memberships.filter(user=self.user_a).exists()
+        )
+
+    @override_settings(ARCHIVE_HORIZON_MONTHS=12)
+    def test_round_trip_keeps_archived_history(self):
+        old_at = archive_cutoff() - timedelta(days=20)
+        local_old_at = django_timezone.localtime(old_at)
+        MonthlyClosure.objects.create(
+            business=self.business_a,
+            year=local_old_at.year,
+            month=local_old_at.month,
+            summary={"sales": "100.00"},
+            closed_by=self.user_a,
+        )
+        old_sale = create_transaction(
+            business=self.business_a,
+            created_by=self.user_a,
+            status=self.active_status,
+            created_at=old_at,
+        )
+        create_transaction_detail(
+            transaction=old_sale,
+            product=self.product,
+        )
+        archive_closed_periods(business=self.business_a)
+
+        stream, counts = self._dump()
+        _delete_tenant(self.business_a)
+        business, _ = import_tenant(stream=stream)
+
+        self.assertEqual(counts["ArchivedTransaction"], 1)
+        self.assertEqual(counts["ArchivedTransactionDetail"], 1)
+        self.assertEqual(
+            ArchivedTransaction.objects.get(business=business).public_id,
+            old_sale.public_id,
+        )
+        self.assertEqual(
+            business.monthly_closures.get().summary,
+            {"sales": "100.00"},
+        )
+
+    def _archive_old_sale(self, *, business, user, created_at):
+        local_at = django_timezone.localtime(created_at)
+        MonthlyClosure.objects.get_or_create(
+            business=business,
+            year=local_at.year,
+            month=local_at.month,
+            defaults={
+                "summary": {},
+                "closed_by": user,
+            },
+        )
+        sale = create_transaction(
+            business=business,
+            created_by=user,
+            status=self.active_status,
+            created_at=created_at,
+        )
+        archive_closed_periods(business=business)
+
+        return sale
+
+    @override_settings(ARCHIVE_HORIZON_MONTHS=12)
+    def test_archived_ids_come_from_the_live_sequence(self):
+        old_at = archive_cutoff() - timedelta(days=20)
+        local_old_at = django_timezone.localtime(old_at)
+        other_sale = self._archive_old_sale(
+            business=self.business_b,
+            user=self.user_b,
+            created_at=old_at,
+        )
+        old_sale = self._archive_old_sale(
+            business=self.business_a,
+            user=self.user_a,
+            created_at=old_at,
+        )
+
+        stream, _ = self._dump()
+        _delete_tenant(self.business_a)
+        business, _ = import_tenant(stream=stream, batch_size=2)
+
+        # Los ids importados no chocan con los archivados ni con los
+        # activos, y una venta nueva tampoco los reutiliza.
+        new_sale = create_transaction(
+            business=self.business_b,
+            created_by=self.user_b,
+        )
+        archived_ids = set(
+            ArchivedTransaction.objects.values_list("pk", flat=True)
+        )
+        live_ids = set(Transaction.objects.values_list("pk", flat=True))
+        self.assertEqual(len(archived_ids), 2)
+        self.assertTrue(archived_ids.isdisjoint(live_ids))
+        self.assertIn(new_sale.pk, live_ids)
+
+        for owner, sale in (
+            (business, old_sale),
+            (self.business_b, other_sale),
+        ):
+            with self.subTest(business=owner.business_name):
+                restored = restore_archived_month(
+                    business=owner,
+                    year=local_old_at.year,
+                    month=local_old_at.month,
+                )
+
+                self.assertEqual(restored["Transaction"], 1)
+                self.assertTrue(
+                    Transaction.objects.filter(
+                        business=owner,
+                        public_id=sale.public_id,
+                    ).exists()
+                )
+
+        self.assertFalse(ArchivedTransaction.objects.exists())
+
+    def test_import_rejects_existing_business_and_missing_users(self):
+        stream, _ = self._dump()
+
+        with self.assertRaises(ValidationError):
+            import_tenant(stream=stream)
+
+        stream.seek(0)
+        _delete_tenant(self.business_a)
+        User.objects.filter(pk=self.user_a.pk).delete()
+
+        with self.assertRaises(ValidationError):
+            import_tenant(stream=io.BytesIO(stream.getvalue()))
+
+        business, _ = import_tenant(
+            stream=io.BytesIO(stream.getvalue()),
+            create_missing_users=True,
+        )
+        self.assertTrue(
+            business.memberships.filter(
+                user__email=self.user_a.email,
+            ).exists()
+        )
+
+    def test_commands_write_and_read_gzip_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "tenant.ndjson.gz"
+
+            call_command(
+                "export_tenant",
+                business_public_id=str(self.business_a.public_id),
+                output=str(path),
+                stdout=io.StringIO(),
+            )
+            with gzip.open(path, "rb") as stream:
+                self.assertIn(b'"playnow-tenant"', stream.readline())
+
+            with self.assertRaises(CommandError):
+                call_command(
+                    "import_tenant",
+                    file=str(path),
+                    stdout=io.StringIO(),
+                )
+
+            _delete_tenant(self.business_a)
+            output = io.StringIO()
+            call_command("import_tenant", file=str(path), stdout=output)
+
+        self.assertIn(str(self.business_a.public_id), output.getvalue())
+        self.assertEqual(
+            Transaction.objects.filter(
+                business__public_id=self.business_a.public_id,
+            ).count(),
+            3,
+        )
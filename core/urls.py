@@ -1,20 +1,31 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+
+from .async_views import async_report_view
 from .views import (
     CommissionSettlementViewSet, CurrentUserView, CustomerSummaryView, DebtSummaryView, InventorySummaryView, SupplierSummaryView, healthcheck, RegisterViewSet,
     BusinessViewSet, EntityStatusViewSet,
-    ProductCategoryViewSet, ProductViewSet,
+    ProductCategoryViewSet, ProductViewSet, PosBootstrapView,
     EmployeeViewSet, CustomerViewSet, SupplierViewSet, PaymentMethodViewSet,
     TransactionViewSet, DebtViewSet, DebtPaymentViewSet,
     NotificationViewSet, ReminderViewSet,
     BudgetViewSet, GoalViewSet, GoalProgressViewSet,
-    StockMovementViewSet, UserViewSet, PasswordResetRequestView, PasswordResetConfirmView,
-    EmployeeCommissionPlanViewSet, EmployeeCommissionPreviewView, EmployeeSalesReportView,
+    StockMovementViewSet, StocktakeSessionViewSet, UserViewSet, PasswordResetRequestView, PasswordResetConfirmView,
+    EmployeeCommissionPlanViewSet, EmployeeCommissionBatchPreviewView, EmployeeCommissionPreviewView, EmployeeSalesReportView,
     CashMovementViewSet, CashRegisterViewSet, MonthlySummaryView, MonthlyClosureViewSet, PaymentSummaryView,
-    DashboardOverviewView,
+    DashboardOverviewView, MetricsView, ReportJobView,
     PublicProductCategoryViewSet, PublicProductViewSet
 )
 
+# Con ASYNC_REPORT_VIEWS los reportes se sirven con handlers `async def`
+# (útil con uvicorn u otro servidor ASGI).
+report_view = (
+    async_report_view
+    if settings.ASYNC_REPORT_VIEWS
+    else (lambda view_class: view_class)
+)
+
 router = DefaultRouter()
 public_router = DefaultRouter()
 # auth
@@ -52,6 +63,7 @@ router.register(r'goal-progress', GoalProgressViewSet, basename='goal-progress')
 
 # inventario
 router.register(r'stock-movements', StockMovementViewSet, basename='stock-movement')
+router.register(r'stocktakes', StocktakeSessionViewSet, basename='stocktake')
 
 # User
 router.register(r'users', UserViewSet, basename='user')
@@ -85,6 +97,11 @@ urlpatterns = [
         EmployeeCommissionPreviewView.as_view(),
         name="employee-commission-preview",
     ),
+    path(
+        "reports/employee-commission/batch/",
+        EmployeeCommissionBatchPreviewView.as_view(),
+        name="employee-commission-batch-preview",
+    ),
     path(
         "auth/password/reset/",
         PasswordResetRequestView.as_view(),
@@ -97,37 +114,42 @@ urlpatterns = [
     ),
     path(
         "reports/monthly-summary/",
-        MonthlySummaryView.as_view(),
+        report_view(MonthlySummaryView).as_view(),
         name="monthly-summary",
     ),
     path(
         "reports/customers-summary/",
-        CustomerSummaryView.as_view(),
+        report_view(CustomerSummaryView).as_view(),
         name="customers-summary",
     ),
     path(
         "reports/suppliers-summary/",
-        SupplierSummaryView.as_view(),
+        report_view(SupplierSummaryView).as_view(),
         name="suppliers-summary",
     ),
     path(
         "reports/debts-summary/",
-        DebtSummaryView.as_view(),
+        report_view(DebtSummaryView).as_view(),
         name="debts-summary",
     ),
     path(
         "reports/payments-summary/",
-        PaymentSummaryView.as_view(),
+        report_view(PaymentSummaryView).as_view(),
         name="payments-summary",
     ),
     path(
         "reports/inventory-summary/",
-        InventorySummaryView.as_view(),
+        report_view(InventorySummaryView).as_view(),
         name="inventory-summary",
     ),
+    path(
+        "reports/jobs/<uuid:public_id>/",
+        ReportJobView.as_view(),
+        name="report-job-detail",
+    ),
     path(
         "dashboard/overview/",
-        DashboardOverviewView.as_view(),
+        report_view(DashboardOverviewView).as_view(),
         name="dashboard-overview",
     ),
     path(
@@ -135,11 +157,21 @@ urlpatterns = [
         CurrentUserView.as_view(),
         name="current-user",
     ),
+    path(
+        "pos/bootstrap/",
+        PosBootstrapView.as_view(),
+        name="pos-bootstrap",
+    ),
     path(
         "health/",
         healthcheck,
         name="healthcheck",
     ),
+    path(
+        "metrics/",
+        MetricsView.as_view(),
+        name="metrics",
+    ),
     path(
         "",
         include(router.urls),
@@ -10,6 +10,16 @@ import logging
 
 from core.models import CashMovement
 
+
+# Nombre del EntityStatus de los registros vigentes (ver seed_statuses).
+ACTIVE_STATUS_NAME = "Activo"
+
+# El stock de un producto existente solo cambia con StockMovement.
+STOCK_CHANGE_MESSAGE = (
+    "El stock de un producto existente solo puede "
+    "cambiar mediante movimientos de inventario."
+)
+
 class LoginView(TokenObtainPairView):
     throttle_classes = [ScopedRateThrottle]
     throttle_scope = 'login'
@@ -1,3 +1,4 @@
+import hashlib
 from decimal import Decimal
 from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
 from django.utils import timezone
@@ -18,13 +19,25 @@ from drf_spectacular.utils import (
     extend_schema_view,
 )
 from django_filters import rest_framework as filters
-from core.services.customer_supplier_reports import build_customers_summary, build_suppliers_summary
+from core.services.archive import restore_archived_month
+from core.services.cash_registers import filter_cash_register_activity
+from core.services.commission_accruals import (
+    sale_accrual_key,
+    sync_sale_accrual,
+)
+from core.services.commissions import (
+    build_commission_roster,
+    employee_sales_totals,
+    settle_business_commissions,
+)
+from core.services.customer_supplier_reports import (
+    build_customers_summary,
+    build_suppliers_summary,
+    get_report_datetime_range,
+)
 from core.services.dashboard import build_dashboard_overview
 from core.services.inventory_report import build_inventory_summary
-from core.services.inventory import (
-    lock_products_for_inventory,
-    record_locked_stock_movement,
-)
+from core.services.inventory import record_transaction_stock_movements
 from core.services.financial_flows import (
     direct_payment_transactions,
     exclude_terminal_transactions,
@@ -32,6 +45,26 @@ from core.services.financial_flows import (
 )
 from core.services.monthly_summary import build_monthly_summary
 from core.services.payment_debt_reports import build_debts_summary, build_payments_summary
+from core.services.pos_bootstrap import (
+    get_pos_bootstrap,
+    pos_bootstrap_generation,
+)
+from core.services.product_import import (
+    adjust_product_prices,
+    upsert_products,
+)
+from core.services.product_lookup import lookup_products_by_code
+from core.services.report_sources import (
+    aggregate_sources,
+    report_sources,
+)
+from core.services.stock_snapshots import take_stock_snapshots
+from core.services.stocktakes import (
+    apply_stocktake,
+    cancel_stocktake,
+    record_stocktake_counts,
+    stocktake_differences,
+)
 from core.services.transaction_cancellation import cancel_transaction
 from .filters import (
     DebtFilter,
@@ -39,14 +72,29 @@ from .filters import (
     StockMovementFilter,
     TransactionFilter,
 )
+from .metrics import render_metrics, store as metrics_store
 from .pagination import StandardResultsSetPagination
-from .mixins import RequireBusinessPublicIdListMixin, SoftDeleteByStatusMixin
+from .query_plans import prune_queryset_for_serializer
+from .renderers import PrometheusTextRenderer
+from .mixins import (
+    ASYNC_REPORT_PARAMETER,
+    BUSINESS_PUBLIC_ID_LIST_PARAMETER,
+    SPARSE_FIELDSET_PARAMETERS,
+    ArchiveUnionListMixin,
+    AsyncReportMixin,
+    DeltaSyncMixin,
+    FastListMixin,
+    RequireBusinessPublicIdListMixin,
+    SoftDeleteByStatusMixin,
+    SparseFieldsetMixin,
+    StreamingExportMixin,
+    StreamingListResponseMixin,
+)
 from django.db import (
     IntegrityError,
     transaction as db_tx,
 )
 from django.db.models import (
-    Avg,
     Count,
     DecimalField,
     ExpressionWrapper,
@@ -69,6 +117,7 @@ from .serializers import (
     DashboardOverviewQuerySerializer,
     DashboardOverviewResponseSerializer,
     DetailErrorResponseSerializer,
+    EmployeeCommissionBatchQuerySerializer,
     InventoryValidationErrorResponseSerializer,
     DebtSummaryResponseSerializer,
     DebtSummaryQuerySerializer,
@@ -83,11 +132,22 @@ from .serializers import (
     MonthlySummaryResponseSerializer,
     PaymentSummaryQuerySerializer,
     PaymentSummaryResponseSerializer,
+    PosBootstrapQuerySerializer,
+    ProductBulkUpsertSerializer,
+    ProductCodeBatchLookupSerializer,
+    ProductCodeLookupQuerySerializer,
+    ProductCodeLookupSerializer,
+    ProductPriceUpdateSerializer,
+    ReportJobSerializer,
     SupplierSummaryQuerySerializer,
     TransactionCancellationConflictResponseSerializer,
     CurrentUserSerializer,
     PublicProductCategorySerializer,
     PublicProductSerializer,
+    StocktakeCountsSerializer,
+    StocktakeDifferenceSerializer,
+    StocktakeSessionCreateSerializer,
+    StocktakeSessionSerializer,
 )
 from datetime import (
     date,
@@ -98,8 +158,10 @@ from datetime import (
 from uuid import UUID
 from .services.serializer import ChangePasswordSerializer, PasswordResetRequestSerializer, PasswordResetConfirmSerializer
 from django.conf import settings
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from django.utils import timezone as django_timezone
+from django.utils.http import parse_etags, quote_etag
 
 FRONTEND_RESET_URL = settings.FRONTEND_RESET_URL
 
@@ -509,7 +571,8 @@ from .models import (
     Employee, Customer, Supplier, PaymentMethod,
     Transaction, TransactionDetail, StockMovement,
     Debt, DebtPayment, Notification, Reminder,
-    Budget, Goal, GoalProgress, EmployeeCommissionPlan, CommissionSettlement, CashMovement
+    Budget, Goal, GoalProgress, EmployeeCommissionPlan, CommissionSettlement, CashMovement,
+    ArchivedStockMovement, ArchivedTransaction, StocktakeSession, ReportJob,
 )
 from .serializers import (
     UserSerializer, RegisterSerializer,
@@ -520,26 +583,24 @@ from .serializers import (
     TransactionDetailSerializer, StockMovementSerializer,
     DebtSerializer, DebtPaymentSerializer, NotificationSerializer, ReminderSerializer,
     BudgetSerializer, GoalSerializer, GoalProgressSerializer, 
-    CommissionSettlementCreateSerializer, CommissionSettlementSerializer, EmployeeCommissionPlanSerializer,
+    CommissionSettlementBulkCreateSerializer, CommissionSettlementCreateSerializer, CommissionSettlementSerializer,
+    EmployeeCommissionPlanSerializer,
 )
-from .permissions import IsOwnerOrBusinessOwner
+from .permissions import CanReadMetrics, IsOwnerOrBusinessOwner
 
-def validate_report_business_access(
+def _report_access_queryset(
     *,
     user,
     business,
     allowed_roles=None,
 ):
-    if user.is_superuser:
-        return
-
     if allowed_roles is None:
         allowed_roles = [
             BusinessMembership.ROLE_OWNER,
             BusinessMembership.ROLE_ADMIN,
         ]
 
-    has_access = (
+    return (
         BusinessMembership.objects
         .filter(
             user=user,
@@ -547,10 +608,40 @@ def validate_report_business_access(
             is_active=True,
             role__in=allowed_roles,
         )
-        .exists()
     )
 
-    if not has_access:
+def validate_report_business_access(
+    *,
+    user,
+    business,
+    allowed_roles=None,
+):
+    if user.is_superuser:
+        return
+
+    if not _report_access_queryset(
+        user=user,
+        business=business,
+        allowed_roles=allowed_roles,
+    ).exists():
+        raise PermissionDenied(
+            "No tienes permisos para consultar este reporte."
+        )
+
+async def avalidate_report_business_access(
+    *,
+    user,
+    business,
+    allowed_roles=None,
+):
+    if user.is_superuser:
+        return
+
+    if not await _report_access_queryset(
+        user=user,
+        business=business,
+        allowed_roles=allowed_roles,
+    ).aexists():
         raise PermissionDenied(
             "No tienes permisos para consultar este reporte."
         )
@@ -562,32 +653,39 @@ def calculate_cash_register_summary(
 ):
     until = until or django_timezone.now()
 
-    base_transactions = exclude_terminal_transactions(
-        Transaction.objects
-        .filter(
-            business=cash_register.business,
-            created_at__gte=cash_register.open_time,
-            created_at__lte=until,
-        )
+    # Una caja abierta antes de la marca de archivo puede tener
+    # movimientos en meses ya archivados.
+    sources = report_sources(
+        business=cash_register.business,
+        start=cash_register.open_time,
     )
 
-    direct_transactions = direct_payment_transactions(
-        base_transactions
-    )
+    direct_transactions = [
+        direct_payment_transactions(
+            exclude_terminal_transactions(
+                filter_cash_register_activity(
+                    models[Transaction].objects.all(),
+                    cash_register=cash_register,
+                    until=until,
+                )
+            )
+        )
+        for models in sources
+    ]
 
     def transaction_total(
         transaction_type,
         method_type,
     ):
-        result = (
-            direct_transactions
-            .filter(
-                type=transaction_type,
-                payment_method__method_type=method_type,
-            )
-            .aggregate(
-                total=Sum("total_value")
-            )
+        result = aggregate_sources(
+            [
+                queryset.filter(
+                    type=transaction_type,
+                    payment_method__method_type=method_type,
+                )
+                for queryset in direct_transactions
+            ],
+            total=Sum("total_value"),
         )
 
         return (
@@ -625,29 +723,33 @@ def calculate_cash_register_summary(
         PaymentMethod.TYPE_CASH,
     )
 
-    session_debt_payments = recognized_debt_payments(
-        DebtPayment.objects
-        .filter(
-            debt__transaction__business=(
-                cash_register.business
-            ),
-            payment_method__method_type=(
-                PaymentMethod.TYPE_CASH
-            ),
-            created_at__gte=(
-                cash_register.open_time
-            ),
-            created_at__lte=until,
+    session_debt_payments = [
+        recognized_debt_payments(
+            filter_cash_register_activity(
+                models[DebtPayment].objects.filter(
+                    payment_method__method_type=(
+                        PaymentMethod.TYPE_CASH
+                    ),
+                ),
+                cash_register=cash_register,
+                until=until,
+                business_lookup="debt__transaction__business",
+            )
         )
-    )
+        for models in sources
+    ]
 
     def cash_debt_payment_total(transaction_type):
         return (
-            session_debt_payments
-            .filter(
-                debt__transaction__type=transaction_type,
+            aggregate_sources(
+                [
+                    queryset.filter(
+                        debt__transaction__type=transaction_type,
+                    )
+                    for queryset in session_debt_payments
+                ],
+                total=Sum("amount"),
             )
-            .aggregate(total=Sum("amount"))
             .get("total")
             or Decimal("0.00")
         )
@@ -891,7 +993,13 @@ class RegisterViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
 
 # -------- Base mixin para filtrar por usuario --------
 
-class BusinessScopedViewSet(RequireBusinessPublicIdListMixin, viewsets.ModelViewSet):
+class BusinessScopedViewSet(
+    SparseFieldsetMixin,
+    RequireBusinessPublicIdListMixin,
+    FastListMixin,
+    StreamingListResponseMixin,
+    viewsets.ModelViewSet,
+):
     """
     ViewSet base para recursos pertenecientes a un usuario o negocio.
 
@@ -951,18 +1059,57 @@ class BusinessScopedViewSet(RequireBusinessPublicIdListMixin, viewsets.ModelView
     update_allowed_roles = None
     destroy_allowed_roles = None
 
+    # Acciones que consumen el cupo de lectura en lugar del de escritura.
+    read_throttle_actions = (
+        "list",
+        "retrieve",
+        "sync",
+        "export",
+    )
+
+    # Acciones cuyo queryset se limita a las columnas y relaciones que
+    # lee el serializer (ver core.query_plans).
+    column_pruning_actions = (
+        "list",
+        "sync",
+        "export",
+    )
+
     def get_throttles(self):
         self.throttle_scope = (
             "public_read"
-            if self.action in (
-                "list",
-                "retrieve",
-            )
+            if self.action in self.read_throttle_actions
             else "admin_write"
         )
 
         return super().get_throttles()
 
+    @extend_schema(
+        parameters=[
+            BUSINESS_PUBLIC_ID_LIST_PARAMETER,
+            *SPARSE_FIELDSET_PARAMETERS,
+        ],
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        parameters=SPARSE_FIELDSET_PARAMETERS,
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        if self.action in self.column_pruning_actions:
+            queryset = prune_queryset_for_serializer(
+                queryset,
+                self.get_serializer(),
+            )
+
+        return queryset
+
     @staticmethod
     def _is_platform_admin(user) -> bool:
         """
@@ -1312,8 +1459,16 @@ class BusinessScopedViewSet(RequireBusinessPublicIdListMixin, viewsets.ModelView
         )
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        return self.scope_queryset(
+            super().get_queryset()
+        )
 
+    def scope_queryset(self, queryset):
+        """
+        Limita un queryset a los negocios y recursos visibles para el
+        usuario. Sirve también para querysets de otros modelos con la
+        misma ruta al negocio, como las tablas de archivo.
+        """
         user = self.request.user
         if not user.is_authenticated:
             return queryset.none()
@@ -2310,10 +2465,12 @@ class ProductCategoryViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
     update=extend_schema(tags=["Products"]),
     partial_update=extend_schema(tags=["Products"]),
     destroy=extend_schema(tags=["Products"]),
+    sync=extend_schema(tags=["Products"]),
 )
-class ProductViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
+class ProductViewSet(DeltaSyncMixin, SoftDeleteByStatusMixin, BusinessScopedViewSet):
     queryset = Product.objects.select_related("business", "category", "status").all()
     serializer_class = ProductSerializer
+    fast_list = True
 
     business_lookup = "business"
 
@@ -2356,12 +2513,277 @@ class ProductViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
                 field_name="is_visible",
             ),
     }
-    search_fields = ["title"]
+    search_fields = ["title", "=sku", "=barcode"]
     ordering_fields = ["title", "created_at", "updated_at"]
     ordering = ["-created_at"]
 
     pagination_class = StandardResultsSetPagination
 
+    read_throttle_actions = (
+        "list",
+        "retrieve",
+        "sync",
+        "by_code",
+        "by_codes",
+    )
+
+    def _lookup_business(self, business_public_id):
+        business = get_object_or_404(
+            Business,
+            public_id=business_public_id,
+        )
+
+        self._validate_business_access(
+            business,
+            allowed_roles=self.read_allowed_roles,
+        )
+
+        return business
+
+    @extend_schema(
+        tags=["Products"],
+        summary="Buscar producto por código",
+        description=(
+            "Resuelve un código de barras o SKU del negocio para el punto "
+            "de venta. Devuelve solo identificador, precio y stock; solo "
+            "se encuentran productos activos."
+        ),
+        parameters=[
+            ProductCodeLookupQuerySerializer,
+        ],
+        responses={
+            200: ProductCodeLookupSerializer,
+            404: DetailErrorResponseSerializer,
+        },
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"by-code/(?P<code>[^/]+)",
+        filter_backends=[],
+        pagination_class=None,
+    )
+    def by_code(
+        self,
+        request,
+        code=None,
+    ):
+        query = ProductCodeLookupQuerySerializer(
+            data=request.query_params,
+        )
+        query.is_valid(raise_exception=True)
+
+        business = self._lookup_business(
+            query.validated_data["business_public_id"]
+        )
+        product = lookup_products_by_code(
+            business=business,
+            codes=[code],
+        ).get(code)
+
+        if product is None:
+            return Response(
+                {"detail": "No existe un producto con ese código."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(
+            ProductCodeLookupSerializer(product).data
+        )
+
+    @extend_schema(
+        tags=["Products"],
+        summary="Buscar productos por varios códigos",
+        description=(
+            "Resuelve en una llamada varios códigos de barras o SKU. "
+            "La respuesta agrupa los productos por código y lista en "
+            "`missing` los códigos sin coincidencia."
+        ),
+        request=ProductCodeBatchLookupSerializer,
+        responses={
+            200: OpenApiResponse(
+                description="Productos por código y códigos no encontrados."
+            ),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="by-code",
+    )
+    def by_codes(
+        self,
+        request,
+    ):
+        serializer = ProductCodeBatchLookupSerializer(
+            data=request.data,
+        )
+        serializer.is_valid(raise_exception=True)
+
+        business = self._lookup_business(
+            serializer.validated_data["business_public_id"]
+        )
+        codes = serializer.validated_data["codes"]
+        products = lookup_products_by_code(
+            business=business,
+            codes=codes,
+        )
+
+        return Response({
+            "products": {
+                code: ProductCodeLookupSerializer(product).data
+                for code, product in products.items()
+            },
+            "missing": [
+                code
+                for code in dict.fromkeys(codes)
+                if code not in products
+            ],
+        })
+
+    @extend_schema(
+        tags=["Products"],
+        summary="Importar productos en bloque",
+        description=(
+            "Crea o actualiza productos desde una lista JSON o un archivo "
+            "CSV/JSON. Las filas con public_id actualizan ese producto y "
+            "solo modifican las columnas enviadas. Si una fila es inválida "
+            "no se escribe ninguna y los errores se devuelven por índice."
+        ),
+        request=ProductBulkUpsertSerializer,
+        responses={
+            200: OpenApiResponse(
+                description="Productos creados y actualizados."
+            ),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk-upsert",
+    )
+    def bulk_upsert(
+        self,
+        request,
+    ):
+        serializer = ProductBulkUpsertSerializer(
+            data=request.data,
+        )
+
+        serializer.is_valid(
+            raise_exception=True
+        )
+
+        business = get_object_or_404(
+            Business,
+            public_id=serializer.validated_data[
+                "business_public_id"
+            ],
+        )
+
+        self._validate_business_access(
+            business,
+            allowed_roles=self.create_allowed_roles,
+        )
+
+        result = upsert_products(
+            business=business,
+            rows=serializer.validated_data["rows"],
+        )
+
+        log_action(
+            request.user,
+            "BULK_UPSERT",
+            Product.__name__,
+            None,
+            extra={
+                "business": business.pk,
+                **result,
+            },
+        )
+
+        return Response(result)
+
+    @extend_schema(
+        tags=["Products"],
+        summary="Actualizar precios por porcentaje",
+        description=(
+            "Aplica un porcentaje al precio o al costo de todos los "
+            "productos del negocio, u opcionalmente de una categoría, "
+            "con una sola sentencia UPDATE."
+        ),
+        request=ProductPriceUpdateSerializer,
+        responses={
+            200: OpenApiResponse(
+                description="Cantidad de productos actualizados."
+            ),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="price-update",
+    )
+    def price_update(
+        self,
+        request,
+    ):
+        serializer = ProductPriceUpdateSerializer(
+            data=request.data,
+        )
+
+        serializer.is_valid(
+            raise_exception=True
+        )
+
+        business = get_object_or_404(
+            Business,
+            public_id=serializer.validated_data[
+                "business_public_id"
+            ],
+        )
+
+        self._validate_business_access(
+            business,
+            allowed_roles=self.update_allowed_roles,
+        )
+
+        category = None
+        category_public_id = serializer.validated_data.get(
+            "category_public_id"
+        )
+
+        if category_public_id:
+            category = get_object_or_404(
+                ProductCategory,
+                business=business,
+                public_id=category_public_id,
+            )
+
+        updated = adjust_product_prices(
+            business=business,
+            percent=serializer.validated_data["percent"],
+            category=category,
+            field=serializer.validated_data["field"],
+        )
+
+        log_action(
+            request.user,
+            "PRICE_UPDATE",
+            Product.__name__,
+            None,
+            extra={
+                "business": business.pk,
+                "percent": str(serializer.validated_data["percent"]),
+                "field": serializer.validated_data["field"],
+                "updated": updated,
+            },
+        )
+
+        return Response({
+            "updated": updated,
+        })
+
 
 @extend_schema_view(
     list=extend_schema(
@@ -2405,8 +2827,9 @@ class ProductViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
     update=extend_schema(tags=["Employees"]),
     partial_update=extend_schema(tags=["Employees"]),
     destroy=extend_schema(tags=["Employees"]),
+    sync=extend_schema(tags=["Employees"]),
 )
-class EmployeeViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
+class EmployeeViewSet(DeltaSyncMixin, SoftDeleteByStatusMixin, BusinessScopedViewSet):
     queryset = Employee.objects.select_related("business", "status").all()
     serializer_class = EmployeeSerializer
     lookup_field = "public_id"
@@ -2448,7 +2871,7 @@ class EmployeeViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
 
         business_id = None
 
-        if self.action == "list":
+        if self.action in {"list", "sync"}:
             business_public_id = self.request.query_params.get(
                 "business_public_id"
             )
@@ -2493,7 +2916,7 @@ class EmployeeViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
         )
 
     def get_serializer_class(self):
-        if self.action in {"list", "retrieve"}:
+        if self.action in {"list", "retrieve", "sync"}:
             role = self._request_membership_role()
             if role in {
                 BusinessMembership.ROLE_CASHIER,
@@ -2526,8 +2949,9 @@ class EmployeeViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
     update=extend_schema(tags=["Customers"]),
     partial_update=extend_schema(tags=["Customers"]),
     destroy=extend_schema(tags=["Customers"]),
+    sync=extend_schema(tags=["Customers"]),
 )
-class CustomerViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
+class CustomerViewSet(DeltaSyncMixin, SoftDeleteByStatusMixin, BusinessScopedViewSet):
     queryset = Customer.objects.select_related("business", "status").all()
     serializer_class = CustomerSerializer
     lookup_field = "public_id"
@@ -2634,8 +3058,9 @@ class SupplierViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
     update=extend_schema(tags=["Payment Methods"]),
     partial_update=extend_schema(tags=["Payment Methods"]),
     destroy=extend_schema(tags=["Payment Methods"]),
+    sync=extend_schema(tags=["Payment Methods"]),
 )
-class PaymentMethodViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
+class PaymentMethodViewSet(DeltaSyncMixin, SoftDeleteByStatusMixin, BusinessScopedViewSet):
     queryset = PaymentMethod.objects.select_related(
         "business",
         "status",
@@ -2734,14 +3159,28 @@ class PaymentMethodViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
 @extend_schema_view(
     list=extend_schema(tags=["Stock Movements"]),
     retrieve=extend_schema(tags=["Stock Movements"]),
+    export=extend_schema(
+        tags=["Stock Movements"],
+        summary="Exportar movimientos de inventario",
+    ),
 )
-class StockMovementViewSet(BusinessScopedViewSet):
+class StockMovementViewSet(
+    ArchiveUnionListMixin,
+    StreamingExportMixin,
+    BusinessScopedViewSet,
+):
     queryset = (
         StockMovement.objects
         .select_related("product", "product__business", "transaction")
         .all()
     )
+    archive_queryset = (
+        ArchivedStockMovement.objects
+        .select_related("product", "product__business", "transaction")
+        .all()
+    )
     serializer_class = StockMovementSerializer
+    fast_list = True
 
     business_lookup = "product__business"
 
@@ -2769,8 +3208,379 @@ class StockMovementViewSet(BusinessScopedViewSet):
     pagination_class = StandardResultsSetPagination
 
 @extend_schema_view(
-    list=extend_schema(tags=["Transactions"]),
+    list=extend_schema(
+        tags=["Stocktakes"],
+        summary="Listar conteos físicos",
+    ),
+    retrieve=extend_schema(
+        tags=["Stocktakes"],
+        summary="Consultar un conteo físico",
+    ),
+    create=extend_schema(
+        tags=["Stocktakes"],
+        summary="Abrir un conteo físico",
+        request=StocktakeSessionCreateSerializer,
+        responses={
+            201: StocktakeSessionSerializer,
+        },
+    ),
+)
+class StocktakeSessionViewSet(
+    RequireBusinessPublicIdListMixin,
+    viewsets.GenericViewSet,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.CreateModelMixin,
+):
+    queryset = (
+        StocktakeSession.objects
+        .select_related(
+            "business",
+            "created_by",
+            "applied_by",
+        )
+        .annotate(
+            counts_count=Count("counts"),
+        )
+        .order_by("-created_at")
+    )
+
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    lookup_field = "public_id"
+    lookup_url_kwarg = "public_id"
+
+    pagination_class = (
+        StandardResultsSetPagination
+    )
+
+    simple_filter_fields = {
+        "status": filters.CharFilter(
+            field_name="status",
+        ),
+    }
+
+    ordering_fields = [
+        "created_at",
+        "applied_at",
+    ]
+
+    ordering = [
+        "-created_at",
+    ]
+
+    business_lookup = "business"
+
+    list_allowed_roles = [
+        BusinessMembership.ROLE_OWNER,
+        BusinessMembership.ROLE_ADMIN,
+        BusinessMembership.ROLE_INVENTORY,
+        BusinessMembership.ROLE_VIEWER,
+    ]
+
+    read_roles = list_allowed_roles
+
+    management_roles = [
+        BusinessMembership.ROLE_OWNER,
+        BusinessMembership.ROLE_ADMIN,
+        BusinessMembership.ROLE_INVENTORY,
+    ]
+
+    def get_serializer_class(self):
+        if self.action == "create":
+            return StocktakeSessionCreateSerializer
+
+        if self.action == "counts":
+            return StocktakeCountsSerializer
+
+        return StocktakeSessionSerializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+
+        if not user.is_superuser:
+            queryset = (
+                queryset
+                .filter(
+                    business__memberships__user=user,
+                    business__memberships__is_active=True,
+                    business__memberships__role__in=(
+                        self.read_roles
+                    ),
+                )
+                .distinct()
+            )
+
+        return queryset
+
+    def _validate_stocktake_access(
+        self,
+        business,
+    ):
+        user = self.request.user
+
+        if user.is_superuser:
+            return
+
+        has_access = (
+            BusinessMembership.objects
+            .filter(
+                user=user,
+                business=business,
+                is_active=True,
+                role__in=self.management_roles,
+            )
+            .exists()
+        )
+
+        if not has_access:
+            raise PermissionDenied(
+                "No tienes permiso para gestionar "
+                "el inventario de este negocio."
+            )
+
+    def _session_response(
+        self,
+        session,
+        *,
+        response_status=status.HTTP_200_OK,
+    ):
+        session = self.get_queryset().get(
+            pk=session.pk,
+        )
+
+        return Response(
+            StocktakeSessionSerializer(
+                session,
+                context={
+                    "request": self.request,
+                },
+            ).data,
+            status=response_status,
+        )
+
+    def create(
+        self,
+        request,
+        *args,
+        **kwargs,
+    ):
+        serializer = self.get_serializer(
+            data=request.data
+        )
+
+        serializer.is_valid(
+            raise_exception=True
+        )
+
+        self._validate_stocktake_access(
+            serializer.validated_data["business"]
+        )
+
+        session = serializer.save(
+            created_by=request.user,
+        )
+
+        log_action(
+            request.user,
+            "OPEN_STOCKTAKE",
+            session.__class__.__name__,
+            session.pk,
+        )
+
+        return self._session_response(
+            session,
+            response_status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(
+        tags=["Stocktakes"],
+        summary="Registrar cantidades contadas",
+        description=(
+            "Agrega o reemplaza cantidades contadas en una sesión "
+            "abierta. Puede llamarse varias veces con lotes de "
+            "hasta 5000 productos."
+        ),
+        request=StocktakeCountsSerializer,
+        responses={
+            200: StocktakeSessionSerializer,
+        },
+    )
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="counts",
+    )
+    def counts(
+        self,
+        request,
+        public_id=None,
+    ):
+        session = self.get_object()
+
+        self._validate_stocktake_access(
+            session.business
+        )
+
+        serializer = self.get_serializer(
+            data=request.data
+        )
+
+        serializer.is_valid(
+            raise_exception=True
+        )
+
+        record_stocktake_counts(
+            session=session,
+            counts=[
+                (
+                    entry["product_public_id"],
+                    entry["counted_quantity"],
+                )
+                for entry in serializer.validated_data[
+                    "counts"
+                ]
+            ],
+        )
+
+        return self._session_response(session)
+
+    @extend_schema(
+        tags=["Stocktakes"],
+        summary="Diferencias del conteo",
+        description=(
+            "Compara lo contado con el stock actual, o con el stock "
+            "guardado si la sesión ya fue aplicada. Con all=true "
+            "incluye también los productos sin diferencia."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="all",
+                type=OpenApiTypes.BOOL,
+                location=OpenApiParameter.QUERY,
+                required=False,
+            ),
+        ],
+        responses={
+            200: StocktakeDifferenceSerializer(many=True),
+        },
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="differences",
+        filter_backends=[],
+        pagination_class=None,
+    )
+    def differences(
+        self,
+        request,
+        public_id=None,
+    ):
+        session = self.get_object()
+        include_all = (
+            request.query_params.get("all", "")
+            .lower()
+            in ("1", "true")
+        )
+
+        return Response(
+            StocktakeDifferenceSerializer(
+                stocktake_differences(
+                    session=session,
+                    only_changed=not include_all,
+                ),
+                many=True,
+            ).data,
+            status=status.HTTP_200_OK,
+        )
+
+    @extend_schema(
+        tags=["Stocktakes"],
+        summary="Aplicar el conteo",
+        description=(
+            "Ajusta en una sola transacción el stock de todos los "
+            "productos contados y registra un movimiento de ajuste "
+            "por cada diferencia."
+        ),
+        request=None,
+        responses={
+            200: StocktakeSessionSerializer,
+        },
+    )
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="apply",
+    )
+    def apply(
+        self,
+        request,
+        public_id=None,
+    ):
+        session = self.get_object()
+
+        self._validate_stocktake_access(
+            session.business
+        )
+
+        adjusted = apply_stocktake(
+            session=session,
+            applied_by=request.user,
+        )
+
+        log_action(
+            request.user,
+            "APPLY_STOCKTAKE",
+            session.__class__.__name__,
+            session.pk,
+            extra={
+                "adjusted_products": adjusted,
+            },
+        )
+
+        return self._session_response(session)
+
+    @extend_schema(
+        tags=["Stocktakes"],
+        summary="Cancelar el conteo",
+        request=None,
+        responses={
+            200: StocktakeSessionSerializer,
+        },
+    )
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="cancel",
+    )
+    def cancel(
+        self,
+        request,
+        public_id=None,
+    ):
+        session = self.get_object()
+
+        self._validate_stocktake_access(
+            session.business
+        )
+
+        cancel_stocktake(
+            session=session,
+        )
+
+        return self._session_response(session)
+
+@extend_schema_view(
+    list=extend_schema(tags=["Transactions"]),
     retrieve=extend_schema(tags=["Transactions"]),
+    export=extend_schema(
+        tags=["Transactions"],
+        summary="Exportar transacciones",
+    ),
     create=extend_schema(
         tags=["Transactions"],
         summary="Crear una transacción",
@@ -2852,7 +3662,12 @@ class StockMovementViewSet(BusinessScopedViewSet):
         },
     ),
 )
-class TransactionViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
+class TransactionViewSet(
+    ArchiveUnionListMixin,
+    StreamingExportMixin,
+    SoftDeleteByStatusMixin,
+    BusinessScopedViewSet,
+):
     queryset = (
         Transaction.objects
         .select_related(
@@ -2868,7 +3683,24 @@ class TransactionViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
         .prefetch_related("details", "details__product")
         .all()
     )
+    archive_queryset = (
+        ArchivedTransaction.objects
+        .select_related(
+            "business",
+            "customer",
+            "supplier",
+            "employee",
+            "payment_method",
+            "status",
+            "created_by",
+            "updated_by",
+        )
+        .prefetch_related("details", "details__product")
+        .all()
+    )
     serializer_class = TransactionSerializer
+    # La ruta rápida lee `details` con su propia consulta por página.
+    fast_list = True
     business_lookup = "business"
     soft_delete_status_name = "Anulado"
     destroy_allowed_roles = [
@@ -2983,36 +3815,28 @@ class TransactionViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
             created_by=self.request.user,
         )
 
+        sync_sale_accrual(
+            before=None,
+            after=sale_accrual_key(tx),
+        )
+
         sign = self._sign_for_tx(tx.type)
 
         if sign is not None:
-            details = list(tx.details.select_related("product"))
-            locked_products = lock_products_for_inventory(
-                product_ids=(detail.product_id for detail in details),
-                business_id=tx.business_id,
-                require_active=True,
-            )
-
-            for detail in details:
-                product = locked_products[detail.product_id]
-                quantity = detail.quantity
-
-                record_locked_stock_movement(
-                    product=product,
-                    transaction=tx,
-                    transaction_detail=detail,
-                    created_by=self.request.user,
-                    movement_type=(
-                        "sale"
-                        if sign == -1
-                        else "entry"
-                    ),
-                    quantity=sign * quantity,
-                    note=(
-                        f"Auto base from "
-                        f"{tx.type} {tx.public_id}"
-                    ),
-                )
+            record_transaction_stock_movements(
+                transaction=tx,
+                sign=sign,
+                created_by=self.request.user,
+                movement_type=(
+                    "sale"
+                    if sign == -1
+                    else "entry"
+                ),
+                note=(
+                    f"Auto base from "
+                    f"{tx.type} {tx.public_id}"
+                ),
+            )
 
         log_action(
             self.request.user,
@@ -3058,10 +3882,19 @@ class TransactionViewSet(SoftDeleteByStatusMixin, BusinessScopedViewSet):
             allowed_roles=allowed_roles,
         )
 
+        accrual_before = sale_accrual_key(
+            serializer.instance
+        )
+
         tx = serializer.save(
             updated_by=self.request.user,
         )
 
+        sync_sale_accrual(
+            before=accrual_before,
+            after=sale_accrual_key(tx),
+        )
+
         log_action(
             self.request.user,
             "UPDATE",
@@ -3148,6 +3981,10 @@ class DebtViewSet(BusinessScopedViewSet):
 
 
 @extend_schema_view(
+    export=extend_schema(
+        tags=["Debt Payments"],
+        summary="Exportar pagos de deudas",
+    ),
     list=extend_schema(
         tags=["Debt Payments"],
         summary="Listar pagos de deudas",
@@ -3169,7 +4006,7 @@ class DebtViewSet(BusinessScopedViewSet):
         ],
     ),
 )
-class DebtPaymentViewSet(BusinessScopedViewSet):
+class DebtPaymentViewSet(StreamingExportMixin, BusinessScopedViewSet):
     queryset = DebtPayment.objects.select_related(
         "debt",
         "debt__transaction",
@@ -3612,6 +4449,7 @@ class EmployeeSalesReportView(
     permission_classes = [
         IsAuthenticated,
     ]
+    replica_reads = True
 
     @extend_schema(
         tags=["Reports"],
@@ -3721,43 +4559,57 @@ class EmployeeSalesReportView(
         employee = get_object_or_404(
             Employee.objects.select_related(
                 "business"
-            ),
-            public_id=employee_public_id,
-            business=business,
-        )
-
-        sales = (
-            Transaction.objects
-            .select_related(
-                "customer",
-                "employee",
-                "business",
-            )
-            .filter(
-                business=business,
-                employee=employee,
-                type="sale",
-                created_at__date__gte=date_from,
-                created_at__date__lte=date_to,
-            )
-            .order_by("-created_at")
+            ),
+            public_id=employee_public_id,
+            business=business,
         )
-        sales = exclude_terminal_transactions(sales)
 
-        summary = sales.aggregate(
-            sales_count=Count("id"),
-            sales_total=Sum("total_value"),
-            average_sale=Avg("total_value"),
+        start_datetime, end_datetime = get_report_datetime_range(
+            date_from=date_from,
+            date_to=date_to,
         )
 
-        sales_total = (
-            summary["sales_total"]
-            or Decimal("0.00")
+        # El resumen sale del libro de comisiones, que conserva las
+        # ventas archivadas; el detalle también las incluye.
+        sales = sorted(
+            (
+                transaction
+                for models in report_sources(
+                    business=business,
+                    start=start_datetime,
+                )
+                for transaction in exclude_terminal_transactions(
+                    models[Transaction].objects
+                    .select_related(
+                        "customer",
+                        "employee",
+                        "business",
+                    )
+                    .filter(
+                        business=business,
+                        employee=employee,
+                        type="sale",
+                        created_at__date__gte=date_from,
+                        created_at__date__lte=date_to,
+                    )
+                )
+            ),
+            key=lambda transaction: transaction.created_at,
+            reverse=True,
+        )
+
+        summary = employee_sales_totals(
+            employee=employee,
+            period_start=date_from,
+            period_end=date_to,
         )
 
+        sales_total = summary["sales_total"]
+
         average_sale = (
-            summary["average_sale"]
-            or Decimal("0.00")
+            sales_total / summary["sales_count"]
+            if summary["sales_count"]
+            else Decimal("0.00")
         )
 
         transactions = [
@@ -3947,29 +4799,13 @@ class EmployeeCommissionPreviewView(
                 )
             })
 
-        sales = (
-            Transaction.objects
-            .filter(
-                business=business,
-                employee=employee,
-                type="sale",
-                created_at__date__range=(
-                    date_from,
-                    date_to,
-                ),
-            )
-        )
-        sales = exclude_terminal_transactions(sales)
-
-        summary = sales.aggregate(
-            sales_count=Count("id"),
-            sales_total=Sum("total_value"),
+        summary = employee_sales_totals(
+            employee=employee,
+            period_start=date_from,
+            period_end=date_to,
         )
 
-        sales_total = (
-            summary["sales_total"]
-            or Decimal("0.00")
-        )
+        sales_total = summary["sales_total"]
 
         percentage = (
             commission_plan.percentage
@@ -4068,6 +4904,79 @@ class EmployeeCommissionPreviewView(
                 commission_plan.public_id
             ),
         })
+
+class EmployeeCommissionBatchPreviewView(
+    APIView
+):
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    @extend_schema(
+        tags=["Commissions"],
+        summary="Calcular comisiones de todos los empleados",
+        description=(
+            "Calcula la vista previa de comisiones de todos los "
+            "empleados del negocio para un período. Los empleados "
+            "sin plan vigente se listan en "
+            "`employees_without_plan`."
+        ),
+        parameters=[
+            EmployeeCommissionBatchQuerySerializer,
+        ],
+        responses={
+            200: OpenApiResponse(
+                description=(
+                    "Vista previa de comisiones por empleado."
+                )
+            ),
+        },
+    )
+    def get(
+        self,
+        request,
+    ):
+        query_serializer = (
+            EmployeeCommissionBatchQuerySerializer(
+                data=request.query_params
+            )
+        )
+
+        query_serializer.is_valid(
+            raise_exception=True
+        )
+
+        validated_data = (
+            query_serializer.validated_data
+        )
+
+        business = get_object_or_404(
+            Business,
+            public_id=validated_data[
+                "business_public_id"
+            ],
+        )
+
+        validate_report_business_access(
+            user=request.user,
+            business=business,
+        )
+
+        roster = build_commission_roster(
+            business=business,
+            date_from=validated_data[
+                "date_from"
+            ],
+            date_to=validated_data[
+                "date_to"
+            ],
+        )
+
+        return Response(
+            roster,
+            status=status.HTTP_200_OK,
+        )
+
 @extend_schema_view(
     list=extend_schema(
         tags=["Commissions"],
@@ -4181,6 +5090,11 @@ class CommissionSettlementViewSet(
                 CommissionSettlementCreateSerializer
             )
 
+        if self.action == "bulk_create":
+            return (
+                CommissionSettlementBulkCreateSerializer
+            )
+
         return (
             CommissionSettlementSerializer
         )
@@ -4289,6 +5203,118 @@ class CommissionSettlementViewSet(
             status=status.HTTP_201_CREATED,
         )
 
+    @extend_schema(
+        tags=["Commissions"],
+        summary=(
+            "Liquidar comisiones de todos "
+            "los empleados"
+        ),
+        description=(
+            "Crea en una sola operación atómica las "
+            "liquidaciones de todos los empleados "
+            "elegibles del negocio para el período. "
+            "Los empleados ya liquidados o sin plan "
+            "vigente se reportan en `skipped`."
+        ),
+        request=(
+            CommissionSettlementBulkCreateSerializer
+        ),
+        responses={
+            201: OpenApiResponse(
+                description=(
+                    "Liquidaciones creadas y "
+                    "empleados omitidos."
+                )
+            ),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+    )
+    def bulk_create(
+        self,
+        request,
+    ):
+        serializer = self.get_serializer(
+            data=request.data,
+        )
+
+        serializer.is_valid(
+            raise_exception=True
+        )
+
+        business = get_object_or_404(
+            Business,
+            public_id=serializer.validated_data[
+                "business_public_id"
+            ],
+        )
+
+        self._validate_management_access(
+            business
+        )
+
+        try:
+            result = settle_business_commissions(
+                business=business,
+                period_start=serializer.validated_data[
+                    "period_start"
+                ],
+                period_end=serializer.validated_data[
+                    "period_end"
+                ],
+                created_by=request.user,
+            )
+        except IntegrityError as exc:
+            raise ValidationError({
+                "period": (
+                    "Otra liquidación fue creada para "
+                    "este período mientras se procesaba "
+                    "la solicitud. Intenta nuevamente."
+                )
+            }) from exc
+
+        log_action(
+            request.user,
+            "BULK_CREATE",
+            CommissionSettlement.__name__,
+            business.pk,
+            extra={
+                "created": len(result["created"]),
+                "skipped": len(result["skipped"]),
+            },
+        )
+
+        return Response(
+            {
+                "created": (
+                    CommissionSettlementSerializer(
+                        result["created"],
+                        many=True,
+                        context={
+                            "request": request,
+                        },
+                    ).data
+                ),
+                "skipped": [
+                    {
+                        "employee_public_id": str(
+                            skip["employee"].public_id
+                        ),
+                        "employee_name": (
+                            skip["employee"].full_name
+                        ),
+                        "reason": skip["reason"],
+                        "detail": skip["detail"],
+                    }
+                    for skip in result["skipped"]
+                ],
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
     @extend_schema(
         tags=["Commissions"],
         summary=(
@@ -4926,47 +5952,199 @@ class CashMovementViewSet(
             )
         )
 
-        self._validate_access(
-            locked_register.business
+        self._validate_access(
+            locked_register.business
+        )
+
+        if (
+            locked_register.status
+            != CashRegister.STATUS_OPEN
+        ):
+            raise ValidationError({
+                "cash_register_public_id": (
+                    "No se pueden registrar "
+                    "movimientos en una caja cerrada."
+                )
+            })
+
+        movement = serializer.save(
+            cash_register=locked_register,
+            created_by=self.request.user,
+        )
+
+        log_action(
+            self.request.user,
+            "CREATE_CASH_MOVEMENT",
+            movement.__class__.__name__,
+            movement.pk,
+            extra={
+                "movement_type": (
+                    movement.movement_type
+                ),
+                "amount": str(
+                    movement.amount
+                ),
+            },
+        )
+
+class ReportAPIView(
+    AsyncReportMixin,
+    APIView
+):
+    """
+    Reporte de solo lectura descrito por atributos:
+
+    - `report_query_serializer_class` valida la consulta; siempre incluye
+      `business_public_id`.
+    - `report_params` son los campos validados que recibe el builder.
+    - `report_lookups` resuelve objetos opcionales del mismo negocio:
+      argumento del builder -> (modelo, campo con su public_id).
+    - `report_allowed_roles` limita el acceso; por defecto owner y admin.
+
+    La misma descripción sirve a la petición síncrona, a la asíncrona
+    (`async_report_view`) y a `run_report_worker`.
+    """
+
+    permission_classes = [
+        IsAuthenticated,
+    ]
+    replica_reads = True
+
+    report_query_serializer_class = None
+    report_params = (
+        "date_from",
+        "date_to",
+    )
+    report_lookups = {}
+    report_allowed_roles = None
+
+    def _validate_report_params(
+        self,
+        params,
+    ):
+        query_serializer = (
+            self.report_query_serializer_class(
+                data=params
+            )
+        )
+
+        query_serializer.is_valid(
+            raise_exception=True
+        )
+
+        return query_serializer.validated_data
+
+    def _report_kwargs(
+        self,
+        *,
+        business,
+        validated_data,
+    ):
+        return {
+            "business": business,
+            **{
+                name: validated_data[name]
+                for name in self.report_params
+            },
+        }
+
+    def get_report_kwargs(
+        self,
+        *,
+        user,
+        params,
+    ):
+        validated_data = self._validate_report_params(
+            params
+        )
+
+        business = get_object_or_404(
+            Business,
+            public_id=validated_data[
+                "business_public_id"
+            ],
+        )
+
+        validate_report_business_access(
+            user=user,
+            business=business,
+            allowed_roles=self.report_allowed_roles,
+        )
+
+        report_kwargs = self._report_kwargs(
+            business=business,
+            validated_data=validated_data,
+        )
+
+        for name, (model, field) in self.report_lookups.items():
+            public_id = validated_data.get(field)
+
+            report_kwargs[name] = (
+                get_object_or_404(
+                    model,
+                    public_id=public_id,
+                    business=business,
+                )
+                if public_id is not None
+                else None
+            )
+
+        return report_kwargs
+
+    async def aget_report_kwargs(
+        self,
+        *,
+        user,
+        params,
+    ):
+        validated_data = self._validate_report_params(
+            params
+        )
+
+        try:
+            business = await Business.objects.aget(
+                public_id=validated_data[
+                    "business_public_id"
+                ],
+            )
+        except Business.DoesNotExist:
+            raise Http404
+
+        await avalidate_report_business_access(
+            user=user,
+            business=business,
+            allowed_roles=self.report_allowed_roles,
+        )
+
+        report_kwargs = self._report_kwargs(
+            business=business,
+            validated_data=validated_data,
         )
 
-        if (
-            locked_register.status
-            != CashRegister.STATUS_OPEN
-        ):
-            raise ValidationError({
-                "cash_register_public_id": (
-                    "No se pueden registrar "
-                    "movimientos en una caja cerrada."
-                )
-            })
+        for name, (model, field) in self.report_lookups.items():
+            public_id = validated_data.get(field)
 
-        movement = serializer.save(
-            cash_register=locked_register,
-            created_by=self.request.user,
-        )
+            if public_id is None:
+                report_kwargs[name] = None
+                continue
 
-        log_action(
-            self.request.user,
-            "CREATE_CASH_MOVEMENT",
-            movement.__class__.__name__,
-            movement.pk,
-            extra={
-                "movement_type": (
-                    movement.movement_type
-                ),
-                "amount": str(
-                    movement.amount
-                ),
-            },
-        )
+            try:
+                report_kwargs[name] = await model.objects.aget(
+                    public_id=public_id,
+                    business=business,
+                )
+            except model.DoesNotExist:
+                raise Http404
+
+        return report_kwargs
 
 class MonthlySummaryView(
-    APIView
+    ReportAPIView
 ):
-    permission_classes = [
-        IsAuthenticated,
-    ]
+    report_name = "monthly-summary"
+    report_builder = staticmethod(build_monthly_summary)
+    report_query_serializer_class = MonthlySummaryQuerySerializer
+    report_params = ("year", "month")
 
     @extend_schema(
         tags=["Reports"],
@@ -4977,6 +6155,7 @@ class MonthlySummaryView(
         ),
         parameters=[
             MonthlySummaryQuerySerializer,
+            ASYNC_REPORT_PARAMETER,
         ],
         responses={
             200: OpenApiResponse(
@@ -4985,54 +6164,17 @@ class MonthlySummaryView(
                     "Resumen mensual calculado."
                 )
             ),
+            202: ReportJobSerializer,
         },
     )
     def get(
         self,
         request,
     ):
-        query_serializer = (
-            MonthlySummaryQuerySerializer(
-                data=request.query_params
-            )
-        )
-
-        query_serializer.is_valid(
-            raise_exception=True
-        )
-
-        business = get_object_or_404(
-            Business,
-            public_id=(
-                query_serializer
-                .validated_data[
-                    "business_public_id"
-                ]
-            ),
-        )
-
-        validate_report_business_access(
-            user=request.user,
-            business=business,
-        )
-
-        summary = build_monthly_summary(
-            business=business,
-            year=(
-                query_serializer
-                .validated_data["year"]
-            ),
-            month=(
-                query_serializer
-                .validated_data["month"]
-            ),
+        return self.report_response(
+            request
         )
 
-        return Response(
-            summary,
-            status=status.HTTP_200_OK,
-        )
-    
 @extend_schema_view(
     list=extend_schema(
         tags=["Monthly Closures"],
@@ -5353,6 +6495,14 @@ class MonthlyClosureViewSet(
                 )
             }) from exc
 
+        take_stock_snapshots(
+            business=business,
+            taken_at=get_month_period(
+                year=year,
+                month=month,
+            )["end_datetime"],
+        )
+
         log_action(
             request.user,
             "CREATE_MONTHLY_CLOSURE",
@@ -5460,6 +6610,14 @@ class MonthlyClosureViewSet(
             ]
         )
 
+        # Un mes reabierto vuelve a ser editable: su historial archivado
+        # regresa a las tablas activas.
+        restore_archived_month(
+            business=closure.business,
+            year=closure.year,
+            month=closure.month,
+        )
+
         log_action(
             request.user,
             "REOPEN_MONTHLY_CLOSURE",
@@ -5490,11 +6648,14 @@ class MonthlyClosureViewSet(
         )
 
 class CustomerSummaryView(
-    APIView
+    ReportAPIView
 ):
-    permission_classes = [
-        IsAuthenticated,
-    ]
+    report_name = "customers-summary"
+    report_builder = staticmethod(build_customers_summary)
+    report_query_serializer_class = CustomerSummaryQuerySerializer
+    report_lookups = {
+        "customer": (Customer, "customer_public_id"),
+    }
 
     @extend_schema(
         tags=["Reports"],
@@ -5505,6 +6666,7 @@ class CustomerSummaryView(
         ),
         parameters=[
             CustomerSummaryQuerySerializer,
+            ASYNC_REPORT_PARAMETER,
         ],
         responses={
             200: OpenApiResponse(
@@ -5512,76 +6674,26 @@ class CustomerSummaryView(
                     "Resumen dinámico de clientes."
                 )
             ),
+            202: ReportJobSerializer,
         },
     )
     def get(
         self,
         request,
     ):
-        query_serializer = (
-            CustomerSummaryQuerySerializer(
-                data=request.query_params
-            )
-        )
-
-        query_serializer.is_valid(
-            raise_exception=True
-        )
-
-        validated_data = (
-            query_serializer.validated_data
-        )
-
-        business = get_object_or_404(
-            Business,
-            public_id=validated_data[
-                "business_public_id"
-            ],
-        )
-
-        validate_report_business_access(
-            user=request.user,
-            business=business,
-        )
-
-        customer = None
-
-        customer_public_id = (
-            validated_data.get(
-                "customer_public_id"
-            )
-        )
-
-        if customer_public_id is not None:
-            customer = get_object_or_404(
-                Customer,
-                public_id=customer_public_id,
-                business=business,
-            )
-
-        summary = build_customers_summary(
-            business=business,
-            date_from=validated_data[
-                "date_from"
-            ],
-            date_to=validated_data[
-                "date_to"
-            ],
-            customer=customer,
-        )
-
-        return Response(
-            summary,
-            status=status.HTTP_200_OK,
+        return self.report_response(
+            request
         )
 
-
 class SupplierSummaryView(
-    APIView
+    ReportAPIView
 ):
-    permission_classes = [
-        IsAuthenticated,
-    ]
+    report_name = "suppliers-summary"
+    report_builder = staticmethod(build_suppliers_summary)
+    report_query_serializer_class = SupplierSummaryQuerySerializer
+    report_lookups = {
+        "supplier": (Supplier, "supplier_public_id"),
+    }
 
     @extend_schema(
         tags=["Reports"],
@@ -5592,6 +6704,7 @@ class SupplierSummaryView(
         ),
         parameters=[
             SupplierSummaryQuerySerializer,
+            ASYNC_REPORT_PARAMETER,
         ],
         responses={
             200: OpenApiResponse(
@@ -5599,168 +6712,63 @@ class SupplierSummaryView(
                     "Resumen dinámico de proveedores."
                 )
             ),
+            202: ReportJobSerializer,
         },
     )
     def get(
         self,
         request,
-    ):
-        query_serializer = (
-            SupplierSummaryQuerySerializer(
-                data=request.query_params
-            )
-        )
-
-        query_serializer.is_valid(
-            raise_exception=True
-        )
-
-        validated_data = (
-            query_serializer.validated_data
-        )
-
-        business = get_object_or_404(
-            Business,
-            public_id=validated_data[
-                "business_public_id"
-            ],
-        )
-
-        validate_report_business_access(
-            user=request.user,
-            business=business,
-        )
-
-        supplier = None
-
-        supplier_public_id = (
-            validated_data.get(
-                "supplier_public_id"
-            )
-        )
-
-        if supplier_public_id is not None:
-            supplier = get_object_or_404(
-                Supplier,
-                public_id=supplier_public_id,
-                business=business,
-            )
-
-        summary = build_suppliers_summary(
-            business=business,
-            date_from=validated_data[
-                "date_from"
-            ],
-            date_to=validated_data[
-                "date_to"
-            ],
-            supplier=supplier,
-        )
-
-        return Response(
-            summary,
-            status=status.HTTP_200_OK,
-        )
-
-class PaymentSummaryView(
-    APIView
-):
-    permission_classes = [
-        IsAuthenticated,
-    ]
-
-    @extend_schema(
-        tags=["Reports"],
-        summary="Resumen de pagos",
-        description=(
-            "Separa pagos recibidos y realizados por método. "
-            "Las transacciones con deuda histórica se reconocen "
-            "exclusivamente mediante sus pagos de deuda."
-        ),
-        parameters=[
-            PaymentSummaryQuerySerializer,
-        ],
-        responses={
-            200: OpenApiResponse(
-                response=PaymentSummaryResponseSerializer,
-                description=(
-                    "Resumen dinámico de pagos."
-                )
-            ),
-        },
-    )
-    def get(
-        self,
-        request,
-    ):
-        query_serializer = (
-            PaymentSummaryQuerySerializer(
-                data=request.query_params
-            )
-        )
-
-        query_serializer.is_valid(
-            raise_exception=True
-        )
-
-        validated_data = (
-            query_serializer.validated_data
-        )
-
-        business = get_object_or_404(
-            Business,
-            public_id=validated_data[
-                "business_public_id"
-            ],
-        )
-
-        validate_report_business_access(
-            user=request.user,
-            business=business,
-        )
-
-        payment_method = None
-
-        payment_method_public_id = (
-            validated_data.get(
-                "payment_method_public_id"
-            )
-        )
-
-        if (
-            payment_method_public_id
-            is not None
-        ):
-            payment_method = get_object_or_404(
-                PaymentMethod,
-                public_id=(
-                    payment_method_public_id
-                ),
-                business=business,
-            )
-
-        summary = build_payments_summary(
-            business=business,
-            date_from=validated_data[
-                "date_from"
-            ],
-            date_to=validated_data[
-                "date_to"
-            ],
-            payment_method=payment_method,
+    ):
+        return self.report_response(
+            request
         )
 
-        return Response(
-            summary,
-            status=status.HTTP_200_OK,
+class PaymentSummaryView(
+    ReportAPIView
+):
+    report_name = "payments-summary"
+    report_builder = staticmethod(build_payments_summary)
+    report_query_serializer_class = PaymentSummaryQuerySerializer
+    report_lookups = {
+        "payment_method": (PaymentMethod, "payment_method_public_id"),
+    }
+
+    @extend_schema(
+        tags=["Reports"],
+        summary="Resumen de pagos",
+        description=(
+            "Separa pagos recibidos y realizados por método. "
+            "Las transacciones con deuda histórica se reconocen "
+            "exclusivamente mediante sus pagos de deuda."
+        ),
+        parameters=[
+            PaymentSummaryQuerySerializer,
+            ASYNC_REPORT_PARAMETER,
+        ],
+        responses={
+            200: OpenApiResponse(
+                response=PaymentSummaryResponseSerializer,
+                description=(
+                    "Resumen dinámico de pagos."
+                )
+            ),
+            202: ReportJobSerializer,
+        },
+    )
+    def get(
+        self,
+        request,
+    ):
+        return self.report_response(
+            request
         )
 
 class DebtSummaryView(
-    APIView
+    ReportAPIView
 ):
-    permission_classes = [
-        IsAuthenticated,
-    ]
+    report_name = "debts-summary"
+    report_builder = staticmethod(build_debts_summary)
+    report_query_serializer_class = DebtSummaryQuerySerializer
 
     @extend_schema(
         tags=["Reports"],
@@ -5771,6 +6779,7 @@ class DebtSummaryView(
         ),
         parameters=[
             DebtSummaryQuerySerializer,
+            ASYNC_REPORT_PARAMETER,
         ],
         responses={
             200: OpenApiResponse(
@@ -5779,59 +6788,31 @@ class DebtSummaryView(
                     "Resumen dinámico de deudas."
                 )
             ),
+            202: ReportJobSerializer,
         },
     )
     def get(
         self,
         request,
     ):
-        query_serializer = (
-            DebtSummaryQuerySerializer(
-                data=request.query_params
-            )
-        )
-
-        query_serializer.is_valid(
-            raise_exception=True
-        )
-
-        validated_data = (
-            query_serializer.validated_data
-        )
-
-        business = get_object_or_404(
-            Business,
-            public_id=validated_data[
-                "business_public_id"
-            ],
-        )
-
-        validate_report_business_access(
-            user=request.user,
-            business=business,
-        )
-
-        summary = build_debts_summary(
-            business=business,
-            date_from=validated_data[
-                "date_from"
-            ],
-            date_to=validated_data[
-                "date_to"
-            ],
-        )
-
-        return Response(
-            summary,
-            status=status.HTTP_200_OK,
+        return self.report_response(
+            request
         )
 
 class InventorySummaryView(
-    APIView
+    ReportAPIView
 ):
-    permission_classes = [
-        IsAuthenticated,
+    report_name = "inventory-summary"
+    report_builder = staticmethod(build_inventory_summary)
+    report_query_serializer_class = InventorySummaryQuerySerializer
+    report_allowed_roles = [
+        BusinessMembership.ROLE_OWNER,
+        BusinessMembership.ROLE_ADMIN,
+        BusinessMembership.ROLE_INVENTORY,
     ]
+    report_lookups = {
+        "product": (Product, "product_public_id"),
+    }
 
     @extend_schema(
         tags=["Reports"],
@@ -5843,6 +6824,7 @@ class InventorySummaryView(
         ),
         parameters=[
             InventorySummaryQuerySerializer,
+            ASYNC_REPORT_PARAMETER,
         ],
         responses={
             200: OpenApiResponse(
@@ -5850,80 +6832,32 @@ class InventorySummaryView(
                     "Resumen dinámico de inventario."
                 )
             ),
+            202: ReportJobSerializer,
         },
     )
     def get(
         self,
         request,
     ):
-        query_serializer = (
-            InventorySummaryQuerySerializer(
-                data=request.query_params
-            )
-        )
-
-        query_serializer.is_valid(
-            raise_exception=True
-        )
-
-        validated_data = (
-            query_serializer.validated_data
-        )
-
-        business = get_object_or_404(
-            Business,
-            public_id=validated_data[
-                "business_public_id"
-            ],
-        )
-
-        validate_report_business_access(
-            user=request.user,
-            business=business,
-            allowed_roles=[
-                BusinessMembership.ROLE_OWNER,
-                BusinessMembership.ROLE_ADMIN,
-                BusinessMembership.ROLE_INVENTORY,
-            ],
-        )
-
-        product = None
-        product_public_id = (
-            validated_data.get(
-                "product_public_id"
-            )
-        )
-
-        if product_public_id is not None:
-            product = get_object_or_404(
-                Product,
-                public_id=(
-                    product_public_id
-                ),
-                business=business,
-            )
-
-        summary = build_inventory_summary(
-            business=business,
-            date_from=validated_data[
-                "date_from"
-            ],
-            date_to=validated_data[
-                "date_to"
-            ],
-            product=product,
-        )
-
-        return Response(
-            summary,
-            status=status.HTTP_200_OK,
+        return self.report_response(
+            request
         )
 
 class DashboardOverviewView(
-    APIView
+    ReportAPIView
 ):
-    permission_classes = [
-        IsAuthenticated,
+    report_name = "dashboard-overview"
+    report_builder = staticmethod(build_dashboard_overview)
+    report_query_serializer_class = DashboardOverviewQuerySerializer
+    report_params = (
+        "date_from",
+        "date_to",
+        "low_stock_threshold",
+    )
+    report_allowed_roles = [
+        BusinessMembership.ROLE_OWNER,
+        BusinessMembership.ROLE_ADMIN,
+        BusinessMembership.ROLE_VIEWER,
     ]
 
     @extend_schema(
@@ -5936,6 +6870,7 @@ class DashboardOverviewView(
         ),
         parameters=[
             DashboardOverviewQuerySerializer,
+            ASYNC_REPORT_PARAMETER,
         ],
         responses={
             200: OpenApiResponse(
@@ -5945,61 +6880,169 @@ class DashboardOverviewView(
                     "negocio."
                 )
             ),
+            202: ReportJobSerializer,
         },
     )
     def get(
         self,
         request,
     ):
-        query_serializer = (
-            DashboardOverviewQuerySerializer(
-                data=request.query_params
-            )
+        return self.report_response(
+            request
         )
 
-        query_serializer.is_valid(
-            raise_exception=True
+class ReportJobView(
+    APIView
+):
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    @extend_schema(
+        tags=["Reports"],
+        summary="Consultar un reporte en segundo plano",
+        description=(
+            "Estado de un reporte pedido con `async=true`. Cuando "
+            "`status` es `done`, `result` contiene la misma respuesta "
+            "que el reporte síncrono. Solo lo consulta quien lo pidió."
+        ),
+        responses={
+            200: ReportJobSerializer,
+        },
+    )
+    def get(
+        self,
+        request,
+        public_id,
+    ):
+        job = get_object_or_404(
+            ReportJob.objects.select_related("business"),
+            public_id=public_id,
+            requested_by=request.user,
         )
 
-        validated_data = (
-            query_serializer.validated_data
+        return Response(
+            ReportJobSerializer(
+                job,
+                context={"request": request},
+            ).data,
+            status=status.HTTP_200_OK,
+        )
+
+class PosBootstrapView(APIView):
+    permission_classes = [
+        IsAuthenticated,
+    ]
+
+    allowed_roles = [
+        BusinessMembership.ROLE_OWNER,
+        BusinessMembership.ROLE_ADMIN,
+        BusinessMembership.ROLE_CASHIER,
+        BusinessMembership.ROLE_SELLER,
+    ]
+
+    @extend_schema(
+        tags=["POS"],
+        summary="Datos de arranque del punto de venta",
+        description=(
+            "Devuelve en una sola respuesta el usuario, el negocio y los "
+            "productos, categorías, métodos de pago, empleados y clientes "
+            "activos con las columnas que usa la caja. Incluye ETag: con "
+            "If-None-Match vigente responde 304 sin cuerpo."
+        ),
+        parameters=[
+            PosBootstrapQuerySerializer,
+        ],
+        responses={
+            200: OpenApiResponse(
+                description="Bundle de arranque del punto de venta."
+            ),
+            304: OpenApiResponse(
+                description="El bundle no cambió desde el ETag enviado."
+            ),
+        },
+    )
+    def get(
+        self,
+        request,
+    ):
+        query_serializer = PosBootstrapQuerySerializer(
+            data=request.query_params,
+        )
+        query_serializer.is_valid(
+            raise_exception=True
         )
 
         business = get_object_or_404(
             Business,
-            public_id=validated_data[
+            public_id=query_serializer.validated_data[
                 "business_public_id"
             ],
         )
 
-        validate_report_business_access(
-            user=request.user,
-            business=business,
-            allowed_roles=[
-                BusinessMembership.ROLE_OWNER,
-                BusinessMembership.ROLE_ADMIN,
-                BusinessMembership.ROLE_VIEWER,
-            ],
+        user = request.user
+        membership = (
+            BusinessMembership.objects
+            .filter(
+                user=user,
+                business=business,
+                is_active=True,
+            )
+            .values(
+                "public_id",
+                "role",
+                "employee__public_id",
+            )
+            .first()
         )
 
-        overview = build_dashboard_overview(
-            business=business,
-            date_from=validated_data[
-                "date_from"
-            ],
-            date_to=validated_data[
-                "date_to"
-            ],
-            low_stock_threshold=(
-                validated_data[
-                    "low_stock_threshold"
-                ]
-            ),
+        if not user.is_superuser and (
+            membership is None
+            or membership["role"] not in self.allowed_roles
+        ):
+            raise PermissionDenied(
+                "No tienes permisos para abrir el punto de venta "
+                "de este negocio."
+            )
+
+        membership = membership or {}
+        current_user = {
+            "public_id": user.public_id,
+            "email": user.email,
+            "full_name": user.full_name,
+            "membership_public_id": membership.get("public_id"),
+            "role": membership.get("role"),
+            "employee_public_id": membership.get("employee__public_id"),
+        }
+
+        generation = pos_bootstrap_generation(business)
+        etag = quote_etag(
+            hashlib.sha1(
+                repr((generation, sorted(current_user.items()))).encode(),
+                usedforsecurity=False,
+            ).hexdigest()
+        )
+
+        if etag in parse_etags(
+            request.headers.get("If-None-Match", "")
+        ):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag},
+            )
+
+        bundle = get_pos_bootstrap(
+            business,
+            generation=generation,
         )
 
         return Response(
-            overview,
-            status=status.HTTP_200_OK,
+            {
+                "generation": generation,
+                "user": current_user,
+                **bundle,
+            },
+            headers={"ETag": etag},
         )
 
 class CurrentUserView(APIView):
@@ -6070,3 +7113,35 @@ class CurrentUserView(APIView):
             serializer.data,
             status=status.HTTP_200_OK,
         )
+
+
+class MetricsView(APIView):
+    permission_classes = [
+        CanReadMetrics,
+    ]
+    renderer_classes = [
+        PrometheusTextRenderer,
+    ]
+    # Lo consulta un scraper a intervalo fijo.
+    throttle_classes = []
+
+    @extend_schema(
+        tags=["Monitoring"],
+        summary="Métricas por endpoint (Prometheus)",
+        description=(
+            "Peticiones, latencia, consultas SQL, tamaño de respuesta y "
+            "rechazos por throttling por ruta y método, sumados entre "
+            "todos los workers, en formato de texto de Prometheus."
+        ),
+        responses={
+            (200, "text/plain"): OpenApiTypes.STR,
+        },
+    )
+    def get(
+        self,
+        request,
+    ):
+        return Response(
+            render_metrics(metrics_store.collect()),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
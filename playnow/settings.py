@@ -67,6 +67,7 @@ INSTALLED_APPS = [
 # Middleware
 # -------------------------
 MIDDLEWARE = [
+    "core.middleware.RequestMetricsMiddleware",        # mide todo el resto
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",           # CORS primero
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -75,6 +76,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.middleware.ReplicaReadMiddleware",
 ]
 
 ROOT_URLCONF = "playnow.urls"
@@ -112,6 +114,25 @@ DATABASES = {
     }
 }
 
+# Réplica de solo lectura para reportes y listados (ver
+# core.db_routers). Sin DB_REPLICA_HOST todo va a `default`. En las
+# pruebas la réplica es un espejo de la base de prueba.
+REPLICA_DATABASE_ALIAS = "replica"
+REPLICA_READ_YOUR_WRITES_SECONDS = int(os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", "5"))
+
+if os.getenv("DB_REPLICA_HOST"):
+    DATABASES[REPLICA_DATABASE_ALIAS] = {
+        **DATABASES["default"],
+        "NAME": os.getenv("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "USER": os.getenv("DB_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": os.getenv("DB_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "HOST": os.getenv("DB_REPLICA_HOST"),
+        "PORT": os.getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["core.db_routers.PrimaryReplicaRouter"]
+
 # -------------------------
 # Password validators
 # -------------------------
@@ -149,6 +170,23 @@ AUTH_USER_MODEL = "core.User"
 # -------------------------
 # DRF
 # -------------------------
+# "drf": JSONRenderer de DRF (por defecto).
+# "fast": los mismos bytes, codificados con orjson si está instalado.
+# "streaming": como "fast", y las páginas con muchas filas en `results`
+# se envían por bloques de JSON_STREAM_CHUNK_SIZE filas.
+JSON_RENDERER_CLASSES = {
+    "drf": "rest_framework.renderers.JSONRenderer",
+    "fast": "core.renderers.FastJSONRenderer",
+    "streaming": "core.renderers.StreamingJSONRenderer",
+}
+API_JSON_RENDERER = os.getenv("API_JSON_RENDERER", "drf").lower()
+if API_JSON_RENDERER not in JSON_RENDERER_CLASSES:
+    raise RuntimeError(
+        "API_JSON_RENDERER debe ser uno de: "
+        + ", ".join(JSON_RENDERER_CLASSES)
+    )
+JSON_STREAM_CHUNK_SIZE = int(os.getenv("JSON_STREAM_CHUNK_SIZE", "100"))
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
@@ -158,6 +196,10 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": (
+        JSON_RENDERER_CLASSES[API_JSON_RENDERER],
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
 
     "DEFAULT_THROTTLE_CLASSES": (
         "rest_framework.throttling.AnonRateThrottle",
@@ -267,6 +309,74 @@ else:
     CORS_ALLOWED_ORIGINS = list_from_env("DJANGO_CORS_ALLOWED_ORIGINS")
 CORS_ALLOW_CREDENTIALS = True
 
+# -------------------------
+# Inventario
+# -------------------------
+# "locking": SELECT ... FOR UPDATE sobre los productos antes de escribir.
+# "conditional": un UPDATE condicionado por producto (stock + delta >= 0).
+INVENTORY_STOCK_ENGINE = os.getenv("INVENTORY_STOCK_ENGINE", "locking").lower()
+
+# -------------------------
+# Archivo histórico
+# -------------------------
+# Meses cerrados anteriores a este horizonte pueden trasladarse a las
+# tablas de archivo con `manage.py archive_closed_periods`.
+ARCHIVE_HORIZON_MONTHS = int(os.getenv("ARCHIVE_HORIZON_MONTHS", "12"))
+
+# -------------------------
+# Punto de venta
+# -------------------------
+# La marca de `/sync/` retrocede estos segundos para no perder filas de
+# transacciones que aún no habían confirmado durante la lectura.
+SYNC_WATERMARK_OVERLAP_SECONDS = int(os.getenv("SYNC_WATERMARK_OVERLAP_SECONDS", "30"))
+# Filas de `changed` por página de `/sync/`.
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))
+
+# El bundle de `/api/pos/bootstrap/` se cachea por negocio y generación;
+# una generación nueva no reutiliza entradas viejas.
+POS_BOOTSTRAP_CACHE_SECONDS = int(os.getenv("POS_BOOTSTRAP_CACHE_SECONDS", "600"))
+
+# Filas que `/export/` lee y serializa por bloque; en PostgreSQL es el
+# tamaño de cada FETCH del cursor del lado del servidor.
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+
+# -------------------------
+# Reportes en segundo plano
+# -------------------------
+# `?async=true` encola el reporte; `manage.py run_report_worker` lo
+# calcula. Un trabajo en `running` por más de REPORT_JOB_STALE_SECONDS
+# se considera abandonado y vuelve a la cola hasta REPORT_JOB_MAX_ATTEMPTS.
+REPORT_JOB_STALE_SECONDS = int(os.getenv("REPORT_JOB_STALE_SECONDS", "900"))
+REPORT_JOB_MAX_ATTEMPTS = int(os.getenv("REPORT_JOB_MAX_ATTEMPTS", "3"))
+# Horas que se conserva el resultado de un trabajo terminado.
+REPORT_JOB_RETENTION_HOURS = int(os.getenv("REPORT_JOB_RETENTION_HOURS", "24"))
+
+# Consultas del dashboard que pueden correr a la vez, cada una con su
+# conexión y la misma instantánea (solo PostgreSQL). El límite es por
+# proceso; 1 las ejecuta en secuencia.
+DASHBOARD_QUERY_PARALLELISM = int(os.getenv("DASHBOARD_QUERY_PARALLELISM", "1"))
+
+# Sirve los reportes y el dashboard con vistas `async def` (ASGI). Bajo
+# WSGI conviene dejarlo apagado: cada petición crearía su event loop.
+ASYNC_REPORT_VIEWS = os.getenv("ASYNC_REPORT_VIEWS", "false").lower() == "true"
+
+# -------------------------
+# Métricas (Prometheus)
+# -------------------------
+# Cada proceso vuelca sus series a METRICS_DIR como mucho cada
+# METRICS_FLUSH_SECONDS; `/api/metrics/` suma las de todos los workers.
+# Los archivos de workers terminados se consolidan al recolectar. Con
+# METRICS_TOKEN definido, el scraper se autentica con
+# `Authorization: Token <METRICS_TOKEN>`; sin él solo pueden leerlas
+# usuarios staff.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+METRICS_DIR = os.getenv("METRICS_DIR", str(LOG_DIR / "metrics"))
+METRICS_FLUSH_SECONDS = int(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Durante `manage.py test` METRICS_DIR apunta a un directorio temporal.
+TEST_RUNNER = "core.tests.runner.PlayNowTestRunner"
+
 # -------------------------
 # Logging + Auditoría
 # -------------------------